@@ -3,11 +3,15 @@ import re
 from typing import Any, Dict, Optional
 
 from app.agents.base import BaseAgent
+from app.core.config import settings
 from app.core.logging import logger
-from app.services.ai.ollama_service import OllamaService
+from app.services.ai.ollama_service import OllamaService, get_ollama_service
 
 
 class AnalystAgent(BaseAgent):
+    # Température du second essai après un JSON invalide
+    RETRY_TEMPERATURE = 0.3
+
     def __init__(self, ollama_service: Optional[OllamaService] = None) -> None:
         super().__init__(
             name="AnalystAgent",
@@ -15,7 +19,7 @@ class AnalystAgent(BaseAgent):
             version="1.1.0",
             capabilities=["skill_analysis", "build_synergy", "wvw_evaluation"],
         )
-        self._ollama = ollama_service or OllamaService()
+        self._ollama = ollama_service or get_ollama_service()
 
     async def _initialize_impl(self) -> None:
         return None
@@ -67,12 +71,15 @@ class AnalystAgent(BaseAgent):
 
             logger.info("Running build synergy analysis with AnalystAgent (Ollama)")
             ai_result: Any = {}
-            for attempt in range(2):
+            # Le retry échantillonne toujours: à température 0 il reproduirait
+            # le même JSON invalide.
+            for attempt, temperature in enumerate((settings.LLM_AGENT_TEMPERATURE, self.RETRY_TEMPERATURE)):
                 try:
                     ai_result = await self._ollama.generate_structured(
                         prompt=prompt,
                         system_prompt=system_prompt,
                         schema=None,
+                        temperature=temperature,
                     )
                     break
                 except ValueError as e:
@@ -166,6 +173,7 @@ class AnalystAgent(BaseAgent):
             prompt=prompt,
             system_prompt=system_prompt,
             schema=schema,
+            temperature=settings.LLM_AGENT_TEMPERATURE,
         )
 
         rating: Optional[str] = None
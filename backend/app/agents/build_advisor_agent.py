@@ -1,8 +1,10 @@
+import asyncio
 from dataclasses import dataclass
 from typing import Any, Dict, List
 
+from app.core.config import settings
 from app.core.logging import logger
-from app.services.ai.ollama_service import OllamaService
+from app.services.ai.ollama_service import get_ollama_service
 from app.services.learning.data_collector import DataCollector
 from app.models.learning import DataSource
 
@@ -33,6 +35,20 @@ class AdvisorChoice:
     ranked_candidates: list[BuildCandidate] | None = None
 
 
+@dataclass
+class AdvisorSlot:
+    """Candidats d'un slot d'équipe, arbitrés avec ceux des autres slots.
+
+    slot_id identifie le slot dans le prompt et la réponse (unique dans le lot),
+    label le décrit au LLM (ex: "Guardian Firebrand").
+    """
+
+    slot_id: str
+    candidates: List[BuildCandidate]
+    role: str
+    label: str = ""
+
+
 class BuildAdvisorAgent:
     """Sous-agent chargé de choisir le meilleur build parmi plusieurs candidats.
 
@@ -41,8 +57,11 @@ class BuildAdvisorAgent:
     le contexte (niveau du joueur, mode de jeu, préférences).
     """
 
+    # Nombre max d'options par slot envoyées au LLM (coût et clarté du prompt)
+    MAX_LLM_OPTIONS = 5
+
     def __init__(self) -> None:
-        self.ollama = OllamaService()
+        self.ollama = get_ollama_service()
         # Data collector for logging advisor decisions as training data
         self.collector = DataCollector()
 
@@ -83,6 +102,53 @@ class BuildAdvisorAgent:
         # Fallback: logique heuristique historique
         return self._choose_best_candidate_heuristic(candidates, role, ctx)
 
+    async def choose_best_candidates(
+        self,
+        slots: List[AdvisorSlot],
+        context: Dict[str, Any] | None = None,
+    ) -> List[AdvisorChoice]:
+        """Choisit un candidat pour chaque slot d'une équipe en un seul appel LLM.
+
+        Chaque choix du modèle est validé pour son slot; seuls les slots sans
+        choix valide (slot absent de la réponse, ID inconnu) repassent par
+        l'heuristique. Les choix sont retournés dans l'ordre de ``slots``.
+        """
+        ctx = context or {}
+
+        if any(not slot.candidates for slot in slots):
+            raise ValueError("No candidates provided to BuildAdvisorAgent")
+        if len({slot.slot_id for slot in slots}) != len(slots):
+            raise ValueError("Duplicate slot_id in BuildAdvisorAgent batch")
+        if not slots:
+            return []
+        if len(slots) == 1:
+            return [await self.choose_best_candidate(slots[0].candidates, slots[0].role, ctx)]
+
+        llm_choices: Dict[str, AdvisorChoice] = {}
+        try:
+            llm_choices = await self._choose_batch_with_llm(slots, ctx)
+        except Exception as e:
+            logger.warning(
+                "BuildAdvisorAgent batch LLM choice failed; falling back to heuristic.",
+                extra={"error": str(e), "slots": len(slots)},
+            )
+
+        choices: List[AdvisorChoice] = []
+        fallback_slots: List[str] = []
+        for slot in slots:
+            choice = llm_choices.get(slot.slot_id)
+            if choice is None:
+                fallback_slots.append(slot.slot_id)
+                choice = self._choose_best_candidate_heuristic(slot.candidates, slot.role, ctx)
+            choices.append(choice)
+
+        if fallback_slots:
+            logger.info(
+                "BuildAdvisorAgent heuristic used for slots without a valid LLM choice.",
+                extra={"slots": fallback_slots},
+            )
+        return choices
+
     def _choose_best_candidate_heuristic(
         self,
         candidates: List[BuildCandidate],
@@ -192,11 +258,7 @@ class BuildAdvisorAgent:
         experience = str(context.get("experience", "beginner")).lower()
         mode = str(context.get("mode", "wvw_zerg")).lower()
 
-        # Limiter le nombre d'options envoyées au LLM pour le coût et la clarté.
-        # On prend les meilleures options selon le score global du moteur.
-        MAX_OPTIONS = 5
-        sorted_candidates = sorted(candidates, key=lambda c: c.overall_score, reverse=True)
-        limited_candidates = sorted_candidates[:MAX_OPTIONS]
+        limited_candidates = self._limit_candidates(candidates)
 
         schema: Dict[str, Any] = {
             "type": "object",
@@ -211,16 +273,7 @@ class BuildAdvisorAgent:
             "required": ["best_id", "reason"],
         }
 
-        options_lines: List[str] = []
-        for c in limited_candidates:
-            sigils_str = ", ".join(c.sigils)
-            options_lines.append(
-                f"- id: {c.id} | prefix: {c.prefix} | rune: {c.rune} | sigils: [{sigils_str}] | "
-                f"total_damage: {c.total_damage:.1f} | survivability: {c.survivability:.3f} | "
-                f"overall_score: {c.overall_score:.3f}"
-            )
-
-        options_block = "\n".join(options_lines)
+        options_block = self._format_options(limited_candidates)
 
         prompt = (
             "Tu es un conseiller de builds Guild Wars 2 expert en WvW.\n"
@@ -243,11 +296,12 @@ class BuildAdvisorAgent:
             "Réponds toujours en JSON valide uniquement, en français."
         )
 
-        result = await self.ollama.generate_structured(
+        result, from_cache = await self.ollama.generate_structured_cached(
             prompt=prompt,
             system_prompt=system_prompt,
             schema=schema,
             max_tokens=512,
+            temperature=settings.LLM_AGENT_TEMPERATURE,
         )
 
         best_id = str(result.get("best_id", "")).strip()
@@ -263,20 +317,176 @@ class BuildAdvisorAgent:
             )
             return None
 
+        ranked = self._rank_from_ids(limited_candidates, best, ranking_ids)
+
+        if not reason:
+            reason = f"Choix du preset {best.prefix} via arbitre LLM pour le rôle {role_cat}."
+
+        # Une réponse servie par le cache LLM a déjà été collectée à sa génération
+        if not from_cache:
+            await self._collect_decision(mode, role_cat, experience, limited_candidates, best_id, reason)
+        return AdvisorChoice(candidate=best, reason=reason, ranked_candidates=ranked)
+
+    async def _choose_batch_with_llm(
+        self,
+        slots: List[AdvisorSlot],
+        context: Dict[str, Any],
+    ) -> Dict[str, AdvisorChoice]:
+        """Un prompt pour tous les slots; retourne {slot_id: choix} pour les choix valides."""
+        experience = str(context.get("experience", "beginner")).lower()
+        mode = str(context.get("mode", "wvw_zerg")).lower()
+
+        limited_by_slot: Dict[str, List[BuildCandidate]] = {}
+        role_by_slot: Dict[str, str] = {}
+        slot_blocks: List[str] = []
+        for slot in slots:
+            limited = self._limit_candidates(slot.candidates)
+            limited_by_slot[slot.slot_id] = limited
+            role_by_slot[slot.slot_id] = self._normalize_role(slot.role)
+            label = f" {slot.label}" if slot.label else ""
+            slot_blocks.append(
+                f"Slot {slot.slot_id}{label} (rôle logique : {role_by_slot[slot.slot_id]}) :\n"
+                f"{self._format_options(limited)}"
+            )
+
+        schema: Dict[str, Any] = {
+            "type": "object",
+            "properties": {
+                "choices": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "slot": {"type": "string"},
+                            "best_id": {"type": "string"},
+                            "reason": {"type": "string"},
+                            "ranking": {"type": "array", "items": {"type": "string"}},
+                        },
+                        "required": ["slot", "best_id", "reason"],
+                    },
+                },
+            },
+            "required": ["choices"],
+        }
+
+        slots_block = "\n\n".join(slot_blocks)
+        prompt = (
+            "Tu es un conseiller de builds Guild Wars 2 expert en WvW.\n"
+            "Contexte :\n"
+            f"- Mode : {mode}\n"
+            f"- Niveau de l'équipe : {experience}\n\n"
+            "Pour chaque slot de l'équipe, on te donne plusieurs options de gear déjà évaluées par un "
+            "moteur mathématique (préfixe de stats, rune, sigils, scores de dégâts et de survie). "
+            "Utilise ta connaissance de la méta WvW pour choisir, slot par slot, l'option la plus "
+            "réaliste et jouable pour ce contexte et ce rôle. Choisis uniquement parmi les IDs du slot.\n\n"
+            f"{slots_block}\n\n"
+            "Donne ta réponse STRICTEMENT au format JSON en suivant le schéma: {choices: [{slot: string, "
+            "best_id: string, reason: string, ranking: string[]}]}, avec un élément par slot."
+        )
+
+        system_prompt = (
+            "Tu es un arbitre de builds WvW pour Guild Wars 2. "
+            "Réponds toujours en JSON valide uniquement, en français."
+        )
+
+        result, from_cache = await self.ollama.generate_structured_cached(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            schema=schema,
+            max_tokens=min(4096, 128 + 192 * len(slots)),
+            temperature=settings.LLM_AGENT_TEMPERATURE,
+        )
+
+        entries = result.get("choices") if isinstance(result, dict) else None
+        choices: Dict[str, AdvisorChoice] = {}
+        for entry in entries if isinstance(entries, list) else []:
+            if not isinstance(entry, dict):
+                continue
+            slot_id = str(entry.get("slot", "")).strip()
+            limited = limited_by_slot.get(slot_id)
+            if limited is None or slot_id in choices:
+                continue
+
+            best_id = str(entry.get("best_id", "")).strip()
+            best = next((c for c in limited if c.id == best_id), None)
+            if best is None:
+                logger.warning(
+                    "BuildAdvisorAgent LLM returned unknown best_id for slot; falling back to heuristic.",
+                    extra={"slot": slot_id, "best_id": best_id},
+                )
+                continue
+
+            role_cat = role_by_slot[slot_id]
+            reason = str(entry.get("reason", "")).strip() or (
+                f"Choix du preset {best.prefix} via arbitre LLM pour le rôle {role_cat}."
+            )
+            choices[slot_id] = AdvisorChoice(
+                candidate=best,
+                reason=reason,
+                ranked_candidates=self._rank_from_ids(limited, best, entry.get("ranking")),
+            )
+
+        if from_cache:
+            return choices
+        await asyncio.gather(
+            *(
+                self._collect_decision(
+                    mode,
+                    role_by_slot[slot_id],
+                    experience,
+                    limited_by_slot[slot_id],
+                    choice.candidate.id,
+                    choice.reason,
+                )
+                for slot_id, choice in choices.items()
+            )
+        )
+        return choices
+
+    def _limit_candidates(self, candidates: List[BuildCandidate]) -> List[BuildCandidate]:
+        """Meilleures options selon le score global du moteur, limitées pour le LLM."""
+        return sorted(candidates, key=lambda c: c.overall_score, reverse=True)[: self.MAX_LLM_OPTIONS]
+
+    @staticmethod
+    def _format_options(candidates: List[BuildCandidate]) -> str:
+        options_lines: List[str] = []
+        for c in candidates:
+            sigils_str = ", ".join(c.sigils)
+            options_lines.append(
+                f"- id: {c.id} | prefix: {c.prefix} | rune: {c.rune} | sigils: [{sigils_str}] | "
+                f"total_damage: {c.total_damage:.1f} | survivability: {c.survivability:.3f} | "
+                f"overall_score: {c.overall_score:.3f}"
+            )
+        return "\n".join(options_lines)
+
+    @staticmethod
+    def _rank_from_ids(
+        candidates: List[BuildCandidate],
+        best: BuildCandidate,
+        ranking_ids: Any,
+    ) -> List[BuildCandidate]:
+        """Classement proposé par le LLM (IDs inconnus ignorés), complété par les options restantes."""
+        candidates_by_id: Dict[str, BuildCandidate] = {c.id: c for c in candidates}
         ranked: List[BuildCandidate] = []
-        for cid in ranking_ids:
-            cid_str = str(cid)
-            cand = candidates_by_id.get(cid_str)
+        for cid in ranking_ids if isinstance(ranking_ids, list) else []:
+            cand = candidates_by_id.get(str(cid))
             if cand is not None and cand not in ranked:
                 ranked.append(cand)
 
-        for c in limited_candidates:
+        for c in candidates:
             if c not in ranked:
                 ranked.append(c)
+        return ranked
 
-        if not reason:
-            reason = f"Choix du preset {best.prefix} via arbitre LLM pour le rôle {role_cat}."
-
+    async def _collect_decision(
+        self,
+        mode: str,
+        role_cat: str,
+        experience: str,
+        limited_candidates: List[BuildCandidate],
+        best_id: str,
+        reason: str,
+    ) -> None:
         # Enregistrer cette décision comme datapoint d'entraînement compact.
         try:
             decision_payload: Dict[str, Any] = {
@@ -313,5 +523,3 @@ class BuildAdvisorAgent:
                 "Failed to collect advisor decision datapoint",
                 extra={"error": str(e)},
             )
-
-        return AdvisorChoice(candidate=best, reason=reason, ranked_candidates=ranked)
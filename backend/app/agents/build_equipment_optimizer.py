@@ -12,12 +12,16 @@ import asyncio
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 
+import numpy as np
+
 from app.core.logging import logger
 from app.engine.combat.context import CombatContext
+from app.engine.simulation.batch import BatchBuildCalculator
 from app.engine.simulation.calculator import BuildCalculator
+from app.engine.gear.compiled import COMPILED_GEAR
 from app.engine.gear.registry import RUNE_REGISTRY, SIGIL_REGISTRY, RELIC_REGISTRY
 from app.engine.modifiers.base import Modifier, ModifierType
-from app.services.gw2_data_store import GW2DataStore
+from app.services.gw2_data_store import GW2DataStore, get_gw2_data_store, short_upgrade_name
 from app.engine.simulation.rotation import RotationSimulator, RotationSkill
 
 
@@ -49,11 +53,20 @@ class BuildEquipmentOptimizer:
     - Heavy Armor targets (meta comps)
     """
     
+    # Durée (s) du combat simulé par RotationSimulator; le simulateur à
+    # événements permet des combats soutenus (60-300s) pour un coût proche.
+    rotation_duration: float = 10.0
+
     def __init__(self):
         self.calculator = BuildCalculator()
+        self.batch_calculator = BatchBuildCalculator(self.calculator)
         self.rotation_simulator = RotationSimulator()
         self.wvw_context = self._create_wvw_context()
-        self.data_store = GW2DataStore()
+
+    @property
+    def data_store(self) -> GW2DataStore:
+        """Store GW2 partagé courant (remplacé à chaque rechargement des données)."""
+        return get_gw2_data_store()
     
     def _create_wvw_context(self) -> CombatContext:
         """Crée un contexte WvW réaliste."""
@@ -175,35 +188,52 @@ class BuildEquipmentOptimizer:
         else:
             sigils_to_test = sigils_for_role
 
-        tested_combinations: List[OptimizationResult] = []
-
         # Contexte spécifique éventuel pour ce run (mode roam/outnumber/zerg)
         context_for_run = self._context_for_constraints(constraints)
 
-        for rune_name in runes_to_test:
-            for sigil_combo in self._generate_sigil_combinations(sigils_to_test):
-                result = await self._test_combination(
-                    base_stats=base_stats,
-                    rune_name=rune_name,
-                    sigil_names=sigil_combo,
-                    skill_rotation=skill_rotation,
-                    role=role,
-                    context=context_for_run,
-                )
-                tested_combinations.append(result)
-
-        if not tested_combinations:
+        sigil_combos = self._generate_sigil_combinations(sigils_to_test)
+        if not runes_to_test or not sigil_combos:
             logger.warning("No combinations tested in optimize_build_top_k.")
             return []
 
-        sorted_combos = sorted(
-            tested_combinations,
-            key=lambda x: x.overall_score,
-            reverse=True,
-        )
-
         # Normaliser top_k
         k = max(1, top_k)
+
+        # 1) Évaluation vectorisée de toute la grille rune × sigils
+        batch_scores = self._score_grid_batch(
+            base_stats=base_stats,
+            rune_names=runes_to_test,
+            sigil_combos=sigil_combos,
+            skill_rotation=skill_rotation,
+            role=role,
+            context=context_for_run,
+        ).ravel()
+
+        # 2) Seuls les finalistes (score batch proche du K-ième) sont recalculés
+        #    via le chemin scalaire complet, ce qui garantit un résultat identique
+        #    à la recherche exhaustive (tri stable, ordre rune puis sigils).
+        n_keep = min(k, batch_scores.size)
+        kth_score = np.partition(batch_scores, -n_keep)[-n_keep]
+        tolerance = 1e-6 * max(1.0, float(np.max(np.abs(batch_scores))))
+        finalist_indices = np.flatnonzero(batch_scores >= kth_score - 2 * tolerance)
+
+        tested_combinations: List[Tuple[int, OptimizationResult]] = []
+        for flat_index in finalist_indices:
+            rune_index, combo_index = divmod(int(flat_index), len(sigil_combos))
+            result = await self._test_combination(
+                base_stats=base_stats,
+                rune_name=runes_to_test[rune_index],
+                sigil_names=sigil_combos[combo_index],
+                skill_rotation=skill_rotation,
+                role=role,
+                context=context_for_run,
+            )
+            tested_combinations.append((int(flat_index), result))
+
+        sorted_combos = [
+            res for _, res in sorted(tested_combinations, key=lambda item: (-item[1].overall_score, item[0]))
+        ]
+
         top_candidates = sorted_combos[:k]
 
         logger.info("🏆 Top combinations:")
@@ -227,32 +257,17 @@ class BuildEquipmentOptimizer:
         """Teste une combinaison spécifique de rune + sigils."""
         ctx = context or self.wvw_context
 
-        # Créer les modifiers
-        modifiers = []
-        
         relic_name = self.get_relic_for_role(role)
-
-        # Ajouter la rune
-        if rune_name in RUNE_REGISTRY:
-            modifiers.extend(RUNE_REGISTRY[rune_name]())
-        
-        # Ajouter les sigils
-        for sigil_name in sigil_names:
-            if sigil_name in SIGIL_REGISTRY:
-                sigil_func = SIGIL_REGISTRY[sigil_name]
-                # Gérer le cas Bloodlust (besoin de stacks)
-                if sigil_name == "Bloodlust":
-                    modifiers.append(sigil_func(25))  # Max stacks pour WvW
-                else:
-                    modifiers.append(sigil_func())
-
-        # Ajouter la relique
-        if relic_name and relic_name in RELIC_REGISTRY:
-            try:
-                modifiers.extend(RELIC_REGISTRY[relic_name]())
-            except Exception as e:  # pragma: no cover - sécurité
-                logger.error(f"Failed to build modifiers for relic {relic_name}: {e}")
-                relic_name = None
+        relic_modifiers = self._build_relic_modifiers(relic_name)
+        if relic_modifiers is None:
+            relic_name = None
+
+        # Créer les modifiers (rune + sigils + relique)
+        modifiers = (
+            self._build_rune_modifiers(rune_name)
+            + self._build_sigil_modifiers(sigil_names)
+            + (relic_modifiers or [])
+        )
         
         # Calculer les stats effectives
         effective_stats = self.calculator.calculate_effective_stats(
@@ -316,7 +331,7 @@ class BuildEquipmentOptimizer:
                     modifiers=modifiers,
                     context=ctx,
                     skills=rotation_skills,
-                    duration=10.0,
+                    duration=self.rotation_duration,
                     weapon_strength=1000,
                     effective_stats=effective_stats,
                 )
@@ -369,6 +384,86 @@ class BuildEquipmentOptimizer:
             relic_name=relic_name,
         )
 
+    def _build_rune_modifiers(self, rune_name: str) -> List[Modifier]:
+        """Modifiers d'une rune (liste vide si la rune est inconnue du registre)."""
+        return list(COMPILED_GEAR.rune(rune_name))
+
+    def _build_sigil_modifiers(self, sigil_names: List[str]) -> List[Modifier]:
+        """Modifiers d'une combinaison de sigils (les sigils inconnus sont ignorés).
+
+        Bloodlust est compilé à 25 stacks (max stacks pour WvW).
+        """
+        return list(COMPILED_GEAR.sigil_set(sigil_names))
+
+    def _build_relic_modifiers(self, relic_name: Optional[str]) -> Optional[List[Modifier]]:
+        """Modifiers d'une relique, ou None si aucune relique n'est applicable."""
+        modifiers = COMPILED_GEAR.relic(relic_name)
+        return list(modifiers) if modifiers is not None else None
+
+    def _score_grid_batch(
+        self,
+        base_stats: Dict[str, int],
+        rune_names: List[str],
+        sigil_combos: List[List[str]],
+        skill_rotation: List[Dict[str, Any]],
+        role: str,
+        context: CombatContext,
+    ) -> np.ndarray:
+        """Score global de toute la grille rune × sigils en une seule passe vectorisée.
+
+        Retourne un tableau (len(rune_names), len(sigil_combos)) dont les valeurs
+        correspondent, aux arrondis flottants près, à l'overall_score calculé par
+        _test_combination pour chaque combinaison.
+        """
+        rune_sets = [self._build_rune_modifiers(name) for name in rune_names]
+        sigil_sets = [self._build_sigil_modifiers(combo) for combo in sigil_combos]
+        relic_modifiers = self._build_relic_modifiers(self.get_relic_for_role(role)) or []
+
+        evaluation = self.batch_calculator.evaluate_grid(
+            base_stats=[base_stats],
+            modifier_axes=[rune_sets, sigil_sets],
+            skills=skill_rotation,
+            context=context,
+            shared_modifiers=relic_modifiers,
+        )
+        stats = {key: values[0] for key, values in evaluation.stats.items()}
+
+        # Bonus hors stats dérivées (soins sortants, durée de boons, Scholar),
+        # évalués comme dans le chemin scalaire avec le contexte WvW global.
+        context_dict = self.wvw_context.snapshot()
+
+        def extras(sets: List[List[Modifier]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+            heal = np.zeros(len(sets))
+            boon = np.zeros(len(sets))
+            scholar = np.zeros(len(sets), dtype=bool)
+            for i, mods in enumerate(sets):
+                for m in mods:
+                    if m.modifier_type == ModifierType.OUTGOING_HEALING:
+                        heal[i] += m.get_effective_value(context_dict)
+                    elif m.modifier_type == ModifierType.BOON_DURATION:
+                        boon[i] += m.get_effective_value(context_dict)
+                    if "Scholar" in m.name:
+                        scholar[i] = True
+            return heal, boon, scholar
+
+        rune_heal, rune_boon, rune_scholar = extras(rune_sets)
+        sigil_heal, sigil_boon, sigil_scholar = extras(sigil_sets)
+        relic_heal, relic_boon, relic_scholar = extras([relic_modifiers])
+
+        outgoing_heal_bonus = rune_heal[:, None] + sigil_heal[None, :] + relic_heal[0]
+        boon_duration_from_mods = rune_boon[:, None] + sigil_boon[None, :] + relic_boon[0]
+        has_scholar = rune_scholar[:, None] | sigil_scholar[None, :] | relic_scholar[0]
+
+        survivability = self._calculate_survivability_scores_batch(stats, has_scholar)
+        return self._calculate_overall_scores_batch(
+            evaluation.total_damage[0],
+            survivability,
+            role,
+            stats,
+            outgoing_heal_bonus,
+            boon_duration_from_mods,
+        )
+
     def _calculate_base_damage(
         self,
         base_stats: Dict[str, int],
@@ -441,23 +536,7 @@ class BuildEquipmentOptimizer:
 
         Exemple: "Superior Rune of the Scholar" -> "Scholar".
         """
-        name = full_name or ""
-        if "Rune of " in name:
-            # Ne garder que la partie après "Rune of "
-            name = name.split("Rune of ", 1)[1]
-
-        # Retirer les préfixes de rareté
-        for prefix in ("Superior ", "Major ", "Minor "):
-            if name.startswith(prefix):
-                name = name[len(prefix) :]
-
-        # Retirer l'article initial éventuel
-        for article in ("the ", "The "):
-            if name.startswith(article):
-                name = name[len(article) :]
-
-        name = name.strip()
-        return name or None
+        return short_upgrade_name(full_name, "Rune of ")
 
     def get_runes_for_role(self, role: str) -> List[str]:
         """Retourne les runes candidates pour un rôle donné en s'appuyant sur les données GW2.
@@ -467,19 +546,13 @@ class BuildEquipmentOptimizer:
         le registre interne des runes.
         """
         try:
-            runes = self.data_store.get_runes()
+            rune_names = self.data_store.get_rune_names()
         except Exception as e:  # pragma: no cover - garde-fou
             logger.error(f"GW2DataStore error while loading runes: {e}")
             return self._get_wvw_meta_runes(role)
 
-        available_names: set[str] = set()
-        for comp in runes:
-            api_name = comp.get("name")
-            if not isinstance(api_name, str):
-                continue
-            short = self._normalize_rune_name_from_api(api_name)
-            if short and short in RUNE_REGISTRY:
-                available_names.add(short)
+        # Noms courts indexés une fois par le store: pas de rescan des composants
+        available_names = set(rune_names.intersection(RUNE_REGISTRY))
 
         if not available_names:
             logger.warning(
@@ -494,21 +567,7 @@ class BuildEquipmentOptimizer:
 
         Exemple: "Superior Sigil of Force" -> "Force".
         """
-        name = full_name or ""
-        if "Sigil of " in name:
-            # Ne garder que la partie après "Sigil of "
-            name = name.split("Sigil of ", 1)[1]
-
-        for prefix in ("Superior ", "Major ", "Minor "):
-            if name.startswith(prefix):
-                name = name[len(prefix) :]
-
-        for article in ("the ", "The "):
-            if name.startswith(article):
-                name = name[len(article) :]
-
-        name = name.strip()
-        return name or None
+        return short_upgrade_name(full_name, "Sigil of ")
 
     def get_sigils_for_role(self, role: str) -> List[str]:
         """Retourne les sigils candidats pour un rôle donné en s'appuyant sur les données GW2.
@@ -518,19 +577,12 @@ class BuildEquipmentOptimizer:
         historique basée uniquement sur le registre interne.
         """
         try:
-            sigils = self.data_store.get_sigils()
+            sigil_names = self.data_store.get_sigil_names()
         except Exception as e:  # pragma: no cover - garde-fou
             logger.error(f"GW2DataStore error while loading sigils: {e}")
             return self._get_wvw_meta_sigils(role)
 
-        available_names: set[str] = set()
-        for comp in sigils:
-            api_name = comp.get("name")
-            if not isinstance(api_name, str):
-                continue
-            short = self._normalize_sigil_name_from_api(api_name)
-            if short and short in SIGIL_REGISTRY:
-                available_names.add(short)
+        available_names = set(sigil_names.intersection(SIGIL_REGISTRY))
 
         if not available_names:
             logger.warning(
@@ -565,19 +617,12 @@ class BuildEquipmentOptimizer:
         """
 
         try:
-            relic_items = self.data_store.get_relics()
+            relic_names = self.data_store.get_relic_names()
         except Exception as e:  # pragma: no cover - garde-fou
             logger.error(f"GW2DataStore error while loading relics: {e}")
             return None
 
-        available_names: set[str] = set()
-        for it in relic_items:
-            api_name = it.get("name")
-            if not isinstance(api_name, str):
-                continue
-            short = self._normalize_relic_name_from_api(api_name)
-            if short and short in RELIC_REGISTRY:
-                available_names.add(short)
+        available_names = set(relic_names.intersection(RELIC_REGISTRY))
 
         if not available_names:
             logger.warning("GW2DataStore returned no matching relics; no relic will be applied.")
@@ -621,7 +666,7 @@ class BuildEquipmentOptimizer:
         role_cat = self._normalize_role(role)
 
         # Contexte pour évaluer certains modificateurs (boon, healing).
-        context_dict = self.wvw_context.to_dict()
+        context_dict = self.wvw_context.snapshot()
 
         # Agrégats dérivés disponibles
         healing_power = float(effective_stats.get("healing_power", 0.0))
@@ -684,6 +729,70 @@ class BuildEquipmentOptimizer:
 
         # Fallback générique
         return (damage * 0.6) + (survivability * 400.0)
+
+    def _calculate_survivability_scores_batch(
+        self, effective_stats: Dict[str, np.ndarray], has_scholar: np.ndarray
+    ) -> np.ndarray:
+        """Équivalent vectorisé de _calculate_survivability_score."""
+        toughness = effective_stats["toughness"]
+        max_health = effective_stats["max_health"]
+        healing_power = effective_stats["healing_power"]
+        incoming_mult = effective_stats["incoming_damage_multiplier"]
+        incoming_mult = np.where(incoming_mult != 0, incoming_mult, 1.0)
+        scholar_penalty = np.where(has_scholar, 0.8, 1.0)
+
+        base_hp = np.minimum(max_health, 20000.0)
+        mid_hp = np.minimum(np.maximum(max_health - 20000.0, 0.0), 5000.0)
+        high_hp = np.maximum(max_health - 25000.0, 0.0)
+        hp_score = (base_hp / 15000.0) + (mid_hp / 15000.0 * 0.5) + (high_hp / 15000.0 * 0.1)
+
+        base = (toughness / 1000.0) + hp_score + (healing_power / 1000.0)
+        mitigation_mult = np.where(incoming_mult > 0, 1.0 / incoming_mult, 1.0)
+        return base * mitigation_mult * scholar_penalty
+
+    def _calculate_overall_scores_batch(
+        self,
+        damage: np.ndarray,
+        survivability: np.ndarray,
+        role: str,
+        effective_stats: Dict[str, np.ndarray],
+        outgoing_heal_bonus: np.ndarray,
+        boon_duration_from_mods: np.ndarray,
+    ) -> np.ndarray:
+        """Équivalent vectorisé de _calculate_overall_score (mêmes pondérations par rôle)."""
+        role_cat = self._normalize_role(role)
+
+        healing_power = effective_stats["healing_power"]
+        toughness = effective_stats["toughness"]
+        max_health = effective_stats["max_health"]
+        total_boon_duration = effective_stats["boon_duration_bonus"] + boon_duration_from_mods
+        capped_boon = np.minimum(total_boon_duration, 1.0)
+
+        if role_cat == "dps":
+            return damage + effective_stats["effective_condition_damage"] * 8.0
+
+        if role_cat == "heal":
+            hp_penalty_factor = np.where(max_health < 16000.0, 0.8, np.where(max_health < 18000.0, 0.9, 1.0))
+            return (
+                (healing_power * hp_penalty_factor)
+                + outgoing_heal_bonus * 10000.0
+                + survivability * 500.0
+            )
+
+        if role_cat == "boon":
+            return capped_boon * 10000.0 + survivability * 400.0
+
+        if role_cat == "tank":
+            return toughness * 2.0 + (max_health / 10.0) + survivability * 500.0
+
+        if role_cat == "support":
+            return (
+                damage * 0.5
+                + capped_boon * 5000.0
+                + survivability * 600.0
+            )
+
+        return (damage * 0.6) + (survivability * 400.0)
     
     def _get_wvw_meta_runes(self, role: str, allowed_names: Optional[set[str]] = None) -> List[str]:
         """Sélectionne les runes WvW adaptées à un rôle donné.
@@ -697,10 +806,9 @@ class BuildEquipmentOptimizer:
         role_cat = self._normalize_role(role)
         selected: List[str] = []
 
-        for name, factory in RUNE_REGISTRY.items():
+        for name, mods in COMPILED_GEAR.runes.items():
             if allowed_names is not None and name not in allowed_names:
                 continue
-            mods = factory()
 
             has_heal = any(
                 (m.target_stat in ("healing_power",) and m.modifier_type in {ModifierType.FLAT_STAT, ModifierType.PERCENT_STAT})
@@ -767,14 +875,9 @@ class BuildEquipmentOptimizer:
         role_cat = self._normalize_role(role)
         selected: List[str] = []
 
-        for name, factory in SIGIL_REGISTRY.items():
+        for name, (mod,) in COMPILED_GEAR.sigils.items():
             if allowed_names is not None and name not in allowed_names:
                 continue
-            try:
-                mod = factory()
-            except TypeError:
-                # Certains sigils (ex: Bloodlust) acceptent des paramètres
-                mod = factory(25)  # type: ignore[misc]
 
             has_heal = mod.target_stat == "healing_power" or mod.modifier_type in {
                 ModifierType.OUTGOING_HEALING,
@@ -6,13 +6,13 @@ des modifications pour améliorer les performances.
 """
 
 import httpx
-import json
+from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from app.agents.base import BaseAgent
 from app.agents.synergy_agent import SynergyAgent
-from app.core.config import settings
 from app.core.logging import logger
+from app.services.ai.ollama_service import OllamaService, get_ollama_service
 
 
 class OptimizerAgent(BaseAgent):
@@ -42,14 +42,21 @@ class OptimizerAgent(BaseAgent):
         ```
     """
 
-    def __init__(self, model: Optional[str] = None, host: Optional[str] = None, timeout: int = 120):
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        host: Optional[str] = None,
+        timeout: int = 120,
+        ollama_service: Optional[OllamaService] = None,
+    ):
         """
         Initialise l'agent d'optimisation.
 
         Args:
             model: Nom du modèle Mistral à utiliser
             host: URL de l'hôte Ollama
-            timeout: Timeout pour les requêtes HTTP en secondes
+            timeout: Inactivité max en secondes (avec un hôte ou un modèle explicite)
+            ollama_service: Client LLM (défaut: service partagé)
         """
         super().__init__(
             name="OptimizerAgent",
@@ -63,25 +70,26 @@ class OptimizerAgent(BaseAgent):
             ],
         )
 
-        self.model = model or settings.OLLAMA_MODEL
-        self.host = host or settings.OLLAMA_HOST
+        if ollama_service is None:
+            # Service partagé (ordonnanceur LLM, pool de connexions), sauf hôte ou modèle explicite
+            if model or host:
+                ollama_service = OllamaService(host=host, model=model, timeout=timeout)
+            else:
+                ollama_service = get_ollama_service()
+        self.ollama = ollama_service
+        self.model = self.ollama.model
+        self.host = self.ollama.host
         self.timeout = timeout
-        self._client: Optional[httpx.AsyncClient] = None
         self._synergy_agent: Optional[SynergyAgent] = None
 
     async def _initialize_impl(self) -> None:
-        """Initialise le client HTTP et l'agent de synergie."""
-        self._client = httpx.AsyncClient(timeout=self.timeout)
-        self._synergy_agent = SynergyAgent(model=self.model, host=self.host, timeout=self.timeout)
+        """Initialise l'agent de synergie (même client LLM)."""
+        self._synergy_agent = SynergyAgent(timeout=self.timeout, ollama_service=self.ollama)
         await self._synergy_agent.initialize()
         logger.info("Optimizer agent initialized with synergy analysis capability")
 
     async def _cleanup_impl(self) -> None:
-        """Ferme le client HTTP et nettoie l'agent de synergie."""
-        if self._client:
-            await self._client.aclose()
-            self._client = None
-
+        """Nettoie l'agent de synergie."""
         if self._synergy_agent:
             await self._synergy_agent.cleanup()
             self._synergy_agent = None
@@ -177,28 +185,10 @@ class OptimizerAgent(BaseAgent):
         )
 
         try:
-            # Appel à l'API Ollama/Mistral
-            response = await self._client.post(
-                f"{self.host}/api/generate",
-                json={
-                    "model": self.model,
-                    "prompt": prompt,
-                    "format": "json",
-                    "stream": False,
-                    "options": {
-                        "temperature": 0.8,
-                        "top_p": 0.9,
-                    },
-                },
+            # Appel au LLM via OllamaService (ordonnanceur: priorité, admission, circuit breaker)
+            optimization_result = await self.ollama.generate_structured(
+                prompt=prompt, temperature=0.8, max_tokens=2000
             )
-            response.raise_for_status()
-
-            # Extraction de la réponse
-            response_data = response.json()
-            raw_response = response_data.get("response", "{}")
-
-            # Parse de la réponse JSON
-            optimization_result = json.loads(raw_response)
 
             # Analyse de la composition optimisée
             optimized_composition = optimization_result.get("optimized_composition", [])
@@ -226,7 +216,7 @@ class OptimizerAgent(BaseAgent):
                 "objectives": objectives,
                 "game_mode": game_mode,
                 "max_changes": max_changes,
-                "timestamp": response_data.get("created_at"),
+                "timestamp": datetime.utcnow().isoformat(),
             }
 
             logger.info(
@@ -239,7 +229,7 @@ class OptimizerAgent(BaseAgent):
             logger.error(f"HTTP request failed: {e}")
             raise Exception(f"Failed to communicate with AI service: {str(e)}")
 
-        except json.JSONDecodeError as e:
+        except ValueError as e:
             logger.error(f"Failed to parse AI response: {e}")
             raise Exception(f"Invalid response from AI service: {str(e)}")
 
@@ -0,0 +1,272 @@
+"""CPU-bound part of TeamCommanderAgent slot optimization, runnable in a worker process.
+
+The job (gear solver + BuildEquipmentOptimizer over every stat preset) only
+takes and returns plain picklable data, so TeamCommanderAgent can hand it to
+the CPU worker pool (app.core.process_pool) instead of running it on the
+event loop. The async LLM-backed advisor step stays in the agent.
+
+Results are memoized in SlotResultCache, keyed by the job content and the
+combat context of its mode: squads often repeat the same slot (three Firebrand
+supports in a zerg), and the whole sweep only depends on those inputs.
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.agents.build_equipment_optimizer import (
+    BuildEquipmentOptimizer,
+    OptimizationResult,
+    get_build_optimizer,
+)
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.metrics import track_slot_cache_lookup
+from app.services.gear_optimization_service import GearOptimizationService, get_gear_optimization_service
+from app.services.gw2_data_store import register_reload_listener
+
+
+@dataclass(frozen=True)
+class SlotOptimizationJob:
+    """Inputs of one slot optimization (optimizer role, class, presets, ...)."""
+
+    role: str  # dps, heal, boon, tank, support
+    profession: str
+    specialization: str
+    mode: str
+    experience: str
+    stat_presets: Tuple[Tuple[str, Dict[str, int]], ...]
+    skill_rotation: Tuple[Dict[str, Any], ...]
+    weapon_preference: Optional[str] = None
+
+    def cache_key(self, context: Dict[str, Any]) -> str:
+        """Content hash of the job and of the combat context it is scored in."""
+        payload = {"job": asdict(self), "context": context}
+        encoded = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":"))
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class SlotCandidateResult:
+    """Best equipment found for one stat preset."""
+
+    candidate_id: str
+    preset_name: str
+    result: OptimizationResult
+
+
+@dataclass
+class SlotOptimizationOutput:
+    """Per-preset results, in preset order (GreedyMix first when available)."""
+
+    candidates: List[SlotCandidateResult] = field(default_factory=list)
+    greedy_gear_mix: Optional[Dict[str, str]] = None
+
+
+async def optimize_slot_presets(
+    job: SlotOptimizationJob,
+    optimizer: BuildEquipmentOptimizer,
+    gear_service: GearOptimizationService,
+) -> SlotOptimizationOutput:
+    """Run the gear solver and the equipment optimizer for every stat preset of a slot."""
+    output = SlotOptimizationOutput()
+    stat_presets: List[Tuple[str, Dict[str, int]]] = []
+
+    # 1) Gear solver (prefix per slot: armor, trinkets, weapons)
+    try:
+        gear_result = gear_service.generate_equipment_set(
+            role=job.role,
+            profession=job.profession,
+            specialization=job.specialization,
+            mode=job.mode,
+            experience=job.experience,
+        )
+        stat_presets.append(("GreedyMix", gear_result.base_stats))
+        output.greedy_gear_mix = gear_result.equipment_set.all_slots()
+    except Exception as e:
+        logger.warning(
+            "GearOptimizationService failed in TeamCommander; falling back to presets.",
+            extra={"error": str(e)},
+        )
+
+    # 2) Presets classiques par préfixe (Berserker, Marauder, Minstrel, ...)
+    stat_presets.extend(job.stat_presets)
+
+    constraints: Dict[str, Any] = {"mode": job.mode, "experience": job.experience}
+    if job.weapon_preference:
+        constraints["weapon_preference"] = job.weapon_preference
+
+    for idx, (preset_name, base_stats) in enumerate(stat_presets):
+        try:
+            opt = await optimizer.optimize_build(
+                base_stats=base_stats,
+                skill_rotation=list(job.skill_rotation),
+                role=job.role,
+                constraints=constraints,
+            )
+        except Exception as e:  # pragma: no cover - robust à l'échec isolé
+            logger.error(f"Slot optimization failed for preset {preset_name}: {e}")
+            continue
+
+        output.candidates.append(
+            SlotCandidateResult(candidate_id=f"{preset_name}-{idx}", preset_name=preset_name, result=opt)
+        )
+
+    return output
+
+
+def run_slot_optimization(job: SlotOptimizationJob) -> SlotOptimizationOutput:
+    """Worker-process entry point (uses the process-wide optimizer and gear service)."""
+    return asyncio.run(optimize_slot_presets(job, get_build_optimizer(), get_gear_optimization_service()))
+
+
+class SlotResultCache:
+    """
+    Bounded LRU cache of slot optimization outputs, shared across requests.
+
+    Concurrent lookups of the same key (identical slots of one squad, optimized
+    in parallel) share a single computation. Cached outputs are copied on the
+    way out so callers never mutate the shared entry.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max(0, max_entries)
+        self._entries: "OrderedDict[str, Tuple[SlotOptimizationJob, SlotOptimizationOutput]]" = OrderedDict()
+        self._inflight: Dict[str, "asyncio.Future[SlotOptimizationOutput]"] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def _record(self, hit: bool) -> None:
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        track_slot_cache_lookup(hit=hit, hit_rate=self.hit_rate, entries=len(self._entries))
+
+    def _store(self, key: str, job: SlotOptimizationJob, output: SlotOptimizationOutput) -> None:
+        if self.max_entries == 0:
+            return
+        self._entries[key] = (job, output)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_or_compute(
+        self,
+        job: SlotOptimizationJob,
+        context: Dict[str, Any],
+        compute: Callable[[], Awaitable[SlotOptimizationOutput]],
+    ) -> SlotOptimizationOutput:
+        """Return the cached output for (job, context), computing it once if needed."""
+        key = job.cache_key(context)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self._record(hit=True)
+            return copy.deepcopy(entry[1])
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self._record(hit=True)
+            return copy.deepcopy(await asyncio.shield(pending))
+
+        self._record(hit=False)
+        future: "asyncio.Future[SlotOptimizationOutput]" = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            output = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters re-raise it; mark it retrieved to avoid "never retrieved" noise
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        # An output without candidates means every preset failed: don't pin it
+        if output.candidates:
+            self._store(key, job, output)
+        future.set_result(output)
+        return copy.deepcopy(output)
+
+    def invalidate(
+        self,
+        profession: Optional[str] = None,
+        specialization: Optional[str] = None,
+        mode: Optional[str] = None,
+    ) -> int:
+        """
+        Drop cached outputs matching every given filter (all of them by default).
+
+        Returns:
+            Number of entries removed
+        """
+        removed = 0
+        for key, (job, _) in list(self._entries.items()):
+            if profession is not None and job.profession != profession:
+                continue
+            if specialization is not None and job.specialization != specialization:
+                continue
+            if mode is not None and job.mode != mode:
+                continue
+            del self._entries[key]
+            removed += 1
+        if removed:
+            logger.info(f"🧹 Slot optimization cache: {removed} entries invalidated")
+        return removed
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+        }
+
+
+# Global cache, shared by every TeamCommanderAgent of the process
+_slot_result_cache: Optional[SlotResultCache] = None
+
+
+def get_slot_result_cache() -> SlotResultCache:
+    """Get or create the global slot optimization cache."""
+    global _slot_result_cache
+    if _slot_result_cache is None:
+        _slot_result_cache = SlotResultCache(max_entries=settings.SLOT_CACHE_MAX_ENTRIES)
+    return _slot_result_cache
+
+
+def invalidate_slot_results(
+    profession: Optional[str] = None,
+    specialization: Optional[str] = None,
+    mode: Optional[str] = None,
+) -> int:
+    """Invalidate cached slot optimization outputs (see SlotResultCache.invalidate)."""
+    return get_slot_result_cache().invalidate(profession=profession, specialization=specialization, mode=mode)
+
+
+# Rune/sigil/relic availability comes from the GW2 data: results are stale after a reload
+register_reload_listener(invalidate_slot_results)
@@ -6,12 +6,12 @@ les forces, faiblesses et suggestions d'amélioration.
 """
 
 import httpx
-import json
+from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from app.agents.base import BaseAgent
-from app.core.config import settings
 from app.core.logging import logger
+from app.services.ai.ollama_service import OllamaService, get_ollama_service
 
 
 class SynergyAgent(BaseAgent):
@@ -37,14 +37,21 @@ class SynergyAgent(BaseAgent):
         ```
     """
 
-    def __init__(self, model: Optional[str] = None, host: Optional[str] = None, timeout: int = 90):
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        host: Optional[str] = None,
+        timeout: int = 90,
+        ollama_service: Optional[OllamaService] = None,
+    ):
         """
         Initialise l'agent d'analyse de synergie.
 
         Args:
             model: Nom du modèle Mistral à utiliser
             host: URL de l'hôte Ollama
-            timeout: Timeout pour les requêtes HTTP en secondes
+            timeout: Inactivité max en secondes (avec un hôte ou un modèle explicite)
+            ollama_service: Client LLM (défaut: service partagé)
         """
         super().__init__(
             name="SynergyAgent",
@@ -58,22 +65,16 @@ class SynergyAgent(BaseAgent):
             ],
         )
 
-        self.model = model or settings.OLLAMA_MODEL
-        self.host = host or settings.OLLAMA_HOST
+        if ollama_service is None:
+            # Service partagé (ordonnanceur LLM, pool de connexions), sauf hôte ou modèle explicite
+            if model or host:
+                ollama_service = OllamaService(host=host, model=model, timeout=timeout)
+            else:
+                ollama_service = get_ollama_service()
+        self.ollama = ollama_service
+        self.model = self.ollama.model
+        self.host = self.ollama.host
         self.timeout = timeout
-        self._client: Optional[httpx.AsyncClient] = None
-
-    async def _initialize_impl(self) -> None:
-        """Initialise le client HTTP."""
-        self._client = httpx.AsyncClient(timeout=self.timeout)
-        logger.info(f"HTTP client initialized for {self.host}")
-
-    async def _cleanup_impl(self) -> None:
-        """Ferme le client HTTP."""
-        if self._client:
-            await self._client.aclose()
-            self._client = None
-            logger.info("HTTP client closed")
 
     async def validate_inputs(self, inputs: Dict[str, Any]) -> None:
         """
@@ -152,28 +153,8 @@ class SynergyAgent(BaseAgent):
         prompt = self._build_prompt(professions, game_mode, squad_size, context)
 
         try:
-            # Appel à l'API Ollama/Mistral
-            response = await self._client.post(
-                f"{self.host}/api/generate",
-                json={
-                    "model": self.model,
-                    "prompt": prompt,
-                    "format": "json",
-                    "stream": False,
-                    "options": {
-                        "temperature": 0.7,
-                        "top_p": 0.9,
-                    },
-                },
-            )
-            response.raise_for_status()
-
-            # Extraction de la réponse
-            response_data = response.json()
-            raw_response = response_data.get("response", "{}")
-
-            # Parse de la réponse JSON
-            result = json.loads(raw_response)
+            # Appel au LLM via OllamaService (ordonnanceur: priorité, admission, circuit breaker)
+            result = await self.ollama.generate_structured(prompt=prompt, temperature=0.7, max_tokens=2000)
 
             # Enrichissement de la réponse
             result["metadata"] = {
@@ -181,7 +162,7 @@ class SynergyAgent(BaseAgent):
                 "team_size": len(professions),
                 "game_mode": game_mode,
                 "professions": professions,
-                "timestamp": response_data.get("created_at"),
+                "timestamp": datetime.utcnow().isoformat(),
             }
 
             logger.info(f"Team synergy analysis completed for {len(professions)} professions " f"in {game_mode}")
@@ -192,7 +173,7 @@ class SynergyAgent(BaseAgent):
             logger.error(f"HTTP request failed: {e}")
             raise Exception(f"Failed to communicate with AI service: {str(e)}")
 
-        except json.JSONDecodeError as e:
+        except ValueError as e:
             logger.error(f"Failed to parse AI response: {e}")
             raise Exception(f"Invalid response from AI service: {str(e)}")
 
@@ -12,6 +12,7 @@ Et construit automatiquement une team complète avec:
 VISION: L'utilisateur parle, l'IA fait TOUT.
 """
 
+import asyncio
 import re
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
@@ -21,9 +22,17 @@ from functools import lru_cache
 from app.core.logging import logger
 from app.core.performance import async_timed, batch_processor, async_timer
 from app.agents.build_equipment_optimizer import get_build_optimizer, OptimizationResult
+from app.agents.slot_optimization import (
+    SlotOptimizationJob,
+    SlotOptimizationOutput,
+    get_slot_result_cache,
+    optimize_slot_presets,
+    run_slot_optimization,
+)
+from app.core.process_pool import get_cpu_pool
 from app.engine.combat.context import CombatContext
 from app.engine.gear.prefixes import get_prefix_stats, get_all_prefixes
-from app.agents.build_advisor_agent import BuildAdvisorAgent, BuildCandidate
+from app.agents.build_advisor_agent import AdvisorChoice, AdvisorSlot, BuildAdvisorAgent, BuildCandidate
 from app.agents.team_strategy_agent import TeamStrategyAgent
 from app.models.team_strategy import TeamStrategyPlan, TeamStrategyRequest
 from app.services.gear_prefix_validator import filter_prefix_names_by_itemstats
@@ -71,6 +80,19 @@ class SlotBuild:
     gear_mix: Optional[Dict[str, str]] = None
 
 
+@dataclass
+class PreparedSlot:
+    """Slot optimisé par le moteur, en attente de l'arbitrage du BuildAdvisor."""
+    role: Role
+    profession: str
+    specialization: str
+    optimizer_role: str
+    skill_rotation: List[Dict[str, Any]]
+    candidates: List[BuildCandidate]
+    results_by_id: Dict[str, OptimizationResult]
+    greedy_gear_mix: Optional[Dict[str, str]] = None
+
+
 @dataclass
 class TeamGroup:
     """Un groupe de 5 joueurs."""
@@ -130,7 +152,7 @@ class TeamCommanderAgent:
         self.meta_rag = meta_rag or MetaRAGService()
         # Stratège LLM responsable de la composition haut niveau (classes/rôles)
         self.strategy_agent = TeamStrategyAgent(meta_rag=self.meta_rag)
-        # Greedy gear solver pour le mix d'armure pièce par pièce
+        # Gear solver pour le mix de préfixes pièce par pièce (armure, bijoux, armes)
         self.gear_optimization_service = get_gear_optimization_service()
     
     async def run(
@@ -382,26 +404,40 @@ class TeamCommanderAgent:
 
                 slot_specs.append((group_idx, role, profession, spec))
         
-        # Optimiser TOUS les slots en parallèle (BOOST PERFORMANCE !)
-        async def optimize_single_slot(spec_tuple):
-            group_idx, role, profession, specialization = spec_tuple
-            return (
-                group_idx,
-                await self._optimize_slot(
-                    role=role,
-                    profession=profession,
-                    specialization=specialization,
-                    experience=request.experience,
-                    mode=request.mode,
-                ),
+        # Optimiser TOUS les slots en parallèle (BOOST PERFORMANCE !), puis un
+        # seul arbitrage du BuildAdvisor pour toute l'équipe
+        async def prepare_single_slot(spec_tuple):
+            _group_idx, role, profession, specialization = spec_tuple
+            return await self._prepare_slot(
+                role=role,
+                profession=profession,
+                specialization=specialization,
+                experience=request.experience,
+                mode=request.mode,
             )
-        
+
         async with async_timer("Build all slots"):
-            optimized_slots = await batch_processor.batch_process(
+            prepared_slots = await batch_processor.batch_process(
                 slot_specs,
-                optimize_single_slot,
+                prepare_single_slot,
                 show_progress=True
             )
+            ready = [
+                (spec_tuple[0], prepared)
+                for spec_tuple, prepared in zip(slot_specs, prepared_slots)
+                if not isinstance(prepared, Exception)
+            ]
+            decisions = await self._advise_slots(
+                [prepared for _, prepared in ready], request.experience, request.mode
+            )
+
+            # Un slot qui échoue à la finalisation est écarté, sans faire échouer l'équipe
+            async def finalize_single_slot(item):
+                (_group_idx, prepared), decision = item
+                return await self._finalize_slot(prepared, decision)
+
+            finalized = await batch_processor.batch_process(list(zip(ready, decisions)), finalize_single_slot)
+            optimized_slots = [(group_idx, slot_build) for (group_idx, _), slot_build in zip(ready, finalized)]
         
         # Réorganiser par groupe
         groups: List[TeamGroup] = []
@@ -430,8 +466,8 @@ class TeamCommanderAgent:
         """Construit l'équipe en délégant la composition à TeamStrategyAgent.
 
         Cette voie "AI-first" laisse le LLM décider des rôles, classes et
-        spécialisations pour chaque slot, puis réutilise _optimize_slot pour
-        équiper chaque joueur.
+        spécialisations pour chaque slot, puis équipe tous les joueurs via
+        _optimize_slots (un seul arbitrage du BuildAdvisor pour l'équipe).
         """
 
         ts_request = TeamStrategyRequest(
@@ -446,23 +482,28 @@ class TeamCommanderAgent:
         if not plan.groups:
             raise ValueError("TeamStrategyPlan has no groups")
 
-        groups: List[TeamGroup] = []
-
-        for g in plan.groups:
-            group_slots: List[SlotBuild] = []
-            for s in g.slots:
-                role_enum = self._map_strategy_role_to_role_enum(s.role)
-                slot_build = await self._optimize_slot(
-                    role=role_enum,
-                    profession=s.profession,
-                    specialization=s.specialization,
-                    experience=request.experience,
-                    mode=request.mode,
-                    weapon_preference=getattr(s, "weapon_preference", None),
+        # Tous les slots sont optimisés en parallèle (pool de workers CPU) et
+        # arbitrés en un seul appel LLM, l'ordre des groupes et des slots étant conservé.
+        slot_builds = await self._optimize_slots(
+            [
+                (
+                    self._map_strategy_role_to_role_enum(s.role),
+                    s.profession,
+                    s.specialization,
+                    getattr(s, "weapon_preference", None),
                 )
-                group_slots.append(slot_build)
+                for g in plan.groups
+                for s in g.slots
+            ],
+            experience=request.experience,
+            mode=request.mode,
+        )
 
-            groups.append(TeamGroup(index=g.index, slots=group_slots))
+        groups: List[TeamGroup] = []
+        offset = 0
+        for g in plan.groups:
+            groups.append(TeamGroup(index=g.index, slots=slot_builds[offset : offset + len(g.slots)]))
+            offset += len(g.slots)
 
         # Analyse synergie et notes basées sur le résultat effectif
         synergy_score, synergy_details = self._analyze_synergy(groups, request)
@@ -598,7 +639,57 @@ class TeamCommanderAgent:
         # Prendre la première option (priorité aux builds méta, puis historique)
         return options[0]
     
-    async def _optimize_slot(
+    async def _optimize_slots(
+        self,
+        slot_specs: List[tuple[Role, str, str, Optional[str]]],
+        experience: str = "beginner",
+        mode: str = "wvw_zerg",
+    ) -> List[SlotBuild]:
+        """Optimise tous les slots d'une équipe avec un seul arbitrage LLM.
+
+        slot_specs: (rôle, profession, spécialisation, préférence d'armes) par
+        slot. Les slots sont optimisés en parallèle par le moteur, puis le
+        BuildAdvisor choisit un preset pour chacun en un seul appel.
+        """
+        prepared = await asyncio.gather(
+            *(
+                self._prepare_slot(role, profession, specialization, experience, mode, weapon_preference)
+                for role, profession, specialization, weapon_preference in slot_specs
+            )
+        )
+        decisions = await self._advise_slots(list(prepared), experience, mode)
+        return [await self._finalize_slot(p, d) for p, d in zip(prepared, decisions)]
+
+    async def _advise_slots(
+        self,
+        prepared: List[PreparedSlot],
+        experience: str,
+        mode: str,
+    ) -> List[Optional[AdvisorChoice]]:
+        """Choix du BuildAdvisor pour chaque slot (None: slot sans candidat ou échec)."""
+        advisor_slots = [
+            AdvisorSlot(
+                slot_id=str(idx + 1),
+                candidates=p.candidates,
+                role=p.optimizer_role,
+                label=f"{p.profession} {p.specialization}",
+            )
+            for idx, p in enumerate(prepared)
+            if p.candidates
+        ]
+        decisions: Dict[str, AdvisorChoice] = {}
+        if advisor_slots:
+            try:
+                choices = await self.build_advisor.choose_best_candidates(
+                    advisor_slots,
+                    context={"mode": mode, "experience": experience},
+                )
+                decisions = {slot.slot_id: choice for slot, choice in zip(advisor_slots, choices)}
+            except Exception as e:  # pragma: no cover - robust fallback
+                logger.error(f"BuildAdvisorAgent failed, falling back to max score: {e}")
+        return [decisions.get(str(idx + 1)) for idx in range(len(prepared))]
+
+    async def _prepare_slot(
         self,
         role: Role,
         profession: str,
@@ -606,13 +697,8 @@ class TeamCommanderAgent:
         experience: str = "beginner",
         mode: str = "wvw_zerg",
         weapon_preference: Optional[str] = None,
-    ) -> SlotBuild:
-        """Optimise un slot individuel (runes, sigils, stats).
-
-        Cette version V2 teste plusieurs presets de stats par rôle
-        (ex: Berserker/Marauder pour DPS, Minstrel/Harrier/Cleric pour Heal)
-        et laisse le moteur choisir la meilleure combinaison complète.
-        """
+    ) -> PreparedSlot:
+        """Optimise les presets de stats d'un slot et en fait des candidats pour le BuildAdvisor."""
         # Skill rotation simplifiée (placeholder)
         skill_rotation = [
             {"name": "Burst 1", "damage_coefficient": 2.0},
@@ -633,68 +719,55 @@ class TeamCommanderAgent:
             optimizer_role = "support"
 
         # Construire les presets de stats en deux temps:
-        #   1) utiliser le Greedy Gear Solver pour obtenir un mix d'armure
+        #   1) utiliser le Gear Solver pour obtenir un mix de préfixes
         #      pièce par pièce (base_stats mixées) ;
         #   2) ajouter les presets classiques "full prefix" comme candidats
         #      supplémentaires et fallback.
-
-        stat_presets: List[tuple[str, Dict[str, int]]] = []
-
-        # Mixer d'armure potentiel issu du greedy solver (slot -> prefix)
-        greedy_armor_mix: Optional[Dict[str, str]] = None
-
-        # 1) Greedy gear solver (armor mix)
-        try:
-            gear_result = self.gear_optimization_service.generate_equipment_set(
-                role=optimizer_role,
-                profession=profession,
-                specialization=specialization,
-                mode=mode,
-                experience=experience,
-            )
-            stat_presets.append(("GreedyMix", gear_result.base_stats))
-            greedy_armor_mix = dict(gear_result.equipment_set.armor or {})
-        except Exception as e:
-            logger.warning(
-                "GearOptimizationService failed in TeamCommander; falling back to presets.",
-                extra={"error": str(e)},
-            )
-
-        # 2) Presets classiques par préfixe (Berserker, Marauder, Minstrel, ...)
+        # Les deux étapes sont purement CPU: elles tournent dans le pool de
+        # workers (hors event loop) lorsqu'il est activé.
+        preset_list: List[tuple[str, Dict[str, int]]] = []
         try:
             preset_list = self._get_stat_presets_for_role(role, mode)
-            stat_presets.extend(preset_list)
         except Exception as e:
             logger.error(
                 "Failed to build stat presets for role in TeamCommander.",
                 extra={"error": str(e)},
             )
-        candidates: List[BuildCandidate] = []
-        results_by_id: Dict[str, OptimizationResult] = {}
 
-        # Construire des contraintes pour le moteur d'équipement
-        base_constraints: Dict[str, Any] = {"mode": mode, "experience": experience}
-        if weapon_preference:
-            base_constraints["weapon_preference"] = weapon_preference
+        job = SlotOptimizationJob(
+            role=optimizer_role,
+            profession=profession,
+            specialization=specialization,
+            mode=mode,
+            experience=experience,
+            stat_presets=tuple(preset_list),
+            skill_rotation=tuple(skill_rotation),
+            weapon_preference=weapon_preference or None,
+        )
 
-        for idx, (preset_name, base_stats) in enumerate(stat_presets):
-            try:
-                opt = await self.optimizer.optimize_build(
-                    base_stats=base_stats,
-                    skill_rotation=skill_rotation,
-                    role=optimizer_role,
-                    constraints=base_constraints,
-                )
-            except Exception as e:  # pragma: no cover - robust à l'échec isolé
-                logger.error(f"Slot optimization failed for preset {preset_name}: {e}")
-                continue
+        async def _compute() -> SlotOptimizationOutput:
+            cpu_pool = get_cpu_pool()
+            if cpu_pool.enabled:
+                return await cpu_pool.submit(run_slot_optimization, job)
+            return await optimize_slot_presets(job, self.optimizer, self.gear_optimization_service)
+
+        # Les slots identiques (même classe/rôle/mode/presets) réutilisent le
+        # même résultat, y compris entre requêtes.
+        combat_context = self.optimizer._create_wvw_context_for_mode(mode).to_dict()
+        slot_output = await get_slot_result_cache().get_or_compute(job, combat_context, _compute)
 
-            candidate_id = f"{preset_name}-{idx}"
-            results_by_id[candidate_id] = opt
+        # Mix de préfixes potentiel issu du gear solver (slot -> prefix)
+        greedy_gear_mix = slot_output.greedy_gear_mix
+
+        candidates: List[BuildCandidate] = []
+        results_by_id: Dict[str, OptimizationResult] = {}
+        for item in slot_output.candidates:
+            opt = item.result
+            results_by_id[item.candidate_id] = opt
             candidates.append(
                 BuildCandidate(
-                    id=candidate_id,
-                    prefix=preset_name,
+                    id=item.candidate_id,
+                    prefix=item.preset_name,
                     role=optimizer_role,
                     rune=opt.rune_name,
                     sigils=opt.sigil_names,
@@ -704,18 +777,31 @@ class TeamCommanderAgent:
                 )
             )
 
+        return PreparedSlot(
+            role=role,
+            profession=profession,
+            specialization=specialization,
+            optimizer_role=optimizer_role,
+            skill_rotation=skill_rotation,
+            candidates=candidates,
+            results_by_id=results_by_id,
+            greedy_gear_mix=greedy_gear_mix,
+        )
+
+    async def _finalize_slot(self, prepared: PreparedSlot, decision: Optional[AdvisorChoice]) -> SlotBuild:
+        """Construit le SlotBuild du preset choisi (meilleur score global sans choix du BuildAdvisor)."""
+        role = prepared.role
+        candidates = prepared.candidates
+        results_by_id = prepared.results_by_id
+        greedy_gear_mix = prepared.greedy_gear_mix
+
         best_result: OptimizationResult
         best_preset_name: str
         advisor_reason: Optional[str] = None
         advisor_alternatives: Optional[List[Dict[str, Any]]] = None
 
-        if candidates:
+        if candidates and decision is not None:
             try:
-                decision = await self.build_advisor.choose_best_candidate(
-                    candidates=candidates,
-                    role=optimizer_role,
-                    context={"mode": mode, "experience": experience},
-                )
                 advised = decision.candidate
                 advisor_reason = decision.reason
                 ranked = decision.ranked_candidates or []
@@ -740,31 +826,33 @@ class TeamCommanderAgent:
                 best_result = results_by_id[advised.id]
                 best_preset_name = advised.prefix
             except Exception as e:  # pragma: no cover - robust fallback
-                logger.error(f"BuildAdvisorAgent failed, falling back to max score: {e}")
-                # Fallback: max overall_score
-                best_candidate = max(candidates, key=lambda c: c.overall_score)
-                best_result = results_by_id[best_candidate.id]
-                best_preset_name = best_candidate.prefix
-        else:
+                logger.error(f"BuildAdvisorAgent choice unusable, falling back to max score: {e}")
+                decision = None
+        if candidates and decision is None:
+            # Fallback: max overall_score
+            best_candidate = max(candidates, key=lambda c: c.overall_score)
+            best_result = results_by_id[best_candidate.id]
+            best_preset_name = best_candidate.prefix
+        elif not candidates:
             base_stats = self._get_base_stats_for_role(role)
             best_result = await self.optimizer.optimize_build(
                 base_stats=base_stats,
-                skill_rotation=skill_rotation,
-                role=optimizer_role,
+                skill_rotation=prepared.skill_rotation,
+                role=prepared.optimizer_role,
             )
             best_preset_name = self._get_stats_priority_for_role(role)
 
         stats_priority = best_preset_name or self._get_stats_priority_for_role(role)
 
-        # Conserver le mix d'armure détaillé uniquement si le preset GreedyMix a été choisi.
+        # Conserver le mix de préfixes détaillé uniquement si le preset GreedyMix a été choisi.
         final_gear_mix: Optional[Dict[str, str]] = None
-        if stats_priority == "GreedyMix" and greedy_armor_mix:
-            final_gear_mix = greedy_armor_mix
+        if stats_priority == "GreedyMix" and greedy_gear_mix:
+            final_gear_mix = greedy_gear_mix
 
         return SlotBuild(
             role=role,
-            profession=profession,
-            specialization=specialization,
+            profession=prepared.profession,
+            specialization=prepared.specialization,
             rune=best_result.rune_name,
             sigils=best_result.sigil_names,
             stats_priority=stats_priority,
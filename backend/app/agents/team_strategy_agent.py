@@ -13,11 +13,12 @@ import json
 import re
 from typing import Any, Dict, Optional
 
+from app.core.config import settings
 from app.core.logging import logger
 from app.models.team_strategy import TeamStrategyPlan, TeamStrategyRequest
-from app.services.ai.ollama_service import OllamaService
+from app.services.ai.ollama_service import OllamaService, get_ollama_service
 from app.services.meta_rag_service import MetaRAGService
-from app.services.gw2_data_store import GW2DataStore
+from app.services.gw2_data_store import get_gw2_data_store
 
 
 class TeamStrategyAgent:
@@ -35,8 +36,7 @@ class TeamStrategyAgent:
         ollama_service: Optional[OllamaService] = None,
     ) -> None:
         self.meta_rag = meta_rag or MetaRAGService()
-        self._ollama = ollama_service or OllamaService()
-        self._data_store = GW2DataStore()
+        self._ollama = ollama_service or get_ollama_service()
 
     def _build_profession_spec_vocab_fragment(self) -> str:
         """Construit dynamiquement le vocabulaire professions/spécialisations.
@@ -49,8 +49,9 @@ class TeamStrategyAgent:
         """
 
         try:
-            professions = self._data_store.get_professions()
-            specializations = self._data_store.get_specializations()
+            data_store = get_gw2_data_store()
+            professions = data_store.get_professions()
+            specializations = data_store.get_specializations()
         except Exception:
             # Fallback: liste codée en dur (EoD)
             return (
@@ -275,6 +276,7 @@ class TeamStrategyAgent:
             system_prompt=system_prompt,
             schema=schema,
             max_tokens=1024,
+            temperature=settings.LLM_AGENT_TEMPERATURE,
         )
 
         try:
@@ -3,7 +3,7 @@
 from fastapi import APIRouter
 from fastapi.responses import JSONResponse
 
-from app.services.ai.ollama_service import OllamaService
+from app.services.ai.ollama_service import get_ollama_service
 
 router = APIRouter()
 
@@ -23,7 +23,7 @@ async def health_check() -> JSONResponse:
 @router.get("/health/ollama")
 async def ollama_health() -> JSONResponse:
     """Check Ollama service health."""
-    ollama_service = OllamaService()
+    ollama_service = get_ollama_service()
     is_healthy = await ollama_service.check_health()
 
     return JSONResponse(
@@ -39,7 +39,7 @@ async def ollama_health() -> JSONResponse:
 @router.get("/health/all")
 async def full_health_check() -> JSONResponse:
     """Complete health check of all services."""
-    ollama_service = OllamaService()
+    ollama_service = get_ollama_service()
     ollama_healthy = await ollama_service.check_health()
 
     return JSONResponse(
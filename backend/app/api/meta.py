@@ -9,7 +9,7 @@ from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
 
 from app.workflows.meta_analysis_workflow import MetaAnalysisWorkflow
-from app.services.gw2_api_client import GW2APIClient
+from app.services.gw2_api_client import get_gw2_api_client
 from app.core.logging import logger
 
 
@@ -248,7 +248,7 @@ async def import_gw2_data(request: GW2DataImportRequest):
     logger.info(f"GW2 data import requested: {request.data_types}")
 
     try:
-        client = GW2APIClient()
+        client = get_gw2_api_client()
         imported_data = {}
 
         # Importer les professions
@@ -296,7 +296,7 @@ async def get_gw2_professions():
         Liste des professions
     """
     try:
-        client = GW2APIClient()
+        client = get_gw2_api_client()
         professions = await client.get_professions()
 
         return {"success": True, "professions": professions, "count": len(professions)}
@@ -318,7 +318,7 @@ async def get_gw2_profession(profession_id: str):
         Détails de la profession
     """
     try:
-        client = GW2APIClient()
+        client = get_gw2_api_client()
         profession = await client.get_profession(profession_id)
 
         return {"success": True, "profession": profession}
@@ -337,7 +337,7 @@ async def get_cache_stats():
         Statistiques du cache
     """
     try:
-        client = GW2APIClient()
+        client = get_gw2_api_client()
         stats = client.get_cache_stats()
 
         return {"success": True, "cache_stats": stats}
@@ -356,7 +356,7 @@ async def clear_cache():
         Confirmation
     """
     try:
-        client = GW2APIClient()
+        client = get_gw2_api_client()
         client.clear_cache()
 
         return {"success": True, "message": "Cache cleared successfully"}
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, status
@@ -12,6 +13,7 @@ from app.core.logging import logger
 from app.core.security import get_current_user_optional
 from app.db.session import get_db
 from app.services.etl_gw2 import sync_all
+from app.services.gw2_data_store import reload_gw2_data_store
 
 router = APIRouter(tags=["Sync"])
 # Le préfixe "/sync" est déjà défini dans main.py lors de l'inclusion du routeur
@@ -50,3 +52,16 @@ async def trigger_gw2_sync(
 
     logger.info("GW2 synchronisation triggered via API: %s", result)
     return {"status": "accepted", "result": result}
+
+
+@router.post("/gw2-data/reload")
+async def reload_gw2_data(_: Any = Depends(require_sync_access)) -> dict[str, Any]:
+    """Reload the local GW2 data dumps after an import (e.g. scripts/gw2_full_import.py)."""
+
+    try:
+        counts = await asyncio.to_thread(reload_gw2_data_store)
+    except Exception:
+        logger.exception("GW2 data reload failed")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="GW2 data reload failed")
+
+    return {"status": "reloaded", "datasets": counts}
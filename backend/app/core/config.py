@@ -20,6 +20,27 @@ class Settings(BaseSettings):
     # Ollama Configuration
     OLLAMA_HOST: str = "http://localhost:11434"
     OLLAMA_MODEL: str = "mistral:7b"
+    OLLAMA_TIMEOUT: float = 300.0  # Inactivité max entre deux tokens (secondes)
+    OLLAMA_MAX_CONNECTIONS: int = 4  # Taille du pool de connexions vers Ollama
+    LLM_CACHE_ENABLED: bool = True  # cache persistant de generate_structured (température 0 uniquement)
+    LLM_CACHE_DIR: str = "./data/cache/llm"
+    LLM_CACHE_TTL: int = 7 * 24 * 3600  # seconds a cached response stays valid
+    LLM_CACHE_MAX_ENTRIES: int = 5000  # least recently used entries are dropped beyond this
+    # Température des appels structurés des agents (advisor, stratégie, analyse).
+    # 0 rend leurs réponses déterministes et donc servies par le cache LLM pour
+    # les prompts répétés; au prix de choix moins variés d'une requête à l'autre.
+    LLM_AGENT_TEMPERATURE: float = 0.3
+
+    # LLM scheduler (interactive vs background requests sharing the local model)
+    LLM_MAX_CONCURRENCY: int = 2  # generations running at once on the model host
+    LLM_INTERACTIVE_CONCURRENCY: int = 2
+    LLM_BACKGROUND_CONCURRENCY: int = 1  # leaves room for live users during nightly jobs
+    LLM_INTERACTIVE_QUEUE_SIZE: int = 32
+    LLM_BACKGROUND_QUEUE_SIZE: int = 1024
+    LLM_INTERACTIVE_MAX_WAIT: float = 30.0  # seconds in queue before rejection
+    LLM_BACKGROUND_MAX_WAIT: float = 3600.0
+    LLM_BREAKER_FAILURES: int = 5  # consecutive model failures opening the circuit
+    LLM_BREAKER_RECOVERY: int = 30  # seconds before a probe request is let through
 
     # Database
     DATABASE_PATH: str = "./data/local_db/gw2optimizer.db"
@@ -80,6 +101,28 @@ class Settings(BaseSettings):
     REDIS_URL: str = "redis://localhost:6379/0"
     REDIS_ENABLED: bool = True
 
+    # CPU worker pool (slot optimization off the event loop)
+    CPU_POOL_WORKERS: int = 2  # 0 = run jobs inline on the event loop
+    CPU_POOL_MAX_QUEUE: int = 32  # jobs allowed to wait for a free worker
+    CPU_POOL_JOB_TIMEOUT: float = 60.0  # per-job timeout in seconds
+    SLOT_CACHE_MAX_ENTRIES: int = 256  # memoized slot optimization results (0 = disabled)
+
+    # GW2 API client (pooled connections + in-process response cache)
+    GW2_API_MAX_CONNECTIONS: int = 20
+    GW2_API_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    GW2_API_CACHE_MAX_ENTRIES: int = 2048  # bounded LRU (0 = disabled)
+    GW2_API_CACHE_TTL: int = 24 * 3600  # seconds
+    GW2_API_RATE_LIMIT: float = 10.0  # requests per second (token bucket refill)
+    GW2_API_RATE_BURST: int = 50  # token bucket capacity
+    GW2_API_PAGE_CONCURRENCY: int = 8  # pages fetched in parallel by paginated imports
+    GW2_API_DISK_CACHE_ENABLED: bool = True  # persistent HTTP cache, revalidated with ETag/Last-Modified
+    GW2_API_DISK_CACHE_DIR: str = "./data/cache/gw2api"  # one sub-directory per game build
+    GW2_API_DISK_CACHE_FRESH: int = 3600  # seconds an entry is served without revalidation
+    GW2_API_BUILD_CHECK_INTERVAL: int = 600  # seconds between game build checks
+
+    # GW2 static data (backend/data/gw2)
+    GW2_DATA_WARMUP: bool = True  # load the shared GW2 data store at startup
+
     # Logging
     LOG_LEVEL: str = "INFO"
 
@@ -94,6 +137,9 @@ class Settings(BaseSettings):
     LEARNING_DATA_DIR: str = "backend/data/learning/feedback"
     MAX_LEARNING_ITEMS: int = 10000
     LEARNING_ENABLED: bool = True
+    LEARNING_EVAL_BATCH_SIZE: int = 8  # datapoints scored by one LLM prompt
+    LEARNING_EVAL_CONCURRENCY: int = 2  # batches in flight (LLM_BACKGROUND_CONCURRENCY still applies)
+    LEARNING_EVAL_CHECKPOINT: str = "./data/learning/evaluation_checkpoint.jsonl"  # empty: no resume
 
     # AI Core Configuration (v4.1.0)
     AI_CORE_ENABLED: bool = True  # Feature flag for AI Core
@@ -6,7 +6,7 @@ HTTP metrics provided by prometheus-fastapi-instrumentator.
 """
 
 from prometheus_client import Counter, Histogram, Gauge, Info
-from typing import Optional
+from typing import Dict, Optional
 
 # ============================================================================
 # AI & LLM Metrics
@@ -37,6 +37,43 @@ ai_feedback_total = Counter(
     ["result"],  # result: ok, fallback, error
 )
 
+ai_coalesced_requests_total = Counter(
+    "gw2_ai_coalesced_requests_total",
+    "AI/LLM calls served by an identical in-flight generation",
+    ["model"],
+)
+
+ai_cache_lookups_total = Counter(
+    "gw2_ai_cache_lookups_total",
+    "Structured LLM response cache lookups",
+    ["model", "result"],  # result: hit, miss, bypass
+)
+
+llm_queue_depth = Gauge(
+    "gw2_llm_queue_depth",
+    "LLM requests waiting in the scheduler queue",
+    ["priority"],  # priority: interactive, background
+)
+
+llm_requests_running = Gauge(
+    "gw2_llm_requests_running",
+    "LLM requests currently admitted by the scheduler",
+    ["priority"],
+)
+
+llm_queue_wait_seconds = Histogram(
+    "gw2_llm_queue_wait_seconds",
+    "Time LLM requests spend queued before admission",
+    ["priority"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0, 300.0),
+)
+
+llm_requests_rejected_total = Counter(
+    "gw2_llm_requests_rejected_total",
+    "LLM requests rejected by the scheduler",
+    ["priority", "reason"],  # reason: queue_full, deadline, circuit_open
+)
+
 ai_training_triggers_total = Counter(
     "gw2_ai_training_triggers_total",
     "Total ML training triggers",
@@ -85,6 +122,55 @@ cache_size_bytes = Gauge(
     "Current cache size in bytes",
 )
 
+slot_cache_lookups_total = Counter(
+    "gw2_slot_cache_lookups_total",
+    "Slot optimization cache lookups",
+    ["result"],  # result: hit, miss
+)
+
+slot_cache_hit_rate = Gauge(
+    "gw2_slot_cache_hit_rate",
+    "Slot optimization cache hit rate (0-1)",
+)
+
+slot_cache_entries = Gauge(
+    "gw2_slot_cache_entries",
+    "Number of memoized slot optimization results",
+)
+
+gw2_api_cache_lookups_total = Counter(
+    "gw2_api_cache_lookups_total",
+    "GW2 API client response cache lookups",
+    ["result"],  # result: hit, miss
+)
+
+gw2_api_cache_entries = Gauge(
+    "gw2_api_cache_entries",
+    "Number of GW2 API responses cached in process",
+)
+
+gw2_api_disk_cache_lookups_total = Counter(
+    "gw2_api_disk_cache_lookups_total",
+    "GW2 API client on-disk HTTP cache lookups",
+    ["result"],  # result: hit, revalidated, changed, miss
+)
+
+# ============================================================================
+# GW2 Static Data Metrics
+# ============================================================================
+
+static_data_memory_bytes = Gauge(
+    "gw2_static_data_memory_bytes",
+    "Approximate memory used by the shared GW2 data store",
+    ["dataset"],
+)
+
+static_data_entries = Gauge(
+    "gw2_static_data_entries",
+    "Number of entries loaded in the shared GW2 data store",
+    ["dataset"],
+)
+
 # ============================================================================
 # External API Metrics
 # ============================================================================
@@ -165,6 +251,62 @@ def track_ai_request(
         ai_tokens_used.labels(model=model, token_type="completion").inc(tokens_completion)
 
 
+def track_ai_coalesced(model: str) -> None:
+    """
+    Track an AI/LLM call that joined an identical in-flight generation.
+
+    Args:
+        model: Model name (e.g., "mistral:7b")
+    """
+    ai_coalesced_requests_total.labels(model=model).inc()
+
+
+def track_ai_cache_lookup(model: str, result: str) -> None:
+    """
+    Track a structured LLM response cache lookup.
+
+    Args:
+        model: Model name (e.g., "mistral:7b")
+        result: hit, miss or bypass (non-zero temperature)
+    """
+    ai_cache_lookups_total.labels(model=model, result=result).inc()
+
+
+def track_llm_queue(priority: str, queued: int, running: int) -> None:
+    """
+    Track the LLM scheduler state of a priority class.
+
+    Args:
+        priority: Priority class (interactive, background)
+        queued: Requests waiting for admission
+        running: Requests currently admitted
+    """
+    llm_queue_depth.labels(priority=priority).set(queued)
+    llm_requests_running.labels(priority=priority).set(running)
+
+
+def track_llm_wait(priority: str, wait_seconds: float) -> None:
+    """
+    Track the queue wait of an admitted LLM request.
+
+    Args:
+        priority: Priority class (interactive, background)
+        wait_seconds: Time spent queued (0 when admitted immediately)
+    """
+    llm_queue_wait_seconds.labels(priority=priority).observe(wait_seconds)
+
+
+def track_llm_rejection(priority: str, reason: str) -> None:
+    """
+    Track an LLM request rejected by the scheduler.
+
+    Args:
+        priority: Priority class (interactive, background)
+        reason: queue_full, deadline or circuit_open
+    """
+    llm_requests_rejected_total.labels(priority=priority, reason=reason).inc()
+
+
 def track_db_query(operation: str, table: str, duration: float, error: Optional[str] = None) -> None:
     """
     Track a database query.
@@ -192,6 +334,57 @@ def track_cache_operation(operation: str, result: str) -> None:
     cache_operations_total.labels(operation=operation, result=result).inc()
 
 
+def track_slot_cache_lookup(hit: bool, hit_rate: float, entries: int) -> None:
+    """
+    Track a slot optimization cache lookup.
+    
+    Args:
+        hit: Whether the result was served from the cache
+        hit_rate: Cache hit rate since startup (0-1)
+        entries: Current number of cached results
+    """
+    slot_cache_lookups_total.labels(result="hit" if hit else "miss").inc()
+    slot_cache_hit_rate.set(hit_rate)
+    slot_cache_entries.set(entries)
+
+
+def track_gw2_api_cache_lookup(hit: bool, entries: int) -> None:
+    """
+    Track a GW2 API client response cache lookup.
+    
+    Args:
+        hit: Whether the response was served from the cache
+        entries: Current number of cached responses
+    """
+    gw2_api_cache_lookups_total.labels(result="hit" if hit else "miss").inc()
+    gw2_api_cache_entries.set(entries)
+
+
+def track_gw2_api_disk_cache_lookup(result: str) -> None:
+    """
+    Track a GW2 API client on-disk HTTP cache lookup.
+
+    Args:
+        result: hit (fresh entry), revalidated (304), changed (200 on a
+            conditional request) or miss (no entry)
+    """
+    gw2_api_disk_cache_lookups_total.labels(result=result).inc()
+
+
+def track_static_data_memory(memory_bytes: Dict[str, int], entries: Dict[str, int]) -> None:
+    """
+    Publish the memory accounting of the shared GW2 data store.
+    
+    Args:
+        memory_bytes: Approximate size in bytes per dataset
+        entries: Number of entries per dataset
+    """
+    for dataset, size in memory_bytes.items():
+        static_data_memory_bytes.labels(dataset=dataset).set(size)
+    for dataset, count in entries.items():
+        static_data_entries.labels(dataset=dataset).set(count)
+
+
 def track_external_api(
     service: str,
     endpoint: str,
@@ -0,0 +1,285 @@
+"""
+Process pool for CPU-bound work (slot optimization, gear solving).
+
+Pure CPU work run directly in a coroutine blocks the event loop, and with it
+every other request served by the process. CPUWorkerPool runs such jobs in
+worker processes instead, with:
+
+- a bounded number of pending jobs (running + queued); extra submissions wait
+  for a job to finish (backpressure) instead of piling up in the executor,
+- a per-job timeout (WorkerPoolTimeoutError) covering the wait for capacity
+  and the run; jobs still queued are cancelled,
+- an optional bound on the number of waiting submissions (WorkerPoolFullError),
+- an inline mode (max_workers=0) that runs jobs in the calling coroutine, for
+  development and tests.
+
+Jobs must be module-level functions whose arguments and results are picklable.
+"""
+
+import asyncio
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Deque, Dict, Optional, Tuple, TypeVar
+
+from app.core.config import settings
+from app.core.logging import logger
+
+
+T = TypeVar("T")
+
+
+class WorkerPoolFullError(RuntimeError):
+    """Raised when the pool is at capacity and max_waiters submissions already wait."""
+
+
+class WorkerPoolTimeoutError(TimeoutError):
+    """Raised when a job does not complete within its timeout."""
+
+
+class CPUWorkerPool:
+    """
+    Bounded process pool usable from async code.
+
+    Usage:
+        pool = get_cpu_pool()
+        result = await pool.submit(module_level_function, picklable_arg)
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_queue: int = 32,
+        job_timeout: Optional[float] = 60.0,
+        start_method: str = "spawn",
+        max_waiters: Optional[int] = None,
+    ):
+        """
+        Args:
+            max_workers: Number of worker processes (0 runs jobs inline)
+            max_queue: Jobs allowed to wait for a free worker
+            job_timeout: Default per-job timeout in seconds (None = no timeout)
+            start_method: multiprocessing start method for workers
+            max_waiters: Submissions allowed to wait for capacity (None = no limit)
+        """
+        self.max_workers = max(0, max_workers)
+        self.max_queue = max(0, max_queue)
+        self.job_timeout = job_timeout
+        self.start_method = start_method
+        self.max_waiters = max_waiters
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+        # Submissions waiting for capacity, woken when a job finishes
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, "asyncio.Future[None]"]] = deque()
+        self._stats: Dict[str, int] = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "waited": 0,
+            "timed_out": 0,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        """True if jobs run in worker processes."""
+        return self.max_workers > 0
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of pending jobs (running + queued)."""
+        return self.max_workers + self.max_queue
+
+    @property
+    def pending(self) -> int:
+        """Jobs submitted to workers and not finished yet."""
+        return self._pending
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context(self.start_method),
+            )
+            logger.info(f"⚙️ CPU worker pool started ({self.max_workers} workers, queue {self.max_queue})")
+        return self._executor
+
+    def _on_job_done(self, future: Future) -> None:
+        # Capacity is released only when the worker is really done with the job,
+        # so a timed-out job that keeps running still counts as pending.
+        # Called from the executor's management thread.
+        self._release()
+
+    def _release(self) -> None:
+        with self._lock:
+            self._pending -= 1
+            waiters = list(self._waiters)
+            self._waiters.clear()
+        # Every waiter re-checks capacity: a waiter cancelled meanwhile cannot
+        # keep the freed place from the others.
+        for loop, waiter in waiters:
+            try:
+                loop.call_soon_threadsafe(self._wake, waiter)
+            except RuntimeError:  # loop closed
+                pass
+
+    @staticmethod
+    def _wake(waiter: "asyncio.Future[None]") -> None:
+        if not waiter.done():
+            waiter.set_result(None)
+
+    async def _reserve(self, deadline: Optional[float]) -> None:
+        """Take a pending-job place, waiting until one is free or the deadline passes."""
+        loop = asyncio.get_running_loop()
+        waited = False
+        while True:
+            with self._lock:
+                if self._pending < self.capacity:
+                    self._pending += 1
+                    return
+                if not waited and self.max_waiters is not None and len(self._waiters) >= self.max_waiters:
+                    self._stats["rejected"] += 1
+                    raise WorkerPoolFullError(
+                        f"CPU worker pool is full ({self._pending}/{self.capacity} pending jobs, "
+                        f"{len(self._waiters)} waiting)"
+                    )
+                waiter: "asyncio.Future[None]" = loop.create_future()
+                self._waiters.append((loop, waiter))
+            if not waited:
+                waited = True
+                self._stats["waited"] += 1
+            remaining = None if deadline is None else deadline - loop.time()
+            try:
+                if remaining is not None and remaining <= 0:
+                    raise asyncio.TimeoutError
+                await asyncio.wait_for(waiter, timeout=remaining)
+            except asyncio.TimeoutError:
+                raise WorkerPoolTimeoutError("no CPU worker became available in time") from None
+            finally:
+                with self._lock:
+                    if (loop, waiter) in self._waiters:
+                        self._waiters.remove((loop, waiter))
+
+    async def submit(
+        self,
+        func: Callable[..., T],
+        *args: Any,
+        timeout: Optional[float] = None,
+    ) -> T:
+        """
+        Run func(*args) in a worker process.
+
+        Waits for capacity when the pool is full; the timeout covers that wait
+        and the run.
+
+        Args:
+            func: Module-level function (picklable)
+            *args: Picklable arguments
+            timeout: Timeout in seconds (defaults to job_timeout)
+
+        Returns:
+            The function result
+
+        Raises:
+            WorkerPoolFullError: Pool full and max_waiters submissions already waiting
+            WorkerPoolTimeoutError: The job did not finish in time
+        """
+        timeout = self.job_timeout if timeout is None else timeout
+        self._stats["submitted"] += 1
+
+        if not self.enabled:
+            result = func(*args)
+            self._stats["completed"] += 1
+            return result
+
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        try:
+            await self._reserve(deadline)
+        except WorkerPoolTimeoutError:
+            self._stats["timed_out"] += 1
+            raise
+
+        try:
+            try:
+                future = self._get_executor().submit(func, *args)
+            except BrokenProcessPool:
+                logger.warning("CPU worker pool was broken; restarting it")
+                self._executor = None
+                future = self._get_executor().submit(func, *args)
+        except Exception:
+            self._release()
+            raise
+
+        future.add_done_callback(self._on_job_done)
+
+        remaining = None if deadline is None else max(0.0, deadline - loop.time())
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(future), timeout=remaining)
+        except asyncio.TimeoutError:
+            self._stats["timed_out"] += 1
+            future.cancel()
+            raise WorkerPoolTimeoutError(f"{getattr(func, '__name__', func)} timed out after {timeout}s") from None
+        except BrokenProcessPool:
+            self._stats["failed"] += 1
+            self._executor = None
+            raise
+        except Exception:
+            self._stats["failed"] += 1
+            raise
+
+        self._stats["completed"] += 1
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool counters (for health/metrics endpoints)."""
+        return {
+            **self._stats,
+            "workers": self.max_workers,
+            "capacity": self.capacity,
+            "pending": self._pending,
+            "waiting": len(self._waiters),
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop worker processes (queued jobs are cancelled)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+
+# Global pool, configured from settings
+_cpu_pool: Optional[CPUWorkerPool] = None
+
+
+def get_cpu_pool() -> CPUWorkerPool:
+    """Get or create the global CPU worker pool."""
+    global _cpu_pool
+    if _cpu_pool is None:
+        _cpu_pool = CPUWorkerPool(
+            max_workers=settings.CPU_POOL_WORKERS,
+            max_queue=settings.CPU_POOL_MAX_QUEUE,
+            job_timeout=settings.CPU_POOL_JOB_TIMEOUT,
+        )
+    return _cpu_pool
+
+
+def shutdown_cpu_pool() -> None:
+    """Shut down the global pool (application shutdown)."""
+    global _cpu_pool
+    if _cpu_pool is not None:
+        _cpu_pool.shutdown(wait=False)
+        _cpu_pool = None
+
+
+__all__ = [
+    "CPUWorkerPool",
+    "WorkerPoolFullError",
+    "WorkerPoolTimeoutError",
+    "get_cpu_pool",
+    "shutdown_cpu_pool",
+]
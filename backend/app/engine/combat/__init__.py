@@ -1,11 +1,12 @@
 """Combat state management for GW2 calculations."""
 
-from .context import CombatContext
+from .context import CombatContext, ContextSnapshot
 from .boons import apply_boon_stats, BOON_MODIFIERS
 from .conditions import CONDITION_DEBUFFS
 
 __all__ = [
     "CombatContext",
+    "ContextSnapshot",
     "apply_boon_stats",
     "BOON_MODIFIERS",
     "CONDITION_DEBUFFS",
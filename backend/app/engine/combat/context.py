@@ -1,10 +1,67 @@
 """Combat context representing the current state of combat."""
 
+from collections.abc import Mapping
 from dataclasses import dataclass, field
-from typing import Dict, List, Any
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional
 
 
-@dataclass
+# Context fields holding mutable maps, frozen in snapshots
+_NESTED_MAPPINGS = ("player_boons", "player_conditions", "boon_uptime", "target_conditions", "target_boons")
+
+
+class ContextSnapshot(dict):
+    """
+    Immutable view of a CombatContext used for condition evaluation.
+
+    Same keys as CombatContext.to_dict() and a real dict underneath, so
+    conditions keep their C-speed ``get`` lookups, but built once per context
+    state and shared by every modifier evaluated against it. Mutation is
+    rejected and nested boon/condition maps are frozen copies, so later
+    changes to the context never leak into a snapshot.
+    """
+
+    __slots__ = ()
+
+    def _readonly(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError("ContextSnapshot is immutable")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly  # type: ignore[assignment]
+    clear = pop = popitem = setdefault = update = _readonly  # type: ignore[assignment]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain (mutable, JSON-serializable) copy of the snapshot."""
+        values = dict(self)
+        for name, value in values.items():
+            if isinstance(value, Mapping):
+                values[name] = dict(value)
+            elif isinstance(value, tuple):
+                values[name] = list(value)
+        return values
+
+    def __reduce__(self):
+        # MappingProxyType can't be pickled or deep-copied: rebuild from a dict
+        return (_snapshot_from_dict, (self.to_dict(),))
+
+    def __copy__(self) -> "ContextSnapshot":
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "ContextSnapshot":
+        return self
+
+    def __repr__(self) -> str:
+        return f"ContextSnapshot({dict.__repr__(self)})"
+
+
+def _snapshot_from_dict(values: Dict[str, Any]) -> ContextSnapshot:
+    frozen = dict(values)
+    for name in _NESTED_MAPPINGS:
+        frozen[name] = MappingProxyType(dict(frozen[name]))
+    frozen["active_combo_fields"] = tuple(frozen["active_combo_fields"])
+    return ContextSnapshot(frozen)
+
+
+@dataclass(slots=True)
 class CombatContext:
     """Represents the current state of combat for calculations."""
 
@@ -41,6 +98,18 @@ class CombatContext:
     # Simulation time
     current_time: float = 0.0
 
+    # Cached snapshot(), dropped whenever the context changes
+    _snapshot: Optional[ContextSnapshot] = field(default=None, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name != "_snapshot":
+            object.__setattr__(self, "_snapshot", None)
+
+    def invalidate_snapshot(self) -> None:
+        """Drop the cached snapshot (needed only after mutating nested dicts directly)."""
+        object.__setattr__(self, "_snapshot", None)
+
     def add_boon(self, boon_name: str, stacks: int = 1, max_stacks: int = 25) -> None:
         """
         Add boon stacks to player.
@@ -52,6 +121,7 @@ class CombatContext:
         """
         current = self.player_boons.get(boon_name, 0)
         self.player_boons[boon_name] = min(current + stacks, max_stacks)
+        self.invalidate_snapshot()
 
     def remove_boon(self, boon_name: str, stacks: int = 1) -> None:
         """Remove boon stacks from player."""
@@ -59,11 +129,13 @@ class CombatContext:
             self.player_boons[boon_name] = max(0, self.player_boons[boon_name] - stacks)
             if self.player_boons[boon_name] == 0:
                 del self.player_boons[boon_name]
+            self.invalidate_snapshot()
 
     def add_condition_to_target(self, condition_name: str, stacks: int = 1, max_stacks: int = 25) -> None:
         """Add condition stacks to target."""
         current = self.target_conditions.get(condition_name, 0)
         self.target_conditions[condition_name] = min(current + stacks, max_stacks)
+        self.invalidate_snapshot()
 
     def has_boon(self, boon_name: str, min_stacks: int = 1) -> bool:
         """Check if player has a boon with minimum stacks."""
@@ -81,6 +153,7 @@ class CombatContext:
         """Set average uptime (0..1) for a boon on the player."""
         clamped = max(0.0, min(1.0, float(uptime)))
         self.boon_uptime[boon_name] = clamped
+        self.invalidate_snapshot()
 
     def get_boon_uptime(self, boon_name: str) -> float:
         """Get average uptime for a boon, defaulting to 1.0 when unspecified."""
@@ -109,6 +182,19 @@ class CombatContext:
             "current_time": self.current_time,
         }
 
+    def snapshot(self) -> ContextSnapshot:
+        """
+        Immutable snapshot for condition evaluation, cached until the context changes.
+
+        Prefer this over to_dict() on hot paths: the snapshot is built once and
+        shared by every modifier evaluation instead of allocating a dict per call.
+        """
+        snap = self._snapshot
+        if snap is None:
+            snap = _snapshot_from_dict(self.to_dict())
+            object.__setattr__(self, "_snapshot", snap)
+        return snap
+
     @classmethod
     def create_default(cls, might_stacks: int = 25, fury: bool = True, game_mode: str = "WvW") -> "CombatContext":
         """
@@ -1,6 +1,9 @@
 """Attribute calculations and conversions for GW2 stats."""
 
 from typing import Dict
+
+import numpy as np
+
 from .constants import (
     BASE_CRIT_CHANCE,
     BASE_CRIT_DAMAGE,
@@ -191,3 +194,51 @@ class AttributeCalculator:
             "healing_power": base_stats.get("healing_power", 0),
             "toughness": base_stats.get("toughness", 0),
         }
+
+    @staticmethod
+    def calculate_all_derived_stats_batch(
+        base_stats: Dict[str, np.ndarray],
+        might_stacks: int = 0,
+        fury_active: bool = False,
+        additional_crit_chance: np.ndarray | float = 0.0,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Array-shaped equivalent of calculate_all_derived_stats.
+
+        Each stat maps to a NumPy array holding one value per candidate build;
+        missing stats count as zero. The formulas mirror the scalar version.
+
+        Args:
+            base_stats: Dictionary of stat arrays (all broadcastable together)
+            might_stacks: Number of active Might stacks
+            fury_active: Whether Fury boon is active
+            additional_crit_chance: Additional crit chance per candidate
+
+        Returns:
+            Dictionary with the same keys as calculate_all_derived_stats, as arrays
+        """
+        shape = np.broadcast_shapes(*(np.shape(v) for v in base_stats.values()), np.shape(additional_crit_chance))
+
+        def stat(name: str) -> np.ndarray:
+            value = base_stats.get(name)
+            if value is None:
+                return np.zeros(shape)
+            return np.broadcast_to(np.asarray(value, dtype=float), shape)
+
+        might_bonus = min(might_stacks, 25) * 30
+        fury_bonus = 0.20 if fury_active else 0.0
+
+        crit_chance = np.minimum(1.0, BASE_CRIT_CHANCE + stat("precision") / PRECISION_TO_CRIT + fury_bonus)
+        crit_chance = np.minimum(1.0, crit_chance + additional_crit_chance)
+
+        return {
+            "effective_power": stat("power") + might_bonus,
+            "effective_condition_damage": stat("condition_damage") + might_bonus,
+            "crit_chance": crit_chance,
+            "crit_damage_multiplier": BASE_CRIT_DAMAGE + stat("ferocity") / FEROCITY_TO_CRIT_DMG,
+            "condition_duration_bonus": stat("expertise") / EXPERTISE_TO_CONDI_DURATION / 100,
+            "boon_duration_bonus": stat("concentration") / CONCENTRATION_TO_BOON_DURATION / 100,
+            "max_health": BASE_HEALTH + stat("vitality") * VITALITY_TO_HEALTH,
+            "healing_power": stat("healing_power"),
+            "toughness": stat("toughness"),
+        }
@@ -1,8 +1,13 @@
 """Condition (DoT) damage calculations for Guild Wars 2."""
 
-from typing import Dict, Optional
+from typing import Dict, Optional, Union
+
+import numpy as np
+
 from .constants import CONDITION_BASE_DAMAGE
 
+ArrayLike = Union[float, np.ndarray]
+
 
 def calculate_condition_damage(
     condition_type: str,
@@ -164,3 +169,53 @@ def calculate_all_condition_damage(
     }
 
     return results
+
+
+def calculate_all_condition_damage_batch(
+    conditions: Dict[str, dict],
+    condition_damage_stat: ArrayLike,
+    condition_duration_bonus: ArrayLike,
+    expertise: int = 0,
+    target_has_resolution: bool = False,
+) -> np.ndarray:
+    """
+    Array-shaped equivalent of calculate_all_condition_damage.
+
+    Only the summed total damage is returned, one value per candidate, which
+    is what build scoring consumes. Stat inputs may be NumPy arrays and are
+    broadcast together.
+
+    Args:
+        conditions: Condition config, same format as calculate_all_condition_damage
+        condition_damage_stat: Condition Damage per candidate (already truncated to integers)
+        condition_duration_bonus: Additional condition duration per candidate (decimal)
+        expertise: Expertise stat shared by all candidates
+        target_has_resolution: Whether target has Resolution boon
+
+    Returns:
+        Array with the total condition damage per candidate
+
+    Raises:
+        ValueError: If a condition type is unknown
+    """
+    condition_damage_stat = np.asarray(condition_damage_stat, dtype=float)
+    total = np.zeros(np.broadcast(condition_damage_stat, condition_duration_bonus).shape)
+
+    for condi_type, config in conditions.items():
+        base_dmg = CONDITION_BASE_DAMAGE.get(condi_type)
+        if base_dmg is None:
+            raise ValueError(f"Unknown condition type: {condi_type}")
+
+        stacks = config.get("stacks", 1)
+        base_duration = config.get("base_duration", 1.0)
+
+        total_mult = 1.0 + expertise / 1500 + condition_duration_bonus
+        effective_duration = base_duration * total_mult
+
+        damage = (base_dmg + 0.05 * condition_damage_stat) * stacks * effective_duration
+        if target_has_resolution:
+            damage = damage * 0.50
+
+        total = total + damage
+
+    return total
@@ -1,8 +1,13 @@
 """Strike damage calculations for Guild Wars 2."""
 
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
 from .constants import ARMOR_HEAVY, BASE_CRIT_DAMAGE
 
+ArrayLike = Union[float, np.ndarray]
+
 
 def calculate_strike_damage(
     power: int,
@@ -193,3 +198,68 @@ def calculate_multi_hit_damage(
         "total_average_damage": total_avg,
         "per_hit_breakdown": hits,
     }
+
+
+def calculate_average_damage_batch(
+    power: ArrayLike,
+    weapon_strength: int,
+    skill_coefficient: float,
+    crit_chance: ArrayLike,
+    crit_damage_mult: ArrayLike,
+    target_armor: int = ARMOR_HEAVY,
+    vulnerability_stacks: int = 0,
+    damage_multipliers: Optional[Sequence[ArrayLike]] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Array-shaped equivalent of calculate_average_damage.
+
+    Every stat argument may be a NumPy array (one entry per candidate build);
+    arrays are broadcast together so a whole grid of candidates is evaluated
+    in a single pass. The arithmetic mirrors the scalar function step by step
+    so results match it up to floating point rounding.
+
+    Args:
+        power: Effective Power per candidate (already truncated to integers)
+        weapon_strength: Weapon strength value
+        skill_coefficient: Skill damage coefficient
+        crit_chance: Critical hit chance per candidate (0.0 to 1.0)
+        crit_damage_mult: Critical damage multiplier per candidate
+        target_armor: Target's armor value
+        vulnerability_stacks: Vulnerability stacks on target
+        damage_multipliers: Additional multipliers, scalars or per-candidate arrays
+
+    Returns:
+        Dictionary with base_damage, crit_damage and average_damage arrays
+
+    Raises:
+        ValueError: If armor or weapon_strength is <= 0
+    """
+    if target_armor <= 0:
+        raise ValueError("target_armor must be positive")
+    if weapon_strength <= 0:
+        raise ValueError("weapon_strength must be positive")
+    if skill_coefficient < 0:
+        raise ValueError("skill_coefficient must be non-negative")
+
+    base_dmg = (weapon_strength * np.asarray(power, dtype=float) * skill_coefficient) / target_armor
+    crit_dmg = base_dmg * crit_damage_mult
+
+    vulnerability_stacks = min(vulnerability_stacks, 25)
+    if vulnerability_stacks > 0:
+        vuln_mult = 1.0 + (vulnerability_stacks * 0.01)
+        base_dmg = base_dmg * vuln_mult
+        crit_dmg = crit_dmg * vuln_mult
+
+    if damage_multipliers:
+        for mult in damage_multipliers:
+            base_dmg = base_dmg * mult
+            crit_dmg = crit_dmg * mult
+
+    crit_chance = np.clip(crit_chance, 0.0, 1.0)
+    avg_dmg = base_dmg * (1 - crit_chance) + crit_dmg * crit_chance
+
+    return {
+        "base_damage": base_dmg,
+        "crit_damage": crit_dmg,
+        "average_damage": avg_dmg,
+    }
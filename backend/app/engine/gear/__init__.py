@@ -1,5 +1,17 @@
 """Gear effects registry (runes, sigils, consumables)."""
 
-from .registry import RUNE_REGISTRY, SIGIL_REGISTRY, FOOD_REGISTRY, UTILITY_REGISTRY
+from .compiled import COMPILED_GEAR, RELIC_TABLE, RUNE_TABLE, SIGIL_TABLE, CompiledGearTables
+from .registry import RUNE_REGISTRY, SIGIL_REGISTRY, RELIC_REGISTRY, FOOD_REGISTRY, UTILITY_REGISTRY
 
-__all__ = ["RUNE_REGISTRY", "SIGIL_REGISTRY", "FOOD_REGISTRY", "UTILITY_REGISTRY"]
+__all__ = [
+    "RUNE_REGISTRY",
+    "SIGIL_REGISTRY",
+    "RELIC_REGISTRY",
+    "FOOD_REGISTRY",
+    "UTILITY_REGISTRY",
+    "COMPILED_GEAR",
+    "CompiledGearTables",
+    "RUNE_TABLE",
+    "SIGIL_TABLE",
+    "RELIC_TABLE",
+]
@@ -0,0 +1,72 @@
+"""Precompiled, read-only modifier tables for runes, sigils and relics.
+
+The registries in ``registry.py`` expose factory functions that allocate fresh
+Modifier lists on every call. Optimizers look the same gear up thousands of
+times per request, so the tables below are built once at import time and then
+shared: every entry is a tuple of Modifier objects behind a read-only mapping.
+Modifiers carry no per-fight state, so sharing them across builds is safe.
+"""
+
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Callable, Dict, Iterable, Mapping, Optional, Tuple
+
+from ..modifiers.base import Modifier
+from .registry import RELIC_REGISTRY, RUNE_REGISTRY, SIGIL_REGISTRY
+
+ModifierTable = Mapping[str, Tuple[Modifier, ...]]
+
+# Arguments used when compiling parametrized sigils (max stacks for WvW)
+SIGIL_COMPILE_ARGS: Mapping[str, Tuple[int, ...]] = MappingProxyType({"Bloodlust": (25,)})
+
+
+def _compile_table(
+    registry: Mapping[str, Callable[..., object]],
+    args: Mapping[str, Tuple[int, ...]] = MappingProxyType({}),
+) -> ModifierTable:
+    """Call every factory once and freeze the results into a read-only mapping."""
+    table: Dict[str, Tuple[Modifier, ...]] = {}
+    for name, factory in registry.items():
+        result = factory(*args.get(name, ()))
+        table[name] = tuple(result) if isinstance(result, (list, tuple)) else (result,)
+    return MappingProxyType(table)
+
+
+@dataclass(frozen=True)
+class CompiledGearTables:
+    """Shared rune, sigil and relic modifier tables."""
+
+    runes: ModifierTable
+    sigils: ModifierTable
+    relics: ModifierTable
+
+    def rune(self, name: str) -> Tuple[Modifier, ...]:
+        """Modifiers of a rune (empty tuple if unknown)."""
+        return self.runes.get(name, ())
+
+    def sigil_set(self, names: Iterable[str]) -> Tuple[Modifier, ...]:
+        """Modifiers of a sigil combination (unknown sigils are skipped)."""
+        return tuple(mod for name in names for mod in self.sigils.get(name, ()))
+
+    def relic(self, name: Optional[str]) -> Optional[Tuple[Modifier, ...]]:
+        """Modifiers of a relic, or None if the relic is unknown."""
+        if not name:
+            return None
+        return self.relics.get(name)
+
+
+def compile_gear_tables() -> CompiledGearTables:
+    """Build the compiled tables from the factory registries."""
+    return CompiledGearTables(
+        runes=_compile_table(RUNE_REGISTRY),
+        sigils=_compile_table(SIGIL_REGISTRY, SIGIL_COMPILE_ARGS),
+        relics=_compile_table(RELIC_REGISTRY),
+    )
+
+
+COMPILED_GEAR: CompiledGearTables = compile_gear_tables()
+
+RUNE_TABLE: ModifierTable = COMPILED_GEAR.runes
+SIGIL_TABLE: ModifierTable = COMPILED_GEAR.sigils
+RELIC_TABLE: ModifierTable = COMPILED_GEAR.relics
+
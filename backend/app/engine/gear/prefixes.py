@@ -185,7 +185,7 @@ def get_all_prefixes() -> Dict[str, StatDict]:
     l'API (Power, Precision, Vitality, etc.).
     """
 
-    from app.services.gw2_data_store import GW2DataStore
+    from app.services.gw2_data_store import get_gw2_data_store
 
     try:
         # Import tardif pour éviter toute dépendance circulaire au chargement
@@ -199,8 +199,7 @@ def get_all_prefixes() -> Dict[str, StatDict]:
         # de retourner le registre statique.
         return {name: dict(stats) for name, stats in PREFIX_REGISTRY.items()}
 
-    data_store = GW2DataStore()
-    itemstats = data_store.get_itemstats()
+    itemstats = get_gw2_data_store().get_itemstats()
 
     if not itemstats:
         # Pas de données GW2: retourner uniquement le registre statique.
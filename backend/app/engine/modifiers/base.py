@@ -2,7 +2,7 @@
 
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Mapping, Optional
 
 
 class ModifierType(Enum):
@@ -25,16 +25,20 @@ class ModifierType(Enum):
     PROC_DAMAGE = "proc_damage"  # Fixed damage proc (e.g., Sigil of Air)
 
 
+# Combat state read by conditions: CombatContext.snapshot() (or to_dict())
+ContextView = Mapping[str, Any]
+
+
 class ModifierCondition(ABC):
     """Base class for conditions that determine if a modifier is active."""
 
     @abstractmethod
-    def evaluate(self, context: Dict[str, Any]) -> bool:
+    def evaluate(self, context: ContextView) -> bool:
         """
         Evaluate whether the condition is met.
 
         Args:
-            context: Combat context dictionary with player/target state
+            context: Combat context snapshot (or dictionary) with player/target state
 
         Returns:
             True if condition is met, False otherwise
@@ -50,8 +54,27 @@ class Modifier:
     Generic modifier that can come from Traits, Runes, Sigils, Food, etc.
 
     A modifier represents any effect that changes stats or damage output.
+    Modifiers are slotted: compiled gear tables and boon lists hold many of
+    them, and attribute access sits on the innermost optimizer loops.
     """
 
+    __slots__ = (
+        "name",
+        "source",
+        "modifier_type",
+        "value",
+        "condition",
+        "target_stat",
+        "stacks",
+        "max_stacks",
+        "duration",
+        "cooldown",
+        "internal_cooldown",
+        "proc_chance",
+        "is_multiplicative",
+        "metadata",
+    )
+
     def __init__(
         self,
         name: str,
@@ -103,11 +126,7 @@ class Modifier:
         self.is_multiplicative = is_multiplicative
         self.metadata = metadata or {}
 
-        # Runtime state
-        self._last_proc_time: float = 0.0
-        self._is_on_cooldown: bool = False
-
-    def is_active(self, context: Dict[str, Any]) -> bool:
+    def is_active(self, context: ContextView) -> bool:
         """
         Check if this modifier is currently active.
 
@@ -124,27 +143,7 @@ class Modifier:
         # Otherwise, evaluate the condition
         return self.condition.evaluate(context)
 
-    def can_proc(self, current_time: float) -> bool:
-        """
-        Check if this modifier can proc (respecting ICD).
-
-        Args:
-            current_time: Current simulation time in seconds
-
-        Returns:
-            True if the effect can proc
-        """
-        if self.internal_cooldown is None:
-            return True
-
-        time_since_last_proc = current_time - self._last_proc_time
-        return time_since_last_proc >= self.internal_cooldown
-
-    def record_proc(self, current_time: float) -> None:
-        """Record that this modifier has proc'd."""
-        self._last_proc_time = current_time
-
-    def get_effective_value(self, context: Dict[str, Any]) -> float:
+    def get_effective_value(self, context: ContextView) -> float:
         """
         Get the effective value of this modifier.
 
@@ -211,3 +210,4 @@ class Modifier:
             "proc_chance": self.proc_chance if self.proc_chance < 1.0 else None,
             "internal_cooldown": self.internal_cooldown,
         }
+
@@ -1,7 +1,8 @@
 """Condition evaluators for modifiers."""
 
-from typing import Any, Dict, List
-from .base import ModifierCondition
+from collections.abc import Mapping
+from typing import List
+from .base import ContextView, ModifierCondition
 
 
 class TargetHealthCondition(ModifierCondition):
@@ -18,7 +19,7 @@ class TargetHealthCondition(ModifierCondition):
         self.operator = operator
         self.threshold = threshold
 
-    def evaluate(self, context: Dict[str, Any]) -> bool:
+    def evaluate(self, context: ContextView) -> bool:
         target_health_percent = context.get("target_health_percent", 1.0)
 
         if self.operator == ">":
@@ -45,7 +46,7 @@ class PlayerHealthCondition(ModifierCondition):
         self.operator = operator
         self.threshold = threshold
 
-    def evaluate(self, context: Dict[str, Any]) -> bool:
+    def evaluate(self, context: ContextView) -> bool:
         player_health_percent = context.get("player_health_percent", 1.0)
 
         if self.operator == ">":
@@ -77,13 +78,13 @@ class TargetHasConditionCheck(ModifierCondition):
         self.condition_name = condition_name
         self.min_stacks = min_stacks
 
-    def evaluate(self, context: Dict[str, Any]) -> bool:
+    def evaluate(self, context: ContextView) -> bool:
         target_conditions = context.get("target_conditions", {})
 
         if isinstance(target_conditions, list):
             # Simple list format
             return self.condition_name in target_conditions
-        elif isinstance(target_conditions, dict):
+        elif isinstance(target_conditions, Mapping):
             # Dict format with stacks
             stacks = target_conditions.get(self.condition_name, 0)
             return stacks >= self.min_stacks
@@ -109,7 +110,7 @@ class BoonActiveCondition(ModifierCondition):
         self.boon_name = boon_name
         self.min_stacks = min_stacks
 
-    def evaluate(self, context: Dict[str, Any]) -> bool:
+    def evaluate(self, context: ContextView) -> bool:
         player_boons = context.get("player_boons", {})
         stacks = player_boons.get(self.boon_name, 0)
         return stacks >= self.min_stacks
@@ -133,7 +134,7 @@ class DistanceCondition(ModifierCondition):
         self.operator = operator
         self.distance = distance
 
-    def evaluate(self, context: Dict[str, Any]) -> bool:
+    def evaluate(self, context: ContextView) -> bool:
         current_distance = context.get("distance_to_target", 0.0)
 
         if self.operator == ">":
@@ -165,7 +166,7 @@ class CombinedCondition(ModifierCondition):
         self.conditions = conditions
         self.logic = logic.upper()
 
-    def evaluate(self, context: Dict[str, Any]) -> bool:
+    def evaluate(self, context: ContextView) -> bool:
         if not self.conditions:
             return True
 
@@ -193,7 +194,7 @@ class FlankingCondition(ModifierCondition):
         """
         self.require_behind = require_behind
 
-    def evaluate(self, context: Dict[str, Any]) -> bool:
+    def evaluate(self, context: ContextView) -> bool:
         if self.require_behind:
             return context.get("is_behind_target", False)
         else:
@@ -215,7 +216,7 @@ class RecentActionCondition(ModifierCondition):
         """
         self.action = action
 
-    def evaluate(self, context: Dict[str, Any]) -> bool:
+    def evaluate(self, context: ContextView) -> bool:
         return context.get(f"recently_{self.action}", False)
 
     def __repr__(self) -> str:
@@ -1,14 +1,24 @@
 """Logic for stacking modifiers (multiplicative vs additive)."""
 
-from typing import Dict, List, Any
-from .base import Modifier, ModifierType
+from typing import Any, Dict, List, Tuple
+from .base import ContextView, Modifier, ModifierType
+
+
+_OUTGOING_CATEGORIES = ("all", "strike", "condition")
+
+# Damage categories ("all", "strike", "condition") each multiplier type counts in
+_DAMAGE_CATEGORIES: Dict[ModifierType, Tuple[str, ...]] = {
+    ModifierType.DAMAGE_MULTIPLIER: ("all", "strike", "condition"),
+    ModifierType.STRIKE_DAMAGE_MULTIPLIER: ("all", "strike"),
+    ModifierType.CONDITION_DAMAGE_MULTIPLIER: ("all", "condition"),
+}
 
 
 class ModifierStacker:
     """Handle stacking logic for multiple modifiers."""
 
     @staticmethod
-    def stack_flat_stats(modifiers: List[Modifier], context: Dict[str, Any]) -> Dict[str, float]:
+    def stack_flat_stats(modifiers: List[Modifier], context: ContextView) -> Dict[str, float]:
         """
         Stack flat stat modifiers additively.
 
@@ -36,7 +46,7 @@ class ModifierStacker:
         return stat_bonuses
 
     @staticmethod
-    def stack_percent_stats(modifiers: List[Modifier], context: Dict[str, Any]) -> Dict[str, float]:
+    def stack_percent_stats(modifiers: List[Modifier], context: ContextView) -> Dict[str, float]:
         """
         Stack percentage stat modifiers.
 
@@ -70,7 +80,7 @@ class ModifierStacker:
 
     @staticmethod
     def stack_damage_multipliers(
-        modifiers: List[Modifier], context: Dict[str, Any], damage_type: str = "all"
+        modifiers: List[Modifier], context: ContextView, damage_type: str = "all"
     ) -> float:
         """
         Stack damage multipliers.
@@ -139,7 +149,7 @@ class ModifierStacker:
 
     @staticmethod
     def stack_all_modifiers(
-        modifiers: List[Modifier], context: Dict[str, Any]
+        modifiers: List[Modifier], context: ContextView
     ) -> Dict[str, Any]:
         """
         Process all modifiers and return a comprehensive summary.
@@ -159,35 +169,67 @@ class ModifierStacker:
                 - crit_damage_bonus: Additional crit damage
                 - active_modifiers: List of active modifier names
         """
-        # Filter active modifiers
-        active_mods = [m for m in modifiers if m.is_active(context)]
-
-        # Stack different types
-        stat_bonuses = ModifierStacker.stack_flat_stats(active_mods, context)
-        stat_multipliers = ModifierStacker.stack_percent_stats(active_mods, context)
-
-        outgoing_mods = [m for m in active_mods if not m.metadata.get("incoming_only")]
-        incoming_mods = [m for m in active_mods if m.metadata.get("incoming_only")]
-
-        damage_mult = ModifierStacker.stack_damage_multipliers(outgoing_mods, context, "all")
-        strike_mult = ModifierStacker.stack_damage_multipliers(outgoing_mods, context, "strike")
-        condition_mult = ModifierStacker.stack_damage_multipliers(outgoing_mods, context, "condition")
-
-        incoming_damage_mult = (
-            ModifierStacker.stack_damage_multipliers(incoming_mods, context, "all")
-            if incoming_mods
-            else 1.0
-        )
-
-        # Calculate special bonuses
+        # Single pass: each modifier's condition is evaluated once, and every
+        # category is accumulated in the order the per-category helpers above
+        # would use, so results are bit-for-bit identical to chaining them.
+        active_names: List[str] = []
+        stat_bonuses: Dict[str, float] = {}
+        percent_bonuses: Dict[str, float] = {}
         crit_chance_bonus = 0.0
         crit_damage_bonus = 0.0
 
-        for mod in active_mods:
-            if mod.modifier_type == ModifierType.CRIT_CHANCE:
-                crit_chance_bonus += mod.get_effective_value(context)
-            elif mod.modifier_type == ModifierType.CRIT_DAMAGE:
-                crit_damage_bonus += mod.get_effective_value(context)
+        # Running products of multiplicative modifiers, and additive groups
+        # (group -> running sum), per damage category
+        products = {category: 1.0 for category in _OUTGOING_CATEGORIES}
+        groups: Dict[str, Dict[str, float]] = {category: {} for category in _OUTGOING_CATEGORIES}
+        incoming_product = 1.0
+        incoming_groups: Dict[str, float] = {}
+
+        for mod in modifiers:
+            if not mod.is_active(context):
+                continue
+            active_names.append(mod.name)
+
+            value = mod.value * mod.stacks if mod.max_stacks > 1 else mod.value
+            mod_type = mod.modifier_type
+
+            if mod_type is ModifierType.FLAT_STAT:
+                if mod.target_stat:
+                    stat_bonuses[mod.target_stat] = stat_bonuses.get(mod.target_stat, 0.0) + value
+            elif mod_type is ModifierType.PERCENT_STAT:
+                if mod.target_stat:
+                    percent_bonuses[mod.target_stat] = percent_bonuses.get(mod.target_stat, 0.0) + value
+            elif mod_type is ModifierType.CRIT_CHANCE:
+                crit_chance_bonus += value
+            elif mod_type is ModifierType.CRIT_DAMAGE:
+                crit_damage_bonus += value
+            elif mod_type in _DAMAGE_CATEGORIES:
+                if mod.metadata.get("incoming_only"):
+                    if mod.is_multiplicative:
+                        incoming_product *= 1.0 + value
+                    else:
+                        group = mod.metadata.get("additive_group", "default")
+                        incoming_groups[group] = incoming_groups.get(group, 0) + value
+                    continue
+
+                for category in _DAMAGE_CATEGORIES[mod_type]:
+                    if mod.is_multiplicative:
+                        products[category] *= 1.0 + value
+                    else:
+                        group = mod.metadata.get("additive_group", "default")
+                        category_groups = groups[category]
+                        category_groups[group] = category_groups.get(group, 0) + value
+
+        def _finalize(product: float, additive: Dict[str, float]) -> float:
+            for group_total in additive.values():
+                product *= 1.0 + group_total
+            return product
+
+        stat_multipliers = {stat: 1.0 + bonus for stat, bonus in percent_bonuses.items()}
+        damage_mult = _finalize(products["all"], groups["all"])
+        strike_mult = _finalize(products["strike"], groups["strike"])
+        condition_mult = _finalize(products["condition"], groups["condition"])
+        incoming_damage_mult = _finalize(incoming_product, incoming_groups)
 
         return {
             "stat_bonuses": stat_bonuses,
@@ -198,6 +240,6 @@ class ModifierStacker:
             "incoming_damage_multiplier": incoming_damage_mult,
             "crit_chance_bonus": crit_chance_bonus,
             "crit_damage_bonus": crit_damage_bonus,
-            "active_modifiers": [m.name for m in active_mods],
-            "num_active": len(active_mods),
+            "active_modifiers": active_names,
+            "num_active": len(active_names),
         }
@@ -1,5 +1,6 @@
 """Simulation and calculation modules."""
 
 from .calculator import BuildCalculator
+from .batch import BatchBuildCalculator
 
-__all__ = ["BuildCalculator"]
+__all__ = ["BuildCalculator", "BatchBuildCalculator"]
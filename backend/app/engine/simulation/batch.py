@@ -0,0 +1,287 @@
+"""Vectorized evaluation of whole candidate grids (stat prefix × rune × sigils × ...).
+
+The scalar path (BuildCalculator.calculate_effective_stats followed by
+calculate_skill_damage) runs once per candidate and is dominated by Python
+overhead. This module reaches the same numbers for an entire grid at once:
+
+1. Every modifier set along each axis (one rune's six bonuses, one sigil
+   pair, ...) is compiled once into per-stat contribution arrays.
+2. Contributions are broadcast over the grid, which is valid because the
+   stacking rules are separable: flat and percent bonuses add up, crit chance
+   adds up, multiplicative damage modifiers multiply and additive groups add
+   up before being multiplied in.
+3. Derived stats and skill damage use the array-shaped core functions.
+
+Results match the scalar path within floating point rounding.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from ..combat.boons import apply_boon_stats
+from ..combat.context import CombatContext
+from ..core.attributes import AttributeCalculator
+from ..core.condition import calculate_all_condition_damage_batch
+from ..core.damage import calculate_average_damage_batch
+from ..modifiers.base import ContextView, Modifier, ModifierType
+from .calculator import BuildCalculator
+
+ATTRIBUTE_NAMES: Tuple[str, ...] = (
+    "power",
+    "precision",
+    "toughness",
+    "vitality",
+    "ferocity",
+    "condition_damage",
+    "expertise",
+    "concentration",
+    "healing_power",
+)
+
+# Damage multiplier categories, mirroring ModifierStacker.stack_all_modifiers
+_MULTIPLIER_TYPES: Dict[str, Tuple[ModifierType, ...]] = {
+    "damage": (
+        ModifierType.DAMAGE_MULTIPLIER,
+        ModifierType.STRIKE_DAMAGE_MULTIPLIER,
+        ModifierType.CONDITION_DAMAGE_MULTIPLIER,
+    ),
+    "strike": (ModifierType.DAMAGE_MULTIPLIER, ModifierType.STRIKE_DAMAGE_MULTIPLIER),
+    "condition": (ModifierType.DAMAGE_MULTIPLIER, ModifierType.CONDITION_DAMAGE_MULTIPLIER),
+    "incoming": (
+        ModifierType.DAMAGE_MULTIPLIER,
+        ModifierType.STRIKE_DAMAGE_MULTIPLIER,
+        ModifierType.CONDITION_DAMAGE_MULTIPLIER,
+    ),
+}
+
+
+@dataclass(frozen=True)
+class CompiledModifierSets:
+    """Per-set contribution arrays for a list of modifier sets (one entry per set)."""
+
+    flat_stats: Dict[str, np.ndarray]
+    percent_stats: Dict[str, np.ndarray]
+    crit_chance: np.ndarray
+    factors: Dict[str, np.ndarray]
+    additive: Dict[Tuple[str, str], np.ndarray]
+
+    @property
+    def size(self) -> int:
+        return int(self.crit_chance.shape[0])
+
+
+def compile_modifier_sets(
+    modifier_sets: Sequence[Sequence[Modifier]], context: ContextView
+) -> CompiledModifierSets:
+    """
+    Compile modifier sets into contribution arrays.
+
+    Args:
+        modifier_sets: One list of modifiers per candidate along an axis
+        context: Combat context snapshot used to evaluate modifier conditions
+
+    Returns:
+        CompiledModifierSets with one row per modifier set
+    """
+    n = len(modifier_sets)
+    flat: Dict[str, np.ndarray] = {}
+    percent: Dict[str, np.ndarray] = {}
+    crit = np.zeros(n)
+    factors = {category: np.ones(n) for category in _MULTIPLIER_TYPES}
+    additive: Dict[Tuple[str, str], np.ndarray] = {}
+
+    for row, modifiers in enumerate(modifier_sets):
+        for mod in modifiers:
+            if not mod.is_active(context):
+                continue
+            value = mod.get_effective_value(context)
+            mod_type = mod.modifier_type
+
+            if mod_type == ModifierType.FLAT_STAT and mod.target_stat:
+                flat.setdefault(mod.target_stat, np.zeros(n))[row] += value
+            elif mod_type == ModifierType.PERCENT_STAT and mod.target_stat:
+                percent.setdefault(mod.target_stat, np.zeros(n))[row] += value
+            elif mod_type == ModifierType.CRIT_CHANCE:
+                crit[row] += value
+
+            incoming = bool(mod.metadata.get("incoming_only"))
+            for category, types in _MULTIPLIER_TYPES.items():
+                if (category == "incoming") != incoming or mod_type not in types:
+                    continue
+                if mod.is_multiplicative:
+                    factors[category][row] *= 1.0 + value
+                else:
+                    key = (category, mod.metadata.get("additive_group", "default"))
+                    additive.setdefault(key, np.zeros(n))[row] += value
+
+    return CompiledModifierSets(
+        flat_stats=flat,
+        percent_stats=percent,
+        crit_chance=crit,
+        factors=factors,
+        additive=additive,
+    )
+
+
+@dataclass(frozen=True)
+class BatchEvaluation:
+    """Result of a grid evaluation.
+
+    Every array has shape ``(num_base_stats, len(axis_0), len(axis_1), ...)``.
+    ``stats`` holds the same keys as BuildCalculator.calculate_effective_stats.
+    """
+
+    total_damage: np.ndarray
+    stats: Dict[str, np.ndarray]
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return tuple(self.total_damage.shape)
+
+
+class BatchBuildCalculator:
+    """Evaluate a whole grid of candidate builds in a single vectorized pass."""
+
+    def __init__(self, calculator: BuildCalculator | None = None):
+        self.calculator = calculator or BuildCalculator()
+
+    def evaluate_grid(
+        self,
+        base_stats: Sequence[Dict[str, int]],
+        modifier_axes: Sequence[Sequence[Sequence[Modifier]]],
+        skills: Sequence[Dict[str, Any]],
+        context: CombatContext,
+        shared_modifiers: Sequence[Modifier] = (),
+        weapon_strength: int = 1000,
+    ) -> BatchEvaluation:
+        """
+        Evaluate every combination of base stats and modifier sets.
+
+        Candidate ``(p, i, j, ...)`` uses ``base_stats[p]`` together with
+        ``modifier_axes[0][i] + modifier_axes[1][j] + ... + shared_modifiers``
+        and the context's boons, exactly like the scalar calculator would.
+
+        Args:
+            base_stats: Base stats per stat-prefix candidate
+            modifier_axes: Candidate modifier sets per axis (e.g. runes, sigil pairs)
+            skills: Skill dicts with damage_coefficient / conditions (one cast each)
+            context: Combat context shared by all candidates
+            shared_modifiers: Modifiers applied to every candidate (relic, food, ...)
+            weapon_strength: Weapon strength value
+
+        Returns:
+            BatchEvaluation with per-candidate total damage and effective stats
+        """
+        ndim = 1 + len(modifier_axes)
+        context_dict = context.snapshot()
+
+        components: List[Tuple[int, CompiledModifierSets]] = [
+            (axis + 1, compile_modifier_sets(sets, context_dict)) for axis, sets in enumerate(modifier_axes)
+        ]
+        constant = list(shared_modifiers) + self.calculator.get_boon_modifiers(context)
+        components.append((-1, compile_modifier_sets([constant], context_dict)))
+
+        def place(values: np.ndarray, axis: int) -> np.ndarray:
+            if axis < 0:
+                return values.reshape(())
+            shape = [1] * ndim
+            shape[axis] = values.shape[0]
+            return values.reshape(shape)
+
+        def combine_sum(attr_getter) -> np.ndarray | float:
+            total: np.ndarray | float = 0.0
+            for axis, comp in components:
+                values = attr_getter(comp)
+                if values is not None:
+                    total = total + place(values, axis)
+            return total
+
+        # Base stats with boon stats (Might, ...) along axis 0
+        boosted = [apply_boon_stats(stats, context.player_boons) for stats in base_stats]
+        base_shape = [1] * ndim
+        base_shape[0] = len(boosted)
+        stats: Dict[str, np.ndarray] = {}
+        for attr in ATTRIBUTE_NAMES:
+            column = np.array([float(s.get(attr, 0)) for s in boosted]).reshape(base_shape)
+            flat_bonus = combine_sum(lambda c, a=attr: c.flat_stats.get(a))
+            stats[attr] = column + np.trunc(flat_bonus)
+            if any(attr in comp.percent_stats for _, comp in components):
+                percent_bonus = combine_sum(lambda c, a=attr: c.percent_stats.get(a))
+                stats[attr] = np.trunc(stats[attr] * (1.0 + percent_bonus))
+
+        grid_shape = np.broadcast_shapes(
+            *(np.shape(v) for v in stats.values()),
+            *(place(comp.crit_chance, axis).shape for axis, comp in components),
+        )
+        stats = {attr: np.broadcast_to(v, grid_shape) for attr, v in stats.items()}
+
+        derived = AttributeCalculator.calculate_all_derived_stats_batch(
+            stats,
+            might_stacks=context.player_boons.get("Might", 0),
+            fury_active=context.has_boon("Fury"),
+            additional_crit_chance=combine_sum(lambda c: c.crit_chance),
+        )
+
+        additive_keys = {key for _, comp in components for key in comp.additive}
+        multipliers: Dict[str, np.ndarray] = {}
+        for category in _MULTIPLIER_TYPES:
+            mult: np.ndarray | float = 1.0
+            for axis, comp in components:
+                mult = mult * place(comp.factors[category], axis)
+            for key in sorted(k for k in additive_keys if k[0] == category):
+                mult = mult * (1.0 + combine_sum(lambda c, k=key: c.additive.get(k)))
+            multipliers[category] = np.broadcast_to(mult, grid_shape)
+
+        derived["damage_multiplier"] = multipliers["damage"]
+        derived["strike_multiplier"] = multipliers["strike"]
+        derived["condition_multiplier"] = multipliers["condition"]
+        derived["incoming_damage_multiplier"] = multipliers["incoming"]
+
+        total_damage = self._evaluate_skills(derived, skills, context, weapon_strength)
+        return BatchEvaluation(total_damage=total_damage, stats=derived)
+
+    @staticmethod
+    def _evaluate_skills(
+        effective_stats: Dict[str, np.ndarray],
+        skills: Sequence[Dict[str, Any]],
+        context: CombatContext,
+        weapon_strength: int,
+    ) -> np.ndarray:
+        """Array-shaped equivalent of summing calculate_skill_damage over skills."""
+        power = np.trunc(effective_stats["effective_power"])
+        condition_damage = np.trunc(effective_stats["effective_condition_damage"])
+        # The scalar path skips falsy multipliers, i.e. treats an exact 0 as 1
+        damage_mults = [
+            np.where(effective_stats["damage_multiplier"] != 0, effective_stats["damage_multiplier"], 1.0),
+            np.where(effective_stats["strike_multiplier"] != 0, effective_stats["strike_multiplier"], 1.0),
+        ]
+        vuln_stacks = context.target_conditions.get("Vulnerability", 0)
+        has_resolution = context.target_has_boon("Resolution")
+
+        total = np.zeros(power.shape)
+        for skill in skills:
+            strike = calculate_average_damage_batch(
+                power=power,
+                weapon_strength=weapon_strength,
+                skill_coefficient=skill.get("damage_coefficient", 0),
+                crit_chance=effective_stats["crit_chance"],
+                crit_damage_mult=effective_stats["crit_damage_multiplier"],
+                target_armor=context.target_armor,
+                vulnerability_stacks=vuln_stacks,
+                damage_multipliers=damage_mults,
+            )
+            total = total + strike["average_damage"]
+
+            if skill.get("conditions"):
+                # Derived stats carry no raw Expertise, as in calculate_skill_damage
+                total = total + calculate_all_condition_damage_batch(
+                    conditions=skill["conditions"],
+                    condition_damage_stat=condition_damage,
+                    condition_duration_bonus=effective_stats["condition_duration_bonus"],
+                    expertise=0,
+                    target_has_resolution=has_resolution,
+                )
+
+        return total
@@ -17,25 +17,20 @@ class BuildCalculator:
         self.attr_calc = AttributeCalculator()
         self.stacker = ModifierStacker()
 
-    def calculate_effective_stats(
-        self,
-        base_stats: Dict[str, int],
-        modifiers: List[Modifier],
-        context: CombatContext,
-    ) -> Dict[str, float]:
+    def get_boon_modifiers(self, context: CombatContext) -> List[Modifier]:
         """
-        Calculate effective stats with all modifiers applied.
+        Convert the context's boons into explicit modifiers (Quickness, Protection, ...).
+
+        Might and Fury are deliberately skipped to avoid double-counting, since
+        their effects are already modeled via boon stats and derived stats.
+        Modifiers are scaled by the boon's uptime.
 
         Args:
-            base_stats: Base stats from gear
-            modifiers: All active modifiers (traits, runes, sigils, food)
             context: Combat context with boons
 
         Returns:
-            Dictionary with effective stats
+            List of boon modifiers
         """
-        # Apply boon stat bonuses first (handles Might, etc.)
-        stats_with_boons = apply_boon_stats(base_stats, context.player_boons)
 
         def _scale_modifiers_for_uptime(mods: List[Modifier], uptime: float) -> List[Modifier]:
             if uptime >= 0.999:
@@ -63,9 +58,6 @@ class BuildCalculator:
                 )
             return scaled
 
-        # Convert selected boons into explicit modifiers (Quickness, Protection, ...).
-        # We deliberately skip Might and Fury here to avoid double-counting, since
-        # their effects are already modeled via stats_with_boons and derived stats.
         boon_mods: List[Modifier] = []
         for boon_name, stacks in context.player_boons.items():
             if boon_name in {"Might", "Fury"}:
@@ -82,10 +74,33 @@ class BuildCalculator:
                 boon_mods.extend(_scale_modifiers_for_uptime(list(raw_mods), uptime))
             else:
                 boon_mods.extend(_scale_modifiers_for_uptime([mod_def], uptime))
+        return boon_mods
+
+    def calculate_effective_stats(
+        self,
+        base_stats: Dict[str, int],
+        modifiers: List[Modifier],
+        context: CombatContext,
+    ) -> Dict[str, float]:
+        """
+        Calculate effective stats with all modifiers applied.
+
+        Args:
+            base_stats: Base stats from gear
+            modifiers: All active modifiers (traits, runes, sigils, food)
+            context: Combat context with boons
+
+        Returns:
+            Dictionary with effective stats
+        """
+        # Apply boon stat bonuses first (handles Might, etc.)
+        stats_with_boons = apply_boon_stats(base_stats, context.player_boons)
+
+        boon_mods = self.get_boon_modifiers(context)
 
         # Stack all modifiers (gear + boons)
         all_mods = list(modifiers) + boon_mods
-        mod_summary = self.stacker.stack_all_modifiers(all_mods, context.to_dict())
+        mod_summary = self.stacker.stack_all_modifiers(all_mods, context.snapshot())
 
         # Apply flat stat bonuses
         for stat, bonus in mod_summary["stat_bonuses"].items():
@@ -1,5 +1,6 @@
+import heapq
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from ..combat.context import CombatContext
 from ..core.healing import calculate_healing
@@ -49,7 +50,7 @@ class RotationSimulator:
             )
 
         # Calculer les multiplicateurs de soin sortant/entrant à partir des modifiers.
-        context_dict = context.to_dict()
+        context_dict = context.snapshot()
         outgoing_heal_bonus = 0.0
         incoming_heal_bonus = 0.0
         for m in modifiers:
@@ -61,31 +62,11 @@ class RotationSimulator:
         outgoing_heal_mult = 1.0 + max(0.0, outgoing_heal_bonus)
         incoming_heal_mult = 1.0 + max(0.0, incoming_heal_bonus)
 
-        num_skills = len(skills)
-        next_available: List[float] = [0.0 for _ in range(num_skills)]
-        total_damage = 0.0
-        total_heal = 0.0
-        per_skill: Dict[str, Dict[str, float]] = {}
-
-        current_time = 0.0
-
-        while current_time < duration:
-            available_indices = [i for i in range(num_skills) if next_available[i] <= current_time]
-            if not available_indices:
-                next_time = min(next_available)
-                if next_time <= current_time:
-                    break
-                if next_time >= duration:
-                    break
-                current_time = next_time
-                continue
-
-            best_index = min(
-                available_indices,
-                key=lambda idx: (skills[idx].priority, idx),
-            )
-            skill = skills[best_index]
-
+        # Dégâts et soins d'un cast ne dépendent que du skill (stats et contexte
+        # sont figés pendant le combat): on les calcule une fois par skill.
+        cast_damage: List[float] = []
+        cast_heal: List[float] = []
+        for skill in skills:
             skill_data: Dict[str, Any] = {
                 "name": skill.name,
                 "damage_coefficient": skill.damage_coefficient,
@@ -99,17 +80,10 @@ class RotationSimulator:
                 context=context,
                 weapon_strength=weapon_strength,
             )
-            dmg = float(result.get("total_damage", 0.0))
-            total_damage += dmg
-
-            entry = per_skill.setdefault(
-                skill.name,
-                {"casts": 0.0, "total_damage": 0.0, "total_heal": 0.0},
-            )
-            entry["casts"] += 1.0
-            entry["total_damage"] += dmg
+            cast_damage.append(float(result.get("total_damage", 0.0)))
 
             # Calcul de soin approximatif pour les skills disposant d'un coefficient de heal.
+            heal_amount_f = 0.0
             if skill.heal_coefficient > 0.0 or skill.base_heal > 0.0:
                 heal_amount = calculate_healing(
                     base_heal=float(skill.base_heal),
@@ -119,13 +93,27 @@ class RotationSimulator:
                     incoming_healing_mult=incoming_heal_mult,
                 )
                 heal_amount_f = float(heal_amount)
-                total_heal += heal_amount_f
-                entry["total_heal"] += heal_amount_f
+            cast_heal.append(heal_amount_f)
 
-            cast_time = skill.cast_time if skill.cast_time > 0 else 0.1
-            cooldown = skill.cooldown if skill.cooldown >= 0 else 0.0
-            next_available[best_index] = current_time + cooldown
-            current_time += cast_time
+        casts = self._schedule_casts(skills, duration)
+
+        total_damage = 0.0
+        total_heal = 0.0
+        per_skill: Dict[str, Dict[str, float]] = {}
+        for idx, skill in enumerate(skills):
+            if casts[idx] == 0:
+                continue
+            entry = per_skill.setdefault(
+                skill.name,
+                {"casts": 0.0, "total_damage": 0.0, "total_heal": 0.0},
+            )
+            dmg = cast_damage[idx] * casts[idx]
+            heal = cast_heal[idx] * casts[idx]
+            entry["casts"] += float(casts[idx])
+            entry["total_damage"] += dmg
+            entry["total_heal"] += heal
+            total_damage += dmg
+            total_heal += heal
 
         eff_duration = duration if duration > 0 else 1.0
         dps = total_damage / eff_duration
@@ -140,6 +128,44 @@ class RotationSimulator:
             "per_skill": per_skill,
         }
 
+    @staticmethod
+    def _schedule_casts(skills: List[RotationSkill], duration: float) -> List[int]:
+        """Nombre de lancers de chaque skill sur la durée du combat.
+
+        Simulation à événements: un tas des skills prêts (priorité, index) et
+        un tas des recharges (instant de disponibilité, index). Le temps saute
+        directement d'une fin de cast ou d'une fin de recharge à la suivante,
+        donc le coût dépend du nombre de lancers et pas d'un pas de temps fixe.
+        """
+        casts = [0 for _ in skills]
+        ready: List[Tuple[int, int]] = [(skill.priority, idx) for idx, skill in enumerate(skills)]
+        heapq.heapify(ready)
+        cooling: List[Tuple[float, int]] = []
+
+        current_time = 0.0
+        while current_time < duration:
+            while cooling and cooling[0][0] <= current_time:
+                _, idx = heapq.heappop(cooling)
+                heapq.heappush(ready, (skills[idx].priority, idx))
+
+            if not ready:
+                next_time = cooling[0][0]
+                if next_time >= duration:
+                    break
+                current_time = next_time
+                continue
+
+            _, idx = heapq.heappop(ready)
+            skill = skills[idx]
+            casts[idx] += 1
+
+            cast_time = skill.cast_time if skill.cast_time > 0 else 0.1
+            cooldown = skill.cooldown if skill.cooldown >= 0 else 0.0
+            heapq.heappush(cooling, (current_time + cooldown, idx))
+            current_time += cast_time
+
+        return casts
+
 
 def get_firebrand_support_wvw_rotation() -> List[Dict[str, Any]]:
     """Rotation canonique simplifiée pour Firebrand support WvW (zerg).
@@ -5,12 +5,15 @@ This module centralizes error handling to provide consistent,
 structured error responses across the API.
 """
 
+import math
+
 from fastapi import FastAPI, Request, status
 from fastapi.responses import JSONResponse
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from fastapi.exceptions import RequestValidationError
 from redis.exceptions import ConnectionError
 from app.core.logging import logger
+from app.services.ai.llm_scheduler import LLMRejectedError
 
 
 class BusinessException(Exception):
@@ -84,6 +87,24 @@ def add_exception_handlers(app: FastAPI) -> None:
             content={"error_code": exc.error_code, "detail": exc.detail, "correlation_id": correlation_id},
         )
 
+    @app.exception_handler(LLMRejectedError)
+    async def llm_rejected_exception_handler(request: Request, exc: LLMRejectedError) -> JSONResponse:
+        correlation_id = getattr(request.state, "correlation_id", "N/A")
+        retry_after = max(1, math.ceil(exc.retry_after))
+        logger.warning(
+            f"LLM request rejected ({exc.reason}) for {request.method} {request.url}, "
+            f"retry after {retry_after}s [ID: {correlation_id}]"
+        )
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={
+                "error_code": "LLM_OVERLOADED",
+                "detail": "The AI model is busy. Please retry later.",
+                "correlation_id": correlation_id,
+            },
+            headers={"Retry-After": str(retry_after)},
+        )
+
     @app.exception_handler(RequestValidationError)
     async def validation_exception_handler(request: Request, exc: RequestValidationError) -> JSONResponse:
         correlation_id = getattr(request.state, "correlation_id", "N/A")
@@ -89,6 +89,17 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         logger.error(f"❌ Redis connection failed: {str(e)}")
         # Depending on requirements, you might want to raise here
 
+    # Load GW2 static data once, before the first request needs it
+    if settings.GW2_DATA_WARMUP:
+        try:
+            import asyncio
+
+            from app.services.gw2_data_store import warmup_gw2_data_store
+
+            await asyncio.to_thread(warmup_gw2_data_store)
+        except Exception as e:
+            logger.warning(f"⚠️ GW2 data warmup failed: {str(e)}")
+
     # Start background tasks
     try:
         from app.services.scheduler import scheduler
@@ -125,6 +136,21 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     except Exception as e:
         logger.error(f"❌ Error shutting down scheduler: {str(e)}")
 
+    # Close pooled GW2 API connections
+    from app.services.gw2_api_client import close_gw2_api_client
+
+    await close_gw2_api_client()
+
+    # Close pooled Ollama connections
+    from app.services.ai.ollama_service import close_ollama_service
+
+    await close_ollama_service()
+
+    # Stop CPU worker processes
+    from app.core.process_pool import shutdown_cpu_pool
+
+    shutdown_cpu_pool()
+
     # Close Redis connection
     redis_client = await get_redis_client()
     if settings.REDIS_ENABLED and redis_client:
@@ -9,7 +9,7 @@ from urllib.parse import urlparse, urlunparse
 from app.core.logging import logger
 from app.core.circuit_breaker import circuit_breaker, CircuitBreakerError, chat_service_circuit_breaker, CircuitBreaker
 from app.models.chat import ChatRequest, ChatResponse, BuildSuggestion
-from app.services.ai.ollama_service import OllamaService
+from app.services.ai.ollama_service import OllamaService, get_ollama_service
 
 # Constants
 MAX_MESSAGE_LENGTH = 2000
@@ -33,7 +33,7 @@ class ChatService:
         Sets up the Ollama service and defines the system prompt that guides
         the AI's behavior and expertise.
         """
-        self.ollama = client or OllamaService()
+        self.ollama = client or get_ollama_service()
         selected_breaker = breaker or chat_service_circuit_breaker
         # Maintain backward compatibility with tests expecting either attribute name
         self.breaker = selected_breaker
@@ -0,0 +1,169 @@
+"""
+Cache persistant des réponses structurées du LLM (generate_structured).
+
+Les réponses JSON sont adressées par leur contenu: sha256 du modèle, du
+prompt et du prompt système normalisés (espaces compactés), du schéma, de la
+température et du nombre max de tokens. Un fichier par réponse:
+
+    <cache_dir>/<sha256[:2]>/<sha256>.json
+
+Seuls les appels déterministes (température 0) sont mis en cache: à
+température non nulle la réponse attendue varie d'un appel à l'autre. Les
+entrées expirent après ``ttl_seconds`` et le nombre d'entrées est borné par
+``max_entries`` (les moins récemment utilisées sont supprimées d'abord).
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+import shutil
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import aiofiles
+
+from app.core.logging import logger
+from app.core.metrics import track_ai_cache_lookup
+
+
+# À incrémenter si le format des clés ou des entrées change
+CACHE_FORMAT_VERSION = 1
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_prompt(text: Optional[str]) -> str:
+    """Prompt sans différences d'espacement (indentation, retours à la ligne, espaces de fin)."""
+    return _WHITESPACE.sub(" ", text or "").strip()
+
+
+class LLMResponseCache:
+    """Cache disque des réponses structurées, borné en âge et en nombre d'entrées."""
+
+    def __init__(self, cache_dir: Path, ttl_seconds: float = 7 * 24 * 3600, max_entries: int = 5000):
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self.stats: Dict[str, int] = {"hit": 0, "miss": 0, "bypass": 0}
+        # digest -> dernier accès, du plus ancien au plus récent (chargé au premier accès)
+        self._index: Optional["OrderedDict[str, float]"] = None
+        self._index_lock = asyncio.Lock()
+
+    @staticmethod
+    def key(
+        model: str,
+        prompt: str,
+        system_prompt: Optional[str],
+        schema: Optional[Dict[str, Any]],
+        temperature: float,
+        max_tokens: int,
+    ) -> str:
+        """Clé de contenu d'un appel generate_structured."""
+        material = json.dumps(
+            [
+                CACHE_FORMAT_VERSION,
+                model,
+                normalize_prompt(system_prompt),
+                normalize_prompt(prompt),
+                schema,
+                float(temperature),
+                max_tokens,
+            ],
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def cacheable(temperature: float) -> bool:
+        return temperature == 0
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _scan(self) -> "OrderedDict[str, float]":
+        entries = []
+        if self.cache_dir.exists():
+            for path in self.cache_dir.glob("*/*.json"):
+                try:
+                    entries.append((path.stat().st_mtime, path.stem))
+                except OSError:
+                    continue
+        entries.sort()
+        return OrderedDict((key, mtime) for mtime, key in entries)
+
+    async def _get_index(self) -> "OrderedDict[str, float]":
+        if self._index is None:
+            async with self._index_lock:
+                if self._index is None:
+                    self._index = await asyncio.to_thread(self._scan)
+        return self._index
+
+    def _discard(self, key: str) -> None:
+        if self._index is not None:
+            self._index.pop(key, None)
+        self._path(key).unlink(missing_ok=True)
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Réponse en cache, ou None si absente, expirée ou illisible."""
+        index = await self._get_index()
+        if key not in index:
+            return None
+        path = self._path(key)
+        try:
+            async with aiofiles.open(path, "r", encoding="utf-8") as f:
+                entry = json.loads(await f.read())
+        except FileNotFoundError:
+            index.pop(key, None)
+            return None
+        except Exception as e:
+            logger.warning(f"LLM response cache: ignoring unreadable entry {path.name}: {e}")
+            self._discard(key)
+            return None
+
+        if time.time() - entry.get("stored_at", 0.0) >= self.ttl_seconds:
+            self._discard(key)
+            return None
+        index[key] = time.time()
+        index.move_to_end(key)
+        return entry.get("response")
+
+    async def set(self, key: str, model: str, response: Any) -> None:
+        path = self._path(key)
+        entry = {"model": model, "stored_at": time.time(), "response": response}
+        # Écriture puis renommage: un lecteur concurrent ne voit jamais un fichier partiel
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            async with aiofiles.open(tmp_path, "w", encoding="utf-8") as f:
+                await f.write(json.dumps(entry, ensure_ascii=False))
+            tmp_path.replace(path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"LLM response cache: cannot write {path.name}: {e}")
+            return
+
+        index = await self._get_index()
+        index[key] = entry["stored_at"]
+        index.move_to_end(key)
+        while len(index) > self.max_entries:
+            oldest, _ = index.popitem(last=False)
+            self._path(oldest).unlink(missing_ok=True)
+
+    def record(self, result: str, model: str) -> None:
+        """Compte un accès: hit, miss ou bypass (température non nulle)."""
+        self.stats[result] += 1
+        track_ai_cache_lookup(model, result)
+
+    def clear(self) -> None:
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        self._index = None
+
+    def get_stats(self) -> Dict[str, object]:
+        return {
+            **self.stats,
+            "entries": len(self._index) if self._index is not None else None,
+            "cache_dir": str(self.cache_dir),
+        }
@@ -0,0 +1,291 @@
+"""
+Ordonnanceur des appels au LLM local.
+
+Toutes les générations d'OllamaService passent par ``LLMScheduler.acquire``.
+Chaque requête appartient à une classe de priorité:
+
+- ``interactive`` (défaut): /command, chat, analyse de build;
+- ``background``: évaluation du pipeline d'apprentissage, synchronisation méta.
+
+La classe est portée par le contexte d'exécution (``llm_priority``), si bien
+que les agents n'ont rien à transmettre: un job de fond entoure simplement son
+travail de ``with llm_priority(LLMPriority.BACKGROUND):``.
+
+Règles d'admission:
+
+- au plus ``max_concurrency`` générations en cours sur le modèle, et au plus
+  la limite de sa classe pour chaque classe;
+- une place libérée va d'abord aux requêtes interactives en attente;
+- chaque classe a une file bornée (rejet ``queue_full`` au-delà);
+- une requête dont l'attente estimée (durée moyenne d'une génération x
+  requêtes devant elle) dépasse son délai max est rejetée tout de suite, et
+  une requête encore en file à son échéance est rejetée (``deadline``);
+- quand le circuit breaker du modèle est ouvert, les requêtes échouent
+  immédiatement (``circuit_open``) au lieu de s'accumuler.
+"""
+
+import asyncio
+import contextvars
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from enum import Enum
+from typing import AsyncIterator, Deque, Dict, Iterator, Optional, Tuple
+
+import httpx
+
+from app.core.circuit_breaker import CircuitBreaker, CircuitBreakerError
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.metrics import track_llm_queue, track_llm_rejection, track_llm_wait
+
+
+class LLMPriority(str, Enum):
+    """Classes de priorité des appels au LLM."""
+
+    INTERACTIVE = "interactive"
+    BACKGROUND = "background"
+
+
+class LLMRejectedError(Exception):
+    """Requête refusée par l'ordonnanceur (file pleine ou échéance dépassée).
+
+    ``retry_after`` est l'attente estimée (secondes) au moment du refus.
+    """
+
+    def __init__(self, priority: LLMPriority, reason: str, message: str, retry_after: float = 0.0) -> None:
+        self.priority = priority
+        self.reason = reason
+        self.retry_after = retry_after
+        super().__init__(message)
+
+
+# (classe, attente max en secondes ou None pour la valeur de la classe)
+_request_class: contextvars.ContextVar[Tuple[LLMPriority, Optional[float]]] = contextvars.ContextVar(
+    "llm_request_class", default=(LLMPriority.INTERACTIVE, None)
+)
+
+
+@contextmanager
+def llm_priority(priority: LLMPriority, max_wait: Optional[float] = None) -> Iterator[None]:
+    """Classe de priorité (et attente max) des appels LLM faits dans ce bloc."""
+    token = _request_class.set((priority, max_wait))
+    try:
+        yield
+    finally:
+        _request_class.reset(token)
+
+
+def current_request_class() -> Tuple[LLMPriority, Optional[float]]:
+    """(classe, attente max) des appels LLM faits dans le contexte courant."""
+    return _request_class.get()
+
+
+def _is_model_failure(exc: BaseException) -> bool:
+    """Erreurs qui comptent pour le circuit breaker (hôte du modèle en panne ou surchargé)."""
+    if isinstance(exc, (asyncio.CancelledError, GeneratorExit)):
+        return False
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500
+    return True
+
+
+class LLMScheduler:
+    """Admission des appels LLM par classe de priorité, avec files bornées et échéances."""
+
+    # Poids de la dernière mesure dans la durée moyenne d'une génération
+    SERVICE_TIME_SMOOTHING = 0.2
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        limits: Optional[Dict[LLMPriority, int]] = None,
+        queue_sizes: Optional[Dict[LLMPriority, int]] = None,
+        max_waits: Optional[Dict[LLMPriority, float]] = None,
+        breaker: Optional[CircuitBreaker] = None,
+    ) -> None:
+        """
+        Args:
+            max_concurrency: Générations simultanées sur le modèle (défaut: settings)
+            limits: Générations simultanées max par classe (défaut: settings)
+            queue_sizes: Taille max de la file de chaque classe (défaut: settings)
+            max_waits: Attente max en file par classe, en secondes (défaut: settings)
+            breaker: Circuit breaker du modèle (défaut: seuils des settings)
+        """
+        self.max_concurrency = max(1, max_concurrency or settings.LLM_MAX_CONCURRENCY)
+        self.limits = {
+            LLMPriority.INTERACTIVE: settings.LLM_INTERACTIVE_CONCURRENCY,
+            LLMPriority.BACKGROUND: settings.LLM_BACKGROUND_CONCURRENCY,
+            **(limits or {}),
+        }
+        self.queue_sizes = {
+            LLMPriority.INTERACTIVE: settings.LLM_INTERACTIVE_QUEUE_SIZE,
+            LLMPriority.BACKGROUND: settings.LLM_BACKGROUND_QUEUE_SIZE,
+            **(queue_sizes or {}),
+        }
+        self.max_waits = {
+            LLMPriority.INTERACTIVE: settings.LLM_INTERACTIVE_MAX_WAIT,
+            LLMPriority.BACKGROUND: settings.LLM_BACKGROUND_MAX_WAIT,
+            **(max_waits or {}),
+        }
+        self.breaker = breaker or CircuitBreaker(
+            failure_threshold=settings.LLM_BREAKER_FAILURES,
+            recovery_timeout=settings.LLM_BREAKER_RECOVERY,
+            max_retries=0,
+        )
+        self._queues: Dict[LLMPriority, Deque["asyncio.Future[None]"]] = {p: deque() for p in LLMPriority}
+        self._running: Dict[LLMPriority, int] = {p: 0 for p in LLMPriority}
+        self.service_time: Optional[float] = None
+        self.stats: Dict[str, int] = {"admitted": 0, "queue_full": 0, "deadline": 0, "circuit_open": 0}
+
+    @property
+    def running(self) -> int:
+        return sum(self._running.values())
+
+    def queued(self, priority: LLMPriority) -> int:
+        return sum(1 for waiter in self._queues[priority] if not waiter.done())
+
+    def _can_start(self, priority: LLMPriority) -> bool:
+        if self.running >= self.max_concurrency or self._running[priority] >= self.limits[priority]:
+            return False
+        if priority is LLMPriority.BACKGROUND:
+            # Une place libre revient d'abord à une requête interactive admissible
+            return not (
+                self.queued(LLMPriority.INTERACTIVE)
+                and self._running[LLMPriority.INTERACTIVE] < self.limits[LLMPriority.INTERACTIVE]
+            )
+        return True
+
+    def estimated_wait(self, priority: LLMPriority) -> float:
+        """Attente estimée d'une nouvelle requête de cette classe (0 sans mesure ou si une place est libre)."""
+        if self.service_time is None or (not self.queued(priority) and self._can_start(priority)):
+            return 0.0
+        ahead = self.queued(LLMPriority.INTERACTIVE)
+        if priority is LLMPriority.BACKGROUND:
+            ahead += self.queued(LLMPriority.BACKGROUND)
+        slots = max(1, min(self.max_concurrency, self.limits[priority]))
+        return (ahead // slots + 1) * self.service_time
+
+    def _publish(self, priority: LLMPriority) -> None:
+        track_llm_queue(priority.value, self.queued(priority), self._running[priority])
+
+    def _reject(self, priority: LLMPriority, reason: str, message: str) -> LLMRejectedError:
+        self.stats[reason] += 1
+        track_llm_rejection(priority.value, reason)
+        logger.warning(f"LLM request rejected ({priority.value}, {reason}): {message}")
+        return LLMRejectedError(priority, reason, message, retry_after=self.estimated_wait(priority))
+
+    def _start(self, priority: LLMPriority) -> None:
+        self._running[priority] += 1
+        self.stats["admitted"] += 1
+        self._publish(priority)
+
+    def _dispatch(self) -> None:
+        """Attribue les places libres aux requêtes en file, interactives d'abord."""
+        for priority in LLMPriority:
+            queue = self._queues[priority]
+            while queue and self._can_start(priority):
+                waiter = queue.popleft()
+                if waiter.done():  # abandonnée (échéance, annulation)
+                    continue
+                self._start(priority)
+                waiter.set_result(None)
+            self._publish(priority)
+
+    def _release(self, priority: LLMPriority) -> None:
+        self._running[priority] -= 1
+        self._dispatch()
+
+    async def _admit(self, priority: LLMPriority, max_wait: float) -> None:
+        queue = self._queues[priority]
+        if not self.queued(priority) and self._can_start(priority):
+            self._start(priority)
+            track_llm_wait(priority.value, 0.0)
+            return
+
+        if self.queued(priority) >= self.queue_sizes[priority]:
+            raise self._reject(priority, "queue_full", f"{self.queue_sizes[priority]} requests already queued")
+        estimate = self.estimated_wait(priority)
+        if estimate > max_wait:
+            raise self._reject(priority, "deadline", f"estimated wait {estimate:.1f}s exceeds {max_wait:.1f}s")
+
+        waiter: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        queue.append(waiter)
+        self._publish(priority)
+        enqueued_at = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=max_wait)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+            if waiter.done() and not waiter.cancelled():
+                # Place attribuée au moment de l'abandon: la rendre
+                self._release(priority)
+            else:
+                waiter.cancel()
+                self._publish(priority)
+            if isinstance(exc, asyncio.TimeoutError):
+                raise self._reject(priority, "deadline", f"not admitted within {max_wait:.1f}s") from None
+            raise
+        track_llm_wait(priority.value, time.perf_counter() - enqueued_at)
+
+    @asynccontextmanager
+    async def acquire(
+        self,
+        priority: Optional[LLMPriority] = None,
+        max_wait: Optional[float] = None,
+    ) -> AsyncIterator[None]:
+        """Réserve une place sur le modèle pour la durée du bloc.
+
+        Sans argument, la classe et l'attente max viennent de ``llm_priority``.
+
+        Raises:
+            LLMRejectedError: File pleine ou échéance dépassée
+            CircuitBreakerError: Circuit du modèle ouvert
+        """
+        context_priority, context_wait = _request_class.get()
+        priority = priority or context_priority
+        if max_wait is None:
+            max_wait = context_wait if context_wait is not None else self.max_waits[priority]
+
+        if self.breaker.state == "OPEN":
+            self.stats["circuit_open"] += 1
+            track_llm_rejection(priority.value, "circuit_open")
+            raise CircuitBreakerError(self.breaker, "LLM circuit breaker is open")
+
+        await self._admit(priority, max_wait)
+        started = time.perf_counter()
+        try:
+            yield
+        except BaseException as exc:
+            if _is_model_failure(exc):
+                self.breaker.record_failure()
+            raise
+        else:
+            self.breaker.record_success()
+            elapsed = time.perf_counter() - started
+            if self.service_time is None:
+                self.service_time = elapsed
+            else:
+                self.service_time += self.SERVICE_TIME_SMOOTHING * (elapsed - self.service_time)
+        finally:
+            self._release(priority)
+
+    def get_stats(self) -> Dict[str, object]:
+        return {
+            **self.stats,
+            "running": {p.value: n for p, n in self._running.items()},
+            "queued": {p.value: self.queued(p) for p in LLMPriority},
+            "service_time": self.service_time,
+            "circuit": self.breaker.state,
+        }
+
+
+# Ordonnanceur partagé par le processus (un seul modèle local)
+_llm_scheduler: Optional[LLMScheduler] = None
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """Get or create the shared LLMScheduler."""
+    global _llm_scheduler
+    if _llm_scheduler is None:
+        _llm_scheduler = LLMScheduler()
+    return _llm_scheduler
@@ -1,36 +1,218 @@
-"""Ollama service for AI interactions."""
+"""Ollama service for AI interactions.
 
+Toutes les requêtes passent par un client httpx poolé (une instance par boucle
+asyncio) et lisent les réponses en streaming NDJSON: le timeout porte sur
+l'inactivité entre deux tokens, pas sur la durée totale de la génération.
+Les appels identiques concurrents (même modèle, messages et options) partagent
+une seule génération en cours (single-flight). Chaque génération passe par
+l'ordonnanceur LLM (priorités, files bornées, circuit breaker).
+"""
+
+import hashlib
 import json
 import re
 import time
-from typing import Any, Dict, List, Optional
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
 
 import asyncio
 import httpx
 
 from app.core.config import settings
 from app.core.logging import logger
+from app.core.metrics import track_ai_coalesced, track_ai_request
+from app.services.ai.llm_response_cache import LLMResponseCache
+from app.services.ai.llm_scheduler import LLMScheduler, current_request_class, get_llm_scheduler
+
+
+class _InFlight:
+    """Génération partagée et nombre d'appelants qui l'attendent."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Task[str]") -> None:
+        self.task = task
+        self.waiters = 0
 
 
 class OllamaService:
     """Service for interacting with Ollama AI."""
 
-    def __init__(self) -> None:
-        """Initialize Ollama service."""
-        self.host = settings.OLLAMA_HOST
-        self.model = settings.OLLAMA_MODEL
-        self.timeout = 300.0  # Augmenté à 5 minutes
+    def __init__(
+        self,
+        host: Optional[str] = None,
+        model: Optional[str] = None,
+        timeout: Optional[float] = None,
+        max_connections: Optional[int] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        response_cache: Optional[LLMResponseCache] = None,
+        scheduler: Optional[LLMScheduler] = None,
+    ) -> None:
+        """Initialize Ollama service.
+
+        Args:
+            host: URL d'Ollama (défaut: settings.OLLAMA_HOST)
+            model: Modèle utilisé (défaut: settings.OLLAMA_MODEL)
+            timeout: Inactivité max en secondes (défaut: settings.OLLAMA_TIMEOUT)
+            max_connections: Taille du pool (défaut: settings.OLLAMA_MAX_CONNECTIONS)
+            transport: Transport httpx personnalisé (tests)
+            response_cache: Cache de generate_structured (défaut: settings, None si désactivé)
+            scheduler: Ordonnanceur des générations (défaut: ordonnanceur partagé)
+        """
+        self.host = (host or settings.OLLAMA_HOST).rstrip("/")
+        self.model = model or settings.OLLAMA_MODEL
+        self.timeout = timeout or settings.OLLAMA_TIMEOUT
+        connections = max(1, max_connections or settings.OLLAMA_MAX_CONNECTIONS)
+        self.limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+        self._transport = transport
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._inflight: Dict[str, _InFlight] = {}
+        if response_cache is None and settings.LLM_CACHE_ENABLED:
+            response_cache = LLMResponseCache(
+                settings.LLM_CACHE_DIR, settings.LLM_CACHE_TTL, settings.LLM_CACHE_MAX_ENTRIES
+            )
+        self.response_cache = response_cache
+        self.scheduler = scheduler or get_llm_scheduler()
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Client HTTP poolé, recréé si l'instance change de boucle asyncio."""
+        loop = asyncio.get_running_loop()
+        if self._http_client is None or self._http_client.is_closed or self._http_client_loop is not loop:
+            self._http_client = httpx.AsyncClient(
+                base_url=self.host,
+                timeout=httpx.Timeout(self.timeout, connect=10.0),
+                limits=self.limits,
+                transport=self._transport,
+            )
+            self._http_client_loop = loop
+        return self._http_client
+
+    async def aclose(self) -> None:
+        """Ferme le pool de connexions."""
+        client, self._http_client = self._http_client, None
+        if client is not None and not client.is_closed:
+            await client.aclose()
 
     async def check_health(self) -> bool:
         """Check if Ollama service is available."""
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{self.host}/api/tags")
-                return response.status_code == 200
+            response = await self._get_http_client().get("/api/tags", timeout=5.0)
+            return response.status_code == 200
         except Exception as e:
             logger.error(f"Ollama health check failed: {e}")
             return False
 
+    @staticmethod
+    def _messages(prompt: str, system_prompt: Optional[str]) -> List[Dict[str, str]]:
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        return messages
+
+    async def _stream(
+        self,
+        path: str,
+        payload: Dict[str, Any],
+        final: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[str]:
+        """Poste ``payload`` en streaming et produit les tokens au fil de l'eau.
+
+        Ollama renvoie une ligne JSON par token; la dernière (``done: true``)
+        porte les compteurs de tokens, recopiés dans ``final`` si fourni.
+
+        La génération occupe une place de l'ordonnanceur LLM (classe de
+        priorité du contexte courant) jusqu'à la fin du flux: un appelant qui
+        s'arrête avant doit fermer le générateur (``contextlib.aclosing``).
+
+        Raises:
+            httpx.HTTPStatusError: Statut HTTP d'erreur (404 inclus)
+            RuntimeError: Erreur signalée par Ollama en cours de génération
+            LLMRejectedError: Requête refusée par l'ordonnanceur
+            CircuitBreakerError: Circuit du modèle ouvert
+        """
+        field = "message" if path == "/api/chat" else "response"
+        async with self.scheduler.acquire():
+            async with self._get_http_client().stream("POST", path, json={**payload, "stream": True}) as response:
+                if response.status_code >= 400:
+                    await response.aread()
+                    response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.strip():
+                        continue
+                    data = json.loads(line)
+                    if data.get("error"):
+                        raise RuntimeError(f"Ollama error: {data['error']}")
+                    chunk = data.get(field)
+                    token = chunk.get("content", "") if isinstance(chunk, dict) else chunk
+                    if token:
+                        yield token
+                    if data.get("done"):
+                        if final is not None:
+                            final.update(data)
+                        break
+
+    async def _complete(self, path: str, payload: Dict[str, Any], operation: str) -> str:
+        """Génération complète (tokens concaténés), avec métriques."""
+        final: Dict[str, Any] = {}
+        start = time.perf_counter()
+        status = "error"
+        try:
+            async with aclosing(self._stream(path, payload, final)) as stream:
+                text = "".join([token async for token in stream])
+            status = "success"
+            return text
+        except asyncio.CancelledError:
+            status = "cancelled"
+            raise
+        finally:
+            track_ai_request(
+                self.model,
+                operation,
+                time.perf_counter() - start,
+                status=status,
+                tokens_prompt=final.get("prompt_eval_count"),
+                tokens_completion=final.get("eval_count"),
+            )
+
+    async def _single_flight(self, key_parts: Any, factory: Callable[[], Awaitable[str]]) -> str:
+        """Partage une génération en cours entre appels identiques concurrents.
+
+        La génération n'est annulée que si tous ses appelants sont annulés.
+        La tâche partagée hérite de la classe de priorité du premier appelant:
+        la classe (et l'attente max) fait donc partie de la clé, pour qu'un
+        appel interactif ne rejoigne jamais une génération de fond en file.
+        """
+        priority, max_wait = current_request_class()
+        key = hashlib.sha256(
+            json.dumps(
+                [self.host, self.model, priority.value, max_wait, key_parts], sort_keys=True, ensure_ascii=False
+            ).encode("utf-8")
+        ).hexdigest()
+        loop = asyncio.get_running_loop()
+        entry = self._inflight.get(key)
+        if entry is None or entry.task.done() or entry.task.get_loop() is not loop:
+            entry = _InFlight(loop.create_task(factory()))
+            self._inflight[key] = entry
+            entry.task.add_done_callback(lambda _task, key=key, entry=entry: self._release(key, entry))
+        else:
+            track_ai_coalesced(self.model)
+
+        entry.waiters += 1
+        try:
+            return await asyncio.shield(entry.task)
+        except asyncio.CancelledError:
+            if entry.waiters == 1 and not entry.task.done():
+                entry.task.cancel()
+            raise
+        finally:
+            entry.waiters -= 1
+
+    def _release(self, key: str, entry: _InFlight) -> None:
+        if self._inflight.get(key) is entry:
+            del self._inflight[key]
+
     async def generate(
         self,
         prompt: str,
@@ -41,6 +223,8 @@ class OllamaService:
         """
         Generate text using Ollama.
 
+        Les appels concurrents identiques partagent la même génération.
+
         Args:
             prompt: User prompt
             system_prompt: System instructions
@@ -50,32 +234,26 @@ class OllamaService:
         Returns:
             Generated text
         """
-        messages = []
-
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-
-        messages.append({"role": "user", "content": prompt})
-
-        chat_payload = {
-            "model": self.model,
-            "messages": messages,
-            "stream": False,
-            "options": {
-                "temperature": temperature,
-                "num_predict": max_tokens,
-            },
-        }
+        messages = self._messages(prompt, system_prompt)
+        options = {"temperature": temperature, "num_predict": max_tokens}
+        return await self._single_flight(
+            ["generate", messages, options], lambda: self._generate(prompt, system_prompt, messages, options)
+        )
 
+    async def _generate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        messages: List[Dict[str, str]],
+        options: Dict[str, Any],
+    ) -> str:
         # Essayer d'abord l'endpoint /api/chat (Ollama récents)
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(f"{self.host}/api/chat", json=chat_payload)
-                response.raise_for_status()
-                data = response.json()
-                content = data.get("message", {}).get("content", "")
-                if content:
-                    return content
+            content = await self._complete(
+                "/api/chat", {"model": self.model, "messages": messages, "options": options}, "generate"
+            )
+            if content:
+                return content
         except httpx.HTTPStatusError as e:
             if e.response is not None and e.response.status_code == 404:
                 logger.warning("Ollama /api/chat returned 404, falling back to /api/generate")
@@ -93,25 +271,10 @@ class OllamaService:
 
         # Fallback: utiliser /api/generate (anciennes versions d'Ollama)
         try:
-            full_prompt = prompt
-            if system_prompt:
-                full_prompt = f"{system_prompt}\n\n{prompt}"
-
-            generate_payload = {
-                "model": self.model,
-                "prompt": full_prompt,
-                "stream": False,
-                "options": {
-                    "temperature": temperature,
-                    "num_predict": max_tokens,
-                },
-            }
-
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(f"{self.host}/api/generate", json=generate_payload)
-                response.raise_for_status()
-                data = response.json()
-                return data.get("response", "")
+            full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
+            return await self._complete(
+                "/api/generate", {"model": self.model, "prompt": full_prompt, "options": options}, "generate"
+            )
         except asyncio.CancelledError:
             logger.info("Ollama /api/generate call cancelled (shutdown in progress)")
             raise
@@ -119,6 +282,48 @@ class OllamaService:
             logger.error(f"Error generating with Ollama via /api/generate: {e}")
             raise
 
+    async def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+    ) -> AsyncIterator[str]:
+        """
+        Stream generated tokens as Ollama produces them.
+
+        Chaque appelant reçoit son propre flux (pas de single-flight). La place
+        de l'ordonnanceur est tenue jusqu'à la fin du flux: pour s'arrêter avant,
+        itérer dans ``contextlib.aclosing(service.generate_stream(...))``.
+
+        Args:
+            prompt: User prompt
+            system_prompt: System instructions
+            temperature: Creativity (0-1)
+            max_tokens: Max response length
+
+        Yields:
+            Generated text chunks
+        """
+        options = {"temperature": temperature, "num_predict": max_tokens}
+        payload = {"model": self.model, "messages": self._messages(prompt, system_prompt), "options": options}
+        try:
+            async with aclosing(self._stream("/api/chat", payload)) as stream:
+                async for token in stream:
+                    yield token
+            return
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code != 404:
+                logger.error(f"Ollama /api/chat error: {e}")
+                raise
+            logger.warning("Ollama /api/chat returned 404, falling back to /api/generate")
+
+        full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
+        legacy_payload = {"model": self.model, "prompt": full_prompt, "options": options}
+        async with aclosing(self._stream("/api/generate", legacy_payload)) as stream:
+            async for token in stream:
+                yield token
+
     def _clean_json_string(self, text: str) -> str:
         """Extract the first JSON object from a text blob, if possible.
 
@@ -146,18 +351,67 @@ class OllamaService:
         system_prompt: Optional[str] = None,
         schema: Optional[Dict[str, Any]] = None,
         max_tokens: int = 256,
+        temperature: float = 0.3,
     ) -> Dict[str, Any]:
         """
         Generate structured JSON response.
 
+        À température 0, les réponses sont servies par le cache persistant
+        (clé: modèle, prompts normalisés, schéma, température, max_tokens).
+
         Args:
             prompt: User prompt
             system_prompt: System instructions
             schema: Expected JSON schema
+            max_tokens: Max response length
+            temperature: Creativity (0 = deterministic and cacheable)
 
         Returns:
             Parsed JSON response
         """
+        result, _ = await self.generate_structured_cached(prompt, system_prompt, schema, max_tokens, temperature)
+        return result
+
+    async def generate_structured_cached(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        schema: Optional[Dict[str, Any]] = None,
+        max_tokens: int = 256,
+        temperature: float = 0.3,
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Same as generate_structured, also telling whether the response came from the cache.
+
+        Returns:
+            (parsed JSON response, True if served by the LLM response cache)
+        """
+        cache = self.response_cache
+        cache_key: Optional[str] = None
+        if cache is not None:
+            if cache.cacheable(temperature):
+                cache_key = cache.key(self.model, prompt, system_prompt, schema, temperature, max_tokens)
+                cached = await cache.get(cache_key)
+                if cached is not None:
+                    cache.record("hit", self.model)
+                    return cached, True
+                cache.record("miss", self.model)
+            else:
+                cache.record("bypass", self.model)
+
+        result = await self._generate_structured(prompt, system_prompt, schema, max_tokens, temperature)
+        if cache_key is not None:
+            await cache.set(cache_key, self.model, result)
+        return result, False
+
+    async def _generate_structured(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        schema: Optional[Dict[str, Any]],
+        max_tokens: int,
+        temperature: float,
+    ) -> Dict[str, Any]:
         full_system = system_prompt or ""
         if schema:
             full_system += f"\n\nRespond with valid JSON matching this schema:\n{json.dumps(schema, indent=2)}"
@@ -167,7 +421,7 @@ class OllamaService:
         raw_response = await self.generate(
             prompt=prompt,
             system_prompt=full_system,
-            temperature=0.3,  # Lower temperature for structured output
+            temperature=temperature,
             max_tokens=max_tokens,
         )
 
@@ -215,46 +469,53 @@ class OllamaService:
         Returns:
             Assistant response
         """
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "options": {
+                "temperature": temperature,
+            },
+        }
+
+        logger.info(f"Sending request to Ollama with model: {self.model}")
+        logger.debug(f"Request payload: {json.dumps(payload, indent=2)}")
+
+        start_time = time.time()
         try:
-            payload = {
-                "model": self.model,
-                "messages": messages,
-                "stream": False,
-                "options": {
-                    "temperature": temperature,
-                },
-            }
-
-            logger.info(f"Sending request to Ollama with model: {self.model}")
-            logger.debug(f"Request payload: {json.dumps(payload, indent=2)}")
-
-            start_time = time.time()
-
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                try:
-                    response = await client.post(
-                        f"{self.host}/api/chat",
-                        json=payload,
-                    )
-                    response.raise_for_status()
+            content = await self._single_flight(
+                ["chat", messages, payload["options"]], lambda: self._complete("/api/chat", payload, "chat")
+            )
+        except httpx.HTTPStatusError as e:
+            logger.error(f"Ollama API error: {e.response.status_code} - {e.response.text}")
+            raise
+        except httpx.RequestError as e:
+            logger.error(f"Request to Ollama failed: {str(e)}")
+            raise
+        except Exception as e:
+            logger.error(f"Error in chat with Ollama: {e}")
+            raise
 
-                    elapsed = time.time() - start_time
-                    logger.info(f"Ollama response received in {elapsed:.2f} seconds")
+        elapsed = time.time() - start_time
+        logger.info(f"Ollama response received in {elapsed:.2f} seconds")
+        logger.info(f"Extracted content length: {len(content)} characters")
+        return content
 
-                    data = response.json()
-                    logger.debug(f"Ollama response: {json.dumps(data, indent=2)}")
 
-                    content = data.get("message", {}).get("content", "")
-                    logger.info(f"Extracted content length: {len(content)} characters")
+# Service partagé par le processus (pool de connexions et générations en cours communs)
+_ollama_service: Optional[OllamaService] = None
 
-                    return content
-                except httpx.HTTPStatusError as e:
-                    logger.error(f"Ollama API error: {e.response.status_code} - {e.response.text}")
-                    raise
-                except httpx.RequestError as e:
-                    logger.error(f"Request to Ollama failed: {str(e)}")
-                    raise
 
-        except Exception as e:
-            logger.error(f"Error in chat with Ollama: {e}")
-            raise
+def get_ollama_service() -> OllamaService:
+    """Get or create the shared OllamaService."""
+    global _ollama_service
+    if _ollama_service is None:
+        _ollama_service = OllamaService()
+    return _ollama_service
+
+
+async def close_ollama_service() -> None:
+    """Close the shared service's connection pool (application shutdown)."""
+    global _ollama_service
+    if _ollama_service is not None:
+        await _ollama_service.aclose()
+        _ollama_service = None
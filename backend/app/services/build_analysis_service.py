@@ -1,11 +1,13 @@
 from typing import Any, Dict, List, Optional
 from pathlib import Path
+import asyncio
 import json
 
 from app.core.logging import logger
 from app.core.config import settings
-from app.services.gw2_api_client import GW2APIClient
+from app.services.gw2_api_client import GW2APIClient, get_gw2_api_client
 from app.services.gw2_data_service import Gw2DataService, get_gw2_data_service, RoleAnalysis
+from app.services.gw2_entity_resolver import GW2EntityResolver, unique_ids
 from app.agents.analyst_agent import AnalystAgent
 from app.engine.damage import ARMOR_HEAVY, WEAPON_STRENGTH_AVG, calculate_damage
 from app.agents.build_equipment_optimizer import get_build_optimizer, OptimizationResult
@@ -38,7 +40,8 @@ class BuildAnalysisService:
         advisor_agent: Optional[BuildAdvisorAgent] = None,
         gw2_data_service: Optional[Gw2DataService] = None,
     ) -> None:
-        self.gw2_client = gw2_client or GW2APIClient()
+        self.gw2_client = gw2_client or get_gw2_api_client()
+        self.entity_resolver = GW2EntityResolver(self.gw2_client)
         self.analyst_agent = analyst_agent or AnalystAgent()
         # Optimizer & advisor for equipment recommendations (optional in V1)
         self.optimizer = optimizer or get_build_optimizer()
@@ -695,23 +698,17 @@ class BuildAnalysisService:
         traits_data: List[Dict[str, Any]] = []
         skills_data: List[Dict[str, Any]] = []
 
-        # Spécialisation
+        # Spécialisation, traits et skills résolus en parallèle, chacun en un lot
+        # (données locales puis une requête multi-ids pour les IDs manquants)
+        specs_by_id, traits_by_id, skills_by_id = await asyncio.gather(
+            self.entity_resolver.resolve_specializations([specialization_id] if specialization_id else []),
+            self.entity_resolver.resolve_traits(trait_ids),
+            self.entity_resolver.resolve_skills(skill_ids),
+        )
         if specialization_id:
-            spec_data = await self.gw2_client.get_specialization_details(specialization_id)
-
-        # Traits (un par un pour gestion de 404 individuelle)
-        for tid in trait_ids:
-            trait = await self.gw2_client.get_trait_details(tid)
-            if trait:
-                traits_data.append(trait)
-
-        # Skills (utiliser l'endpoint de liste pour limiter les requêtes)
-        if skill_ids:
-            try:
-                skills_data = await self.gw2_client.get_skills(skill_ids)
-            except Exception as e:
-                logger.error(f"Failed to fetch skills for build analysis: {e}")
-                skills_data = []
+            spec_data = specs_by_id.get(specialization_id)
+        traits_data = [traits_by_id[tid] for tid in unique_ids(trait_ids) if tid in traits_by_id]
+        skills_data = [skills_by_id[sid] for sid in unique_ids(skill_ids) if sid in skills_by_id]
 
         # ==================== Basic consistency validation ====================
         if specialization_id and not spec_data:
@@ -6,7 +6,7 @@ from typing import List, Optional
 from app.core.logging import logger
 from app.models.build import Build, BuildCreate, BuildResponse, GameMode, Profession, Role
 from app.models.learning import DataSource
-from app.services.ai.ollama_service import OllamaService
+from app.services.ai.ollama_service import get_ollama_service
 from app.services.learning.data_collector import DataCollector
 from app.services.parser.gw2skill_parser import GW2SkillParser
 
@@ -16,7 +16,7 @@ class BuildService:
 
     def __init__(self) -> None:
         """Initialize build service."""
-        self.ollama = OllamaService()
+        self.ollama = get_ollama_service()
         self.parser = GW2SkillParser()
         self.collector = DataCollector()
         self.builds_cache: dict[str, Build] = {}
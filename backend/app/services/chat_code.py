@@ -1,136 +1,135 @@
+"""Binary codec for GW2 build template chat codes (link type 0x0D).
+
+Single parser for every chat code of the app (URL analysis, meta-build sync,
+meta-build lookups). The payload is parsed in one ``struct.unpack_from`` over
+a memoryview of the decoded bytes, with a precompiled layout::
+
+    type (u8) | profession (u8) | 3 x (specialization (u8), traits (u8)) | 10 x palette id (u16 LE)
+
+followed by profession-specific and newer template data (pets, legends,
+weapons, ...) which is kept verbatim in ``extra`` so that
+``encode_build_template(decode_build_template(code)) == code``.
+
+The traits byte packs 3 two-bit choices, lowest bits first:
+(b7..b0) [x x t3_hi t3_lo t2_hi t2_lo t1_hi t1_lo]; 0 = none, 1..3 = top/middle/bottom.
+
+Resolving ids (specializations, traits, skills) is done by
+app.services.gw2_chat_code.ChatCodeDecoder on top of this module.
+"""
+
 from __future__ import annotations
 
-import base64
-from dataclasses import dataclass, asdict
-from typing import Any, Dict, List
+import binascii
+import struct
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
 
 from app.core.logging import logger
 
 
-@dataclass
-class DecodedChatCode:
-    """Intermediate representation of a GW2 build chat code.
+BUILD_TEMPLATE_TYPE = 0x0D
+
+_LAYOUT = struct.Struct("<BB6B10H")
+
+# Trait choices of every possible traits byte
+_TRAIT_CHOICES: Tuple[Tuple[int, int, int], ...] = tuple(
+    (byte & 0b11, (byte >> 2) & 0b11, (byte >> 4) & 0b11) for byte in range(256)
+)
+
+
+class BuildTemplate(NamedTuple):
+    """Decoded build template: compact, immutable and hashable.
 
-    This structure is intentionally low-level and close to the raw format:
     - profession_code: numeric profession code (1..9).
-    - specialization_ids: up to 3 specialization IDs (0 means unused).
-    - trait_choices: for each specialization, 3 two-bit choices (0..3).
-    - skill_palette_ids: 10 palette IDs (may include zeros for empty slots).
+    - specialization_ids: 3 specialization IDs (0 means unused).
+    - trait_choices: for each specialization, 3 choices (0..3).
+    - palette_ids: 10 skill palette IDs: heal, 3 utilities, elite, each as a (land, water) pair.
+    - extra: template bytes after the skill palettes, kept for re-encoding.
     """
 
     profession_code: int
-    specialization_ids: List[int]
-    trait_choices: List[List[int]]
-    skill_palette_ids: List[int]
+    specialization_ids: Tuple[int, int, int]
+    trait_choices: Tuple[Tuple[int, int, int], ...]
+    palette_ids: Tuple[int, ...]
+    extra: bytes = b""
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
-
-
-class ChatCodeDecoder:
-    """Decoder for GW2 build template chat codes.
-
-    Only the build template link type (0x0D) is supported. The decoder does
-    *not* hit the GW2 API; it only exposes specialization IDs, trait choices
-    and skill palette IDs so that higher-level services can resolve them.
+        return {
+            "profession_code": self.profession_code,
+            "specialization_ids": list(self.specialization_ids),
+            "trait_choices": [list(choices) for choices in self.trait_choices],
+            "skill_palette_ids": list(self.palette_ids),
+        }
+
+
+def _payload(code: str) -> bytes:
+    text = code.strip()
+    if text.startswith("[&") and text.endswith("]"):
+        text = text[2:-1]
+    if not text:
+        raise ValueError("Empty chat code")
+    try:
+        return binascii.a2b_base64(text)
+    except (binascii.Error, ValueError) as exc:
+        raise ValueError(f"Invalid base64 chat code: {exc}") from exc
+
+
+def _parse(raw: bytes) -> BuildTemplate:
+    if len(raw) < 2:
+        raise ValueError("Chat code payload too short")
+    if raw[0] != BUILD_TEMPLATE_TYPE:
+        raise ValueError(f"Unsupported chat code type: 0x{raw[0]:02X}")
+
+    # Truncated templates are read as if the missing slots were empty
+    if len(raw) < _LAYOUT.size:
+        raw = raw + bytes(_LAYOUT.size - len(raw))
+    with memoryview(raw) as view:
+        (_, profession, spec1, traits1, spec2, traits2, spec3, traits3, *palettes) = _LAYOUT.unpack_from(view)
+        extra = view[_LAYOUT.size :].tobytes()
+
+    return BuildTemplate(
+        profession,
+        (spec1, spec2, spec3),
+        (_TRAIT_CHOICES[traits1], _TRAIT_CHOICES[traits2], _TRAIT_CHOICES[traits3]),
+        tuple(palettes),
+        extra,
+    )
+
+
+def decode_build_template(code: str) -> BuildTemplate:
+    """Decode a build template chat code, e.g. "[&DQEQGi8fGybZEgAA...]".
+
+    Raises:
+        ValueError: If the code is empty, not base64 or not a build template.
     """
 
-    BUILD_TEMPLATE_TYPE = 0x0D
-
-    @classmethod
-    def decode_chat_code(cls, code: str) -> DecodedChatCode:
-        """Decode a GW2 build template chat code.
+    if not code:
+        raise ValueError("Empty chat code")
+    return _parse(_payload(code))
 
-        Args:
-            code: Chat code string, e.g. "[&DQg1OSc5AjkAAAAAmQEAAJkBAAAAAJkBAAAA...]".
 
-        Returns:
-            DecodedChatCode with profession code, specialization IDs,
-            per-line trait choices and skill palette IDs.
+def decode_build_templates(codes: Iterable[str]) -> List[Optional[BuildTemplate]]:
+    """Decode many chat codes; an invalid code yields None instead of raising."""
 
-        Raises:
-            ValueError: If the code is invalid or not a build template.
-        """
+    templates: List[Optional[BuildTemplate]] = []
+    for code in codes:
+        try:
+            templates.append(decode_build_template(code))
+        except ValueError as exc:
+            logger.debug("Invalid build chat code", extra={"chat_code": code, "error": str(exc)})
+            templates.append(None)
+    return templates
 
-        if not code:
-            raise ValueError("Empty chat code")
 
-        text = code.strip()
-        if text.startswith("[&") and text.endswith("]"):
-            inner = text[2:-1]
-        else:
-            inner = text
+def encode_build_template(template: BuildTemplate) -> str:
+    """Encode a BuildTemplate back to its chat code ("[&...]")."""
 
-        try:
-            raw = base64.b64decode(inner)
-        except Exception as exc:  # pragma: no cover - defensive
-            raise ValueError(f"Invalid base64 chat code: {exc}") from exc
-
-        if len(raw) < 2:
-            raise ValueError("Chat code payload too short")
-
-        if raw[0] != cls.BUILD_TEMPLATE_TYPE:
-            raise ValueError(f"Unsupported chat code type: 0x{raw[0]:02X}")
-
-        # === Profession code ===
-        offset = 1
-        profession_code = int(raw[offset])
-        offset += 1
-
-        # === 3 specializations (id + trait choices byte) ===
-        specialization_ids: List[int] = []
-        trait_choices: List[List[int]] = []
-
-        for _ in range(3):
-            if offset + 2 > len(raw):
-                specialization_ids.append(0)
-                trait_choices.append([0, 0, 0])
-                continue
-
-            spec_id = int(raw[offset])
-            traits_byte = int(raw[offset + 1])
-            offset += 2
-
-            # 3 two-bit choices stored in reverse order, lowest bits first.
-            # Bits layout (b7..b0): [unused, unused, t3_hi, t3_lo, t2_hi, t2_lo, t1_hi, t1_lo]
-            first_choice = traits_byte & 0b11
-            second_choice = (traits_byte >> 2) & 0b11
-            third_choice = (traits_byte >> 4) & 0b11
-
-            specialization_ids.append(spec_id)
-            trait_choices.append([first_choice, second_choice, third_choice])
-
-        # === 10 skill palette IDs (16-bit little-endian) ===
-        skill_palette_ids: List[int] = []
-        for _ in range(10):
-            if offset + 2 > len(raw):
-                break
-            low = raw[offset]
-            high = raw[offset + 1]
-            offset += 2
-            palette_id = int(low | (high << 8))
-            skill_palette_ids.append(palette_id)
-
-        logger.debug(
-            "Decoded chat code",
-            extra={
-                "profession_code": profession_code,
-                "specialization_ids": specialization_ids,
-                "trait_choices": trait_choices,
-                "skill_palette_ids": skill_palette_ids,
-            },
-        )
-
-        return DecodedChatCode(
-            profession_code=profession_code,
-            specialization_ids=specialization_ids,
-            trait_choices=trait_choices,
-            skill_palette_ids=skill_palette_ids,
-        )
+    traits = [choices[0] | (choices[1] << 2) | (choices[2] << 4) for choices in template.trait_choices]
+    lines = [value for pair in zip(template.specialization_ids, traits) for value in pair]
+    raw = _LAYOUT.pack(BUILD_TEMPLATE_TYPE, template.profession_code, *lines, *template.palette_ids) + template.extra
+    return f"[&{binascii.b2a_base64(raw, newline=False).decode('ascii')}]"
 
 
 def decode_chat_code(code: str) -> Dict[str, Any]:
     """Convenience wrapper returning a plain dict for JSON friendliness."""
 
-    decoded = ChatCodeDecoder.decode_chat_code(code)
-    return decoded.to_dict()
+    return decode_build_template(code).to_dict()
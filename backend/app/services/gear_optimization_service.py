@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
+
+from app.core.logging import logger
 from app.engine.gear.prefixes import get_all_prefixes
 from app.services.gear_prefix_validator import filter_prefix_names_by_itemstats
 
@@ -35,6 +39,46 @@ WEAPON_SLOTS: List[str] = [
     "WeaponB2",
 ]
 
+ALL_SLOTS: List[str] = ARMOR_SLOTS + TRINKET_SLOTS + WEAPON_SLOTS
+
+# Share of a full-set prefix carried by each slot, proportional to the major
+# attribute of ascended pieces (Coat 141, Amulet 157, one-handed weapon 125,
+# ...). Both weapon sets are averaged, each being active half of the time.
+# Shares sum to 1, so a full single-prefix set keeps the PREFIX_REGISTRY totals.
+_SLOT_MAJOR_ATTRIBUTE: Dict[str, float] = {
+    "Helm": 63,
+    "Shoulders": 47,
+    "Coat": 141,
+    "Gloves": 47,
+    "Leggings": 94,
+    "Boots": 47,
+    "Amulet": 157,
+    "Ring1": 126,
+    "Ring2": 126,
+    "Accessory1": 110,
+    "Accessory2": 110,
+    "Backpiece": 63,
+    "WeaponA1": 62.5,
+    "WeaponA2": 62.5,
+    "WeaponB1": 62.5,
+    "WeaponB2": 62.5,
+}
+SLOT_STAT_SHARE: Dict[str, float] = {
+    slot: value / sum(_SLOT_MAJOR_ATTRIBUTE.values()) for slot, value in _SLOT_MAJOR_ATTRIBUTE.items()
+}
+
+# Poids de l'agrégat "offensif" maximisé par rôle (à contraintes satisfaites)
+ROLE_STAT_WEIGHTS: Dict[str, Dict[str, float]] = {
+    "dps": {"power": 1.0, "precision": 0.8, "ferocity": 0.7, "condition_damage": 0.4},
+    "heal": {"healing_power": 1.0, "concentration": 0.7, "vitality": 0.5},
+    "boon": {"concentration": 1.0, "power": 0.5, "toughness": 0.5},
+    "tank": {"toughness": 1.0, "vitality": 0.9, "healing_power": 0.3},
+    "support": {"healing_power": 0.8, "concentration": 0.8, "toughness": 0.6, "vitality": 0.6, "power": 0.3},
+}
+
+# Coût d'un point de stat manquant sous un minimum de derive_constraints
+CONSTRAINT_PENALTY: float = 100.0
+
 
 @dataclass
 class OptimizationConstraints:
@@ -77,22 +121,31 @@ class GearOptimizationResult:
     - base_stats: aggregated stats for the whole set
     - constraints: constraints used for the search
     - score: overall heuristic score achieved by this configuration
+    - proven_optimal: True if the exact solver proved no assignment of the
+      candidate prefixes scores higher (False if its node budget ran out)
     """
 
     equipment_set: EquipmentSet
     base_stats: Dict[str, int]
     constraints: OptimizationConstraints
     score: float
+    proven_optimal: bool = False
 
 
 class GearOptimizationService:
     """Service responsible for piece-by-piece gear optimization.
 
-    V1 focuses on armor slots only and uses a greedy heuristic. The
-    public API is intentionally simple so it can later be used both by
-    TeamCommanderAgent and offline training loops (AlphaGW2).
+    Every slot (armor, trinkets, weapons) gets a prefix. A greedy
+    hill-climb provides a first assignment, then an exact branch-and-bound
+    search proves it optimal or improves it. The public API is intentionally
+    simple so it can be used both by TeamCommanderAgent and offline
+    training loops (AlphaGW2).
     """
 
+    # Nombre maximal de noeuds explorés par le branch-and-bound; au-delà, la
+    # meilleure solution trouvée est retournée (quasi-optimale).
+    solver_node_budget: int = 50_000
+
     def __init__(self) -> None:
         # Snapshot of all prefixes (Berserker, Ritualist, Grieving, etc.)
         # discovered from GW2 itemstats.json. This map is shared between
@@ -105,7 +158,8 @@ class GearOptimizationService:
             sample_stats = next(iter(self._all_prefixes.values()))
             self._stat_keys = list(sample_stats.keys())
 
-        self._num_armor_slots: int = len(ARMOR_SLOTS)
+        # Contributions (slot, prefix) -> stats, calculées une seule fois
+        self._contributions: Dict[Tuple[str, str], Dict[str, int]] = {}
 
     def derive_constraints(
         self,
@@ -341,11 +395,47 @@ class GearOptimizationService:
 
         return ordered_candidates[0]
 
-    def _compute_armor_stats_from_assignment(self, armor_assignment: Dict[str, str]) -> Dict[str, int]:
-        """Agrège les stats d'un mapping slot -> prefix pour l'armure.
+    def _slot_contribution(self, slot: str, prefix: str) -> Dict[str, int]:
+        """Stats apportées par un préfixe sur un slot (part SLOT_STAT_SHARE du set complet).
 
-        Hypothèse V1: les valeurs de get_all_prefixes() représentent un set
-        complet; chaque pièce d'armure contribue donc ~1/6 de ces stats.
+        Le dict retourné est mis en cache et partagé: ne pas le modifier.
+        """
+
+        key = (slot, prefix)
+        cached = self._contributions.get(key)
+        if cached is not None:
+            return cached
+
+        stats = self._all_prefixes.get(prefix)
+        if not stats:
+            return {}
+        share = SLOT_STAT_SHARE.get(slot, 0.0)
+        contribution = {stat: int(round(float(stats.get(stat, 0)) * share)) for stat in self._stat_keys}
+        self._contributions[key] = contribution
+        return contribution
+
+    def _apply_slot_delta(
+        self,
+        stats: Dict[str, int],
+        slot: str,
+        old_prefix: str,
+        new_prefix: str,
+    ) -> Dict[str, int]:
+        """Stats après remplacement du préfixe d'un slot, en O(attributs).
+
+        Retire la contribution de old_prefix et ajoute celle de new_prefix au
+        lieu de ré-agréger tous les slots.
+        """
+
+        removed = self._slot_contribution(slot, old_prefix)
+        added = self._slot_contribution(slot, new_prefix)
+        return {key: value - removed.get(key, 0) + added.get(key, 0) for key, value in stats.items()}
+
+    def _compute_stats_from_assignment(self, assignment: Dict[str, str]) -> Dict[str, int]:
+        """Agrège les stats d'un mapping slot -> prefix (armure, bijoux, armes).
+
+        Les valeurs de get_all_prefixes() représentent un set complet; chaque
+        slot en apporte la part SLOT_STAT_SHARE.
         """
 
         if not self._all_prefixes:
@@ -357,16 +447,8 @@ class GearOptimizationService:
 
         totals: Dict[str, int] = {k: 0 for k in self._stat_keys}
 
-        if self._num_armor_slots <= 0:
-            return totals
-
-        for slot, prefix in armor_assignment.items():
-            stats = self._all_prefixes.get(prefix)
-            if not stats:
-                continue
-            for key in self._stat_keys:
-                base_val = stats.get(key, 0)
-                contrib = int(round(float(base_val) / float(self._num_armor_slots)))
+        for slot, prefix in assignment.items():
+            for key, contrib in self._slot_contribution(slot, prefix).items():
                 totals[key] += contrib
 
         return totals
@@ -391,37 +473,149 @@ class GearOptimizationService:
                 penalty += float(min_val) - actual
 
         # Agrégat offensif par rôle
-        power = float(stats.get("power", 0))
-        precision = float(stats.get("precision", 0))
-        ferocity = float(stats.get("ferocity", 0))
-        cond = float(stats.get("condition_damage", 0))
-        tough = float(stats.get("toughness", 0))
-        vita = float(stats.get("vitality", 0))
-        conc = float(stats.get("concentration", 0))
-        heal = float(stats.get("healing_power", 0))
+        weights = ROLE_STAT_WEIGHTS.get((role_cat or "").lower(), ROLE_STAT_WEIGHTS["support"])
+        offense = 0.0
+        for key, weight in weights.items():
+            offense += float(stats.get(key, 0)) * weight
 
-        r = (role_cat or "").lower()
+        # Les contraintes sont prioritaires: un petit manque coûte très cher.
+        score = offense - penalty * CONSTRAINT_PENALTY
+        return score
 
-        if r == "dps":
-            offense = power * 1.0 + precision * 0.8 + ferocity * 0.7 + cond * 0.4
-        elif r == "heal":
-            offense = heal * 1.0 + conc * 0.7 + vita * 0.5
-        elif r == "boon":
-            offense = conc * 1.0 + power * 0.5 + tough * 0.5
-        elif r == "tank":
-            offense = tough * 1.0 + vita * 0.9 + heal * 0.3
-        else:  # support générique
-            offense = (
-                heal * 0.8
-                + conc * 0.8
-                + tough * 0.6
-                + vita * 0.6
-                + power * 0.3
+    def _solve_exact(
+        self,
+        candidate_prefixes: List[str],
+        constraints: OptimizationConstraints,
+        role_cat: str,
+        incumbent: Dict[str, str],
+    ) -> Tuple[Dict[str, str], bool]:
+        """Affectation optimale slot -> préfixe par séparation-évaluation.
+
+        Le score est linéaire en stats (agrégat offensif) moins une pénalité
+        convexe sur les seules stats contraintes. Bornes supérieures d'un
+        noeud (on garde la plus serrée):
+          - meilleur agrégat possible de chaque slot restant, pénalité
+            calculée comme si chaque stat contrainte recevait son maximum;
+          - relaxation lagrangienne: -P*max(0, m - s) <= lambda*(s - m) pour
+            tout 0 <= lambda <= P, ce qui rend le score séparable par slot;
+            lambda est optimisé une fois à la racine (sous-gradient).
+        Les slots de même part (anneaux, armes, ...) sont interchangeables:
+        on n'explore que des affectations à indices croissants dans chaque
+        groupe.
+
+        Returns:
+            (affectation, True si l'optimalité est prouvée dans le budget)
+        """
+
+        weights = ROLE_STAT_WEIGHTS.get((role_cat or "").lower(), ROLE_STAT_WEIGHTS["support"])
+        min_items = [(key, float(value)) for key, value in constraints.min_stats.items()]
+
+        # Slots les plus lourds d'abord: les bornes se resserrent plus vite
+        slots = sorted(ALL_SLOTS, key=lambda slot: -SLOT_STAT_SHARE[slot])
+        same_group = [i > 0 and SLOT_STAT_SHARE[slots[i]] == SLOT_STAT_SHARE[slots[i - 1]] for i in range(len(slots))]
+
+        # Par slot et par préfixe: agrégat offensif et stats contraintes
+        offense: List[List[float]] = []
+        constrained: List[List[Tuple[int, ...]]] = []
+        for slot in slots:
+            slot_offense: List[float] = []
+            slot_constrained: List[Tuple[int, ...]] = []
+            for prefix in candidate_prefixes:
+                contrib = self._slot_contribution(slot, prefix)
+                total = 0.0
+                for key, weight in weights.items():
+                    total += float(contrib.get(key, 0)) * weight
+                slot_offense.append(total)
+                slot_constrained.append(tuple(contrib.get(key, 0) for key, _ in min_items))
+            offense.append(slot_offense)
+            constrained.append(slot_constrained)
+
+        # Maxima cumulés des slots restants (bornes optimistes)
+        n_slots = len(slots)
+        rest_offense = [0.0] * (n_slots + 1)
+        rest_constrained = [[0] * len(min_items) for _ in range(n_slots + 1)]
+        for i in range(n_slots - 1, -1, -1):
+            rest_offense[i] = rest_offense[i + 1] + max(offense[i])
+            for k in range(len(min_items)):
+                rest_constrained[i][k] = rest_constrained[i + 1][k] + max(c[k] for c in constrained[i])
+
+        multipliers = self._lagrange_multipliers(offense, constrained, [m for _, m in min_items])
+        relaxed = [
+            [offense[i][c] + sum(l * v for l, v in zip(multipliers, constrained[i][c])) for c in range(len(candidate_prefixes))]
+            for i in range(n_slots)
+        ]
+        rest_relaxed = [0.0] * (n_slots + 1)
+        for i in range(n_slots - 1, -1, -1):
+            rest_relaxed[i] = rest_relaxed[i + 1] + max(relaxed[i])
+        relaxed_offset = sum(l * m for l, (_, m) in zip(multipliers, min_items))
+
+        def _penalty(totals: List[float], depth: int) -> float:
+            missing = 0.0
+            for k, (_, min_val) in enumerate(min_items):
+                gap = min_val - totals[k] - rest_constrained[depth][k]
+                if gap > 0:
+                    missing += gap
+            return missing * CONSTRAINT_PENALTY
+
+        index_of = {prefix: idx for idx, prefix in enumerate(candidate_prefixes)}
+        best_choice = [index_of.get(incumbent.get(slot, ""), 0) for slot in slots]
+        best_score = sum(offense[i][c] for i, c in enumerate(best_choice)) - _penalty(
+            [float(sum(constrained[i][c][k] for i, c in enumerate(best_choice))) for k in range(len(min_items))],
+            n_slots,
+        )
+
+        choice = [0] * n_slots
+        totals = [0.0] * len(min_items)
+        nodes = 0
+        budget = self.solver_node_budget
+        exhausted = False
+
+        # Préfixes les plus prometteurs (score relâché) d'abord par slot
+        orders = [sorted(range(len(candidate_prefixes)), key=lambda c, i=i: -relaxed[i][c]) for i in range(n_slots)]
+
+        def _search(depth: int, partial_offense: float, partial_relaxed: float) -> None:
+            nonlocal best_score, best_choice, nodes, exhausted
+            if depth == n_slots:
+                score = partial_offense - _penalty(totals, depth)
+                if score > best_score + 1e-6:
+                    best_score = score
+                    best_choice = list(choice)
+                return
+
+            start = choice[depth - 1] if same_group[depth] else 0
+            for c in orders[depth]:
+                if c < start:
+                    continue
+                nodes += 1
+                if nodes > budget:
+                    exhausted = True
+                    return
+                next_relaxed = partial_relaxed + relaxed[depth][c]
+                if next_relaxed + rest_relaxed[depth + 1] - relaxed_offset <= best_score + 1e-6:
+                    continue
+                values = constrained[depth][c]
+                for k in range(len(min_items)):
+                    totals[k] += values[k]
+                next_offense = partial_offense + offense[depth][c]
+                bound = next_offense + rest_offense[depth + 1] - _penalty(totals, depth + 1)
+                if bound > best_score + 1e-6:
+                    choice[depth] = c
+                    _search(depth + 1, next_offense, next_relaxed)
+                for k in range(len(min_items)):
+                    totals[k] -= values[k]
+                if exhausted:
+                    return
+
+        started = time.perf_counter()
+        _search(0, 0.0, 0.0)
+        if exhausted:
+            logger.info(
+                "Gear solver node budget reached; returning best assignment found",
+                extra={"nodes": budget, "elapsed": time.perf_counter() - started},
             )
 
-        # Les contraintes sont prioritaires: un petit manque coûte très cher.
-        score = offense - penalty * 100.0
-        return score
+        assignment = {slot: candidate_prefixes[best_choice[i]] for i, slot in enumerate(slots)}
+        return {slot: assignment[slot] for slot in ALL_SLOTS}, not exhausted
 
     def generate_equipment_set(
         self,
@@ -431,15 +625,16 @@ class GearOptimizationService:
         mode: str,
         experience: str,
     ) -> GearOptimizationResult:
-        """Greedy armor-piece gear optimization entrypoint (V1).
+        """Piece-by-piece gear optimization entrypoint.
 
-        Algo glouton simplifié:
+        Algo:
           1. Normaliser le rôle (dps/heal/boon/tank/support).
           2. Choisir quelques préfixes candidats adaptés au rôle.
           3. Démarrer en full préfixe offensif (ex: Berserker pour DPS).
-          4. Tant qu'on trouve un slot + préfixe qui améliore le score
-             (moins de pénalité de contraintes, ou même pénalité mais plus
-             d'offense), on applique la modification.
+          4. Hill-climb glouton sur tous les slots (armure, bijoux, armes):
+             tant qu'un slot + préfixe améliore le score, on l'applique.
+          5. Séparation-évaluation exacte, initialisée par le hill-climb,
+             pour prouver l'optimum ou l'améliorer (budget de noeuds borné).
         """
 
         if not self._all_prefixes:
@@ -458,58 +653,107 @@ class GearOptimizationService:
         if base_prefix not in candidate_prefixes:
             candidate_prefixes = [base_prefix] + [p for p in candidate_prefixes if p != base_prefix]
 
-        # 3) Configuration initiale: full base_prefix sur les 6 pièces d'armure
-        current_armor: Dict[str, str] = {slot: base_prefix for slot in ARMOR_SLOTS}
-        current_stats = self._compute_armor_stats_from_assignment(current_armor)
+        # 3) Configuration initiale: full base_prefix sur tous les slots
+        current: Dict[str, str] = {slot: base_prefix for slot in ALL_SLOTS}
+        current_stats = self._compute_stats_from_assignment(current)
         current_score = self._evaluate_stats_for_role(current_stats, constraints, role_cat)
 
         # 4) Boucle gloutonne: pour chaque slot, tester tous les préfixes
-        #    candidats et ne garder que les améliorations de score.
-        max_iterations = max(1, len(ARMOR_SLOTS) * 4)
+        #    candidats et ne garder que les améliorations de score. Chaque
+        #    voisin est évalué par delta sur le vecteur de stats courant.
+        max_iterations = max(1, len(ALL_SLOTS) * 4)
         for _ in range(max_iterations):
             best_neighbor_score = current_score
-            best_neighbor_assignment: Optional[Dict[str, str]] = None
+            best_neighbor_move: Optional[Tuple[str, str]] = None
             best_neighbor_stats: Optional[Dict[str, int]] = None
 
-            for slot in ARMOR_SLOTS:
-                current_prefix = current_armor.get(slot, base_prefix)
+            for slot in ALL_SLOTS:
+                current_prefix = current.get(slot, base_prefix)
                 for prefix in candidate_prefixes:
                     if prefix == current_prefix:
                         continue
 
-                    new_armor = dict(current_armor)
-                    new_armor[slot] = prefix
-                    new_stats = self._compute_armor_stats_from_assignment(new_armor)
+                    new_stats = self._apply_slot_delta(current_stats, slot, current_prefix, prefix)
                     new_score = self._evaluate_stats_for_role(new_stats, constraints, role_cat)
 
                     if new_score > best_neighbor_score + 1e-6:
                         best_neighbor_score = new_score
-                        best_neighbor_assignment = new_armor
+                        best_neighbor_move = (slot, prefix)
                         best_neighbor_stats = new_stats
 
-            if best_neighbor_assignment is None or best_neighbor_stats is None:
+            if best_neighbor_move is None or best_neighbor_stats is None:
                 break
 
-            current_armor = best_neighbor_assignment
+            slot, prefix = best_neighbor_move
+            current[slot] = prefix
             current_stats = best_neighbor_stats
             current_score = best_neighbor_score
 
-        armor = current_armor
-        trinkets: Dict[str, str] = {}
-        weapons: Dict[str, str] = {}
-
-        equipment_set = EquipmentSet(armor=armor, trinkets=trinkets, weapons=weapons)
-
-        base_stats = current_stats
+        # 5) Optimum exact (ou meilleur trouvé dans le budget)
+        solved, proven_optimal = self._solve_exact(candidate_prefixes, constraints, role_cat, incumbent=current)
+        solved_stats = self._compute_stats_from_assignment(solved)
+        solved_score = self._evaluate_stats_for_role(solved_stats, constraints, role_cat)
+        if solved_score > current_score + 1e-6:
+            current, current_stats, current_score = solved, solved_stats, solved_score
+
+        equipment_set = EquipmentSet(
+            armor={slot: current[slot] for slot in ARMOR_SLOTS},
+            trinkets={slot: current[slot] for slot in TRINKET_SLOTS},
+            weapons={slot: current[slot] for slot in WEAPON_SLOTS},
+        )
 
         return GearOptimizationResult(
             equipment_set=equipment_set,
-            base_stats=base_stats,
+            base_stats=current_stats,
             constraints=constraints,
             score=current_score,
+            proven_optimal=proven_optimal,
         )
 
 
+    @staticmethod
+    def _lagrange_multipliers(
+        offense: List[List[float]],
+        constrained: List[List[Tuple[int, ...]]],
+        minimums: List[float],
+        iterations: int = 200,
+    ) -> List[float]:
+        """Multiplicateurs lambda (un par stat contrainte) minimisant la borne lagrangienne.
+
+        L(lambda) = somme des max par slot de (agrégat + lambda * stats contraintes)
+        - lambda * minimums, convexe et linéaire par morceaux: descente de
+        sous-gradient projetée sur [0, CONSTRAINT_PENALTY].
+        """
+
+        if not minimums or not offense:
+            return [0.0] * len(minimums)
+
+        off = np.asarray(offense, dtype=float)  # (slots, prefixes)
+        con = np.asarray(constrained, dtype=float)  # (slots, prefixes, K)
+        mins = np.asarray(minimums, dtype=float)
+        slot_index = np.arange(off.shape[0])
+
+        def _bound(lam: np.ndarray) -> Tuple[float, np.ndarray]:
+            values = off + con @ lam
+            best = values.argmax(axis=1)
+            return float(values[slot_index, best].sum() - lam @ mins), con[slot_index, best].sum(axis=0) - mins
+
+        lam = np.zeros(len(minimums))
+        best_lam, (best_bound, grad) = lam, _bound(lam)
+        step = CONSTRAINT_PENALTY / 4.0
+        for _ in range(iterations):
+            norm = float(np.abs(grad).max())
+            if norm == 0.0:
+                break
+            lam = np.clip(lam - step * grad / norm, 0.0, CONSTRAINT_PENALTY)
+            bound, grad = _bound(lam)
+            if bound < best_bound:
+                best_lam, best_bound = lam, bound
+            else:
+                step *= 0.8
+        return [float(v) for v in best_lam]
+
+
 # Global convenience instance
 _gear_opt_service: Optional[GearOptimizationService] = None
 
@@ -6,7 +6,7 @@ from typing import List, Set, Dict, Any
 
 from app.core.logging import logger
 from app.engine.gear.prefixes import PREFIX_REGISTRY
-from app.services.gw2_data_store import GW2DataStore
+from app.services.gw2_data_store import get_gw2_data_store, register_reload_listener
 
 
 def _normalize_itemstat_name(raw_name: str) -> Set[str]:
@@ -53,8 +53,7 @@ _ITEMSTAT_ATTR_MAP: Dict[str, str] = {
 
 @lru_cache(maxsize=1)
 def _build_itemstats_index() -> Dict[str, List[Dict[str, Any]]]:
-    data_store = GW2DataStore()
-    itemstats = data_store.get_itemstats()
+    itemstats = get_gw2_data_store().get_itemstats()
     index: Dict[str, List[Dict[str, Any]]] = {}
     if not itemstats:
         return index
@@ -80,8 +79,7 @@ def get_available_prefixes_from_itemstats() -> Set[str]:
     "Berserker", "Berserker's and Valkyrie" -> {"Berserker", "Valkyrie"}).
     """
 
-    data_store = GW2DataStore()
-    itemstats = data_store.get_itemstats()
+    itemstats = get_gw2_data_store().get_itemstats()
 
     if not itemstats:
         return set()
@@ -212,3 +210,8 @@ def get_prefix_stats_from_itemstats(prefix_name: str) -> Dict[str, int]:
         else:
             result[key] = 0
     return result
+
+
+# Itemstats indexes are derived from the shared data store: rebuild them after a reload
+register_reload_listener(_build_itemstats_index.cache_clear)
+register_reload_listener(get_available_prefixes_from_itemstats.cache_clear)
@@ -12,7 +12,7 @@ from functools import lru_cache
 from typing import Any, Dict, List
 
 from app.models.build import Equipment
-from app.services.gw2_data_store import GW2DataStore
+from app.services.gw2_data_store import GW2DataStore, get_gw2_data_store, register_reload_listener
 from app.services.gear_prefix_validator import _normalize_itemstat_name
 
 
@@ -35,7 +35,12 @@ class GearPresetService:
     """
 
     def __init__(self, data_store: GW2DataStore | None = None) -> None:
-        self._data_store = data_store or GW2DataStore()
+        self._data_store = data_store
+
+    @property
+    def data_store(self) -> GW2DataStore:
+        """Injected store, else the current shared store (replaced on every data reload)."""
+        return self._data_store or get_gw2_data_store()
 
     @lru_cache(maxsize=1)
     def _build_itemstats_index(self) -> Dict[int, List[str]]:
@@ -46,7 +51,7 @@ class GearPresetService:
         """
 
         index: Dict[int, List[str]] = {}
-        itemstats = self._data_store.get_itemstats()
+        itemstats = self.data_store.get_itemstats()
         if not itemstats:
             return index
 
@@ -73,7 +78,7 @@ class GearPresetService:
 
         mapping: Dict[str, List[Equipment]] = {}
         stat_index = self._build_itemstats_index()
-        items = self._data_store.get_items()
+        items = self.data_store.get_items()
         if not items or not stat_index:
             return mapping
 
@@ -147,6 +152,11 @@ class GearPresetService:
         return ordered
 
 
+# Per-instance caches derived from the shared data store: rebuild them after a reload
+register_reload_listener(GearPresetService._build_itemstats_index.cache_clear)
+register_reload_listener(GearPresetService._build_prefix_to_armor_index.cache_clear)
+
+
 # Global convenience instance
 _preset_service: GearPresetService | None = None
 
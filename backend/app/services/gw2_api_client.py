@@ -7,18 +7,133 @@ Permet l'importation automatique des données (professions, skills, traits, item
 Documentation API: https://wiki.guildwars2.com/wiki/API:Main
 """
 
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
 import asyncio
-from datetime import datetime, timedelta
+import time
+from datetime import datetime
 
 import httpx
+from app.core.config import settings
 from app.core.logging import logger
+from app.core.metrics import track_external_api, track_gw2_api_cache_lookup
+from app.services.gw2_http_cache import CachedResponse, DiskHTTPCache
 
 
 class Gw2ApiError(Exception):
     pass
 
 
+class ResponseCache:
+    """
+    Cache LRU borné avec expiration (TTL) des réponses de l'API GW2.
+
+    Les entrées expirées sont supprimées à la lecture; au-delà de
+    ``max_entries`` la moins récemment utilisée est évincée.
+    """
+
+    def __init__(self, max_entries: int = 2048, ttl_seconds: float = 24 * 3600):
+        self.max_entries = max(0, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Retourne (trouvé, valeur) et met à jour les compteurs hit/miss."""
+        entry = self._entries.get(key)
+        hit = False
+        value = None
+        if entry is not None:
+            if entry[1] > time.monotonic():
+                self._entries.move_to_end(key)
+                hit, value = True, entry[0]
+            else:
+                del self._entries[key]
+
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        track_gw2_api_cache_lookup(hit=hit, entries=len(self._entries))
+        return hit, value
+
+    def set(self, key: str, value: Any) -> None:
+        if self.max_entries == 0:
+            return
+        self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class TokenBucket:
+    """
+    Limiteur de débit à jetons partagé par les requêtes d'un client.
+
+    ``rate`` jetons par seconde, rafale de ``capacity`` requêtes. Sur un 429,
+    ``throttle`` suspend toutes les requêtes pendant le délai demandé et divise
+    le débit par deux; chaque succès le fait remonter vers le débit nominal.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.max_rate = max(rate, 0.01)
+        self.min_rate = self.max_rate / 16
+        self.rate = self.max_rate
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        # Pas de verrou: entre le test et la prise du jeton il n'y a aucun await
+        while True:
+            now = time.monotonic()
+            self._refill(now)
+            wait = self._blocked_until - now
+            if wait <= 0:
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            await asyncio.sleep(wait)
+
+    def throttle(self, delay: float) -> None:
+        now = time.monotonic()
+        self._refill(now)
+        self._blocked_until = max(self._blocked_until, now + delay)
+        self._tokens = 0.0
+        self.rate = max(self.min_rate, self.rate / 2)
+
+    def recover(self) -> None:
+        if self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 16)
+
+
+def _page_total(response: httpx.Response, page_size: int) -> int:
+    """Nombre de pages annoncé par l'API (X-Page-Total, sinon X-Result-Total; 1 par défaut)."""
+    for header, per_page in (("X-Page-Total", 1), ("X-Result-Total", page_size)):
+        value = response.headers.get(header)
+        if value is not None and value.isdigit():
+            return max(1, -(-int(value) // per_page))
+    return 1
+
+
 class GW2APIClient:
     """
     Client pour l'API officielle Guild Wars 2.
@@ -31,9 +146,18 @@ class GW2APIClient:
     - /v2/items: Items et équipement
     - /v2/itemstats: Statistiques d'items
 
+    Le client garde un ``httpx.AsyncClient`` ouvert (pool de connexions
+    keep-alive/TLS réutilisées entre requêtes) et un cache LRU/TTL borné des
+    réponses. Utiliser ``get_gw2_api_client()`` pour partager l'instance.
+
+    Les réponses publiques sont aussi conservées sur disque (DiskHTTPCache)
+    avec leurs validateurs ETag/Last-Modified: après un redémarrage elles
+    sont revalidées par requête conditionnelle (304 sans corps) au lieu
+    d'être retéléchargées, et un nouveau build du jeu les invalide toutes.
+
     Example:
         ```python
-        client = GW2APIClient()
+        client = get_gw2_api_client()
         professions = await client.get_professions()
         skills = await client.get_skills([12345, 67890])
         ```
@@ -42,7 +166,22 @@ class GW2APIClient:
     BASE_URL = "https://api.guildwars2.com"
     API_VERSION = "v2"
 
-    def __init__(self, api_key: Optional[str] = None, timeout: int = 30, max_retries: int = 3):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        timeout: int = 30,
+        max_retries: int = 3,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        cache_max_entries: Optional[int] = None,
+        cache_ttl_seconds: Optional[float] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        rate_limit: Optional[float] = None,
+        rate_burst: Optional[int] = None,
+        page_concurrency: Optional[int] = None,
+        throttle_backoff: float = 1.0,
+        disk_cache: Optional[DiskHTTPCache] = None,
+    ):
         """
         Initialise le client API GW2.
 
@@ -50,12 +189,47 @@ class GW2APIClient:
             api_key: Clé API GW2 (optionnel, requis pour certains endpoints)
             timeout: Timeout des requêtes en secondes
             max_retries: Nombre maximum de tentatives
+            max_connections: Connexions simultanées max du pool (défaut: settings)
+            max_keepalive_connections: Connexions gardées ouvertes (défaut: settings)
+            cache_max_entries: Taille max du cache de réponses (défaut: settings)
+            cache_ttl_seconds: Durée de vie des réponses en cache (défaut: settings)
+            transport: Transport httpx (tests: httpx.MockTransport)
+            rate_limit: Requêtes par seconde du token bucket (défaut: settings)
+            rate_burst: Rafale autorisée du token bucket (défaut: settings)
+            page_concurrency: Pages récupérées en parallèle (défaut: settings)
+            throttle_backoff: Attente initiale après un 429 sans Retry-After (doublée à chaque 429)
+            disk_cache: Cache HTTP persistant (défaut: settings, None si désactivé)
         """
         self.api_key = api_key
         self.timeout = timeout
         self.max_retries = max_retries
-        self._cache: Dict[str, Any] = {}
-        self._cache_ttl = timedelta(hours=24)
+        self.limits = httpx.Limits(
+            max_connections=max_connections or settings.GW2_API_MAX_CONNECTIONS,
+            max_keepalive_connections=max_keepalive_connections or settings.GW2_API_MAX_KEEPALIVE_CONNECTIONS,
+        )
+        self._transport = transport
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._cache = ResponseCache(
+            max_entries=settings.GW2_API_CACHE_MAX_ENTRIES if cache_max_entries is None else cache_max_entries,
+            ttl_seconds=settings.GW2_API_CACHE_TTL if cache_ttl_seconds is None else cache_ttl_seconds,
+        )
+
+        self._rate_limiter = TokenBucket(
+            rate=rate_limit or settings.GW2_API_RATE_LIMIT,
+            capacity=rate_burst or settings.GW2_API_RATE_BURST,
+        )
+        self.page_concurrency = max(1, page_concurrency or settings.GW2_API_PAGE_CONCURRENCY)
+        self.throttle_backoff = throttle_backoff
+        self.max_throttle_retries = 6
+        self._throttle_delay = throttle_backoff
+
+        if disk_cache is None and settings.GW2_API_DISK_CACHE_ENABLED:
+            disk_cache = DiskHTTPCache(settings.GW2_API_DISK_CACHE_DIR, settings.GW2_API_DISK_CACHE_FRESH)
+        self._disk_cache = disk_cache
+        self.build_check_interval = settings.GW2_API_BUILD_CHECK_INTERVAL
+        self._build_checked_until = 0.0
+        self._build_check: Optional["asyncio.Future[Optional[int]]"] = None
 
         # Headers par défaut
         self.headers = {"User-Agent": "GW2Optimizer/1.1.0", "Accept": "application/json"}
@@ -63,6 +237,36 @@ class GW2APIClient:
         if api_key:
             self.headers["Authorization"] = f"Bearer {api_key}"
 
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Client HTTP poolé, créé à la première requête de la boucle courante.
+
+        Les connexions d'un AsyncClient sont liées à la boucle asyncio qui les
+        a ouvertes: si l'instance est réutilisée depuis une autre boucle
+        (asyncio.run successifs, worker), un nouveau pool est ouvert.
+        """
+        loop = asyncio.get_running_loop()
+        if self._http_client is None or self._http_client.is_closed or self._http_client_loop is not loop:
+            self._http_client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self.limits,
+                headers=self.headers,
+                transport=self._transport,
+            )
+            self._http_client_loop = loop
+        return self._http_client
+
+    async def aclose(self) -> None:
+        """Ferme le pool de connexions."""
+        client, self._http_client = self._http_client, None
+        if client is not None and not client.is_closed:
+            await client.aclose()
+
+    async def __aenter__(self) -> "GW2APIClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
     async def _request(self, endpoint: str, params: Optional[Dict[str, Any]] = None, use_cache: bool = True) -> Any:
         """
         Effectue une requête à l'API GW2.
@@ -82,33 +286,133 @@ class GW2APIClient:
         cache_key = f"{url}:{str(params)}"
 
         # Vérifier le cache
-        if use_cache and cache_key in self._cache:
-            cached_data, cached_time = self._cache[cache_key]
-            if datetime.utcnow() - cached_time < self._cache_ttl:
+        if use_cache:
+            hit, cached_data = self._cache.get(cache_key)
+            if hit:
                 logger.debug(f"Cache hit for {endpoint}")
                 return cached_data
 
-        # Effectuer la requête avec retry
-        for attempt in range(self.max_retries):
-            try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    response = await client.get(url, params=params, headers=self.headers)
-                    response.raise_for_status()
-                    data = response.json()
+        data = (await self._fetch(endpoint, params)).json()
 
-                    # Mettre en cache
-                    if use_cache:
-                        self._cache[cache_key] = (data, datetime.utcnow())
+        # Mettre en cache
+        if use_cache:
+            self._cache.set(cache_key, data)
+        return data
 
-                    logger.info(f"Successfully fetched {endpoint}")
-                    return data
+    def _throttle_wait(self, response: httpx.Response) -> float:
+        """Attente après un 429: Retry-After si fourni, sinon backoff exponentiel adaptatif."""
+        retry_after = response.headers.get("Retry-After")
+        try:
+            delay = float(retry_after) if retry_after is not None else self._throttle_delay
+        except ValueError:
+            delay = self._throttle_delay
+        self._throttle_delay = min(self._throttle_delay * 2, 60.0)
+        return max(0.0, delay)
+
+    async def _current_build(self) -> Optional[int]:
+        """Build du jeu qui partitionne le cache disque, revérifié au plus une fois par intervalle."""
+        if time.monotonic() < self._build_checked_until:
+            return self._disk_cache.build_id
+        # Une seule vérification en vol: les requêtes concurrentes l'attendent
+        check = self._build_check
+        if check is None or check.done() or check.get_loop() is not asyncio.get_running_loop():
+            check = self._build_check = asyncio.ensure_future(self._check_build())
+        return await asyncio.shield(check)
+
+    async def _check_build(self) -> Optional[int]:
+        cache = self._disk_cache
+        try:
+            build_id = await self.get_build_id(use_cache=False)
+        except (httpx.HTTPError, Gw2ApiError) as e:
+            # API injoignable: on garde le build connu (None = cache disque ignoré), nouvel essai sous une minute
+            logger.warning(f"GW2 build check failed, keeping build {cache.build_id}: {e}")
+            self._build_checked_until = time.monotonic() + min(60.0, self.build_check_interval)
+            return cache.build_id
+
+        if build_id != cache.build_id:
+            if cache.build_id is not None:
+                logger.info(f"GW2 build changed ({cache.build_id} -> {build_id}): dropping cached responses")
+                self._cache.clear()
+            await asyncio.to_thread(cache.set_build, build_id)
+        self._build_checked_until = time.monotonic() + self.build_check_interval
+        return build_id
+
+    async def _disk_cache_key(self, endpoint: str, url: str, params: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Clé du cache disque, ou None si la requête ne doit pas y passer."""
+        # Réponses liées au compte (clé API) non persistées; "build" sert à partitionner le cache
+        if self._disk_cache is None or endpoint == "build" or "Authorization" in self.headers:
+            return None
+        if await self._current_build() is None:
+            return None
+        query = sorted((params or {}).items())
+        return f"{url}?{query}"
+
+    @staticmethod
+    def _cached_response(entry: CachedResponse, url: str, params: Optional[Dict[str, Any]]) -> httpx.Response:
+        return httpx.Response(
+            200,
+            content=entry.body.encode("utf-8"),
+            headers=entry.headers,
+            request=httpx.Request("GET", url, params=params),
+        )
+
+    async def _fetch(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> httpx.Response:
+        """Requête brute (sans cache mémoire) avec cache disque, limitation de débit, retry et backoff sur 429."""
+        url = f"{self.BASE_URL}/{self.API_VERSION}/{endpoint}"
+        # Label de métrique borné: "skills/123" -> "skills"
+        metric_endpoint = endpoint.split("/", 1)[0]
+
+        disk_key = await self._disk_cache_key(endpoint, url, params)
+        stored = await self._disk_cache.get(disk_key) if disk_key is not None else None
+        if stored is not None and stored.is_fresh(self._disk_cache.fresh_seconds):
+            self._disk_cache.record("hit")
+            return self._cached_response(stored, url, params)
+        conditional = stored.conditional_headers() if stored is not None else {}
+
+        attempt = 0
+        throttled = 0
+        while True:
+            await self._rate_limiter.acquire()
+            started = time.perf_counter()
+            try:
+                response = await self._get_http_client().get(url, params=params, headers=conditional)
+                if response.status_code == 304 and stored is not None:
+                    # Inchangé côté serveur: on ressert le corps stocké et on ré-arme l'entrée
+                    track_external_api("gw2api", metric_endpoint, time.perf_counter() - started, "304")
+                    self._rate_limiter.recover()
+                    self._throttle_delay = self.throttle_backoff
+                    self._disk_cache.record("revalidated")
+                    await self._disk_cache.touch(disk_key, stored, response.headers)
+                    return self._cached_response(stored, url, params)
+                if response.status_code == 429 and throttled < self.max_throttle_retries:
+                    # Throttling: ne consomme pas les tentatives, ralentit tout le client
+                    throttled += 1
+                    track_external_api("gw2api", metric_endpoint, time.perf_counter() - started, "429")
+                    delay = self._throttle_wait(response)
+                    self._rate_limiter.throttle(delay)
+                    logger.warning(f"GW2 API throttled {endpoint}; backing off {delay:.1f}s")
+                    continue
+                response.raise_for_status()
+                track_external_api("gw2api", metric_endpoint, time.perf_counter() - started, str(response.status_code))
+                self._rate_limiter.recover()
+                self._throttle_delay = self.throttle_backoff
+
+                if disk_key is not None:
+                    self._disk_cache.record("miss" if stored is None else "changed")
+                    await self._disk_cache.set(disk_key, url, response.text, response.headers)
+
+                logger.info(f"Successfully fetched {endpoint}")
+                return response
 
             except httpx.HTTPError as e:
-                logger.warning(f"Attempt {attempt + 1}/{self.max_retries} failed for {endpoint}: {e}")
-                if attempt == self.max_retries - 1:
+                status = e.response.status_code if isinstance(e, httpx.HTTPStatusError) else type(e).__name__
+                track_external_api("gw2api", metric_endpoint, time.perf_counter() - started, str(status))
+                attempt += 1
+                logger.warning(f"Attempt {attempt}/{self.max_retries} failed for {endpoint}: {e}")
+                if attempt >= self.max_retries:
                     logger.error(f"Failed to fetch {endpoint} after {self.max_retries} attempts")
                     raise
-                await asyncio.sleep(2**attempt)  # Exponential backoff
+                await asyncio.sleep(2 ** (attempt - 1))  # Exponential backoff
 
     # ==================== Professions ====================
 
@@ -174,10 +478,8 @@ class GW2APIClient:
             params = {"ids": ",".join(map(str, skill_ids))}
             return await self._request("skills", params=params)
         else:
-            # Récupérer tous les IDs puis les détails
-            all_ids = await self._request("skills")
-            # Limiter à 200 IDs par requête (limite API)
-            return await self._get_paginated("skills", all_ids, page_size=200)
+            # Toutes les compétences, par pages de 200 (limite API)
+            return await self._get_paginated("skills", page_size=200)
 
     async def get_skill(self, skill_id: int) -> Dict[str, Any]:
         """
@@ -221,8 +523,7 @@ class GW2APIClient:
             params = {"ids": ",".join(map(str, trait_ids))}
             return await self._request("traits", params=params)
         else:
-            all_ids = await self._request("traits")
-            return await self._get_paginated("traits", all_ids, page_size=200)
+            return await self._get_paginated("traits", page_size=200)
 
     async def get_trait(self, trait_id: int) -> Dict[str, Any]:
         """
@@ -271,8 +572,7 @@ class GW2APIClient:
             params = {"ids": ",".join(map(str, spec_ids))}
             return await self._request("specializations", params=params)
         else:
-            all_ids = await self._request("specializations")
-            return await self._get_paginated("specializations", all_ids, page_size=200)
+            return await self._get_paginated("specializations", page_size=200)
 
     async def get_specialization(self, spec_id: int) -> Dict[str, Any]:
         """
@@ -351,72 +651,106 @@ class GW2APIClient:
             params = {"ids": ",".join(map(str, stat_ids))}
             return await self._request("itemstats", params=params)
         else:
-            all_ids = await self._request("itemstats")
-            return await self._get_paginated("itemstats", all_ids, page_size=200)
+            return await self._get_paginated("itemstats", page_size=200)
 
     async def get_all_items(self) -> List[Dict[str, Any]]:
-        all_ids = await self._request("items")
-        return await self._get_paginated("items", all_ids, page_size=200)
+        return await self._get_paginated("items", page_size=200)
 
     async def get_upgrade_components(self, component_ids: Optional[List[int]] = None) -> List[Dict[str, Any]]:
         if component_ids:
             params = {"ids": ",".join(map(str, component_ids))}
             return await self._request("upgrade_components", params=params)
-        all_ids = await self._request("upgrade_components")
-        return await self._get_paginated("upgrade_components", all_ids, page_size=200)
+        return await self._get_paginated("upgrade_components", page_size=200)
 
     async def get_upgrade_component(self, component_id: int) -> Dict[str, Any]:
         return await self._request(f"upgrade_components/{component_id}")
 
     # ==================== Helpers ====================
 
-    async def _get_paginated(self, endpoint: str, all_ids: List[int], page_size: int = 200) -> List[Dict[str, Any]]:
+    async def _get_paginated(
+        self,
+        endpoint: str,
+        all_ids: Optional[List[int]] = None,
+        page_size: int = 200,
+    ) -> List[Dict[str, Any]]:
         """
-        Récupère des données paginées.
+        Récupère des données paginées, plusieurs pages en parallèle.
+
+        Sans ``all_ids``, la première page (``?page=0&page_size=N``) donne le
+        nombre de pages (en-tête X-Page-Total); avec ``all_ids``, les pages
+        sont des lots d'IDs (``?ids=...``). Au plus ``page_concurrency`` pages
+        sont en vol, sous le token bucket du client.
 
         Args:
             endpoint: Endpoint de l'API
-            all_ids: Liste de tous les IDs
+            all_ids: Liste de tous les IDs (optionnel)
             page_size: Taille de page
 
         Returns:
-            Liste complète des données
+            Liste complète des données, dans l'ordre des pages
         """
-        results = []
-        total_batches = (len(all_ids) + page_size - 1) // page_size
+        if all_ids is not None:
+            batches = [all_ids[i : i + page_size] for i in range(0, len(all_ids), page_size)]
+            pages: List[Optional[List[Dict[str, Any]]]] = [None] * len(batches)
 
-        for i in range(0, len(all_ids), page_size):
-            batch_ids = all_ids[i : i + page_size]
-            params = {"ids": ",".join(map(str, batch_ids))}
-            batch_num = i // page_size + 1
+            async def fetch_page(index: int) -> List[Dict[str, Any]]:
+                return await self._request(endpoint, params={"ids": ",".join(map(str, batches[index]))})
 
-            try:
-                batch_data = await self._request(endpoint, params=params)
-                results.extend(batch_data)
-                
-                # Progress logging for large datasets
-                if total_batches > 10:  # Only log for significant imports
-                    logger.info(f"Fetched batch {batch_num}/{total_batches} for {endpoint} ({len(results)} items)")
-                
-                # Rate limiting: small delay between batches for large endpoints
-                if endpoint in ("items", "upgrade_components") and batch_num < total_batches:
-                    await asyncio.sleep(0.1)  # 100ms delay to avoid API throttling
-                    
-            except Exception as e:
-                logger.error(f"Failed to fetch batch {batch_num}/{total_batches} for {endpoint}: {e}")
+            await self._fetch_pages(endpoint, pages, fetch_page, range(len(batches)))
+        else:
+            first = await self._fetch(endpoint, {"page": 0, "page_size": page_size})
+            first_data = first.json()
+            page_total = _page_total(first, page_size)
+            pages = [first_data] + [None] * (page_total - 1)
 
+            async def fetch_page(index: int) -> List[Dict[str, Any]]:
+                return (await self._fetch(endpoint, {"page": index, "page_size": page_size})).json()
+
+            await self._fetch_pages(endpoint, pages, fetch_page, range(1, page_total))
+
+        results = [entry for page in pages if page for entry in page]
         logger.info(f"Completed pagination for {endpoint}: {len(results)} total items")
         return results
 
-    async def get_build_id(self) -> int:
+    async def _fetch_pages(
+        self,
+        endpoint: str,
+        pages: List[Optional[List[Dict[str, Any]]]],
+        fetch_page: Callable[[int], Awaitable[List[Dict[str, Any]]]],
+        indexes: Iterable[int],
+    ) -> None:
+        """Remplit ``pages[i]`` pour chaque index; une page en échec est journalisée et laissée vide."""
+        semaphore = asyncio.Semaphore(self.page_concurrency)
+        total = len(pages)
+        done = 0
+
+        async def run(index: int) -> None:
+            nonlocal done
+            async with semaphore:
+                try:
+                    pages[index] = await fetch_page(index)
+                except Exception as e:
+                    logger.error(f"Failed to fetch batch {index + 1}/{total} for {endpoint}: {e}")
+                    return
+            done += 1
+            # Progress logging for large datasets
+            if total > 10 and done % 10 == 0:
+                logger.info(f"Fetched {done}/{total} batches for {endpoint}")
+
+        await asyncio.gather(*(run(index) for index in indexes))
+
+    async def get_build_id(self, use_cache: bool = True) -> int:
         """Récupère l'identifiant de build du jeu depuis l'API GW2.
 
         L'endpoint /v2/build peut renvoyer soit un entier brut, soit un
         objet JSON de la forme {"id": 191645}. Cette méthode gère les deux
         formats et lève Gw2ApiError en cas de payload inattendu.
+
+        Args:
+            use_cache: Utiliser le cache mémoire (False pour détecter un patch)
         """
 
-        payload = await self._request("build")
+        payload = await self._request("build", use_cache=use_cache)
 
         # Ancien format: entier direct
         if isinstance(payload, int):
@@ -489,9 +823,12 @@ class GW2APIClient:
                 "error": str(e),
             }
 
-    def clear_cache(self) -> None:
-        """Vide le cache."""
+    def clear_cache(self, disk: bool = False) -> None:
+        """Vide le cache mémoire (et le cache disque si ``disk``)."""
         self._cache.clear()
+        if disk and self._disk_cache is not None:
+            self._disk_cache.clear()
+            self._build_checked_until = 0.0
         logger.info("API cache cleared")
 
     def get_cache_stats(self) -> Dict[str, Any]:
@@ -501,4 +838,32 @@ class GW2APIClient:
         Returns:
             Statistiques du cache
         """
-        return {"cache_size": len(self._cache), "cache_ttl_hours": self._cache_ttl.total_seconds() / 3600}
+        return {
+            "cache_size": len(self._cache),
+            "cache_max_entries": self._cache.max_entries,
+            "cache_ttl_hours": self._cache.ttl_seconds / 3600,
+            "hits": self._cache.hits,
+            "misses": self._cache.misses,
+            "hit_rate": self._cache.hit_rate,
+            "disk_cache": self._disk_cache.get_stats() if self._disk_cache is not None else None,
+        }
+
+
+# Client partagé par le processus (pool de connexions et cache communs)
+_gw2_api_client: Optional[GW2APIClient] = None
+
+
+def get_gw2_api_client() -> GW2APIClient:
+    """Get or create the shared GW2APIClient."""
+    global _gw2_api_client
+    if _gw2_api_client is None:
+        _gw2_api_client = GW2APIClient()
+    return _gw2_api_client
+
+
+async def close_gw2_api_client() -> None:
+    """Close the shared client's connection pool (application shutdown)."""
+    global _gw2_api_client
+    if _gw2_api_client is not None:
+        await _gw2_api_client.aclose()
+        _gw2_api_client = None
@@ -1,14 +1,14 @@
 from __future__ import annotations
 
-import base64
-from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from app.core.logging import logger
-from app.services.gw2_api_client import GW2APIClient
+from app.services.gw2_api_client import GW2APIClient, get_gw2_api_client
+from app.services.chat_code import BuildTemplate, decode_build_template, decode_build_templates
+from app.services.gw2_entity_resolver import GW2EntityResolver, unique_ids
 
 
-BUILD_TEMPLATE_TYPE = 0x0D
-
 # Mapping from build template profession codes to GW2 profession IDs
 _PROFESSION_CODE_MAP: Dict[int, str] = {
     1: "Guardian",
@@ -38,91 +38,27 @@ class ChatCodeDecoder:
     """
 
     def __init__(self, gw2_client: Optional[GW2APIClient] = None) -> None:
-        self.gw2_client = gw2_client or GW2APIClient()
+        self.gw2_client = gw2_client or get_gw2_api_client()
+        self.entity_resolver = GW2EntityResolver(self.gw2_client)
 
     # ------------------------------------------------------------------
     # Low-level binary decoding
     # ------------------------------------------------------------------
-    def _decode_raw(self, code: str) -> Tuple[int, List[int], List[List[int]], List[int]]:
-        """Return (profession_code, specialization_ids, trait_choices, palette_ids)."""
-
-        if not code:
-            raise ValueError("Empty chat code")
-
-        text = code.strip()
-        if text.startswith("[&") and text.endswith("]"):
-            inner = text[2:-1]
-        else:
-            inner = text
-
-        try:
-            raw = base64.b64decode(inner)
-        except Exception as exc:  # pragma: no cover - defensive
-            raise ValueError(f"Invalid base64 chat code: {exc}") from exc
-
-        if len(raw) < 2:
-            raise ValueError("Chat code payload too short")
-
-        if raw[0] != BUILD_TEMPLATE_TYPE:
-            raise ValueError(f"Unsupported chat code type: 0x{raw[0]:02X}")
-
-        # Profession code (1..9)
-        offset = 1
-        profession_code = int(raw[offset])
-        offset += 1
-
-        # Three specialization lines: (spec_id, trait-byte)
-        specialization_ids: List[int] = []
-        trait_choices: List[List[int]] = []
-
-        for _ in range(3):
-            if offset + 2 > len(raw):
-                specialization_ids.append(0)
-                trait_choices.append([0, 0, 0])
-                continue
-
-            spec_id = int(raw[offset])
-            traits_byte = int(raw[offset + 1])
-            offset += 2
-
-            # Traits byte packs 3 two-bit choices in reverse order
-            # Bits (b7..b0): [x x t3_hi t3_lo t2_hi t2_lo t1_hi t1_lo]
-            first = traits_byte & 0b11
-            second = (traits_byte >> 2) & 0b11
-            third = (traits_byte >> 4) & 0b11
-
-            specialization_ids.append(spec_id)
-            trait_choices.append([first, second, third])
-
-        # Ten 16-bit little-endian palette IDs (heal/utility/elite x land/water)
-        palette_ids: List[int] = []
-        for _ in range(10):
-            if offset + 2 > len(raw):
-                break
-            low = raw[offset]
-            high = raw[offset + 1]
-            offset += 2
-            palette_ids.append(int(low | (high << 8)))
-
-        logger.debug(
-            "Decoded raw chat code",
-            extra={
-                "profession_code": profession_code,
-                "specialization_ids": specialization_ids,
-                "trait_choices": trait_choices,
-                "palette_ids": palette_ids,
-            },
-        )
+    def _decode_raw(self, code: str) -> BuildTemplate:
+        """Decode the binary template (profession, specializations, trait choices, palette IDs)."""
 
-        return profession_code, specialization_ids, trait_choices, palette_ids
+        return decode_build_template(code)
 
     # ------------------------------------------------------------------
     # High-level decoding to specialization/trait/skill IDs
     # ------------------------------------------------------------------
-    async def _resolve_traits(
-        self, specialization_ids: List[int], trait_choices: List[List[int]]
+    @staticmethod
+    def _traits_from_specs(
+        specialization_ids: Sequence[int],
+        trait_choices: Sequence[Sequence[int]],
+        specs_by_id: Dict[int, Dict[str, Any]],
     ) -> Tuple[Optional[int], List[int]]:
-        """Resolve trait IDs from spec IDs + trait choices.
+        """Resolve trait IDs from spec IDs + trait choices, given the resolved specializations.
 
         Returns (primary_specialization_id, trait_ids).
         The primary specialization prefers an elite spec if present.
@@ -135,7 +71,7 @@ class ChatCodeDecoder:
             if not spec_id:
                 continue
 
-            spec_data = await self.gw2_client.get_specialization_details(spec_id)
+            spec_data = specs_by_id.get(spec_id)
             if not spec_data:
                 continue
 
@@ -156,36 +92,13 @@ class ChatCodeDecoder:
                     if isinstance(tid, int):
                         trait_ids.append(tid)
 
-        # Deduplicate while preserving order
-        seen: set[int] = set()
-        unique: List[int] = []
-        for tid in trait_ids:
-            if tid not in seen:
-                seen.add(tid)
-                unique.append(tid)
-
-        return primary_spec_id, unique
-
-    async def _resolve_skills(self, profession_code: int, palette_ids: List[int]) -> List[int]:
-        """Resolve palette IDs to GW2 skill IDs via /v2/professions (v=latest)."""
-
-        profession_name = _PROFESSION_CODE_MAP.get(profession_code)
-        if not profession_name:
-            logger.warning("Unknown profession code in chat code", extra={"profession_code": profession_code})
-            return []
-
-        try:
-            data = await self.gw2_client.get_profession_with_skills(profession_name)
-        except Exception as exc:  # pragma: no cover - network failures
-            logger.error(
-                "Failed to fetch profession for palette resolution",
-                extra={"profession": profession_name, "error": str(exc)},
-            )
-            return []
+        return primary_spec_id, unique_ids(trait_ids)
 
-        raw_mapping = data.get("skills_by_palette") or {}
+    @staticmethod
+    def _palette_map(profession_data: Dict[str, Any]) -> Dict[int, Any]:
+        """Normalize ``skills_by_palette`` of a /v2/professions payload into a dict[int, Any]."""
 
-        # Normalize skills_by_palette into a dict[int, Any]
+        raw_mapping = profession_data.get("skills_by_palette") or {}
         palette_map: Dict[int, Any] = {}
         if isinstance(raw_mapping, dict):
             for key, value in raw_mapping.items():
@@ -206,7 +119,10 @@ class ChatCodeDecoder:
                     if not isinstance(pid, int):
                         continue
                     palette_map[pid] = entry
+        return palette_map
 
+    @staticmethod
+    def _skills_from_palette(palette_map: Dict[int, Any], palette_ids: Sequence[int]) -> List[int]:
         skill_ids: List[int] = []
 
         for pid in palette_ids:
@@ -227,42 +143,91 @@ class ChatCodeDecoder:
             if isinstance(sid, int):
                 skill_ids.append(sid)
 
-        # Deduplicate while preserving order
-        seen: set[int] = set()
-        unique_skills: List[int] = []
-        for sid in skill_ids:
-            if sid not in seen:
-                seen.add(sid)
-                unique_skills.append(sid)
+        return unique_ids(skill_ids)
+
+    async def _load_palette_map(self, profession_code: int) -> Dict[int, Any]:
+        """Palette ID -> skill mapping of a profession via /v2/professions (v=latest)."""
+
+        profession_name = _PROFESSION_CODE_MAP.get(profession_code)
+        if not profession_name:
+            logger.warning("Unknown profession code in chat code", extra={"profession_code": profession_code})
+            return {}
+
+        try:
+            data = await self.gw2_client.get_profession_with_skills(profession_name)
+        except Exception as exc:  # pragma: no cover - network failures
+            logger.error(
+                "Failed to fetch profession for palette resolution",
+                extra={"profession": profession_name, "error": str(exc)},
+            )
+            return {}
+
+        return self._palette_map(data)
+
+    async def _resolve_batch(self, templates: List[BuildTemplate]) -> List[Dict[str, Any]]:
+        """Resolve decoded templates together: each spec and profession is looked up once per batch."""
 
-        return unique_skills
+        profession_codes = unique_ids(t.profession_code for t in templates)
+        specs_by_id, *palette_maps = await asyncio.gather(
+            self.entity_resolver.resolve_specializations(sid for t in templates for sid in t.specialization_ids),
+            *(self._load_palette_map(code) for code in profession_codes),
+        )
+        palettes = dict(zip(profession_codes, palette_maps))
+
+        results: List[Dict[str, Any]] = []
+        for template in templates:
+            primary_spec_id, trait_ids = self._traits_from_specs(
+                template.specialization_ids, template.trait_choices, specs_by_id
+            )
+            results.append(
+                {
+                    "profession_code": template.profession_code,
+                    "specialization_id": primary_spec_id,
+                    "trait_ids": trait_ids,
+                    "skill_ids": self._skills_from_palette(
+                        palettes.get(template.profession_code, {}), template.palette_ids
+                    ),
+                }
+            )
+        return results
 
     async def decode_build(self, code: str) -> Dict[str, Any]:
         """Decode a chat code into specialization_id, trait_ids and skill_ids."""
 
-        profession_code, spec_ids, trait_choices, palette_ids = self._decode_raw(code)
-        primary_spec_id, trait_ids = await self._resolve_traits(spec_ids, trait_choices)
-        skill_ids = await self._resolve_skills(profession_code, palette_ids)
-
-        result: Dict[str, Any] = {
-            "profession_code": profession_code,
-            "specialization_id": primary_spec_id,
-            "trait_ids": trait_ids,
-            "skill_ids": skill_ids,
-        }
+        (result,) = await self._resolve_batch([self._decode_raw(code)])
 
         logger.info(
             "Decoded build chat code",
             extra={
-                "profession_code": profession_code,
-                "specialization_id": primary_spec_id,
-                "n_traits": len(trait_ids),
-                "n_skills": len(skill_ids),
+                "profession_code": result["profession_code"],
+                "specialization_id": result["specialization_id"],
+                "n_traits": len(result["trait_ids"]),
+                "n_skills": len(result["skill_ids"]),
             },
         )
 
         return result
 
+    async def decode_builds(self, codes: Sequence[str]) -> List[Optional[Dict[str, Any]]]:
+        """Decode many chat codes at once (sync jobs, meta-build imports).
+
+        Every specialization referenced by the batch is resolved in a single
+        lookup and every profession palette is fetched once, however many
+        codes share them. Results follow the order of ``codes``; an invalid
+        code yields None instead of failing the whole batch.
+        """
+
+        templates = decode_build_templates(codes)
+        decoded = [t for t in templates if t is not None]
+        if len(decoded) < len(templates):
+            logger.warning("Skipping invalid chat codes", extra={"n_invalid": len(templates) - len(decoded)})
+
+        resolved = iter(await self._resolve_batch(decoded) if decoded else [])
+        results: List[Optional[Dict[str, Any]]] = [next(resolved) if t is not None else None for t in templates]
+
+        logger.info("Decoded build chat codes", extra={"n_codes": len(codes), "n_decoded": len(decoded)})
+        return results
+
 
 async def decode_chat_code(code: str) -> Dict[str, Any]:
     """Convenience wrapper to decode a build chat code in one call."""
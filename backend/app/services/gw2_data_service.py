@@ -19,8 +19,8 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Set, Tuple
 
 from app.core.logging import logger
-from app.services.gw2_api_client import GW2APIClient
-from app.services.gw2_data_store import GW2DataStore
+from app.services.gw2_api_client import GW2APIClient, get_gw2_api_client
+from app.services.gw2_data_store import GW2DataStore, get_gw2_data_store, register_reload_listener
 from app.services.meta_build_catalog import (
     MetaBuild,
     find_closest_meta_build,
@@ -165,8 +165,8 @@ class Gw2DataService:
         data_store: Optional[GW2DataStore] = None,
         meta_builds_path: Optional[Path] = None,
     ) -> None:
-        self.api_client = api_client or GW2APIClient()
-        self.data_store = data_store or GW2DataStore()
+        self.api_client = api_client or get_gw2_api_client()
+        self._data_store = data_store
         
         # Load meta builds if path provided
         if meta_builds_path and meta_builds_path.exists():
@@ -181,7 +181,21 @@ class Gw2DataService:
         self._profession_by_name: Dict[str, Dict[str, Any]] = {}
         
         self._indexes_built = False
-    
+
+    @property
+    def data_store(self) -> GW2DataStore:
+        """Injected store, else the current shared store (replaced on every data reload)."""
+        return self._data_store or get_gw2_data_store()
+    
+    def reset_indexes(self) -> None:
+        """Drop the lookup indexes (rebuilt on next access, e.g. after a data reload)."""
+        self._spec_by_id = {}
+        self._spec_by_name = {}
+        self._trait_by_id = {}
+        self._skill_by_id = {}
+        self._profession_by_name = {}
+        self._indexes_built = False
+
     def _build_indexes(self) -> None:
         """Build lookup indexes from local data store."""
         if self._indexes_built:
@@ -488,11 +502,15 @@ class Gw2DataService:
                 seen_specs.add(mb.specialization)
         
         # Find closest meta build to user's build
+        user_build = user_build_data or {}
         closest_meta = find_closest_meta_build(
             profession=profession,
             specialization=specialization,
             role=role,
             game_mode=game_mode,
+            chat_code=user_build.get("chat_code"),
+            trait_ids=user_build.get("trait_ids"),
+            skill_ids=user_build.get("skill_ids"),
         )
         
         # Calculate diff if we have user build data and a closest meta
@@ -618,12 +636,14 @@ class Gw2DataService:
             context=context,
         )
         
-        # Find closest meta build
+        # Find closest meta build (nearest traits/skills among the matching ones)
         closest_meta = find_closest_meta_build(
             profession=profession,
             specialization=spec_name,
             role=role_analysis.primary_role,
             game_mode="wvw",
+            trait_ids=trait_ids,
+            skill_ids=skill_ids,
         )
         
         if not closest_meta:
@@ -896,4 +916,5 @@ def get_gw2_data_service() -> Gw2DataService:
         base_dir = Path(__file__).resolve().parents[2]
         meta_path = base_dir / "data" / "meta_builds_wvw.json"
         _gw2_data_service = Gw2DataService(meta_builds_path=meta_path)
+        register_reload_listener(_gw2_data_service.reset_indexes)
     return _gw2_data_service
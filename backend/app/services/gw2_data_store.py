@@ -1,17 +1,123 @@
 from __future__ import annotations
 
 import json
+import sys
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
 
 from app.core.logging import logger
+from app.core.metrics import track_static_data_memory
+
+
+# Rarity prefixes and articles stripped from upgrade names ("Superior Rune of the Scholar" -> "Scholar")
+_UPGRADE_RARITY_PREFIXES = ("Superior ", "Major ", "Minor ")
+_UPGRADE_ARTICLES = ("the ", "The ")
+_UPGRADE_MARKERS = {"rune": "Rune of ", "sigil": "Sigil of ", "relic": "Relic of "}
+
+# Data files of the dump (without .json)
+DATASETS = (
+    "professions",
+    "specializations",
+    "traits",
+    "skills",
+    "items",
+    "upgrade_components",
+    "relics",
+    "itemstats",
+)
+
+# Datasets loaded at startup: the ones optimizers and build analysis hit on every request
+WARMUP_DATASETS = ("professions", "specializations", "traits", "upgrade_components", "itemstats")
+
+# Dataset name -> GW2DataStore loader method
+_DATASET_LOADERS = {
+    "skills": "get_skills",
+    "items": "get_items",
+    "upgrade_components": "get_upgrade_components",
+    "itemstats": "get_itemstats",
+    "relics": "get_relics",
+    "professions": "get_professions",
+    "specializations": "get_specializations",
+    "traits": "get_traits",
+}
+
+
+def default_data_dir() -> Path:
+    return Path(__file__).resolve().parents[2] / "data" / "gw2"
+
+
+def normalize_name(name: str) -> str:
+    """Lookup key for a GW2 name: case-insensitive, whitespace-collapsed."""
+    return " ".join(name.split()).casefold()
+
+
+def short_upgrade_name(full_name: str, marker: str) -> Optional[str]:
+    """Short registry name of an upgrade ("Superior Sigil of Force", "Sigil of " -> "Force")."""
+    name = full_name or ""
+    if marker in name:
+        name = name.split(marker, 1)[1]
+
+    for prefix in _UPGRADE_RARITY_PREFIXES:
+        if name.startswith(prefix):
+            name = name[len(prefix) :]
+
+    for article in _UPGRADE_ARTICLES:
+        if name.startswith(article):
+            name = name[len(article) :]
+
+    name = name.strip()
+    return name or None
+
+
+@dataclass
+class DataIndex:
+    """Lookup tables over one GW2 data file, built once when the file is loaded.
+
+    ``by_type`` uses the entry ``type`` field (e.g. "UpgradeComponent") and
+    ``by_subtype`` its ``details.type`` (e.g. "Rune", "Sigil", "Gem").
+    """
+
+    by_id: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+    by_name: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    by_type: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    by_subtype: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, entries: List[Dict[str, Any]]) -> "DataIndex":
+        index = cls()
+        for entry in entries:
+            entry_id = entry.get("id")
+            if isinstance(entry_id, int):
+                index.by_id.setdefault(entry_id, entry)
+
+            name = entry.get("name")
+            if isinstance(name, str) and name:
+                index.by_name.setdefault(normalize_name(name), []).append(entry)
+
+            entry_type = entry.get("type")
+            if isinstance(entry_type, str):
+                index.by_type.setdefault(entry_type, []).append(entry)
+
+            details = entry.get("details")
+            subtype = details.get("type") if isinstance(details, dict) else None
+            if isinstance(subtype, str):
+                index.by_subtype.setdefault(subtype, []).append(entry)
+        return index
 
 
 class GW2DataStore:
+    """Local GW2 data dump (backend/data/gw2), loaded lazily file by file.
+
+    Every file is indexed by id, normalized name, type and subtype when it is
+    first loaded, so lookups never rescan the lists. Returned entries and lists
+    are shared between callers and must be treated as read-only.
+    """
+
     def __init__(self, data_dir: Optional[Path] = None) -> None:
         if data_dir is None:
-            base_dir = Path(__file__).resolve().parents[2]
-            data_dir = base_dir / "data" / "gw2"
+            data_dir = default_data_dir()
         self.data_dir = data_dir
 
         self._skills: Optional[List[Dict[str, Any]]] = None
@@ -23,6 +129,13 @@ class GW2DataStore:
         self._specializations: Optional[List[Dict[str, Any]]] = None
         self._traits: Optional[List[Dict[str, Any]]] = None
 
+        self._indexes: Dict[str, DataIndex] = {}
+        # Upgrades by short registry name ("Scholar", "Force", "Fireworks"), per kind
+        self._upgrades_by_short_name: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        self._upgrade_short_names: Dict[str, FrozenSet[str]] = {}
+        self._runes: Optional[List[Dict[str, Any]]] = None
+        self._sigils: Optional[List[Dict[str, Any]]] = None
+
     def _load_list(self, filename: str) -> List[Dict[str, Any]]:
         path = self.data_dir / f"{filename}.json"
         if not path.exists():
@@ -42,30 +155,33 @@ class GW2DataStore:
         logger.warning("GW2DataStore: file %s does not contain a list", path)
         return []
 
+    def _indexed(self, dataset: str, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        self._indexes[dataset] = DataIndex.build(entries)
+        return entries
+
     def get_skills(self) -> List[Dict[str, Any]]:
         if self._skills is None:
-            self._skills = self._load_list("skills")
+            self._skills = self._indexed("skills", self._load_list("skills"))
         return self._skills
 
     def get_items(self) -> List[Dict[str, Any]]:
         if self._items is None:
-            self._items = self._load_list("items")
+            self._items = self._indexed("items", self._load_list("items"))
         return self._items
 
     def get_upgrade_components(self) -> List[Dict[str, Any]]:
         if self._upgrade_components is None:
             components = self._load_list("upgrade_components")
             if not components:
-                items = self.get_items()
-                components = [it for it in items if it.get("type") == "UpgradeComponent"]
+                components = self.get_items_by_type("UpgradeComponent")
                 if components:
                     logger.info("GW2DataStore: derived upgrade_components from items.json")
-            self._upgrade_components = components
+            self._upgrade_components = self._indexed("upgrade_components", components)
         return self._upgrade_components
 
     def get_itemstats(self) -> List[Dict[str, Any]]:
         if self._itemstats is None:
-            self._itemstats = self._load_list("itemstats")
+            self._itemstats = self._indexed("itemstats", self._load_list("itemstats"))
         return self._itemstats
 
     def get_relics(self) -> List[Dict[str, Any]]:
@@ -78,46 +194,244 @@ class GW2DataStore:
         if self._relics is None:
             relics = self._load_list("relics")
             if not relics:
-                items = self.get_items()
-                relics = [it for it in items if it.get("type") == "Relic"]
+                relics = self.get_items_by_type("Relic")
                 if relics:
                     logger.info("GW2DataStore: derived relics from items.json")
-            self._relics = relics
+            self._relics = self._indexed("relics", relics)
         return self._relics
 
     def get_professions(self) -> List[Dict[str, Any]]:
         if self._professions is None:
-            self._professions = self._load_list("professions")
+            self._professions = self._indexed("professions", self._load_list("professions"))
         return self._professions
 
     def get_specializations(self) -> List[Dict[str, Any]]:
         if self._specializations is None:
-            self._specializations = self._load_list("specializations")
+            self._specializations = self._indexed("specializations", self._load_list("specializations"))
         return self._specializations
 
     def get_traits(self) -> List[Dict[str, Any]]:
         if self._traits is None:
-            self._traits = self._load_list("traits")
+            self._traits = self._indexed("traits", self._load_list("traits"))
         return self._traits
 
     def get_runes(self) -> List[Dict[str, Any]]:
-        components = self.get_upgrade_components()
-        runes: List[Dict[str, Any]] = []
-        for c in components:
-            name = c.get("name")
-            if not isinstance(name, str):
-                continue
-            if "Rune of " in name:
-                runes.append(c)
-        return runes
+        if self._runes is None:
+            self._runes = self._filter_upgrades("Rune of ")
+        return self._runes
 
     def get_sigils(self) -> List[Dict[str, Any]]:
-        components = self.get_upgrade_components()
-        sigils: List[Dict[str, Any]] = []
-        for c in components:
-            name = c.get("name")
-            if not isinstance(name, str):
-                continue
-            if "Sigil of " in name:
-                sigils.append(c)
-        return sigils
+        if self._sigils is None:
+            self._sigils = self._filter_upgrades("Sigil of ")
+        return self._sigils
+
+    def _filter_upgrades(self, marker: str) -> List[Dict[str, Any]]:
+        return [
+            c
+            for c in self.get_upgrade_components()
+            if isinstance(c.get("name"), str) and marker in c["name"]
+        ]
+
+    # ------------------------------------------------------------------
+    # Indexed lookups
+    # ------------------------------------------------------------------
+
+    def get_index(self, dataset: str) -> DataIndex:
+        """Index of a data file ("traits", "upgrade_components", ...), loading it if needed."""
+        if dataset not in self._indexes:
+            loader = _DATASET_LOADERS.get(dataset)
+            if loader is None:
+                raise KeyError(f"Unknown GW2 dataset: {dataset}")
+            getattr(self, loader)()
+        return self._indexes[dataset]
+
+    def get_by_id(self, dataset: str, entry_id: int) -> Optional[Dict[str, Any]]:
+        return self.get_index(dataset).by_id.get(entry_id)
+
+    def find_by_name(self, dataset: str, name: str) -> List[Dict[str, Any]]:
+        """Entries whose name matches (case- and whitespace-insensitive)."""
+        return self.get_index(dataset).by_name.get(normalize_name(name), [])
+
+    def get_items_by_type(self, item_type: str) -> List[Dict[str, Any]]:
+        return self.get_index("items").by_type.get(item_type, [])
+
+    def get_upgrade_components_by_subtype(self, subtype: str) -> List[Dict[str, Any]]:
+        """Upgrade components by ``details.type`` ("Rune", "Sigil", "Gem", "Default")."""
+        return self.get_index("upgrade_components").by_subtype.get(subtype, [])
+
+    def get_trait(self, trait_id: int) -> Optional[Dict[str, Any]]:
+        return self.get_by_id("traits", trait_id)
+
+    def get_skill(self, skill_id: int) -> Optional[Dict[str, Any]]:
+        return self.get_by_id("skills", skill_id)
+
+    def get_specialization(self, spec_id: int) -> Optional[Dict[str, Any]]:
+        return self.get_by_id("specializations", spec_id)
+
+    def get_upgrade_component(self, component_id: int) -> Optional[Dict[str, Any]]:
+        return self.get_by_id("upgrade_components", component_id)
+
+    def _short_name_index(self, kind: str) -> Dict[str, List[Dict[str, Any]]]:
+        index = self._upgrades_by_short_name.get(kind)
+        if index is None:
+            entries = {"rune": self.get_runes, "sigil": self.get_sigils, "relic": self.get_relics}[kind]()
+            marker = _UPGRADE_MARKERS[kind]
+            index = {}
+            for entry in entries:
+                name = entry.get("name")
+                if not isinstance(name, str):
+                    continue
+                short = short_upgrade_name(name, marker)
+                if short:
+                    index.setdefault(short, []).append(entry)
+            self._upgrades_by_short_name[kind] = index
+            self._upgrade_short_names[kind] = frozenset(index)
+        return index
+
+    def _short_names(self, kind: str) -> FrozenSet[str]:
+        self._short_name_index(kind)
+        return self._upgrade_short_names[kind]
+
+    def get_rune_names(self) -> FrozenSet[str]:
+        """Short names of the runes in the dump ("Scholar", "Strength", ...)."""
+        return self._short_names("rune")
+
+    def get_sigil_names(self) -> FrozenSet[str]:
+        """Short names of the sigils in the dump ("Force", "Impact", ...)."""
+        return self._short_names("sigil")
+
+    def get_relic_names(self) -> FrozenSet[str]:
+        """Short names of the relics in the dump ("Fireworks", "Monk", ...)."""
+        return self._short_names("relic")
+
+    def find_rune(self, short_name: str) -> List[Dict[str, Any]]:
+        """Rune items matching a short registry name (every rarity)."""
+        return self._short_name_index("rune").get(short_name, [])
+
+    def find_sigil(self, short_name: str) -> List[Dict[str, Any]]:
+        """Sigil items matching a short registry name (every rarity)."""
+        return self._short_name_index("sigil").get(short_name, [])
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def loaded_datasets(self) -> Tuple[str, ...]:
+        return tuple(dataset for dataset in DATASETS if dataset in self._indexes)
+
+    def warmup(self, datasets: Iterable[str] = WARMUP_DATASETS) -> Dict[str, int]:
+        """Load and index datasets ahead of the first request.
+
+        Returns:
+            Number of entries per dataset
+        """
+        counts = {dataset: len(getattr(self, _DATASET_LOADERS[dataset])()) for dataset in datasets}
+        # Short upgrade names used by BuildEquipmentOptimizer for every slot
+        if "upgrade_components" in counts:
+            for kind in ("rune", "sigil"):
+                self._short_names(kind)
+        return counts
+
+    def memory_usage(self) -> Dict[str, int]:
+        """Approximate deep size in bytes of every loaded dataset (entries and index)."""
+        usage: Dict[str, int] = {}
+        for dataset in self.loaded_datasets:
+            entries = getattr(self, f"_{dataset}")
+            usage[dataset] = _deep_sizeof(entries) + _deep_sizeof(self._indexes[dataset], exclude=entries)
+        return usage
+
+
+def _deep_sizeof(root: Any, exclude: Any = None) -> int:
+    """Total sys.getsizeof of a JSON-like object graph, counting shared objects once.
+
+    Containers reachable from ``exclude`` (e.g. the entries an index points
+    to) are not counted.
+    """
+    seen: Set[int] = set()
+    if exclude is not None:
+        seen.add(id(exclude))
+        seen.update(id(entry) for entry in exclude)
+
+    total = 0
+    stack = [root]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif isinstance(obj, DataIndex):
+            stack.extend((obj.by_id, obj.by_name, obj.by_type, obj.by_subtype))
+    return total
+
+
+# Process-wide store: every consumer shares the same parsed data and indexes.
+# Consumers look it up on each use; reload_gw2_data_store swaps in a new one.
+_gw2_data_store: Optional[GW2DataStore] = None
+_reload_listeners: List[Callable[[], None]] = []
+_store_lock = threading.Lock()
+
+
+def get_gw2_data_store() -> GW2DataStore:
+    """Get or create the process-wide GW2DataStore."""
+    global _gw2_data_store
+    if _gw2_data_store is None:
+        with _store_lock:
+            if _gw2_data_store is None:
+                _gw2_data_store = GW2DataStore()
+    return _gw2_data_store
+
+
+def register_reload_listener(listener: Callable[[], None]) -> None:
+    """Call ``listener`` after every reload of the shared store (to drop derived caches)."""
+    if listener not in _reload_listeners:
+        _reload_listeners.append(listener)
+
+
+def _record_memory(store: GW2DataStore) -> Dict[str, int]:
+    usage = store.memory_usage()
+    track_static_data_memory(usage, {dataset: len(getattr(store, f"_{dataset}")) for dataset in usage})
+    return usage
+
+
+def warmup_gw2_data_store(datasets: Iterable[str] = WARMUP_DATASETS) -> Dict[str, int]:
+    """Load the shared store at application startup and publish its memory usage."""
+    store = get_gw2_data_store()
+    with _store_lock:
+        counts = store.warmup(datasets)
+        usage = _record_memory(store)
+    logger.info(
+        "GW2DataStore warmed up: %s (%.1f MB)",
+        ", ".join(f"{name}={count}" for name, count in counts.items()),
+        sum(usage.values()) / 1_000_000,
+    )
+    return counts
+
+
+def reload_gw2_data_store() -> Dict[str, int]:
+    """Replace the shared store with a fresh one read from disk (new data import).
+
+    The new store loads the same datasets as the current one before it is
+    published, so readers keep using a complete store throughout. Listeners
+    are notified once the new store is in place.
+    """
+    global _gw2_data_store
+    current = get_gw2_data_store()
+    fresh = GW2DataStore(data_dir=current.data_dir)
+    counts = fresh.warmup(current.loaded_datasets)
+    with _store_lock:
+        _gw2_data_store = fresh
+        _record_memory(fresh)
+    for listener in list(_reload_listeners):
+        try:
+            listener()
+        except Exception as exc:  # pragma: no cover - a listener must not block the reload
+            logger.error("GW2DataStore reload listener %r failed: %s", listener, exc)
+    logger.info("GW2DataStore reloaded: %s", counts)
+    return counts
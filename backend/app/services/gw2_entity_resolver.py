@@ -0,0 +1,116 @@
+"""
+Résolution groupée d'IDs GW2 (traits, spécialisations, skills).
+
+Les IDs demandés sont dédupliqués puis servis en priorité par les données
+statiques locales indexées (GW2DataStore); seuls les IDs absents partent vers
+l'API, en requêtes multi-ids (``?ids=1,2,3``, 200 IDs max par requête) avec
+une concurrence bornée. Une build complète (spécialisations, 9 traits,
+skills) coûte ainsi au plus une requête par type d'entité au lieu d'une par ID.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.services.gw2_api_client import GW2APIClient, get_gw2_api_client
+from app.services.gw2_data_store import GW2DataStore, get_gw2_data_store
+
+
+# Limite de l'API GW2 pour le paramètre ids
+MAX_IDS_PER_REQUEST = 200
+
+
+def unique_ids(ids: Iterable[Any]) -> List[int]:
+    """IDs entiers non nuls, dédupliqués dans leur ordre d'apparition."""
+    return list(dict.fromkeys(i for i in ids if isinstance(i, int) and not isinstance(i, bool) and i))
+
+
+class GW2EntityResolver:
+    """Résout des lots d'IDs GW2: données locales d'abord, puis API multi-ids."""
+
+    def __init__(
+        self,
+        gw2_client: Optional[GW2APIClient] = None,
+        data_store: Optional[GW2DataStore] = None,
+        concurrency: Optional[int] = None,
+    ) -> None:
+        self.gw2_client = gw2_client or get_gw2_api_client()
+        self._data_store = data_store
+        self.concurrency = max(1, concurrency or settings.GW2_API_PAGE_CONCURRENCY)
+
+    @property
+    def data_store(self) -> GW2DataStore:
+        """Store injecté, sinon le store partagé courant (remplacé à chaque rechargement)."""
+        return self._data_store or get_gw2_data_store()
+
+    async def resolve_traits(self, trait_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        return await self._resolve("traits", trait_ids, self.gw2_client.get_traits)
+
+    async def resolve_specializations(self, spec_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        return await self._resolve("specializations", spec_ids, self.gw2_client.get_specializations)
+
+    async def resolve_skills(self, skill_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        return await self._resolve("skills", skill_ids, self.gw2_client.get_skills)
+
+    async def _resolve(
+        self,
+        dataset: str,
+        ids: Iterable[int],
+        fetch: Callable[[List[int]], Awaitable[List[Dict[str, Any]]]],
+    ) -> Dict[int, Dict[str, Any]]:
+        """Retourne {id: entrée} pour les IDs trouvés (les IDs inconnus sont absents)."""
+        resolved: Dict[int, Dict[str, Any]] = {}
+        missing: List[int] = []
+        for entry_id in unique_ids(ids):
+            local = self._local(dataset, entry_id)
+            if local is not None:
+                resolved[entry_id] = local
+            else:
+                missing.append(entry_id)
+
+        if missing:
+            resolved.update(await self._fetch(dataset, missing, fetch))
+            unresolved = [i for i in missing if i not in resolved]
+            if unresolved:
+                logger.warning(f"GW2 {dataset} not found: {unresolved}")
+        return resolved
+
+    def _local(self, dataset: str, entry_id: int) -> Optional[Dict[str, Any]]:
+        try:
+            return self.data_store.get_by_id(dataset, entry_id)
+        except Exception as e:  # pragma: no cover - données locales corrompues
+            logger.warning(f"Local GW2 {dataset} lookup failed for {entry_id}: {e}")
+            return None
+
+    async def _fetch(
+        self,
+        dataset: str,
+        ids: List[int],
+        fetch: Callable[[List[int]], Awaitable[List[Dict[str, Any]]]],
+    ) -> Dict[int, Dict[str, Any]]:
+        batches = [ids[i : i + MAX_IDS_PER_REQUEST] for i in range(0, len(ids), MAX_IDS_PER_REQUEST)]
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch_batch(batch: List[int]) -> List[Dict[str, Any]]:
+            async with semaphore:
+                try:
+                    return await fetch(batch) or []
+                except httpx.HTTPStatusError as e:
+                    # 404 sur un multi-ids: aucun des IDs n'existe
+                    if e.response.status_code != 404:
+                        logger.error(f"Failed to fetch GW2 {dataset} {batch}: {e}")
+                    return []
+                except Exception as e:
+                    logger.error(f"Failed to fetch GW2 {dataset} {batch}: {e}")
+                    return []
+
+        pages = await asyncio.gather(*(fetch_batch(batch) for batch in batches))
+        return {
+            entry["id"]: entry
+            for page in pages
+            for entry in page
+            if isinstance(entry, dict) and isinstance(entry.get("id"), int)
+        }
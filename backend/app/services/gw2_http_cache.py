@@ -0,0 +1,139 @@
+"""
+Cache HTTP persistant (sur disque) des réponses de l'API GW2.
+
+Les corps de réponse sont stockés avec leurs validateurs (ETag,
+Last-Modified) et les en-têtes utiles (pagination), un fichier par requête,
+sous un répertoire par build du jeu:
+
+    <cache_dir>/<build_id>/<sha256(url + params)>.json
+
+Une entrée récente (``fresh_seconds``) est servie telle quelle; au-delà, le
+client la revalide par requête conditionnelle (If-None-Match /
+If-Modified-Since) et un 304 ré-arme l'entrée sans retélécharger le corps.
+Un changement de build (patch du jeu) bascule sur un répertoire vide et
+supprime les anciens: tout est invalidé d'un coup.
+"""
+
+import hashlib
+import json
+import shutil
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Optional
+
+import aiofiles
+
+from app.core.logging import logger
+from app.core.metrics import track_gw2_api_disk_cache_lookup
+
+
+# En-têtes de réponse conservés avec le corps (validateurs et pagination)
+STORED_HEADERS = ("ETag", "Last-Modified", "Content-Type", "X-Page-Total", "X-Page-Size", "X-Result-Total")
+
+
+@dataclass
+class CachedResponse:
+    """Réponse HTTP stockée sur disque."""
+
+    url: str
+    body: str
+    headers: Dict[str, str] = field(default_factory=dict)
+    stored_at: float = 0.0
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.headers.get("ETag")
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self.headers.get("Last-Modified")
+
+    def is_fresh(self, fresh_seconds: float) -> bool:
+        return time.time() - self.stored_at < fresh_seconds
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """En-têtes de revalidation (vide si la réponse n'avait aucun validateur)."""
+        headers: Dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class DiskHTTPCache:
+    """Cache de réponses GW2 sur disque, partitionné par build du jeu."""
+
+    def __init__(self, cache_dir: Path, fresh_seconds: float = 3600.0):
+        self.cache_dir = Path(cache_dir)
+        self.fresh_seconds = fresh_seconds
+        self.build_id: Optional[int] = None
+        self.stats: Dict[str, int] = {"hit": 0, "revalidated": 0, "changed": 0, "miss": 0}
+
+    def set_build(self, build_id: int) -> None:
+        """Active le répertoire d'un build et supprime ceux des builds précédents."""
+        if build_id == self.build_id:
+            return
+        self.build_id = build_id
+        try:
+            (self.cache_dir / str(build_id)).mkdir(parents=True, exist_ok=True)
+            for entry in self.cache_dir.iterdir():
+                if entry.is_dir() and entry.name != str(build_id):
+                    shutil.rmtree(entry, ignore_errors=True)
+                    logger.info(f"GW2 HTTP cache: dropped entries of build {entry.name}")
+        except OSError as e:
+            logger.warning(f"GW2 HTTP cache: cannot prepare {self.cache_dir}: {e}")
+
+    def _path(self, key: str) -> Optional[Path]:
+        if self.build_id is None:
+            return None
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.cache_dir / str(self.build_id) / f"{digest}.json"
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        path = self._path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            async with aiofiles.open(path, "r", encoding="utf-8") as f:
+                return CachedResponse(**json.loads(await f.read()))
+        except Exception as e:
+            logger.warning(f"GW2 HTTP cache: ignoring unreadable entry {path.name}: {e}")
+            return None
+
+    async def set(self, key: str, url: str, body: str, headers: Dict[str, str]) -> None:
+        path = self._path(key)
+        if path is None:
+            return
+        entry = CachedResponse(
+            url=url,
+            body=body,
+            headers={name: headers[name] for name in STORED_HEADERS if name in headers},
+            stored_at=time.time(),
+        )
+        # Écriture puis renommage: un lecteur concurrent ne voit jamais un fichier partiel
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            async with aiofiles.open(tmp_path, "w", encoding="utf-8") as f:
+                await f.write(json.dumps(asdict(entry)))
+            tmp_path.replace(path)
+        except OSError as e:
+            logger.warning(f"GW2 HTTP cache: cannot write {path.name}: {e}")
+
+    async def touch(self, key: str, entry: CachedResponse, headers: Dict[str, str]) -> None:
+        """Ré-arme une entrée revalidée (304), en reprenant les validateurs éventuellement mis à jour."""
+        merged = {**entry.headers, **{name: headers[name] for name in STORED_HEADERS if name in headers}}
+        await self.set(key, entry.url, entry.body, merged)
+
+    def record(self, result: str) -> None:
+        """Compte un accès: hit (frais), revalidated (304), changed (200 après revalidation), miss."""
+        self.stats[result] += 1
+        track_gw2_api_disk_cache_lookup(result)
+
+    def clear(self) -> None:
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        self.build_id = None
+
+    def get_stats(self) -> Dict[str, object]:
+        return {**self.stats, "build_id": self.build_id, "cache_dir": str(self.cache_dir)}
@@ -1,18 +1,341 @@
-"""Automatic evaluation service for builds and teams."""
+"""Automatic evaluation service for builds and teams.
 
+Datapoints are scored in batches: one structured prompt per batch of builds
+(or teams), with a bounded number of batches in flight. Scores obtained from
+the model are appended to an ``EvaluationCheckpoint`` as each batch finishes,
+so an interrupted run resumes where it stopped and datapoints already scored
+under the current ``EVALUATOR_VERSION`` are never sent to the model again.
+"""
+
+import asyncio
+import json
+import os
 from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
+from app.core.config import settings
 from app.core.logging import logger
+from app.core.performance import AsyncBatchProcessor
 from app.models.learning import QualityScore, TrainingDatapoint
-from app.services.ai.ollama_service import OllamaService
+from app.services.ai.llm_scheduler import LLMPriority, llm_priority
+from app.services.ai.ollama_service import OllamaService, get_ollama_service
+
+
+# Bump when prompts or score mapping change: older checkpointed scores are re-evaluated
+EVALUATOR_VERSION = 2
+
+BUILD_SYSTEM_PROMPT = "You are a GW2 WvW expert evaluator. Be strict and accurate."
+TEAM_SYSTEM_PROMPT = "You are a GW2 WvW team composition expert. Evaluate critically."
+
+BUILD_FIELDS = ("meta_compliance", "build_validity", "role_effectiveness", "synergy_potential")
+TEAM_FIELDS = ("synergy_score", "role_coverage", "boon_coverage", "meta_compliance", "overall_effectiveness")
+
+# Response budget of a batch prompt: per item, plus the JSON envelope
+TOKENS_PER_ITEM = 96
+TOKENS_PER_BATCH = 64
+
+
+def _build_quality(response: Dict[str, Any]) -> QualityScore:
+    """Map a build evaluation (BUILD_FIELDS) to quality scores."""
+    values = {field: float(response.get(field, 5.0)) for field in BUILD_FIELDS}
+    return QualityScore(
+        synergy_score=values["synergy_potential"],
+        role_coverage=values["role_effectiveness"],
+        boon_coverage=5.0,  # Not applicable for single build
+        meta_compliance=values["meta_compliance"],
+        build_validity=values["build_validity"],
+        overall_score=sum(values.values()) / len(values),
+    )
+
+
+def _team_quality(response: Dict[str, Any]) -> QualityScore:
+    """Map a team evaluation (TEAM_FIELDS) to quality scores."""
+    values = {field: float(response.get(field, 5.0)) for field in TEAM_FIELDS}
+    return QualityScore(
+        synergy_score=values["synergy_score"],
+        role_coverage=values["role_coverage"],
+        boon_coverage=values["boon_coverage"],
+        meta_compliance=values["meta_compliance"],
+        build_validity=8.0,  # Teams are always valid if they exist
+        overall_score=values["overall_effectiveness"],
+    )
+
+
+def _zero_quality() -> QualityScore:
+    return QualityScore(
+        synergy_score=0.0,
+        role_coverage=0.0,
+        boon_coverage=0.0,
+        meta_compliance=0.0,
+        build_validity=0.0,
+        overall_score=0.0,
+    )
+
+
+class EvaluationCheckpoint:
+    """
+    Scores already obtained from the model, persisted between runs.
+
+    Append-only JSON Lines file, one ``{"version", "id", "scores"}`` record per
+    datapoint. Records from another evaluator version are ignored, and dropped
+    from the file the next time it is loaded.
+    """
+
+    def __init__(self, path: Path, version: int = EVALUATOR_VERSION) -> None:
+        self.path = Path(path)
+        self.version = version
+        self._lock = asyncio.Lock()
+
+    def _read(self) -> Dict[str, QualityScore]:
+        if not self.path.is_file():
+            return {}
+        scores: Dict[str, QualityScore] = {}
+        stale = 0
+        with self.path.open("r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    if record.get("version") != self.version:
+                        stale += 1
+                        continue
+                    scores[str(record["id"])] = QualityScore(**record["scores"])
+                except Exception:
+                    # Torn last line of an interrupted run, or a record from an older format
+                    stale += 1
+        if stale:
+            self._rewrite(scores)
+        return scores
+
+    def _rewrite(self, scores: Dict[str, QualityScore]) -> None:
+        tmp_path = self.path.with_suffix(".tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            f.writelines(self._record(dp_id, quality) for dp_id, quality in scores.items())
+        tmp_path.replace(self.path)
+
+    def _append(self, scores: Dict[str, QualityScore]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as f:
+            f.writelines(self._record(dp_id, quality) for dp_id, quality in scores.items())
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _record(self, dp_id: str, quality: QualityScore) -> str:
+        return json.dumps({"version": self.version, "id": dp_id, "scores": quality.model_dump()}) + "\n"
+
+    async def load(self) -> Dict[str, QualityScore]:
+        """Scores recorded under the current version, by datapoint id."""
+        async with self._lock:
+            try:
+                return await asyncio.to_thread(self._read)
+            except OSError as e:
+                logger.warning(f"Cannot read evaluation checkpoint {self.path}: {e}")
+                return {}
+
+    async def add(self, scores: Dict[str, QualityScore]) -> None:
+        """Record the scores of a finished batch."""
+        if not scores:
+            return
+        async with self._lock:
+            try:
+                await asyncio.to_thread(self._append, scores)
+            except OSError as e:
+                logger.warning(f"Cannot write evaluation checkpoint {self.path}: {e}")
+
+    def clear(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+
+def _default_checkpoint() -> Optional[EvaluationCheckpoint]:
+    if not settings.LEARNING_EVAL_CHECKPOINT:
+        return None
+    return EvaluationCheckpoint(Path(settings.LEARNING_EVAL_CHECKPOINT))
 
 
 class Evaluator:
     """Evaluates builds and teams for quality scoring."""
 
-    def __init__(self) -> None:
-        """Initialize evaluator."""
-        self.ollama = OllamaService()
+    def __init__(
+        self,
+        ollama_service: Optional[OllamaService] = None,
+        checkpoint: Optional[EvaluationCheckpoint] = None,
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+    ) -> None:
+        """
+        Initialize evaluator.
+
+        Args:
+            ollama_service: LLM client (default: shared OllamaService)
+            checkpoint: Progress store for batch runs (default: LEARNING_EVAL_CHECKPOINT)
+            batch_size: Datapoints per scoring prompt (default: settings)
+            concurrency: Batches evaluated at once (default: settings)
+        """
+        self.ollama = ollama_service or get_ollama_service()
+        self.checkpoint = checkpoint if checkpoint is not None else _default_checkpoint()
+        self.batch_size = max(1, batch_size or settings.LEARNING_EVAL_BATCH_SIZE)
+        self.concurrency = max(1, concurrency or settings.LEARNING_EVAL_CONCURRENCY)
+        self.stats: Dict[str, int] = {"restored": 0, "scored": 0, "fallback": 0, "batches": 0}
+
+    async def evaluate_datapoints(self, datapoints: List[TrainingDatapoint]) -> Dict[str, QualityScore]:
+        """
+        Evaluate datapoints in batches, resuming from the checkpoint.
+
+        Datapoints whose scores are in the checkpoint are not sent to the
+        model. A batch (or an item of a batch) the model fails to score gets
+        the fallback heuristic scores, which are not checkpointed: the next
+        run tries those datapoints again.
+
+        Args:
+            datapoints: Datapoints to evaluate
+
+        Returns:
+            Quality scores by datapoint id
+        """
+        self.stats = {"restored": 0, "scored": 0, "fallback": 0, "batches": 0}
+        wanted = {dp.id for dp in datapoints}
+        restored = await self.checkpoint.load() if self.checkpoint else {}
+        scores = {dp_id: quality for dp_id, quality in restored.items() if dp_id in wanted}
+        self.stats["restored"] = len(scores)
+
+        pending: Dict[str, TrainingDatapoint] = {}
+        for dp in datapoints:
+            if dp.id in scores:
+                continue
+            if not dp.team_id and not dp.build_id:
+                logger.error(f"Error evaluating datapoint {dp.id}: no build_id or team_id")
+                scores[dp.id] = _zero_quality()
+                continue
+            pending.setdefault(dp.id, dp)
+
+        # Builds and teams use different prompts: never mixed in one batch
+        teams = [dp for dp in pending.values() if dp.team_id]
+        builds = [dp for dp in pending.values() if not dp.team_id]
+        batches = [
+            group[i : i + self.batch_size] for group in (builds, teams) for i in range(0, len(group), self.batch_size)
+        ]
+        if batches:
+            logger.info(
+                f"Evaluating {len(pending)} datapoints in {len(batches)} batches "
+                f"({len(scores)} restored from checkpoint)"
+            )
+
+        async def run_batch(batch: List[TrainingDatapoint]) -> None:
+            batch_scores, scored = await self._evaluate_batch(batch)
+            scores.update(batch_scores)
+            if self.checkpoint:
+                await self.checkpoint.add(scored)
+
+        # Travail de fond: les requêtes interactives passent avant
+        with llm_priority(LLMPriority.BACKGROUND):
+            results = await AsyncBatchProcessor(max_concurrent=self.concurrency).batch_process(batches, run_batch)
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return scores
+
+    async def _evaluate_batch(
+        self, batch: List[TrainingDatapoint]
+    ) -> Tuple[Dict[str, QualityScore], Dict[str, QualityScore]]:
+        """Score one batch; returns (all scores, scores obtained from the model)."""
+        is_team = bool(batch[0].team_id)
+        fields = TEAM_FIELDS if is_team else BUILD_FIELDS
+        items = {str(i): dp for i, dp in enumerate(batch, start=1)}
+        self.stats["batches"] += 1
+
+        try:
+            response = await self.ollama.generate_structured(
+                prompt=self._batch_prompt(items, is_team),
+                system_prompt=TEAM_SYSTEM_PROMPT if is_team else BUILD_SYSTEM_PROMPT,
+                schema=self._batch_schema(fields),
+                max_tokens=TOKENS_PER_BATCH + TOKENS_PER_ITEM * len(batch),
+            )
+            entries = response.get("scores") if isinstance(response, dict) else None
+            if not isinstance(entries, list):
+                raise ValueError("response has no 'scores' list")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error in AI batch evaluation ({len(batch)} datapoints): {e}")
+            entries = []
+
+        scored: Dict[str, QualityScore] = {}
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            dp = items.get(str(entry.get("item")))
+            if dp is None or dp.id in scored:
+                continue
+            try:
+                scored[dp.id] = _team_quality(entry) if is_team else _build_quality(entry)
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Invalid AI scores for datapoint {dp.id}: {e}")
+
+        scores = dict(scored)
+        for dp in batch:
+            if dp.id not in scores:
+                scores[dp.id] = await self._fallback_evaluation(dp)
+        self.stats["scored"] += len(scored)
+        self.stats["fallback"] += len(batch) - len(scored)
+        return scores, scored
+
+    @staticmethod
+    def _batch_schema(fields: Tuple[str, ...]) -> Dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "scores": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "item": {"type": "string"},
+                            **{field: {"type": "number", "minimum": 0, "maximum": 10} for field in fields},
+                        },
+                        "required": ["item", *fields],
+                    },
+                }
+            },
+            "required": ["scores"],
+        }
+
+    @staticmethod
+    def _batch_prompt(items: Dict[str, TrainingDatapoint], is_team: bool) -> str:
+        if is_team:
+            lines = [
+                f"[{key}] {dp.game_mode} team, size {dp.data.get('team_size', 'unknown')}: "
+                f"{str(dp.data.get('description', 'N/A'))[:200]}"
+                for key, dp in items.items()
+            ]
+            criteria = """Rate each team from 0-10:
+- synergy_score: Team synergies and combos
+- role_coverage: Balance of tanks/dps/support
+- boon_coverage: Might, fury, protection, etc.
+- meta_compliance: Alignment with current WvW meta
+- overall_effectiveness: Overall team strength"""
+            kind = "WvW team compositions"
+        else:
+            lines = [
+                f"[{key}] {dp.game_mode} build - Profession: {dp.profession}, Role: {dp.role}, "
+                f"Source: {dp.source.value}"
+                for key, dp in items.items()
+            ]
+            criteria = """Rate each build from 0-10:
+- meta_compliance: How well does it match current WvW meta?
+- build_validity: Are trait/skill selections valid and optimal?
+- role_effectiveness: How effective for its intended role?
+- synergy_potential: Potential for team synergies?"""
+            kind = "Guild Wars 2 builds"
+
+        listing = "\n".join(lines)
+        return f"""Evaluate these {len(items)} {kind}:
+
+{listing}
+
+{criteria}
+
+Respond with JSON: {{"scores": [{{"item": "<number in brackets>", <one score per criterion>}}]}}
+with exactly one entry per item."""
 
     async def evaluate_datapoint(self, datapoint: TrainingDatapoint) -> QualityScore:
         """
@@ -25,24 +348,19 @@ class Evaluator:
             Quality scores
         """
         try:
-            if datapoint.team_id:
-                return await self._evaluate_team(datapoint)
-            elif datapoint.build_id:
-                return await self._evaluate_build(datapoint)
-            else:
-                raise ValueError("Datapoint must have either build_id or team_id")
+            # Travail de fond: les requêtes interactives passent avant
+            with llm_priority(LLMPriority.BACKGROUND):
+                if datapoint.team_id:
+                    return await self._evaluate_team(datapoint)
+                elif datapoint.build_id:
+                    return await self._evaluate_build(datapoint)
+                else:
+                    raise ValueError("Datapoint must have either build_id or team_id")
 
         except Exception as e:
             logger.error(f"Error evaluating datapoint {datapoint.id}: {e}")
             # Return default low scores on error
-            return QualityScore(
-                synergy_score=0.0,
-                role_coverage=0.0,
-                boon_coverage=0.0,
-                meta_compliance=0.0,
-                build_validity=0.0,
-                overall_score=0.0,
-            )
+            return _zero_quality()
 
     async def _evaluate_build(self, datapoint: TrainingDatapoint) -> QualityScore:
         """Evaluate a single build."""
@@ -73,26 +391,9 @@ Respond with JSON format:
         try:
             response = await self.ollama.generate_structured(
                 prompt=prompt,
-                system_prompt="You are a GW2 WvW expert evaluator. Be strict and accurate.",
-            )
-
-            # Map response to QualityScore
-            return QualityScore(
-                synergy_score=response.get("synergy_potential", 5.0),
-                role_coverage=response.get("role_effectiveness", 5.0),
-                boon_coverage=5.0,  # Not applicable for single build
-                meta_compliance=response.get("meta_compliance", 5.0),
-                build_validity=response.get("build_validity", 5.0),
-                overall_score=sum(
-                    [
-                        response.get("meta_compliance", 5.0),
-                        response.get("build_validity", 5.0),
-                        response.get("role_effectiveness", 5.0),
-                        response.get("synergy_potential", 5.0),
-                    ]
-                )
-                / 4.0,
+                system_prompt=BUILD_SYSTEM_PROMPT,
             )
+            return _build_quality(response)
 
         except Exception as e:
             logger.error(f"Error in AI evaluation: {e}")
@@ -127,17 +428,9 @@ Respond with JSON:
         try:
             response = await self.ollama.generate_structured(
                 prompt=prompt,
-                system_prompt="You are a GW2 WvW team composition expert. Evaluate critically.",
-            )
-
-            return QualityScore(
-                synergy_score=response.get("synergy_score", 5.0),
-                role_coverage=response.get("role_coverage", 5.0),
-                boon_coverage=response.get("boon_coverage", 5.0),
-                meta_compliance=response.get("meta_compliance", 5.0),
-                build_validity=8.0,  # Teams are always valid if they exist
-                overall_score=response.get("overall_effectiveness", 5.0),
+                system_prompt=TEAM_SYSTEM_PROMPT,
             )
+            return _team_quality(response)
 
         except Exception as e:
             logger.error(f"Error in AI evaluation: {e}")
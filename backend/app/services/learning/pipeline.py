@@ -158,28 +158,33 @@ class LearningPipeline:
             }
 
     async def _evaluate_datapoints(self, datapoints: list) -> Dict:
-        """Evaluate all unevaluated datapoints."""
+        """Evaluate all unevaluated datapoints (batched, resumed from the evaluator checkpoint)."""
         evaluated = 0
         total_score = 0.0
 
-        for dp in datapoints:
-            if not dp.is_validated or not dp.quality_scores:
-                try:
-                    quality = await self.evaluator.evaluate_datapoint(dp)
-                    dp.quality_scores = quality
-                    await self.evaluator.mark_validated(dp)
+        pending = [dp for dp in datapoints if not dp.is_validated or not dp.quality_scores]
+        try:
+            scores = await self.evaluator.evaluate_datapoints(pending) if pending else {}
+        except Exception as e:
+            logger.error(f"Failed to evaluate datapoints: {e}")
+            scores = {}
 
-                    evaluated += 1
-                    total_score += quality.overall_score
+        for dp in pending:
+            quality = scores.get(dp.id)
+            if quality is None:
+                continue
+            dp.quality_scores = quality
+            await self.evaluator.mark_validated(dp)
 
-                except Exception as e:
-                    logger.error(f"Failed to evaluate datapoint {dp.id}: {e}")
+            evaluated += 1
+            total_score += quality.overall_score
 
         avg_score = total_score / evaluated if evaluated > 0 else 0.0
 
         return {
             "datapoints_evaluated": evaluated,
             "average_quality_score": avg_score,
+            "evaluator": dict(self.evaluator.stats),
         }
 
     async def _execute_training(self, selected_datapoints: list) -> Dict:
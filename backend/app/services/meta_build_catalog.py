@@ -1,8 +1,11 @@
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Container, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple, Union
 import json
 
+from app.core.logging import logger
+from app.services.chat_code import BuildTemplate, decode_build_template
+
 
 @dataclass(frozen=True)
 class MetaBuild:
@@ -20,9 +23,202 @@ class MetaBuild:
     chat_code: Optional[str] = None
     stats_text: Optional[str] = None
     runes_text: Optional[str] = None
+    # Resolved ids of the chat code (filled by the meta-build sync when available)
+    trait_ids: Tuple[int, ...] = ()
+    skill_ids: Tuple[int, ...] = ()
+
+
+class MetaBuildRegistry(dict):
+    """Registry of meta builds by id; every mutation bumps ``version`` so indexes know when to rebuild."""
+
+    version = 0
+
+    def _touch(self) -> None:
+        self.version += 1
+
+    def __setitem__(self, key: str, value: MetaBuild) -> None:
+        super().__setitem__(key, value)
+        self._touch()
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self._touch()
+
+    def clear(self) -> None:
+        super().clear()
+        self._touch()
+
+    def pop(self, *args: Any) -> Any:
+        value = super().pop(*args)
+        self._touch()
+        return value
+
+    def popitem(self) -> Tuple[str, MetaBuild]:
+        item = super().popitem()
+        self._touch()
+        return item
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        value = super().setdefault(key, default)
+        self._touch()
+        return value
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        super().update(*args, **kwargs)
+        self._touch()
+
+    def __ior__(self, other: Any) -> "MetaBuildRegistry":
+        super().__ior__(other)
+        self._touch()
+        return self
+
+
+META_BUILD_REGISTRY: MetaBuildRegistry = MetaBuildRegistry()
+
+
+# ---------------------------------------------------------------------------
+# Indexes
+# ---------------------------------------------------------------------------
+
+# Feature groups of the similarity vector and their weight
+_FEATURE_WEIGHTS: Dict[str, float] = {"trait": 2.0, "skill": 1.0, "palette": 1.0}
+
+Features = Dict[str, FrozenSet[int]]
+
+
+def normalize_chat_code(chat_code: Optional[str]) -> Optional[Union[BuildTemplate, str]]:
+    """Hashable key of a chat code: its decoded template, or the stripped text if it does not decode."""
+
+    if not chat_code:
+        return None
+    text = chat_code.strip()
+    if not text:
+        return None
+    try:
+        return decode_build_template(text)
+    except ValueError:
+        return text
+
+
+def _major_traits(template: BuildTemplate) -> List[int]:
+    """Trait ids selected by a template, resolved with the local specialization data."""
+
+    from app.services.gw2_data_store import get_gw2_data_store
+
+    store = get_gw2_data_store()
+    trait_ids: List[int] = []
+    for spec_id, choices in zip(template.specialization_ids, template.trait_choices):
+        spec = store.get_specialization(spec_id) if spec_id else None
+        major_traits = (spec or {}).get("major_traits") or []
+        for tier_index, choice in enumerate(choices):
+            index = tier_index * 3 + choice - 1
+            if choice and index < len(major_traits) and isinstance(major_traits[index], int):
+                trait_ids.append(major_traits[index])
+    return trait_ids
+
+
+def build_features(
+    chat_code: Optional[str] = None,
+    trait_ids: Optional[Iterable[int]] = None,
+    skill_ids: Optional[Iterable[int]] = None,
+) -> Features:
+    """Sparse feature vector of a build: trait ids, skill ids and skill palette ids (from the chat code)."""
+
+    features: Dict[str, Set[int]] = {"trait": set(trait_ids or ()), "skill": set(skill_ids or ())}
+    template = normalize_chat_code(chat_code)
+    if isinstance(template, BuildTemplate):
+        features["palette"] = {pid for pid in template.palette_ids if pid}
+        if not features["trait"]:
+            try:
+                features["trait"] = set(_major_traits(template))
+            except Exception as e:  # pragma: no cover - local data unavailable
+                logger.warning(f"Meta build features: cannot resolve traits locally: {e}")
+    return {group: frozenset(ids) for group, ids in features.items() if ids}
+
+
+def feature_similarity(query: Features, candidate: Features) -> float:
+    """Weighted Jaccard similarity (0..1) over the feature groups present on both sides."""
+
+    shared = 0.0
+    total = 0.0
+    for group, weight in _FEATURE_WEIGHTS.items():
+        left = query.get(group)
+        right = candidate.get(group)
+        if not left or not right:
+            continue
+        shared += weight * len(left & right)
+        total += weight * len(left | right)
+    return shared / total if total else 0.0
+
+
+class _CatalogIndex:
+    """Lookup tables of one registry version: field postings, tags, chat codes and (lazily) features."""
+
+    def __init__(self, registry: MetaBuildRegistry) -> None:
+        self.version = registry.version
+        self.order: Dict[str, int] = {}
+        # Postings are insertion-ordered dicts used as sets (registry order, O(1) membership)
+        self.by_field: Dict[str, Dict[str, Dict[str, None]]] = {
+            "profession": {},
+            "specialization": {},
+            "role": {},
+            "game_mode": {},
+        }
+        self.by_tag: Dict[str, Set[str]] = {}
+        self.by_chat_code: Dict[Union[BuildTemplate, str], str] = {}
+        self._features: Dict[str, Features] = {}
+
+        for position, (mid, meta) in enumerate(registry.items()):
+            self.order[mid] = position
+            for name, postings in self.by_field.items():
+                postings.setdefault(str(getattr(meta, name)).lower(), {})[mid] = None
+            for tag in meta.tags:
+                self.by_tag.setdefault(str(tag).lower(), set()).add(mid)
+            key = normalize_chat_code(meta.chat_code)
+            if key is not None:
+                # First registered build wins, as with the previous linear scan
+                self.by_chat_code.setdefault(key, mid)
+
+    def features(self, meta: MetaBuild) -> Features:
+        cached = self._features.get(meta.id)
+        if cached is None:
+            cached = self._features[meta.id] = build_features(meta.chat_code, meta.trait_ids, meta.skill_ids)
+        return cached
+
+    def select(self, filters: Dict[str, Optional[str]], tags: Optional[List[str]]) -> List[str]:
+        """Ids matching every given filter, in registry order."""
+
+        postings: List[Dict[str, None]] = []
+        for name, value in filters.items():
+            if value:
+                postings.append(self.by_field[name].get(value.lower(), {}))
+        tag_sets = [self.by_tag.get(t.lower(), set()) for t in tags or []]
+
+        if not postings and not tag_sets:
+            return list(self.order)
+        if postings:
+            # Walk the most selective posting, probe the others
+            postings.sort(key=len)
+            base: Iterable[str] = postings[0]
+        else:
+            base = sorted(set.intersection(*tag_sets), key=self.order.__getitem__)
+        others: List[Container[str]] = [*postings[1:], *tag_sets]
+        return [mid for mid in base if all(mid in other for other in others)]
+
 
+_index: Optional[_CatalogIndex] = None
 
-META_BUILD_REGISTRY: Dict[str, MetaBuild] = {}
+
+def _get_index() -> _CatalogIndex:
+    global _index
+    if _index is None or _index.version != META_BUILD_REGISTRY.version:
+        _index = _CatalogIndex(META_BUILD_REGISTRY)
+    return _index
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
 
 
 def list_meta_builds() -> List[MetaBuild]:
@@ -41,25 +237,49 @@ def query_meta_builds(
 ) -> List[MetaBuild]:
     """Filter meta builds by simple fields. Case-insensitive, all filters optional."""
 
-    results: List[MetaBuild] = []
+    index = _get_index()
+    ids = index.select(
+        {"profession": profession, "specialization": specialization, "role": role, "game_mode": game_mode},
+        tags,
+    )
+    return [META_BUILD_REGISTRY[mid] for mid in ids]
 
-    for meta in META_BUILD_REGISTRY.values():
-        if profession and meta.profession.lower() != profession.lower():
-            continue
-        if specialization and meta.specialization.lower() != specialization.lower():
-            continue
-        if role and meta.role.lower() != role.lower():
-            continue
-        if game_mode and meta.game_mode.lower() != game_mode.lower():
-            continue
-        if tags:
-            meta_tags = {t.lower() for t in meta.tags}
-            query_tags = {t.lower() for t in tags}
-            if not query_tags.issubset(meta_tags):
-                continue
-        results.append(meta)
 
-    return results
+def rank_meta_builds(
+    *,
+    profession: Optional[str] = None,
+    specialization: Optional[str] = None,
+    role: Optional[str] = None,
+    game_mode: Optional[str] = None,
+    tags: Optional[List[str]] = None,
+    chat_code: Optional[str] = None,
+    trait_ids: Optional[Iterable[int]] = None,
+    skill_ids: Optional[Iterable[int]] = None,
+    limit: Optional[int] = None,
+) -> List[Tuple[MetaBuild, float]]:
+    """Meta builds matching the filters, nearest first, with their feature similarity (0..1).
+
+    The user build is described by its chat code and/or its resolved trait and
+    skill ids; without any of them every candidate scores 0 and the registry
+    order is kept.
+    """
+
+    candidates = query_meta_builds(
+        profession=profession,
+        specialization=specialization,
+        role=role,
+        game_mode=game_mode,
+        tags=tags,
+    )
+    query = build_features(chat_code, trait_ids, skill_ids)
+    if not query:
+        ranked = [(meta, 0.0) for meta in candidates]
+    else:
+        index = _get_index()
+        scored = [(meta, feature_similarity(query, index.features(meta))) for meta in candidates]
+        # Stable sort: equal scores keep the registry order
+        ranked = sorted(scored, key=lambda item: item[1], reverse=True)
+    return ranked[:limit] if limit is not None else ranked
 
 
 def find_closest_meta_build(
@@ -69,53 +289,62 @@ def find_closest_meta_build(
     role: Optional[str] = None,
     game_mode: Optional[str] = None,
     tags: Optional[List[str]] = None,
+    chat_code: Optional[str] = None,
+    trait_ids: Optional[Iterable[int]] = None,
+    skill_ids: Optional[Iterable[int]] = None,
 ) -> Optional[MetaBuild]:
-    """Best-effort lookup for a single meta build matching simple criteria.
+    """Nearest meta build among those matching the filters, or None if none matches.
 
-    The current implementation relies only on exact filters and returns the first
-    matching entry, or None if the registry is empty or no match exists.
+    Candidates are ranked by similarity of their traits, skills and skill
+    palette to the user build (see rank_meta_builds).
     """
 
-    candidates = query_meta_builds(
+    ranked = rank_meta_builds(
         profession=profession,
         specialization=specialization,
         role=role,
         game_mode=game_mode,
         tags=tags,
+        chat_code=chat_code,
+        trait_ids=trait_ids,
+        skill_ids=skill_ids,
+        limit=1,
     )
+    return ranked[0][0] if ranked else None
+
+
+def find_meta_build_by_chat_code(chat_code: str) -> Optional[MetaBuild]:
+    """Meta build whose chat code decodes to the same build template (O(1) hash lookup)."""
 
-    if not candidates:
+    key = normalize_chat_code(chat_code)
+    if key is None:
         return None
+    mid = _get_index().by_chat_code.get(key)
+    return META_BUILD_REGISTRY.get(mid) if mid is not None else None
 
-    return candidates[0]
 
+# ---------------------------------------------------------------------------
+# Loading
+# ---------------------------------------------------------------------------
 
-def find_meta_build_by_chat_code(chat_code: str) -> Optional[MetaBuild]:
-    if not chat_code:
-        return None
-    target = chat_code.strip()
-    if not target:
-        return None
-    for meta in META_BUILD_REGISTRY.values():
-        if not meta.chat_code:
-            continue
-        if meta.chat_code.strip() == target:
-            return meta
-    return None
 
+def _int_tuple(value: Any) -> Tuple[int, ...]:
+    if not isinstance(value, list):
+        return ()
+    return tuple(v for v in value if isinstance(v, int) and not isinstance(v, bool))
 
-def _load_meta_builds_from_payload(payload: Any) -> int:
-    META_BUILD_REGISTRY.clear()
 
+def _load_meta_builds_from_payload(payload: Any) -> int:
     items: List[Dict[str, Any]]
     if isinstance(payload, list):
         items = payload
     elif isinstance(payload, dict) and isinstance(payload.get("builds"), list):
         items = payload["builds"]
     else:
+        META_BUILD_REGISTRY.clear()
         return 0
 
-    count = 0
+    builds: Dict[str, MetaBuild] = {}
     for raw in items:
         if not isinstance(raw, dict):
             continue
@@ -143,18 +372,40 @@ def _load_meta_builds_from_payload(payload: Any) -> int:
             chat_code=raw.get("chat_code"),
             stats_text=raw.get("stats_text"),
             runes_text=raw.get("runes_text"),
+            trait_ids=_int_tuple(raw.get("trait_ids")),
+            skill_ids=_int_tuple(raw.get("skill_ids")),
         )
-        META_BUILD_REGISTRY[meta.id] = meta
-        count += 1
-    return count
+        builds[meta.id] = meta
+
+    META_BUILD_REGISTRY.clear()
+    META_BUILD_REGISTRY.update(builds)
+    # Index the new registry right away rather than on the first query
+    _get_index()
+    return len(builds)
+
+
+# (path, size, mtime_ns) of the last loaded file and the registry version it produced
+_loaded_source: Optional[Tuple[Path, int, int, int]] = None
 
 
 def load_meta_builds_from_json(path: Union[str, Path]) -> int:
+    """Load the registry from a JSON file; a no-op if the file and the registry are unchanged since the last load."""
+
+    global _loaded_source
     p = Path(path)
     if not p.is_file():
         return 0
+    try:
+        stat = p.stat()
+        resolved = p.resolve()
+    except OSError:
+        return 0
+    if _loaded_source == (resolved, stat.st_size, stat.st_mtime_ns, META_BUILD_REGISTRY.version):
+        return len(META_BUILD_REGISTRY)
     try:
         data = json.loads(p.read_text(encoding="utf-8"))
     except Exception:
         return 0
-    return _load_meta_builds_from_payload(data)
+    count = _load_meta_builds_from_payload(data)
+    _loaded_source = (resolved, stat.st_size, stat.st_mtime_ns, META_BUILD_REGISTRY.version)
+    return count
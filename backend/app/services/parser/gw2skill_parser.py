@@ -12,7 +12,7 @@ from bs4 import BeautifulSoup
 from app.core.logging import logger
 from app.models.build import Build, GameMode, Profession, Role, TraitLine, Skill, Equipment
 from app.services.parser.gw2_data import STAT_COMBOS, EQUIPMENT_SLOTS
-from app.services.ai.ollama_service import OllamaService
+from app.services.ai.ollama_service import OllamaService, get_ollama_service
 
 
 class GW2SkillParser:
@@ -22,7 +22,7 @@ class GW2SkillParser:
         # Ollama service is only used for AI-based fallback when the profession
         # cannot be inferred from the URL. Existing behavior (HTML parsing for
         # traits/skills/gear) remains unchanged.
-        self._ollama = ai_service or OllamaService()
+        self._ollama = ai_service or get_ollama_service()
 
     # Profession name mappings
     PROFESSION_MAP = {
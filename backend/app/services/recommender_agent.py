@@ -3,12 +3,11 @@ AI Agent for recommending Guild Wars 2 builds.
 """
 
 import httpx
-import json
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from app.agents.base import BaseAgent
-from app.core.config import settings
 from app.core.logging import logger
+from app.services.ai.ollama_service import OllamaService, get_ollama_service
 
 
 class RecommenderAgent(BaseAgent):
@@ -16,9 +15,10 @@ class RecommenderAgent(BaseAgent):
     An agent specialized in generating build recommendations by querying an AI model.
     """
 
-    def __init__(self, model: str = settings.OLLAMA_MODEL, host: str = settings.OLLAMA_HOST):
-        self.model = model
-        self.host = host
+    def __init__(self, ollama_service: Optional[OllamaService] = None):
+        self.ollama = ollama_service or get_ollama_service()
+        self.model = self.ollama.model
+        self.host = self.ollama.host
 
     async def run(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -42,19 +42,8 @@ class RecommenderAgent(BaseAgent):
         """
 
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    f"{self.host}/api/generate",
-                    json={
-                        "model": self.model,
-                        "prompt": prompt,
-                        "format": "json",
-                        "stream": False,
-                    },
-                )
-                response.raise_for_status()
-                return json.loads(response.json()["response"])
-
-        except (httpx.RequestError, json.JSONDecodeError, KeyError) as e:
+            return await self.ollama.generate_structured(prompt=prompt, temperature=0.7, max_tokens=1000)
+
+        except (httpx.RequestError, ValueError, KeyError) as e:
             logger.error(f"Error in RecommenderAgent: {e}")
             raise Exception("Failed to get a recommendation from the AI agent.")
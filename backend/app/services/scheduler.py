@@ -5,6 +5,7 @@ from apscheduler.triggers.cron import CronTrigger
 
 from app.core.logging import logger
 from app.models.learning import FineTuningConfig, StorageConfig
+from app.services.ai.llm_scheduler import LLMPriority, llm_priority
 from app.services.learning.pipeline import LearningPipeline
 from scripts.sync_meta_builds import sync_from_config as sync_meta_builds
 
@@ -21,7 +22,11 @@ class PipelineScheduler:
         )
 
     async def run_pipeline_task(self) -> None:
-        """Task to run the learning pipeline."""
+        """Task to run the learning pipeline (background LLM priority)."""
+        with llm_priority(LLMPriority.BACKGROUND):
+            await self._run_pipeline()
+
+    async def _run_pipeline(self) -> None:
         try:
             logger.info("Scheduled meta build sync starting...")
             try:
@@ -1,7 +1,7 @@
 from typing import Any, Dict, Optional
 
 from app.core.logging import logger
-from app.services.gw2_api_client import GW2APIClient
+from app.services.gw2_api_client import GW2APIClient, get_gw2_api_client
 from app.agents.analyst_agent import AnalystAgent
 
 
@@ -11,7 +11,7 @@ class SkillAnalysisService:
         gw2_client: Optional[GW2APIClient] = None,
         analyst_agent: Optional[AnalystAgent] = None,
     ) -> None:
-        self.gw2_client = gw2_client or GW2APIClient()
+        self.gw2_client = gw2_client or get_gw2_api_client()
         self.analyst_agent = analyst_agent or AnalystAgent()
 
     async def analyze_skill(self, skill_id: int, context: str = "WvW Zerg") -> Dict[str, Any]:
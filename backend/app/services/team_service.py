@@ -12,7 +12,7 @@ from app.models.team import (
     TeamResponse,
     TeamSynergy,
 )
-from app.services.ai.ollama_service import OllamaService
+from app.services.ai.ollama_service import get_ollama_service
 from app.services.learning.data_collector import DataCollector
 from app.services.synergy_analyzer import SynergyAnalyzer
 
@@ -22,7 +22,7 @@ class TeamService:
 
     def __init__(self) -> None:
         """Initialize team service."""
-        self.ollama = OllamaService()
+        self.ollama = get_ollama_service()
         self.collector = DataCollector()
         self.analyzer = SynergyAnalyzer()
         self.teams_cache: dict[str, TeamComposition] = {}
@@ -5,7 +5,7 @@ from typing import Any, Dict, List, Optional
 from app.core.logging import logger
 from app.services.build_analysis_service import BuildAnalysisService
 from app.services.gw2_chat_code import ChatCodeDecoder
-from app.services.gw2_api_client import GW2APIClient
+from app.services.gw2_api_client import GW2APIClient, get_gw2_api_client
 from app.services.scraper.scraper_service import ScraperService
 
 
@@ -25,7 +25,7 @@ class UrlAnalysisService:
         gw2_client: Optional[GW2APIClient] = None,
         decoder: Optional[ChatCodeDecoder] = None,
     ) -> None:
-        self.gw2_client = gw2_client or GW2APIClient()
+        self.gw2_client = gw2_client or get_gw2_api_client()
         self.scraper_service = scraper_service or ScraperService()
         self.build_analysis_service = build_analysis_service or BuildAnalysisService(gw2_client=self.gw2_client)
         self.decoder = decoder or ChatCodeDecoder(gw2_client=self.gw2_client)
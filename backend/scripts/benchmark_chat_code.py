@@ -0,0 +1,95 @@
+"""
+Benchmark du codec de chat codes de build (app.services.chat_code).
+
+Mesure le débit (codes par seconde) du décodage unitaire, du décodage
+par lot et de l'encodage, comparé à la lecture octet par octet des anciens
+décodeurs.
+
+Usage:
+    python scripts/benchmark_chat_code.py [nombre_de_codes]
+"""
+
+import base64
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.chat_code import (  # noqa: E402
+    BuildTemplate,
+    decode_build_template,
+    decode_build_templates,
+    encode_build_template,
+)
+
+
+def legacy_decode(code: str):
+    """Lecture octet par octet, telle que faite par les anciens décodeurs."""
+    text = code.strip()
+    inner = text[2:-1] if text.startswith("[&") and text.endswith("]") else text
+    raw = base64.b64decode(inner)
+    if raw[0] != 0x0D:
+        raise ValueError("Unsupported chat code type")
+    offset = 2
+    specialization_ids: List[int] = []
+    trait_choices: List[List[int]] = []
+    for _ in range(3):
+        traits_byte = raw[offset + 1]
+        specialization_ids.append(raw[offset])
+        trait_choices.append([traits_byte & 0b11, (traits_byte >> 2) & 0b11, (traits_byte >> 4) & 0b11])
+        offset += 2
+    palette_ids: List[int] = []
+    for _ in range(10):
+        palette_ids.append(raw[offset] | (raw[offset + 1] << 8))
+        offset += 2
+    return raw[1], specialization_ids, trait_choices, palette_ids
+
+
+def random_codes(count: int, seed: int = 42) -> List[str]:
+    rng = random.Random(seed)
+    return [
+        encode_build_template(
+            BuildTemplate(
+                rng.randint(1, 9),
+                tuple(rng.randint(1, 80) for _ in range(3)),
+                tuple(tuple(rng.randint(0, 3) for _ in range(3)) for _ in range(3)),
+                tuple(rng.randint(0, 6000) for _ in range(10)),
+                bytes(16),
+            )
+        )
+        for _ in range(count)
+    ]
+
+
+def measure(label: str, count: int, run: Callable[[], object], repeat: int = 5) -> float:
+    best = min(_timed(run) for _ in range(repeat))
+    rate = count / best
+    print(f"   • {label:<28} {rate:>12,.0f} codes/s")
+    return rate
+
+
+def _timed(run: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    codes = random_codes(count)
+    templates = [decode_build_template(code) for code in codes]
+
+    print(f"\n🚀 BENCHMARK CHAT CODES ({count} codes)\n")
+    legacy = measure("octet par octet (ancien)", count, lambda: [legacy_decode(c) for c in codes])
+    single = measure("decode_build_template", count, lambda: [decode_build_template(c) for c in codes])
+    measure("decode_build_templates", count, lambda: decode_build_templates(codes))
+    measure("encode_build_template", count, lambda: [encode_build_template(t) for t in templates])
+    print(f"\n📈 Gain du décodage: x{single / legacy:.1f}")
+
+
+if __name__ == "__main__":
+    main()
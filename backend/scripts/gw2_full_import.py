@@ -6,6 +6,9 @@ and writes the results to JSON files under backend/data/gw2/.
 It is designed to be run automatically (e.g. via cron or a scheduler).
 It uses /v2/build to detect whether the game build has changed and will
 skip the import if there is no new build.
+
+A running API keeps the previous data in memory until it is told to reload
+it: POST /api/v1/sync/gw2-data/reload (same access rules as /sync/gw2).
 """
 
 import asyncio
@@ -2,7 +2,7 @@ import asyncio
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import httpx
 from bs4 import BeautifulSoup
@@ -47,14 +47,12 @@ async def _discover_build_urls_from_index(url: str) -> List[str]:
     return sorted(urls)
 
 
-async def _process_single_build(
+async def _scrape_single_build(
     scraper: ScraperService,
-    decoder: ChatCodeDecoder,
-    gw2_client: Any,
     raw: Dict[str, Any],
     meta_id: str,
     url: str,
-) -> Optional[Dict[str, Any]]:
+) -> Optional[Tuple[Dict[str, Any], str, Any]]:
     try:
         scraped = await scraper.scrape_build(url)
     except Exception as e:
@@ -66,47 +64,59 @@ async def _process_single_build(
         logger.error("No chat code found for meta build", extra={"url": url})
         return None
 
-    try:
-        decoded = await decoder.decode_build(chat_code)
-    except Exception as e:
-        logger.error("Failed to decode chat code for meta build", extra={"url": url, "error": str(e)})
-        return None
+    return raw, meta_id, scraped
+
 
-    spec_id = decoded.get("specialization_id")
-    profession = None
-    specialization = None
-    if isinstance(spec_id, int) and spec_id:
-        try:
-            spec_data = await gw2_client.get_specialization_details(spec_id)
-        except Exception as e:
-            logger.error("Failed to load specialization for meta build", extra={"spec_id": spec_id, "error": str(e)})
-            spec_data = None
+async def _decode_scraped_builds(
+    decoder: ChatCodeDecoder,
+    scraped_builds: List[Tuple[Dict[str, Any], str, Any]],
+) -> List[Dict[str, Any]]:
+    """Decode every scraped chat code in one batch (shared spec/profession lookups)."""
+    decoded_builds = await decoder.decode_builds([scraped.chat_code for _, _, scraped in scraped_builds])
+    specs_by_id = await decoder.entity_resolver.resolve_specializations(
+        decoded.get("specialization_id") for decoded in decoded_builds if decoded
+    )
+
+    entries: List[Dict[str, Any]] = []
+    for (raw, meta_id, scraped), decoded in zip(scraped_builds, decoded_builds):
+        if decoded is None:
+            logger.error("Failed to decode chat code for meta build", extra={"meta_id": meta_id})
+            continue
+
+        profession = None
+        specialization = None
+        spec_data = specs_by_id.get(decoded.get("specialization_id"))
         if isinstance(spec_data, dict):
             specialization = spec_data.get("name")
             profession = spec_data.get("profession")
 
-    name = raw.get("name") or scraped.name or specialization or meta_id
-    game_mode = raw.get("game_mode") or scraped.context or "Unknown"
-    role = raw.get("role") or "unknown"
-    source = raw.get("source") or "external"
-    tags = raw.get("tags") or []
-    if not isinstance(tags, list):
-        tags = []
-
-    return {
-        "id": meta_id,
-        "name": name,
-        "profession": profession or "Unknown",
-        "specialization": specialization or "Unknown",
-        "role": str(role),
-        "game_mode": str(game_mode),
-        "source": source,
-        "tags": tags,
-        "notes": raw.get("notes"),
-        "chat_code": chat_code,
-        "stats_text": scraped.stats_text,
-        "runes_text": scraped.runes_text,
-    }
+        name = raw.get("name") or scraped.name or specialization or meta_id
+        game_mode = raw.get("game_mode") or scraped.context or "Unknown"
+        role = raw.get("role") or "unknown"
+        source = raw.get("source") or "external"
+        tags = raw.get("tags") or []
+        if not isinstance(tags, list):
+            tags = []
+
+        entries.append(
+            {
+                "id": meta_id,
+                "name": name,
+                "profession": profession or "Unknown",
+                "specialization": specialization or "Unknown",
+                "role": str(role),
+                "game_mode": str(game_mode),
+                "source": source,
+                "tags": tags,
+                "notes": raw.get("notes"),
+                "chat_code": scraped.chat_code,
+                "trait_ids": decoded.get("trait_ids") or [],
+                "skill_ids": decoded.get("skill_ids") or [],
+                "stats_text": scraped.stats_text,
+                "runes_text": scraped.runes_text,
+            }
+        )
+    return entries
 
 
 async def sync_from_config() -> None:
@@ -127,9 +137,8 @@ async def sync_from_config() -> None:
 
     scraper = ScraperService()
     decoder = ChatCodeDecoder()
-    gw2_client = decoder.gw2_client
 
-    out_builds: List[Dict[str, Any]] = []
+    scraped_builds: List[Tuple[Dict[str, Any], str, Any]] = []
     processed_urls: Set[str] = set()
     counter = 0
 
@@ -154,18 +163,20 @@ async def sync_from_config() -> None:
                 processed_urls.add(build_url)
                 meta_id = build_url
                 counter += 1
-                entry = await _process_single_build(scraper, decoder, gw2_client, raw, meta_id, build_url)
-                if entry is not None:
-                    out_builds.append(entry)
+                scraped = await _scrape_single_build(scraper, raw, meta_id, build_url)
+                if scraped is not None:
+                    scraped_builds.append(scraped)
         else:
             if url in processed_urls:
                 continue
             processed_urls.add(url)
             meta_id = base_id
             counter += 1
-            entry = await _process_single_build(scraper, decoder, gw2_client, raw, meta_id, url)
-            if entry is not None:
-                out_builds.append(entry)
+            scraped = await _scrape_single_build(scraper, raw, meta_id, url)
+            if scraped is not None:
+                scraped_builds.append(scraped)
+
+    out_builds = await _decode_scraped_builds(decoder, scraped_builds)
 
     payload = {
         "generated_at": datetime.utcnow().isoformat(),
@@ -79,3 +79,25 @@ async def test_sync_gw2_endpoint_success(client: AsyncClient, monkeypatch) -> No
             ), f"Expected 202, got {response.status_code}. Response: {response.text}"
             assert response.json() == {"status": "accepted", "result": mock_result}
             mock_sync.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_reload_gw2_data_endpoint(client: AsyncClient) -> None:
+    """The reload endpoint swaps in the re-read GW2 data and returns the dataset counts."""
+
+    mock_settings = Settings()
+    mock_settings.GW2_SYNC_OPEN = True
+    counts = {"traits": 2, "upgrade_components": 2}
+
+    with patch("app.api.sync.settings", mock_settings):
+        with patch("app.api.sync.reload_gw2_data_store", return_value=counts) as mock_reload:
+            response = await client.post("/api/v1/sync/gw2-data/reload")
+
+            assert response.status_code == status.HTTP_200_OK, response.text
+            assert response.json() == {"status": "reloaded", "datasets": counts}
+            mock_reload.assert_called_once_with()
+
+    mock_settings.GW2_SYNC_OPEN = False
+    with patch("app.api.sync.settings", mock_settings):
+        response = await client.post("/api/v1/sync/gw2-data/reload")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
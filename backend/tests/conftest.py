@@ -6,12 +6,13 @@ HTTP clients, and authentication, ensuring tests are isolated and repeatable.
 """
 
 import asyncio
+import json
 import os
-from typing import AsyncGenerator, Dict
+from typing import AsyncGenerator, Callable, Dict, List, Optional, Union
 
 import pytest
 import pytest_asyncio
-from httpx import AsyncClient, ASGITransport
+from httpx import AsyncClient, ASGITransport, MockTransport, Request, Response
 from redis.asyncio import Redis, from_url as redis_from_url
 from sqlalchemy import event, text
 from sqlalchemy.engine import Engine
@@ -33,6 +34,17 @@ os.environ["DATABASE_URL"] = TEST_DATABASE_URL
 
 TEST_REDIS_URL = os.environ.get("TEST_REDIS_URL", "redis://127.0.0.1:6379/15")
 
+# Run CPU-bound jobs inline so tests can patch agent internals
+os.environ.setdefault("CPU_POOL_WORKERS", "0")
+# No slot result memoization across tests (tests patch the optimizer)
+os.environ.setdefault("SLOT_CACHE_MAX_ENTRIES", "0")
+# No persistent GW2 API responses shared between tests (tests use a tmp_path DiskHTTPCache)
+os.environ.setdefault("GW2_API_DISK_CACHE_ENABLED", "false")
+# No LLM responses replayed across tests (tests use a tmp_path LLMResponseCache)
+os.environ.setdefault("LLM_CACHE_ENABLED", "false")
+# No evaluation scores resumed across tests (tests use a tmp_path EvaluationCheckpoint)
+os.environ.setdefault("LEARNING_EVAL_CHECKPOINT", "")
+
 from app.main import app, include_routers
 from app.db.session import get_db
 from app.core import redis as redis_module
@@ -43,6 +55,7 @@ from app.models.build_suggestion import BuildSuggestionDB  # noqa: F401 - ensure
 from app.models.team import TeamCompositionDB, TeamSlotDB  # noqa: F401 - ensure team tables are registered
 from app.models.user import UserOut  # Import UserOut from models
 from app.core.security import create_access_token, get_password_hash
+from app.services.ai.ollama_service import OllamaService
 
 
 REDIS_DEPENDENCY_CANDIDATES = [
@@ -391,3 +404,112 @@ def sample_team_data():
         "description": "Test team composition for WvW zerg",
         "is_public": True,
     }
+
+
+class FakeOllama:
+    """Fake Ollama server (/api/chat, /api/generate, /api/tags) for httpx.MockTransport.
+
+    Generations are streamed as NDJSON like Ollama: one line per token, then a
+    ``done`` line with the counters. ``reply`` maps the prompt (last chat
+    message, or the /api/generate prompt) to the streamed text: a string is
+    sent as a single chunk, a list as one chunk per token. The default echoes
+    the prompt word by word.
+
+    Args:
+        reply: Prompt -> response text or tokens
+        latency: Seconds to wait before answering (counted in ``in_flight``)
+        token_delay: Seconds to wait before each streamed token
+        status: HTTP status of generations; non-200 answers an error body
+        chat_available: When False, /api/chat answers 404 (legacy server)
+        error: Error streamed after the tokens instead of the ``done`` line
+    """
+
+    def __init__(
+        self,
+        reply: Optional[Callable[[str], Union[str, List[str]]]] = None,
+        latency: float = 0.0,
+        token_delay: float = 0.0,
+        status: int = 200,
+        chat_available: bool = True,
+        error: Optional[str] = None,
+    ) -> None:
+        self.reply = reply or (lambda prompt: [word + " " for word in prompt.split()])
+        self.latency = latency
+        self.token_delay = token_delay
+        self.status = status
+        self.chat_available = chat_available
+        self.error = error
+        self.requests: List[Request] = []
+        self.prompts: List[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        # Requests beyond the first ``gate_after`` wait for this event when set
+        self.gate: Optional[asyncio.Event] = None
+        self.gate_after = 1
+
+    async def __call__(self, request: Request) -> Response:
+        self.requests.append(request)
+        path = request.url.path
+        if path == "/api/tags":
+            return Response(200, json={"models": [{"name": "test-model"}]})
+        if path == "/api/chat" and not self.chat_available:
+            return Response(404, json={"error": "not found"})
+        if path not in ("/api/chat", "/api/generate"):
+            return Response(404)
+
+        body = json.loads(request.content)
+        assert body["stream"] is True
+        prompt = body["messages"][-1]["content"] if path == "/api/chat" else body["prompt"]
+        self.prompts.append(prompt)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.gate is not None and len(self.prompts) > self.gate_after:
+                await self.gate.wait()
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+        if self.status != 200:
+            return Response(self.status, json={"error": "model unavailable"})
+
+        tokens = self.reply(prompt)
+        return Response(200, content=self._lines(path, [tokens] if isinstance(tokens, str) else tokens))
+
+    async def _lines(self, path: str, tokens: List[str]):
+        for token in tokens:
+            await asyncio.sleep(self.token_delay)
+            chunk = {"message": {"role": "assistant", "content": token}} if path == "/api/chat" else {"response": token}
+            yield (json.dumps({**chunk, "done": False}) + "\n").encode()
+        if self.error:
+            yield (json.dumps({"error": self.error}) + "\n").encode()
+            return
+        yield (json.dumps({"done": True, "prompt_eval_count": 3, "eval_count": len(tokens)}) + "\n").encode()
+
+    def paths(self) -> List[str]:
+        return [r.url.path for r in self.requests]
+
+
+@pytest.fixture
+def fake_ollama() -> Callable[..., FakeOllama]:
+    """Factory for FakeOllama servers (keyword arguments as in FakeOllama)."""
+    return FakeOllama
+
+
+@pytest_asyncio.fixture
+async def fake_ollama_service() -> AsyncGenerator[Callable[..., OllamaService], None]:
+    """Factory for OllamaService instances talking to a FakeOllama, closed after the test.
+
+    Extra keyword arguments (scheduler, response_cache, ...) go to OllamaService.
+    """
+    services: List[OllamaService] = []
+
+    def make(server: FakeOllama, **kwargs) -> OllamaService:
+        service = OllamaService(
+            host="http://ollama.test", model="test-model", transport=MockTransport(server), **kwargs
+        )
+        services.append(service)
+        return service
+
+    yield make
+    for service in services:
+        await service.aclose()
@@ -2,7 +2,6 @@
 
 import json
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
 
 from app.agents.recommender_agent import RecommenderAgent
 from app.agents.synergy_agent import SynergyAgent
@@ -154,7 +153,7 @@ class TestOptimizerAgent:
     async def test_run_success_with_mocked_synergy_and_llm(self):
         """Test optimizer run() succeeds with mocked SynergyAgent and LLM response.
 
-        This focuses on wiring and post-processing logic rather than real HTTP calls.
+        This focuses on wiring and post-processing logic rather than real LLM calls.
         """
 
         # Mocked LLM response payload compatible with OptimizerAgent expectations
@@ -174,15 +173,11 @@ class TestOptimizerAgent:
             "alternative_options": [],
         }
 
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            "response": json.dumps(mock_payload),
-            "created_at": "2025-01-01T00:00:00Z",
-        }
-        mock_response.raise_for_status.return_value = None
+        class StubOllama:
+            model, host = "test-model", "http://ollama.test"
 
-        async def fake_post(url: str, json: dict | None = None):  # type: ignore[override]
-            return mock_response
+            async def generate_structured(self, **kwargs):  # type: ignore[override]
+                return json.loads(json.dumps(mock_payload))
 
         async def fake_synergy_execute(_inputs):  # type: ignore[override]
             # Mimic BaseAgent.execute() contract for SynergyAgent
@@ -196,18 +191,13 @@ class TestOptimizerAgent:
                 },
             }
 
-        class DummyClient:
-            async def post(self, url: str, json: dict | None = None):  # type: ignore[override]
-                return await fake_post(url, json)
-
         class DummySynergyAgent:
             async def execute(self, inputs):  # type: ignore[override]
                 return await fake_synergy_execute(inputs)
 
-        agent = OptimizerAgent()
+        agent = OptimizerAgent(ollama_service=StubOllama())  # type: ignore[arg-type]
         # Bypass initialize() to keep our fakes
         agent._is_initialized = True
-        agent._client = DummyClient()  # type: ignore[assignment]
         agent._synergy_agent = DummySynergyAgent()  # type: ignore[assignment]
 
         result = await agent.execute(
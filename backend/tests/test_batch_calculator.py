@@ -0,0 +1,123 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from app.engine.combat.context import CombatContext
+from app.engine.gear.registry import RELIC_REGISTRY, RUNE_REGISTRY, SIGIL_REGISTRY
+from app.engine.modifiers.base import Modifier, ModifierType
+from app.engine.simulation.batch import BatchBuildCalculator
+from app.engine.simulation.calculator import BuildCalculator
+
+
+BASE_STATS = [
+    {
+        "power": 2800,
+        "precision": 2200,
+        "ferocity": 1200,
+        "toughness": 1000,
+        "vitality": 1000,
+        "condition_damage": 300,
+        "expertise": 200,
+    },
+    {
+        "power": 1200,
+        "precision": 1000,
+        "toughness": 1400,
+        "vitality": 1400,
+        "concentration": 1200,
+        "healing_power": 1800,
+    },
+]
+
+SKILLS = [
+    {"name": "Strike", "damage_coefficient": 2.0},
+    {
+        "name": "Burn",
+        "damage_coefficient": 0.5,
+        "conditions": {"Burning": {"stacks": 2, "base_duration": 4.0}, "Bleeding": {"stacks": 3}},
+    },
+]
+
+
+def _sigil_set(names):
+    return [SIGIL_REGISTRY[n](25) if n == "Bloodlust" else SIGIL_REGISTRY[n]() for n in names]
+
+
+def _scalar(calculator, base_stats, modifiers, context):
+    effective = calculator.calculate_effective_stats(base_stats, modifiers, context)
+    total = sum(calculator.calculate_skill_damage(s, effective, context)["total_damage"] for s in SKILLS)
+    return effective, total
+
+
+def _make_context() -> CombatContext:
+    ctx = CombatContext.create_default(might_stacks=18, fury=True)
+    ctx.add_boon("Quickness", 1, 1)
+    ctx.add_boon("Protection", 1, 1)
+    ctx.set_boon_uptime("Quickness", 0.5)
+    ctx.add_condition_to_target("Vulnerability", 10)
+    ctx.add_condition_to_target("Burning", 1)
+    return ctx
+
+
+def test_grid_matches_scalar_calculator_on_registries():
+    ctx = _make_context()
+    rune_sets = [factory() for factory in RUNE_REGISTRY.values()]
+    sigil_sets = [_sigil_set(c) for c in itertools.combinations(list(SIGIL_REGISTRY)[:12], 2)]
+    relic = RELIC_REGISTRY["Fireworks"]()
+
+    evaluation = BatchBuildCalculator().evaluate_grid(
+        base_stats=BASE_STATS,
+        modifier_axes=[rune_sets, sigil_sets],
+        skills=SKILLS,
+        context=ctx,
+        shared_modifiers=relic,
+    )
+
+    assert evaluation.shape == (len(BASE_STATS), len(rune_sets), len(sigil_sets))
+
+    calculator = BuildCalculator()
+    for p, base in enumerate(BASE_STATS):
+        for i, rune in enumerate(rune_sets):
+            for j, sigils in enumerate(sigil_sets):
+                effective, total = _scalar(calculator, base, rune + sigils + relic, ctx)
+                assert evaluation.total_damage[p, i, j] == pytest.approx(total, rel=1e-9)
+                for key, value in effective.items():
+                    assert evaluation.stats[key][p, i, j] == pytest.approx(value, rel=1e-9), key
+
+
+def test_grid_handles_percent_stats_additive_groups_and_incoming_modifiers():
+    ctx = _make_context()
+    axis = [
+        [Modifier("Pct", "Trait", ModifierType.PERCENT_STAT, 0.07, target_stat="power")],
+        [
+            Modifier("Add A", "Trait", ModifierType.STRIKE_DAMAGE_MULTIPLIER, 0.1, is_multiplicative=False,
+                     metadata={"additive_group": "trait"}),
+            Modifier("Crit", "Trait", ModifierType.CRIT_CHANCE, 0.15),
+        ],
+        [Modifier("Guard", "Trait", ModifierType.DAMAGE_MULTIPLIER, -0.1, metadata={"incoming_only": True})],
+    ]
+    shared = [
+        Modifier("Add B", "Trait", ModifierType.STRIKE_DAMAGE_MULTIPLIER, 0.05, is_multiplicative=False,
+                 metadata={"additive_group": "trait"}),
+    ]
+
+    evaluation = BatchBuildCalculator().evaluate_grid(BASE_STATS[:1], [axis], SKILLS, ctx, shared_modifiers=shared)
+
+    calculator = BuildCalculator()
+    for i, mods in enumerate(axis):
+        effective, total = _scalar(calculator, BASE_STATS[0], mods + shared, ctx)
+        assert evaluation.total_damage[0, i] == pytest.approx(total, rel=1e-9)
+        assert evaluation.stats["strike_multiplier"][0, i] == pytest.approx(effective["strike_multiplier"])
+        assert evaluation.stats["incoming_damage_multiplier"][0, i] == pytest.approx(
+            effective["incoming_damage_multiplier"]
+        )
+
+
+def test_grid_without_modifier_axes_matches_base_damage():
+    ctx = CombatContext.create_default()
+    evaluation = BatchBuildCalculator().evaluate_grid(BASE_STATS, [], SKILLS, ctx)
+
+    calculator = BuildCalculator()
+    expected = np.array([_scalar(calculator, base, [], ctx)[1] for base in BASE_STATS])
+    np.testing.assert_allclose(evaluation.total_damage, expected, rtol=1e-9)
@@ -0,0 +1,177 @@
+"""
+Tests de l'arbitrage groupé du BuildAdvisorAgent (un appel LLM par équipe).
+"""
+
+import pytest
+
+from app.agents import team_commander_agent as tc_module
+from app.agents.build_advisor_agent import AdvisorSlot, BuildAdvisorAgent, BuildCandidate
+from app.agents.slot_optimization import SlotResultCache
+from app.agents.team_commander_agent import Role, TeamCommanderAgent
+from app.core.config import settings
+
+
+def _candidate(id, damage, survivability):
+    return BuildCandidate(
+        id=id,
+        prefix=id.capitalize(),
+        role="dps",
+        rune="Scholar",
+        sigils=["Force", "Impact"],
+        total_damage=damage,
+        survivability=survivability,
+        overall_score=damage / 1000,
+    )
+
+
+class _StubOllama:
+    """generate_structured_cached scripté; mémorise les prompts reçus."""
+
+    def __init__(self, response, from_cache=False):
+        self.response = response
+        self.from_cache = from_cache
+        self.calls = []
+
+    async def generate_structured_cached(self, **kwargs):
+        self.calls.append(kwargs)
+        if isinstance(self.response, Exception):
+            raise self.response
+        return self.response, self.from_cache
+
+
+class _StubCollector:
+    def __init__(self):
+        self.decisions = []
+
+    async def collect_advisor_decision(self, decision, **kwargs):
+        self.decisions.append(decision)
+
+
+def _advisor(response, from_cache=False):
+    advisor = BuildAdvisorAgent()
+    advisor.ollama = _StubOllama(response, from_cache)
+    advisor.collector = _StubCollector()
+    return advisor
+
+
+def _slots():
+    glass, tanky = _candidate("berserker", 9000, 0.2), _candidate("marauder", 8000, 0.6)
+    return [
+        AdvisorSlot("1", [glass, tanky], role="dps", label="Necromancer Reaper"),
+        AdvisorSlot("2", [glass, tanky], role="dps", label="Warrior Berserker"),
+        AdvisorSlot("3", [_candidate("minstrel", 1000, 0.9), _candidate("harrier", 1200, 0.5)], role="heal"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_one_prompt_for_every_slot():
+    advisor = _advisor(
+        {
+            "choices": [
+                {"slot": "1", "best_id": "marauder", "reason": "plus survivable", "ranking": ["marauder"]},
+                {"slot": "2", "best_id": "berserker", "reason": "burst"},
+                {"slot": "3", "best_id": "minstrel", "reason": "soins", "ranking": ["harrier", "minstrel"]},
+            ]
+        }
+    )
+
+    choices = await advisor.choose_best_candidates(_slots(), {"mode": "wvw_zerg", "experience": "expert"})
+
+    assert len(advisor.ollama.calls) == 1
+    prompt = advisor.ollama.calls[0]["prompt"]
+    assert "Slot 1 Necromancer Reaper" in prompt and "Slot 3" in prompt
+    assert advisor.ollama.calls[0]["temperature"] == settings.LLM_AGENT_TEMPERATURE
+    assert [c.candidate.id for c in choices] == ["marauder", "berserker", "minstrel"]
+    assert choices[0].reason == "plus survivable"
+    assert [c.id for c in choices[2].ranked_candidates] == ["harrier", "minstrel"]
+    assert len(advisor.collector.decisions) == 3
+
+
+@pytest.mark.asyncio
+async def test_cached_llm_answers_are_not_collected_again():
+    batch = _advisor({"choices": [{"slot": "1", "best_id": "marauder", "reason": "ok"}]}, from_cache=True)
+    single = _advisor({"best_id": "marauder", "reason": "ok"}, from_cache=True)
+    slots = _slots()
+
+    choices = await batch.choose_best_candidates(slots, {"experience": "expert"})
+    choice = await single._choose_with_llm(slots[0].candidates, "dps", {"experience": "expert"})
+
+    assert choices[0].candidate.id == choice.candidate.id == "marauder"
+    assert batch.collector.decisions == single.collector.decisions == []
+
+
+@pytest.mark.asyncio
+async def test_only_invalid_slots_fall_back_to_heuristic():
+    advisor = _advisor(
+        {
+            "choices": [
+                {"slot": "1", "best_id": "marauder", "reason": "ok"},
+                {"slot": "2", "best_id": "viper", "reason": "id inconnu"},
+                {"slot": "3", "best_id": "berserker", "reason": "id d'un autre slot"},
+                {"slot": "9", "best_id": "marauder", "reason": "slot inconnu"},
+            ]
+        }
+    )
+    slots = _slots()
+    ctx = {"mode": "wvw_zerg", "experience": "expert"}
+
+    choices = await advisor.choose_best_candidates(slots, ctx)
+
+    assert choices[0].reason == "ok"
+    for slot, choice in zip(slots[1:], choices[1:]):
+        expected = advisor._choose_best_candidate_heuristic(slot.candidates, slot.role, ctx)
+        assert choice.candidate == expected.candidate
+        assert choice.reason == expected.reason
+    assert len(advisor.collector.decisions) == 1
+
+
+@pytest.mark.asyncio
+async def test_llm_failure_uses_heuristic_for_all_slots():
+    advisor = _advisor(ValueError("Failed to parse JSON response"))
+
+    choices = await advisor.choose_best_candidates(_slots(), {"experience": "beginner"})
+
+    assert [c.candidate.id for c in choices] == ["marauder", "marauder", "minstrel"]
+
+
+@pytest.mark.asyncio
+async def test_batch_validates_slots():
+    advisor = _advisor({"choices": []})
+    slots = _slots()
+
+    with pytest.raises(ValueError):
+        await advisor.choose_best_candidates([slots[0], AdvisorSlot("1", slots[1].candidates, role="dps")])
+    with pytest.raises(ValueError):
+        await advisor.choose_best_candidates([slots[0], AdvisorSlot("4", [], role="dps")])
+    assert await advisor.choose_best_candidates([]) == []
+
+
+@pytest.mark.asyncio
+async def test_team_slots_share_one_advisor_call(monkeypatch):
+    agent = TeamCommanderAgent()
+    batches = []
+
+    async def choose_best_candidates(slots, context=None):
+        batches.append(slots)
+        return [
+            agent.build_advisor._choose_best_candidate_heuristic(s.candidates, s.role, context or {}) for s in slots
+        ]
+
+    async def unexpected(*args, **kwargs):
+        raise AssertionError("per-slot advisor call")
+
+    monkeypatch.setattr(agent.build_advisor, "choose_best_candidates", choose_best_candidates)
+    monkeypatch.setattr(agent.build_advisor, "choose_best_candidate", unexpected)
+    monkeypatch.setattr(tc_module, "get_slot_result_cache", lambda: SlotResultCache(max_entries=0))
+
+    specs = [
+        (Role.HEAL, "Guardian", "Firebrand", None),
+        (Role.DPS, "Necromancer", "Reaper", None),
+        (Role.DPS, "Warrior", "Berserker", None),
+    ]
+    slots = await agent._optimize_slots(specs, experience="beginner", mode="wvw_zerg")
+
+    assert len(batches) == 1
+    assert [s.slot_id for s in batches[0]] == ["1", "2", "3"]
+    assert [(s.role, s.profession, s.specialization) for s in slots] == [spec[:3] for spec in specs]
+    assert all(s.advisor_reason for s in slots)
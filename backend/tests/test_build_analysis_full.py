@@ -21,6 +21,12 @@ class DummyGW2Client:
             "description": "Grant allies might and quickness while healing them.",
         }
 
+    async def get_specializations(self, spec_ids):  # type: ignore[override]
+        return [await self.get_specialization_details(sid) for sid in spec_ids]
+
+    async def get_traits(self, trait_ids):  # type: ignore[override]
+        return [await self.get_trait_details(tid) for tid in trait_ids]
+
     async def get_skills(self, skill_ids):  # type: ignore[override]
         return [
             {
@@ -235,3 +235,47 @@ class TestBuildEquipmentOptimizerTopK:
 
         scores = [c.overall_score for c in top_candidates]
         assert scores == sorted(scores, reverse=True)
+
+
+class TestBuildEquipmentOptimizerBatchScoring:
+    @pytest.mark.parametrize("role", ["dps", "heal", "boon", "tank", "support"])
+    async def test_topk_matches_exhaustive_scalar_search(self, role: str) -> None:
+        optimizer = BuildEquipmentOptimizer()
+
+        base_stats = {
+            "power": 2200,
+            "precision": 1800,
+            "ferocity": 900,
+            "toughness": 1200,
+            "vitality": 1200,
+            "condition_damage": 400,
+            "expertise": 0,
+            "concentration": 600,
+            "healing_power": 500,
+        }
+        rotation = [
+            {"name": "Burst Skill", "damage_coefficient": 2.0},
+            {"name": "Bleed Skill", "damage_coefficient": 0.7, "conditions": {"Bleeding": {"stacks": 3}}},
+        ]
+        constraints = {"mode": "wvw_roam"}
+        context = optimizer._context_for_constraints(constraints)
+
+        exhaustive = []
+        for rune_name in optimizer.get_runes_for_role(role):
+            for combo in optimizer._generate_sigil_combinations(optimizer.get_sigils_for_role(role)):
+                exhaustive.append(
+                    await optimizer._test_combination(base_stats, rune_name, combo, rotation, role, context)
+                )
+        expected = sorted(exhaustive, key=lambda r: r.overall_score, reverse=True)[:5]
+
+        top_candidates = await optimizer.optimize_build_top_k(
+            base_stats=base_stats,
+            skill_rotation=rotation,
+            role=role,
+            constraints=constraints,
+            top_k=5,
+        )
+
+        assert [(r.rune_name, r.sigil_names, r.overall_score) for r in top_candidates] == [
+            (r.rune_name, r.sigil_names, r.overall_score) for r in expected
+        ]
@@ -0,0 +1,92 @@
+"""
+Tests du codec binaire des chat codes de build (0x0D).
+"""
+
+import base64
+
+import pytest
+
+from app.services.chat_code import (
+    BuildTemplate,
+    decode_build_template,
+    decode_build_templates,
+    decode_chat_code,
+    encode_build_template,
+)
+
+
+# Chat codes complets (44 octets: palettes + données de profession)
+FIREBRAND = "[&DQEQGi8fGybZEgAAXQEAAG8BAAC0EgAAwhIAAAAAAAAAAAAAAAAAAAAAAAA=]"
+SCOURGE = "[&DQg1Gi0bOwqXEQAABhEAAFgBAADUEgAAwhIAAAAAAAAAAAAAAAAAAAAAAAA=]"
+
+
+def _reference_decode(code: str):
+    """Lecture octet par octet du format, indépendante du codec."""
+    raw = base64.b64decode(code[2:-1])
+    specs = [raw[2], raw[4], raw[6]]
+    choices = [[b & 3, (b >> 2) & 3, (b >> 4) & 3] for b in (raw[3], raw[5], raw[7])]
+    palettes = [raw[8 + 2 * i] | (raw[9 + 2 * i] << 8) for i in range(10)]
+    return raw[1], specs, choices, palettes
+
+
+@pytest.mark.parametrize("code", [FIREBRAND, SCOURGE])
+def test_decode_matches_byte_layout(code):
+    template = decode_build_template(code)
+    profession, specs, choices, palettes = _reference_decode(code)
+
+    assert template.profession_code == profession
+    assert list(template.specialization_ids) == specs
+    assert [list(c) for c in template.trait_choices] == choices
+    assert list(template.palette_ids) == palettes
+    assert len(template.extra) == 16  # données de profession conservées telles quelles
+
+
+@pytest.mark.parametrize("code", [FIREBRAND, SCOURGE])
+def test_encode_round_trip(code):
+    template = decode_build_template(code)
+    assert encode_build_template(template) == code
+    assert decode_build_template(encode_build_template(template)) == template
+
+
+def test_record_is_immutable_and_hashable():
+    template = decode_build_template(f"  {FIREBRAND}\n")
+    with pytest.raises(AttributeError):
+        template.profession_code = 2  # type: ignore[misc]
+    assert {template: 1}[decode_build_template(FIREBRAND)] == 1
+
+
+def test_truncated_template_reads_missing_slots_as_empty():
+    template = decode_build_template("[&DQYfFR0mAAAA]")
+
+    assert template.profession_code == 6
+    assert template.specialization_ids == (31, 29, 0)
+    assert template.palette_ids == (0,) * 10
+    assert template.extra == b""
+
+
+def test_builder_without_extra_data():
+    template = BuildTemplate(1, (16, 13, 62), ((1, 2, 3), (3, 3, 3), (0, 0, 1)), tuple(range(10)))
+    assert decode_build_template(encode_build_template(template)) == template
+
+
+@pytest.mark.parametrize("code", ["", "   ", "[&]", "[&AgEAWgAA]", "[&DQ]", "[&%%%%]"])
+def test_invalid_codes_raise_value_error(code):
+    with pytest.raises(ValueError):
+        decode_build_template(code)
+
+
+def test_batch_decode_keeps_positions():
+    templates = decode_build_templates([FIREBRAND, "[&AgEAWgAA]", SCOURGE])
+
+    assert templates[0] == decode_build_template(FIREBRAND)
+    assert templates[1] is None
+    assert templates[2].profession_code == 8
+
+
+def test_dict_view_keeps_legacy_keys():
+    assert decode_chat_code(FIREBRAND) == {
+        "profession_code": 1,
+        "specialization_ids": [16, 47, 27],
+        "trait_choices": [[2, 2, 1], [3, 3, 1], [2, 1, 2]],
+        "skill_palette_ids": [4825, 0, 349, 0, 367, 0, 4788, 0, 4802, 0],
+    }
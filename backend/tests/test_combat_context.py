@@ -0,0 +1,87 @@
+import copy
+import pickle
+
+import pytest
+
+from app.engine.combat.context import CombatContext, ContextSnapshot
+from app.engine.gear.compiled import COMPILED_GEAR
+from app.engine.modifiers.base import Modifier, ModifierType
+from app.engine.modifiers.conditions import COMMON_CONDITIONS, RecentActionCondition
+from app.engine.modifiers.stacking import ModifierStacker
+
+
+def _context() -> CombatContext:
+    ctx = CombatContext.create_default(might_stacks=12, fury=True)
+    ctx.add_boon("Quickness", 1, 1)
+    ctx.set_boon_uptime("Quickness", 0.5)
+    ctx.add_condition_to_target("Burning", 2)
+    ctx.target_health_percent = 0.4
+    ctx.is_flanking = True
+    ctx.recently_dodged = True
+    return ctx
+
+
+def test_snapshot_matches_to_dict_and_is_cached():
+    ctx = _context()
+    snap = ctx.snapshot()
+
+    assert isinstance(snap, ContextSnapshot)
+    assert set(snap) == set(ctx.to_dict())
+    assert snap.to_dict() == ctx.to_dict()
+    assert ctx.snapshot() is snap
+    assert snap.get("unknown", "default") == "default"
+
+
+def test_snapshot_is_invalidated_by_context_changes():
+    ctx = _context()
+    first = ctx.snapshot()
+
+    ctx.add_boon("Might", 5)
+    assert ctx.snapshot() is not first
+    assert ctx.snapshot()["player_boons"]["Might"] == 17
+    assert first["player_boons"]["Might"] == 12
+
+    second = ctx.snapshot()
+    ctx.target_armor = 1000
+    assert ctx.snapshot() is not second
+    assert ctx.snapshot()["target_armor"] == 1000
+
+
+def test_snapshot_is_immutable_and_copyable():
+    snap = _context().snapshot()
+
+    with pytest.raises(AttributeError):
+        snap.target_armor = 1
+    with pytest.raises(TypeError):
+        snap["player_boons"]["Might"] = 25
+
+    assert pickle.loads(pickle.dumps(snap)) == snap
+    assert copy.deepcopy(snap) == snap
+    ctx = _context()
+    ctx.snapshot()
+    assert copy.deepcopy(ctx) == ctx
+
+
+def test_conditions_evaluate_identically_on_snapshot_and_dict():
+    ctx = _context()
+    conditions = list(COMMON_CONDITIONS.values()) + [RecentActionCondition("dodged")]
+
+    for condition in conditions:
+        assert condition.evaluate(ctx.snapshot()) == condition.evaluate(ctx.to_dict()), condition
+
+
+def test_stack_all_modifiers_unchanged_with_snapshot():
+    ctx = _context()
+    modifiers = [mod for mods in COMPILED_GEAR.runes.values() for mod in mods]
+    modifiers += [mod for mods in COMPILED_GEAR.sigils.values() for mod in mods]
+
+    assert ModifierStacker.stack_all_modifiers(modifiers, ctx.snapshot()) == ModifierStacker.stack_all_modifiers(
+        modifiers, ctx.to_dict()
+    )
+
+
+def test_modifier_is_slotted():
+    mod = Modifier("Might", "Boon", ModifierType.FLAT_STAT, 30, target_stat="power", stacks=5, max_stacks=25)
+
+    assert not hasattr(mod, "__dict__")
+    assert pickle.loads(pickle.dumps(mod)).get_effective_value({}) == 150
@@ -0,0 +1,122 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from app.services.gear_optimization_service import (
+    ALL_SLOTS,
+    ARMOR_SLOTS,
+    SLOT_STAT_SHARE,
+    TRINKET_SLOTS,
+    WEAPON_SLOTS,
+    GearOptimizationService,
+)
+
+
+@pytest.fixture(scope="module")
+def service() -> GearOptimizationService:
+    return GearOptimizationService()
+
+
+def _brute_force_best(service, candidates, constraints, role_cat):
+    """Score optimal par énumération complète (2 préfixes -> 2^16 affectations)."""
+    contrib = np.array(
+        [[[service._slot_contribution(slot, p).get(k, 0) for k in service._stat_keys] for p in candidates] for slot in ALL_SLOTS]
+    )
+    choices = np.array(list(itertools.product(range(len(candidates)), repeat=len(ALL_SLOTS))))
+    totals = contrib[np.arange(len(ALL_SLOTS)), choices].sum(axis=1)
+    scores = [
+        service._evaluate_stats_for_role(dict(zip(service._stat_keys, row.tolist())), constraints, role_cat)
+        for row in np.unique(totals, axis=0)
+    ]
+    return max(scores)
+
+
+def test_slot_shares_cover_every_slot_and_sum_to_one():
+    assert set(SLOT_STAT_SHARE) == set(ARMOR_SLOTS + TRINKET_SLOTS + WEAPON_SLOTS)
+    assert sum(SLOT_STAT_SHARE.values()) == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("role", ["dps", "heal", "boon", "tank", "support"])
+def test_equipment_set_fills_all_slots_and_matches_stats(service, role):
+    result = service.generate_equipment_set(role, "Guardian", "Firebrand", "wvw_zerg", "intermediate")
+
+    assignment = result.equipment_set.all_slots()
+    assert set(result.equipment_set.armor) == set(ARMOR_SLOTS)
+    assert set(result.equipment_set.trinkets) == set(TRINKET_SLOTS)
+    assert set(result.equipment_set.weapons) == set(WEAPON_SLOTS)
+    assert result.base_stats == service._compute_stats_from_assignment(assignment)
+    assert result.score == pytest.approx(
+        service._evaluate_stats_for_role(result.base_stats, result.constraints, service._normalize_role(role))
+    )
+
+
+def test_full_single_prefix_keeps_registry_totals(service):
+    prefix = "Berserker"
+    stats = service._compute_stats_from_assignment({slot: prefix for slot in ALL_SLOTS})
+    for key, value in service._all_prefixes[prefix].items():
+        assert stats[key] == pytest.approx(value, abs=len(ALL_SLOTS))
+
+
+def test_dps_min_stats_are_respected(service):
+    result = service.generate_equipment_set("dps", "Necromancer", "Reaper", "wvw_zerg", "intermediate")
+
+    assert result.proven_optimal
+    for key, minimum in result.constraints.min_stats.items():
+        assert result.base_stats[key] >= minimum, key
+
+
+@pytest.mark.parametrize(
+    "role, candidates",
+    [("dps", ["Berserker", "Marauder"]), ("boon", ["Harrier", "Minstrel"]), ("tank", ["Minstrel", "Soldier"])],
+)
+def test_exact_solver_matches_brute_force(service, role, candidates):
+    candidates = [p for p in candidates if p in service._all_prefixes]
+    if len(candidates) < 2:
+        pytest.skip("prefixes missing from itemstats")
+    constraints = service.derive_constraints(role, "wvw_zerg", "intermediate")
+    role_cat = service._normalize_role(role)
+
+    assignment, proven = service._solve_exact(
+        candidates, constraints, role_cat, incumbent={slot: candidates[0] for slot in ALL_SLOTS}
+    )
+    score = service._evaluate_stats_for_role(service._compute_stats_from_assignment(assignment), constraints, role_cat)
+
+    assert proven
+    assert score == pytest.approx(_brute_force_best(service, candidates, constraints, role_cat))
+
+
+def test_node_budget_returns_incumbent_when_exhausted(service, monkeypatch):
+    monkeypatch.setattr(service, "solver_node_budget", 1)
+    constraints = service.derive_constraints("dps", "wvw_zerg", "intermediate")
+    incumbent = {slot: "Berserker" for slot in ALL_SLOTS}
+
+    assignment, proven = service._solve_exact(["Berserker", "Marauder", "Dragon"], constraints, "dps", incumbent)
+
+    assert not proven
+    assert set(assignment) == set(ALL_SLOTS)
+
+
+def test_slot_delta_matches_full_recomputation(service):
+    assignment = {slot: "Berserker" for slot in ALL_SLOTS}
+    stats = service._compute_stats_from_assignment(assignment)
+
+    for slot, prefix in zip(ALL_SLOTS, itertools.cycle(["Marauder", "Dragon", "Berserker"])):
+        stats = service._apply_slot_delta(stats, slot, assignment[slot], prefix)
+        assignment[slot] = prefix
+        assert stats == service._compute_stats_from_assignment(assignment)
+
+
+def test_hill_climb_does_not_resum_every_slot(service, monkeypatch):
+    calls = []
+    original = service._compute_stats_from_assignment
+
+    def counting(assignment):
+        calls.append(assignment)
+        return original(assignment)
+
+    monkeypatch.setattr(service, "_compute_stats_from_assignment", counting)
+    service.generate_equipment_set("tank", "Warrior", "Spellbreaker", "wvw_zerg", "beginner")
+
+    # Etat initial + solution exacte uniquement
+    assert len(calls) <= 2
@@ -0,0 +1,47 @@
+import pytest
+
+from app.agents.build_equipment_optimizer import BuildEquipmentOptimizer
+from app.engine.gear.compiled import COMPILED_GEAR, RELIC_TABLE, RUNE_TABLE, SIGIL_TABLE
+from app.engine.gear.registry import RELIC_REGISTRY, RUNE_REGISTRY, SIGIL_REGISTRY
+from app.engine.modifiers.base import Modifier
+
+
+def _signature(mod: Modifier):
+    return mod.to_dict()
+
+
+def test_compiled_tables_match_factories():
+    assert set(RUNE_TABLE) == set(RUNE_REGISTRY)
+    assert set(SIGIL_TABLE) == set(SIGIL_REGISTRY)
+    assert set(RELIC_TABLE) == set(RELIC_REGISTRY)
+
+    for name, factory in RUNE_REGISTRY.items():
+        assert [_signature(m) for m in RUNE_TABLE[name]] == [_signature(m) for m in factory()]
+    for name, factory in RELIC_REGISTRY.items():
+        assert [_signature(m) for m in RELIC_TABLE[name]] == [_signature(m) for m in factory()]
+
+    (bloodlust,) = SIGIL_TABLE["Bloodlust"]
+    assert _signature(bloodlust) == _signature(SIGIL_REGISTRY["Bloodlust"](25))
+
+
+def test_compiled_tables_are_read_only_and_shared():
+    with pytest.raises(TypeError):
+        RUNE_TABLE["Scholar"] = ()  # type: ignore[index]
+    assert isinstance(RUNE_TABLE["Scholar"], tuple)
+
+    assert COMPILED_GEAR.rune("Scholar") is COMPILED_GEAR.rune("Scholar")
+    assert COMPILED_GEAR.rune("Unknown") == ()
+    assert COMPILED_GEAR.relic(None) is None
+    assert COMPILED_GEAR.relic("Unknown") is None
+    assert COMPILED_GEAR.sigil_set(["Force", "Unknown", "Air"]) == SIGIL_TABLE["Force"] + SIGIL_TABLE["Air"]
+
+
+def test_optimizer_reuses_compiled_modifiers():
+    optimizer = BuildEquipmentOptimizer()
+
+    first = optimizer._build_rune_modifiers("Scholar")
+    second = optimizer._build_rune_modifiers("Scholar")
+    assert first is not second
+    assert all(a is b for a, b in zip(first, second))
+    assert optimizer._build_sigil_modifiers(["Bloodlust"])[0] is SIGIL_TABLE["Bloodlust"][0]
+
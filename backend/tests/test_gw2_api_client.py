@@ -1,13 +1,88 @@
 """
 Tests for GW2 API Client
 
-Tests unitaires pour le client API GW2.
+Tests unitaires pour le client API GW2 (transport httpx local, sans réseau).
 """
 
-import pytest
-from unittest.mock import AsyncMock, patch, MagicMock
+import asyncio
+import time
 
-from app.services.gw2_api_client import GW2APIClient
+import httpx
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.services.gw2_api_client import GW2APIClient, ResponseCache
+from app.services.gw2_http_cache import DiskHTTPCache
+
+
+class _Sequence(list):
+    """Réponses successives d'une route (une par appel)."""
+
+
+def _stub_transport(routes, calls=None):
+    """Transport local: ``routes`` associe un chemin ("/v2/skills") à une réponse.
+
+    Une réponse est un objet JSON, un statut HTTP (int), ou un _Sequence de
+    ces valeurs consommé à chaque appel.
+    """
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if calls is not None:
+            calls.append(request)
+        route = routes[request.url.path]
+        if isinstance(route, _Sequence):
+            route = route.pop(0)
+        if isinstance(route, int):
+            return httpx.Response(route)
+        return httpx.Response(200, json=route)
+
+    return httpx.MockTransport(handler)
+
+
+class _PaginatedServer:
+    """Faux endpoint paginé: ``?page=N&page_size=M`` ou ``?ids=...``, avec throttling optionnel.
+
+    ``throttle_first`` requêtes reçoivent un 429 (avec ``retry_after`` si
+    fourni); les réponses arrivent dans le désordre (délais variables).
+    """
+
+    def __init__(self, total: int, throttle_first: int = 0, retry_after=None):
+        self.entries = [{"id": i} for i in range(total)]
+        self.throttle_first = throttle_first
+        self.retry_after = retry_after
+        self.requests = []
+        self.throttled = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.throttled < self.throttle_first:
+            self.throttled += 1
+            headers = {} if self.retry_after is None else {"Retry-After": str(self.retry_after)}
+            return httpx.Response(429, headers=headers)
+
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            params = request.url.params
+            if "ids" in params:
+                wanted = [int(i) for i in params["ids"].split(",")]
+                await asyncio.sleep(0.001 * (len(self.requests) % 3))
+                return httpx.Response(200, json=[self.entries[i] for i in wanted])
+
+            page, size = int(params["page"]), int(params["page_size"])
+            # Pages impaires plus lentes: l'ordre d'arrivée diffère de l'ordre des pages
+            await asyncio.sleep(0.002 * (page % 2))
+            body = self.entries[page * size : (page + 1) * size]
+            pages = -(-len(self.entries) // size)
+            return httpx.Response(
+                200,
+                json=body,
+                headers={"X-Page-Total": str(pages), "X-Result-Total": str(len(self.entries))},
+            )
+        finally:
+            self.in_flight -= 1
 
 
 class TestGW2APIClient:
@@ -32,12 +107,9 @@ class TestGW2APIClient:
         assert client.headers["Authorization"] == f"Bearer {api_key}"
 
     @pytest.mark.asyncio
-    @patch("httpx.AsyncClient")
-    async def test_get_professions(self, mock_client):
+    async def test_get_professions(self):
         """Test la récupération de la liste des professions."""
-        # Mock de la réponse
-        mock_response = MagicMock()
-        mock_response.json.return_value = [
+        professions_ids = [
             "Guardian",
             "Warrior",
             "Engineer",
@@ -48,13 +120,7 @@ class TestGW2APIClient:
             "Necromancer",
             "Revenant",
         ]
-        mock_response.raise_for_status = MagicMock()
-
-        mock_client_instance = AsyncMock()
-        mock_client_instance.get.return_value = mock_response
-        mock_client.return_value.__aenter__.return_value = mock_client_instance
-
-        client = GW2APIClient()
+        client = GW2APIClient(transport=_stub_transport({"/v2/professions": professions_ids}))
         professions = await client.get_professions()
 
         assert isinstance(professions, list)
@@ -63,24 +129,16 @@ class TestGW2APIClient:
         assert "Revenant" in professions
 
     @pytest.mark.asyncio
-    @patch("httpx.AsyncClient")
-    async def test_get_profession(self, mock_client):
+    async def test_get_profession(self):
         """Test la récupération des détails d'une profession."""
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
+        guardian = {
             "id": "Guardian",
             "name": "Guardian",
             "code": 1,
             "icon": "https://...",
             "specializations": [13, 16, 27, 42, 46, 62, 65],
         }
-        mock_response.raise_for_status = MagicMock()
-
-        mock_client_instance = AsyncMock()
-        mock_client_instance.get.return_value = mock_response
-        mock_client.return_value.__aenter__.return_value = mock_client_instance
-
-        client = GW2APIClient()
+        client = GW2APIClient(transport=_stub_transport({"/v2/professions/Guardian": guardian}))
         profession = await client.get_profession("Guardian")
 
         assert profession["id"] == "Guardian"
@@ -89,39 +147,23 @@ class TestGW2APIClient:
         assert isinstance(profession["specializations"], list)
 
     @pytest.mark.asyncio
-    @patch("httpx.AsyncClient")
-    async def test_get_skills(self, mock_client):
+    async def test_get_skills(self):
         """Test la récupération des compétences."""
-        mock_response = MagicMock()
-        mock_response.json.return_value = [
-            {"id": 12345, "name": "Test Skill", "description": "A test skill", "type": "Weapon"}
-        ]
-        mock_response.raise_for_status = MagicMock()
-
-        mock_client_instance = AsyncMock()
-        mock_client_instance.get.return_value = mock_response
-        mock_client.return_value.__aenter__.return_value = mock_client_instance
-
-        client = GW2APIClient()
+        calls = []
+        skills_payload = [{"id": 12345, "name": "Test Skill", "description": "A test skill", "type": "Weapon"}]
+        client = GW2APIClient(transport=_stub_transport({"/v2/skills": skills_payload}, calls))
         skills = await client.get_skills([12345])
 
         assert isinstance(skills, list)
         assert len(skills) > 0
         assert skills[0]["id"] == 12345
+        assert calls[0].url.params["ids"] == "12345"
 
     @pytest.mark.asyncio
-    @patch("httpx.AsyncClient")
-    async def test_get_specializations(self, mock_client):
+    async def test_get_specializations(self):
         """Test la récupération des spécialisations."""
-        mock_response = MagicMock()
-        mock_response.json.return_value = [{"id": 27, "name": "Dragonhunter", "profession": "Guardian", "elite": True}]
-        mock_response.raise_for_status = MagicMock()
-
-        mock_client_instance = AsyncMock()
-        mock_client_instance.get.return_value = mock_response
-        mock_client.return_value.__aenter__.return_value = mock_client_instance
-
-        client = GW2APIClient()
+        payload = [{"id": 27, "name": "Dragonhunter", "profession": "Guardian", "elite": True}]
+        client = GW2APIClient(transport=_stub_transport({"/v2/specializations": payload}))
         specs = await client.get_specializations([27])
 
         assert isinstance(specs, list)
@@ -132,17 +174,21 @@ class TestGW2APIClient:
     @pytest.mark.asyncio
     async def test_cache_functionality(self):
         """Test le système de cache."""
-        client = GW2APIClient()
+        calls = []
+        client = GW2APIClient(transport=_stub_transport({"/v2/professions": ["Guardian"]}, calls))
 
         # Vérifier que le cache est vide
         stats = client.get_cache_stats()
         assert stats["cache_size"] == 0
 
-        # Ajouter au cache manuellement pour le test
-        client._cache["test_key"] = ({"data": "test"}, client._cache_ttl)
+        assert await client.get_professions() == ["Guardian"]
+        assert await client.get_professions() == ["Guardian"]
 
+        # Une seule requête HTTP, la seconde est servie par le cache
+        assert len(calls) == 1
         stats = client.get_cache_stats()
         assert stats["cache_size"] == 1
+        assert (stats["hits"], stats["misses"]) == (1, 1)
 
         # Vider le cache
         client.clear_cache()
@@ -150,88 +196,47 @@ class TestGW2APIClient:
         assert stats["cache_size"] == 0
 
     @pytest.mark.asyncio
-    @patch("httpx.AsyncClient")
-    async def test_request_retry_on_failure(self, mock_client):
+    async def test_request_retry_on_failure(self):
         """Test le retry en cas d'échec."""
-        # Simuler un échec puis un succès
-        mock_response_fail = MagicMock()
-        mock_response_fail.raise_for_status.side_effect = Exception("Network error")
-
-        mock_response_success = MagicMock()
-        mock_response_success.json.return_value = ["Guardian"]
-        mock_response_success.raise_for_status = MagicMock()
-
-        mock_client_instance = AsyncMock()
-        mock_client_instance.get.side_effect = [mock_response_fail, mock_response_success]
-        mock_client.return_value.__aenter__.return_value = mock_client_instance
+        calls = []
+        routes = {"/v2/professions": _Sequence([503, ["Guardian"]]), "/v2/build": _Sequence([500, 500])}
+        client = GW2APIClient(max_retries=2, transport=_stub_transport(routes, calls))
 
-        client = GW2APIClient(max_retries=2)
+        with patch("app.services.gw2_api_client.asyncio.sleep", new=AsyncMock()) as sleep:
+            # La première tentative échoue, la seconde réussit
+            assert await client.get_professions() == ["Guardian"]
+            assert len(calls) == 2
+            sleep.assert_awaited_once_with(1)
 
-        # Le client devrait réessayer et réussir
-        with pytest.raises(Exception):
-            # La première tentative échoue
-            await client.get_professions()
+            # Toutes les tentatives échouent: l'erreur HTTP est propagée
+            with pytest.raises(httpx.HTTPStatusError):
+                await client.get_build_id()
 
     @pytest.mark.asyncio
-    @patch("httpx.AsyncClient")
-    async def test_import_all_game_data(self, mock_client):
+    async def test_import_all_game_data(self):
         """Test l'importation complète des données de jeu."""
-        # Mock des réponses
-        mock_professions = MagicMock()
-        mock_professions.json.return_value = ["Guardian", "Warrior"]
-        mock_professions.raise_for_status = MagicMock()
-
-        mock_profession_detail = MagicMock()
-        mock_profession_detail.json.return_value = {
-            "id": "Guardian",
-            "name": "Guardian",
-            "specializations": [13, 16, 27],
+        guardian = {"id": "Guardian", "name": "Guardian", "specializations": [13, 16, 27]}
+        routes = {
+            "/v2/professions": ["Guardian", "Warrior"],
+            "/v2/professions/Guardian": guardian,
+            "/v2/professions/Warrior": {**guardian, "id": "Warrior", "name": "Warrior"},
+            "/v2/specializations": [{"id": 1, "name": "Spec1"}, {"id": 2, "name": "Spec2"}],
+            "/v2/traits": [{"id": 100, "name": "Trait1"}, {"id": 101, "name": "Trait2"}],
         }
-        mock_profession_detail.raise_for_status = MagicMock()
-
-        mock_specs = MagicMock()
-        mock_specs.json.return_value = [1, 2, 3]
-        mock_specs.raise_for_status = MagicMock()
-
-        mock_specs_detail = MagicMock()
-        mock_specs_detail.json.return_value = [{"id": 1, "name": "Spec1"}, {"id": 2, "name": "Spec2"}]
-        mock_specs_detail.raise_for_status = MagicMock()
-
-        mock_traits = MagicMock()
-        mock_traits.json.return_value = [100, 101]
-        mock_traits.raise_for_status = MagicMock()
-
-        mock_traits_detail = MagicMock()
-        mock_traits_detail.json.return_value = [{"id": 100, "name": "Trait1"}, {"id": 101, "name": "Trait2"}]
-        mock_traits_detail.raise_for_status = MagicMock()
-
-        mock_client_instance = AsyncMock()
-        mock_client_instance.get.side_effect = [
-            mock_professions,
-            mock_profession_detail,
-            mock_profession_detail,
-            mock_specs,
-            mock_specs_detail,
-            mock_traits,
-            mock_traits_detail,
-        ]
-        mock_client.return_value.__aenter__.return_value = mock_client_instance
 
-        client = GW2APIClient()
+        client = GW2APIClient(transport=_stub_transport(routes))
         result = await client.import_all_game_data()
 
         assert result["success"] is True
-        assert "professions" in result
-        assert "specializations" in result
-        assert "traits" in result
+        assert [p["id"] for p in result["professions"]] == ["Guardian", "Warrior"]
+        assert len(result["specializations"]) == 2
+        assert len(result["traits"]) == 2
         assert "import_timestamp" in result
 
     @pytest.mark.asyncio
     async def test_get_all_items(self):
-        client = GW2APIClient()
-
-        # Première requête: liste d'IDs, seconde requête: détails paginés
-        client._request = AsyncMock(side_effect=[[1, 2], [{"id": 1}, {"id": 2}]])  # type: ignore[assignment]
+        # Une seule page (pas d'en-tête X-Page-Total)
+        client = GW2APIClient(transport=_stub_transport({"/v2/items": [{"id": 1}, {"id": 2}]}))
 
         items = await client.get_all_items()
 
@@ -242,10 +247,7 @@ class TestGW2APIClient:
 
     @pytest.mark.asyncio
     async def test_get_upgrade_components_all(self):
-        client = GW2APIClient()
-
-        # Première requête: liste d'IDs de composants, seconde: détails
-        client._request = AsyncMock(side_effect=[[10, 11], [{"id": 10}, {"id": 11}]])  # type: ignore[assignment]
+        client = GW2APIClient(transport=_stub_transport({"/v2/upgrade_components": [{"id": 10}, {"id": 11}]}))
 
         components = await client.get_upgrade_components()
 
@@ -281,11 +283,265 @@ class TestGW2APIClient:
         client = GW2APIClient()
 
         # Ajouter des données au cache
-        client._cache["key1"] = ("data1", None)
-        client._cache["key2"] = ("data2", None)
+        client._cache.set("key1", "data1")
+        client._cache.set("key2", "data2")
 
         assert len(client._cache) == 2
 
         client.clear_cache()
 
         assert len(client._cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_requests_share_one_pooled_connection_client(self):
+        """Les requêtes réutilisent le même httpx.AsyncClient (keep-alive)."""
+        calls = []
+        routes = {"/v2/skills/1": {"id": 1}, "/v2/skills/2": {"id": 2}}
+        client = GW2APIClient(api_key="key", max_connections=4, transport=_stub_transport(routes, calls))
+
+        await client.get_skill(1)
+        http_client = client._http_client
+        await client.get_skill(2)
+
+        assert client._http_client is http_client
+        assert client.limits.max_connections == 4
+        assert all(c.headers["Authorization"] == "Bearer key" for c in calls)
+
+        await client.aclose()
+        assert http_client.is_closed
+        assert client._http_client is None
+
+    def test_response_cache_is_bounded_lru_with_ttl(self):
+        now = [1000.0]
+        cache = ResponseCache(max_entries=2, ttl_seconds=10)
+        with patch("app.services.gw2_api_client.time.monotonic", side_effect=lambda: now[0]):
+            cache.set("a", 1)
+            cache.set("b", 2)
+            assert cache.get("a") == (True, 1)  # "a" devient la plus récente
+            cache.set("c", 3)  # évince "b"
+            assert cache.get("b") == (False, None)
+            assert len(cache) == 2
+
+            now[0] += 11
+            assert cache.get("a") == (False, None)
+            assert len(cache) == 1
+
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    @pytest.mark.asyncio
+    async def test_cache_lookups_are_exported_as_metrics(self):
+        from prometheus_client import REGISTRY
+
+        def hits():
+            return REGISTRY.get_sample_value("gw2_api_cache_lookups_total", {"result": "hit"}) or 0.0
+
+        client = GW2APIClient(transport=_stub_transport({"/v2/build": {"id": 191645}}))
+        before = hits()
+        assert await client.get_build_id() == 191645
+        assert await client.get_build_id() == 191645
+        assert hits() == before + 1
+        assert REGISTRY.get_sample_value("gw2_api_cache_entries") == 1
+
+
+class TestPaginatedFetch:
+    """Récupération paginée concurrente (transport local simulant l'API)."""
+
+    @pytest.mark.asyncio
+    async def test_pages_fetched_concurrently_in_order(self):
+        server = _PaginatedServer(total=1050)
+        client = GW2APIClient(transport=httpx.MockTransport(server), page_concurrency=3, rate_burst=100)
+
+        items = await client.get_all_items()
+
+        assert [it["id"] for it in items] == list(range(1050))
+        assert len(server.requests) == 6  # 1 page de découverte + 5 en parallèle
+        assert 1 < server.max_in_flight <= 3
+
+    @pytest.mark.asyncio
+    async def test_id_batches_fetched_concurrently_in_order(self):
+        server = _PaginatedServer(total=500)
+        client = GW2APIClient(transport=httpx.MockTransport(server), page_concurrency=4, rate_burst=100)
+
+        ids = list(range(499, -1, -1))
+        entries = await client._get_paginated("items", ids, page_size=50)
+
+        assert [e["id"] for e in entries] == ids
+        assert len(server.requests) == 10
+
+    @pytest.mark.asyncio
+    async def test_throttled_requests_are_retried_with_retry_after(self):
+        server = _PaginatedServer(total=600, throttle_first=3, retry_after=0)
+        client = GW2APIClient(transport=httpx.MockTransport(server), rate_limit=100, rate_burst=100)
+
+        items = await client.get_traits()
+
+        assert [it["id"] for it in items] == list(range(600))
+        assert server.throttled == 3
+        # Chaque 429 divise le débit, les succès le font remonter
+        assert client._rate_limiter.rate < client._rate_limiter.max_rate
+
+    @pytest.mark.asyncio
+    async def test_adaptive_backoff_without_retry_after(self):
+        server = _PaginatedServer(total=10, throttle_first=3)
+        client = GW2APIClient(
+            transport=httpx.MockTransport(server), throttle_backoff=0.01, rate_limit=1000, rate_burst=100
+        )
+
+        started = time.monotonic()
+        items = await client.get_skills()
+
+        # Attentes 0.01 + 0.02 + 0.04 (doublées à chaque 429 consécutif)
+        assert time.monotonic() - started >= 0.07
+        assert len(items) == 10
+        assert client._throttle_delay == 0.01  # réinitialisé après un succès
+
+    @pytest.mark.asyncio
+    async def test_persistent_throttling_surfaces_429(self):
+        server = _PaginatedServer(total=10, throttle_first=100, retry_after=0)
+        client = GW2APIClient(transport=httpx.MockTransport(server), max_retries=1, rate_limit=1000, rate_burst=100)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.get_itemstats()
+        assert server.throttled == client.max_throttle_retries + 1
+
+    @pytest.mark.asyncio
+    async def test_token_bucket_limits_request_rate(self):
+        server = _PaginatedServer(total=5)
+        client = GW2APIClient(transport=httpx.MockTransport(server), rate_limit=50, rate_burst=1, page_concurrency=5)
+
+        started = time.monotonic()
+        await client._get_paginated("items", list(range(5)), page_size=1)
+
+        # 5 requêtes, rafale de 1 puis 50/s: au moins 4 intervalles de 20 ms
+        assert time.monotonic() - started >= 0.075
+
+
+class _ConditionalServer:
+    """Faux endpoint avec ETag: répond 304 quand If-None-Match correspond à la version courante."""
+
+    def __init__(self, build_id: int = 191645):
+        self.build_id = build_id
+        self.version = 1
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.url.path == "/v2/build":
+            return httpx.Response(200, json={"id": self.build_id})
+        etag = f'"v{self.version}"'
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        return httpx.Response(
+            200,
+            json=[{"id": 1, "name": f"Berserker v{self.version}"}],
+            headers={"ETag": etag, "X-Result-Total": "1"},
+        )
+
+    def data_requests(self):
+        return [r for r in self.requests if r.url.path != "/v2/build"]
+
+
+class TestDiskHTTPCache:
+    """Cache HTTP persistant: revalidation conditionnelle et invalidation par build."""
+
+    @staticmethod
+    def _client(server, cache_dir, fresh_seconds=0.0):
+        return GW2APIClient(
+            transport=httpx.MockTransport(server),
+            disk_cache=DiskHTTPCache(cache_dir, fresh_seconds=fresh_seconds),
+            cache_max_entries=0,
+        )
+
+    @pytest.mark.asyncio
+    async def test_restart_revalidates_instead_of_refetching(self, tmp_path):
+        server = _ConditionalServer()
+        first = await self._client(server, tmp_path).get_itemstats([1])
+
+        # Nouveau processus: cache mémoire vide, entrée disque revalidée
+        client = self._client(server, tmp_path)
+        assert await client.get_itemstats([1]) == first
+
+        revalidation = server.data_requests()[-1]
+        assert revalidation.headers["If-None-Match"] == '"v1"'
+        assert client.get_cache_stats()["disk_cache"]["revalidated"] == 1
+
+    @pytest.mark.asyncio
+    async def test_changed_resource_is_replaced(self, tmp_path):
+        server = _ConditionalServer()
+        client = self._client(server, tmp_path)
+        await client.get_itemstats([1])
+
+        server.version = 2
+        assert (await client.get_itemstats([1]))[0]["name"] == "Berserker v2"
+        assert (await client.get_itemstats([1]))[0]["name"] == "Berserker v2"
+        assert client._disk_cache.stats == {"hit": 0, "revalidated": 1, "changed": 1, "miss": 1}
+
+    @pytest.mark.asyncio
+    async def test_fresh_entries_are_served_without_request(self, tmp_path):
+        server = _ConditionalServer()
+        await self._client(server, tmp_path, fresh_seconds=3600).get_itemstats([1])
+
+        client = self._client(server, tmp_path, fresh_seconds=3600)
+        assert (await client.get_itemstats([1]))[0]["name"] == "Berserker v1"
+        assert len(server.data_requests()) == 1
+        assert client._disk_cache.stats["hit"] == 1
+
+    @pytest.mark.asyncio
+    async def test_new_game_build_invalidates_everything(self, tmp_path):
+        server = _ConditionalServer(build_id=100)
+        await self._client(server, tmp_path).get_itemstats([1])
+        assert (tmp_path / "100").is_dir()
+
+        server.build_id = 101
+        client = self._client(server, tmp_path)
+        await client.get_itemstats([1])
+
+        # Requête complète (sans validateur) et répertoire de l'ancien build supprimé
+        assert "If-None-Match" not in server.data_requests()[-1].headers
+        assert client._disk_cache.stats["miss"] == 1
+        assert [p.name for p in tmp_path.iterdir()] == ["101"]
+
+    @pytest.mark.asyncio
+    async def test_build_is_checked_once_for_concurrent_requests(self, tmp_path):
+        server = _ConditionalServer()
+        client = self._client(server, tmp_path)
+
+        await asyncio.gather(*(client.get_itemstats([1]) for _ in range(5)))
+
+        assert sum(r.url.path == "/v2/build" for r in server.requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_account_requests_bypass_disk_cache(self, tmp_path):
+        server = _ConditionalServer()
+        client = GW2APIClient(
+            api_key="secret",
+            transport=httpx.MockTransport(server),
+            disk_cache=DiskHTTPCache(tmp_path),
+            cache_max_entries=0,
+        )
+
+        await client.get_itemstats([1])
+
+        assert not any(tmp_path.iterdir())
+        assert all(r.url.path != "/v2/build" for r in server.requests)
+
+    @pytest.mark.asyncio
+    async def test_paginated_import_keeps_page_headers(self, tmp_path):
+        server = _PaginatedServer(total=450)
+        original = server.__call__
+
+        async def with_build(request):
+            if request.url.path == "/v2/build":
+                return httpx.Response(200, json={"id": 1})
+            return await original(request)
+
+        transport = httpx.MockTransport(with_build)
+        await GW2APIClient(transport=transport, disk_cache=DiskHTTPCache(tmp_path, fresh_seconds=3600)).get_skills()
+
+        server.requests.clear()
+        client = GW2APIClient(transport=transport, disk_cache=DiskHTTPCache(tmp_path, fresh_seconds=3600))
+        items = await client.get_skills()
+
+        # X-Page-Total relu depuis le disque: les 3 pages sont servies sans requête
+        assert [it["id"] for it in items] == list(range(450))
+        assert [r for r in server.requests if r.url.path != "/v2/build"] == []
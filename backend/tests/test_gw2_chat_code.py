@@ -0,0 +1,134 @@
+"""
+Tests du décodage de chat codes de build (unitaire et par lot), hors ligne.
+
+Les réponses de l'API proviennent de tests/fixtures/gw2_api (payloads /v2
+réduits aux champs utilisés), servies par un transport httpx local.
+"""
+
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+
+from app.services.chat_code import BuildTemplate, encode_build_template
+from app.services.gw2_api_client import GW2APIClient
+from app.services.gw2_chat_code import ChatCodeDecoder
+from app.services.gw2_data_store import GW2DataStore
+from app.services.gw2_entity_resolver import GW2EntityResolver
+
+
+FIXTURES = Path(__file__).parent / "fixtures" / "gw2_api"
+
+GUARDIAN, NECROMANCER = 1, 8
+HONOR, VALOR, RADIANCE, FIREBRAND = 49, 13, 16, 62
+SPITE, SOUL_REAPING, SCOURGE = 53, 50, 60
+
+
+def _chat_code(profession, lines, palettes=()):
+    """Build template 0x0D: profession, 3 x (spec, trait choices), 10 palette IDs."""
+    specs, choices = zip(*lines)
+    return encode_build_template(BuildTemplate(profession, specs, choices, tuple(palettes) + (0,) * (10 - len(palettes))))
+
+
+class _FixtureServer:
+    """Sert /v2/specializations?ids=... et /v2/professions/<id> depuis les fixtures."""
+
+    def __init__(self):
+        specs = json.loads((FIXTURES / "specializations.json").read_text(encoding="utf-8"))
+        self.specializations = {spec["id"]: spec for spec in specs}
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        path = request.url.path
+        if path == "/v2/specializations":
+            wanted = [int(i) for i in request.url.params["ids"].split(",")]
+            return httpx.Response(200, json=[self.specializations[i] for i in wanted if i in self.specializations])
+        if path.startswith("/v2/professions/"):
+            fixture = FIXTURES / f"profession_{path.rsplit('/', 1)[-1]}.json"
+            if fixture.exists():
+                return httpx.Response(200, content=fixture.read_bytes())
+        return httpx.Response(404)
+
+    def paths(self):
+        return [r.url.path for r in self.requests]
+
+
+def _decoder(server, data_dir):
+    client = GW2APIClient(transport=httpx.MockTransport(server), cache_max_entries=0, max_retries=1)
+    decoder = ChatCodeDecoder(gw2_client=client)
+    # Données locales contrôlées par le test (vides: tout passe par les fixtures)
+    decoder.entity_resolver = GW2EntityResolver(client, GW2DataStore(data_dir=data_dir))
+    return decoder
+
+
+FIREBRAND_CODE = _chat_code(
+    GUARDIAN,
+    [(HONOR, (2, 2, 1)), (VALOR, (1, 3, 2)), (FIREBRAND, (1, 2, 3))],
+    palettes=[4857, 4651, 4789, 4800, 254],
+)
+
+
+@pytest.mark.asyncio
+async def test_decode_build_resolves_traits_and_skills(tmp_path):
+    server = _FixtureServer()
+    decoded = await _decoder(server, tmp_path).decode_build(FIREBRAND_CODE)
+
+    firebrand = server.specializations[FIREBRAND]["major_traits"]
+    assert decoded["profession_code"] == GUARDIAN
+    assert decoded["specialization_id"] == FIREBRAND  # spécialisation élite prioritaire
+    assert decoded["trait_ids"][-3:] == [firebrand[0], firebrand[4], firebrand[8]]
+    assert len(decoded["trait_ids"]) == 9
+    assert decoded["skill_ids"] == [41714, 9153, 40915, 43357, 9175]
+    # Trois spécialisations en une requête, plus la palette de la profession
+    assert sorted(server.paths()) == ["/v2/professions/Guardian", "/v2/specializations"]
+
+
+@pytest.mark.asyncio
+async def test_decode_builds_dedupes_lookups_across_the_batch(tmp_path):
+    server = _FixtureServer()
+    scourge = _chat_code(NECROMANCER, [(SPITE, (1, 1, 1)), (SOUL_REAPING, (2, 2, 2)), (SCOURGE, (3, 3, 3))], [115, 105])
+    other_firebrand = _chat_code(GUARDIAN, [(HONOR, (1, 1, 1)), (RADIANCE, (3, 3, 3)), (FIREBRAND, (2, 2, 2))])
+    codes = [FIREBRAND_CODE, scourge, "[&not a build]", other_firebrand, FIREBRAND_CODE]
+
+    decoder = _decoder(server, tmp_path)
+    results = await decoder.decode_builds(codes)
+
+    assert results[2] is None
+    assert results[0] == results[4]
+    assert results[1]["specialization_id"] == SCOURGE
+    assert results[1]["skill_ids"] == [10527, 10545]
+    assert results[3]["specialization_id"] == FIREBRAND
+
+    spec_requests = [r for r in server.requests if r.url.path == "/v2/specializations"]
+    assert len(spec_requests) == 1
+    assert sorted(map(int, spec_requests[0].url.params["ids"].split(","))) == sorted(
+        {HONOR, VALOR, FIREBRAND, SPITE, SOUL_REAPING, SCOURGE, RADIANCE}
+    )
+    assert sorted(p for p in server.paths() if p.startswith("/v2/professions/")) == [
+        "/v2/professions/Guardian",
+        "/v2/professions/Necromancer",
+    ]
+
+    # Même résultat qu'un décodage unitaire
+    for code, result in zip(codes, results):
+        if result is not None:
+            assert result == await _decoder(_FixtureServer(), tmp_path).decode_build(code)
+
+
+@pytest.mark.asyncio
+async def test_local_specializations_avoid_the_api(tmp_path):
+    (tmp_path / "specializations.json").write_bytes((FIXTURES / "specializations.json").read_bytes())
+    server = _FixtureServer()
+
+    results = await _decoder(server, tmp_path).decode_builds([FIREBRAND_CODE, FIREBRAND_CODE])
+
+    assert results[0]["specialization_id"] == FIREBRAND
+    assert server.paths() == ["/v2/professions/Guardian"]
+
+
+def test_invalid_codes_raise_on_single_decode(tmp_path):
+    decoder = _decoder(_FixtureServer(), tmp_path)
+    with pytest.raises(ValueError):
+        decoder._decode_raw("[&AQ==]")  # type 0x01 (coin), pas un build template
@@ -0,0 +1,147 @@
+import json
+from pathlib import Path
+
+from prometheus_client import REGISTRY
+
+from app.agents.build_equipment_optimizer import BuildEquipmentOptimizer
+from app.services import gw2_data_store
+from app.services.gw2_data_store import (
+    GW2DataStore,
+    get_gw2_data_store,
+    normalize_name,
+    register_reload_listener,
+    reload_gw2_data_store,
+    short_upgrade_name,
+    warmup_gw2_data_store,
+)
+
+
+def _write(data_dir: Path, name: str, entries) -> None:
+    (data_dir / f"{name}.json").write_text(json.dumps(entries), encoding="utf-8")
+
+
+def test_indexes_cover_id_name_type_and_subtype(tmp_path: Path):
+    _write(
+        tmp_path,
+        "upgrade_components",
+        [
+            {"id": 24836, "name": "Superior Rune of the Scholar", "type": "UpgradeComponent", "details": {"type": "Rune"}},
+            {"id": 24615, "name": "Superior Sigil of Force", "type": "UpgradeComponent", "details": {"type": "Sigil"}},
+            {"id": 24555, "name": "Minor Sigil of Force", "type": "UpgradeComponent", "details": {"type": "Sigil"}},
+            {"id": 1, "name": "Ruby Orb", "type": "UpgradeComponent", "details": {"type": "Gem"}},
+        ],
+    )
+    _write(tmp_path, "traits", [{"id": 2101, "name": "Liberator's  Vow"}, {"name": "No id"}])
+    store = GW2DataStore(data_dir=tmp_path)
+
+    assert store.get_upgrade_component(24615)["name"] == "Superior Sigil of Force"
+    assert store.get_trait(2101)["name"] == "Liberator's  Vow"
+    assert store.get_trait(9999) is None
+    assert store.find_by_name("traits", "liberator's vow ") == [store.get_trait(2101)]
+    assert [c["id"] for c in store.get_upgrade_components_by_subtype("Sigil")] == [24615, 24555]
+    assert len(store.get_index("upgrade_components").by_type["UpgradeComponent"]) == 4
+
+    assert store.get_rune_names() == {"Scholar"}
+    assert store.get_sigil_names() == {"Force"}
+    assert [s["id"] for s in store.find_sigil("Force")] == [24615, 24555]
+    assert store.find_rune("Force") == []
+
+
+def test_lookups_are_built_once(tmp_path: Path):
+    _write(tmp_path, "upgrade_components", [{"id": 1, "name": "Superior Rune of Strength"}])
+    store = GW2DataStore(data_dir=tmp_path)
+
+    assert store.get_runes() is store.get_runes()
+    assert store.get_rune_names() is store.get_rune_names()
+    assert store.get_index("upgrade_components") is store.get_index("upgrade_components")
+
+
+def test_upgrade_components_fall_back_to_indexed_items(tmp_path: Path):
+    _write(
+        tmp_path,
+        "items",
+        [
+            {"id": 1, "name": "Superior Rune of Strength", "type": "UpgradeComponent"},
+            {"id": 2, "name": "Relic of the Monk", "type": "Relic"},
+            {"id": 3, "name": "Some Weapon", "type": "Weapon"},
+        ],
+    )
+    store = GW2DataStore(data_dir=tmp_path)
+
+    assert [c["id"] for c in store.get_upgrade_components()] == [1]
+    assert store.get_rune_names() == {"Strength"}
+    assert store.get_relic_names() == {"Monk"}
+
+
+def test_short_names_match_linear_scan_on_local_dump():
+    store = GW2DataStore()
+    optimizer = BuildEquipmentOptimizer()
+
+    scanned_runes = {
+        optimizer._normalize_rune_name_from_api(c["name"]) for c in store.get_upgrade_components()
+        if isinstance(c.get("name"), str) and "Rune of " in c["name"]
+    }
+    scanned_sigils = {
+        optimizer._normalize_sigil_name_from_api(c["name"]) for c in store.get_upgrade_components()
+        if isinstance(c.get("name"), str) and "Sigil of " in c["name"]
+    }
+
+    assert store.get_rune_names() == scanned_runes - {None}
+    assert store.get_sigil_names() == scanned_sigils - {None}
+    assert normalize_name("  Superior   Rune of the SCHOLAR") == "superior rune of the scholar"
+    assert short_upgrade_name("Superior Rune of the Scholar", "Rune of ") == "Scholar"
+
+
+def _small_dump(data_dir: Path) -> None:
+    _write(
+        data_dir,
+        "upgrade_components",
+        [
+            {"id": 24836, "name": "Superior Rune of the Scholar", "type": "UpgradeComponent", "details": {"type": "Rune"}},
+            {"id": 24615, "name": "Superior Sigil of Force", "type": "UpgradeComponent", "details": {"type": "Sigil"}},
+        ],
+    )
+    _write(data_dir, "traits", [{"id": 2101, "name": "Liberator's Vow"}])
+
+
+def test_shared_store_warmup_reload_and_memory_metric(tmp_path: Path, monkeypatch):
+    _small_dump(tmp_path)
+    store = GW2DataStore(data_dir=tmp_path)
+    monkeypatch.setattr(gw2_data_store, "_gw2_data_store", store)
+    monkeypatch.setattr(gw2_data_store, "_reload_listeners", [])
+
+    assert get_gw2_data_store() is store
+    optimizer = BuildEquipmentOptimizer()
+    assert optimizer.data_store is store
+
+    counts = warmup_gw2_data_store(("traits", "upgrade_components"))
+    assert counts == {"traits": 1, "upgrade_components": 2}
+    assert store.loaded_datasets == ("traits", "upgrade_components")
+    assert REGISTRY.get_sample_value("gw2_static_data_entries", {"dataset": "traits"}) == 1
+    assert REGISTRY.get_sample_value("gw2_static_data_memory_bytes", {"dataset": "traits"}) > 0
+
+    calls = []
+    register_reload_listener(lambda: calls.append(get_gw2_data_store()))
+    _write(tmp_path, "traits", [{"id": 2101, "name": "Liberator's Vow"}, {"id": 2116, "name": "Stoic Demeanor"}])
+
+    assert reload_gw2_data_store() == {"traits": 2, "upgrade_components": 2}
+    fresh = get_gw2_data_store()
+    # New store swapped in, already warm; the old one is left untouched for in-flight readers
+    assert fresh is not store
+    assert fresh.loaded_datasets == ("traits", "upgrade_components")
+    assert fresh.get_trait(2116)["name"] == "Stoic Demeanor"
+    assert store.get_trait(2116) is None
+    assert optimizer.data_store is fresh
+    assert calls == [fresh]
+    assert REGISTRY.get_sample_value("gw2_static_data_entries", {"dataset": "traits"}) == 2
+
+
+def test_memory_usage_counts_index_without_entries_twice(tmp_path: Path):
+    _small_dump(tmp_path)
+    store = GW2DataStore(data_dir=tmp_path)
+    store.get_traits()
+
+    entries_only = gw2_data_store._deep_sizeof(store.get_traits())
+    index_with_entries = gw2_data_store._deep_sizeof(store.get_index("traits"))
+    usage = store.memory_usage()["traits"]
+    assert entries_only < usage < entries_only + index_with_entries
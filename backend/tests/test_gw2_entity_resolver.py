@@ -0,0 +1,96 @@
+"""
+Tests du résolveur groupé d'IDs GW2 (données locales + API multi-ids, sans réseau).
+"""
+
+import asyncio
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+
+from app.services.gw2_api_client import GW2APIClient
+from app.services.gw2_data_store import GW2DataStore
+from app.services.gw2_entity_resolver import GW2EntityResolver, unique_ids
+
+
+class _MultiIdServer:
+    """Faux endpoints /v2/<dataset>?ids=...: renvoie les IDs connus, 404 si aucun ne l'est."""
+
+    def __init__(self, known):
+        self.known = known
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.001)
+            dataset = request.url.path.rsplit("/", 1)[-1]
+            wanted = [int(i) for i in request.url.params["ids"].split(",")]
+            found = [{"id": i, "name": f"{dataset} {i}"} for i in wanted if i in self.known.get(dataset, ())]
+            if not found:
+                return httpx.Response(404, json={"text": "all ids provided are invalid"})
+            return httpx.Response(200, json=found)
+        finally:
+            self.in_flight -= 1
+
+
+def _resolver(tmp_path: Path, server: _MultiIdServer, local_traits=(), concurrency=None) -> GW2EntityResolver:
+    (tmp_path / "traits.json").write_text(
+        json.dumps([{"id": i, "name": f"local {i}"} for i in local_traits]), encoding="utf-8"
+    )
+    client = GW2APIClient(transport=httpx.MockTransport(server), cache_max_entries=0, max_retries=1)
+    return GW2EntityResolver(client, GW2DataStore(data_dir=tmp_path), concurrency=concurrency)
+
+
+def test_unique_ids_keeps_first_occurrence_and_drops_empty_slots():
+    assert unique_ids([3, 0, 1, 3, None, 2, 1, True]) == [3, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_local_data_first_then_one_multi_id_request(tmp_path):
+    server = _MultiIdServer({"traits": {2101, 2116}})
+    resolver = _resolver(tmp_path, server, local_traits=[1950, 1947])
+
+    traits = await resolver.resolve_traits([1950, 2101, 1947, 2116, 2101, 0])
+
+    assert traits[1950]["name"] == "local 1950"
+    assert traits[2116]["name"] == "traits 2116"
+    assert len(server.requests) == 1
+    assert server.requests[0].url.params["ids"] == "2101,2116"
+
+
+@pytest.mark.asyncio
+async def test_fully_local_build_needs_no_request(tmp_path):
+    server = _MultiIdServer({})
+    resolver = _resolver(tmp_path, server, local_traits=range(1, 10))
+
+    assert sorted(await resolver.resolve_traits(list(range(1, 10)))) == list(range(1, 10))
+    assert server.requests == []
+
+
+@pytest.mark.asyncio
+async def test_unknown_ids_are_omitted(tmp_path):
+    server = _MultiIdServer({"traits": {5}})
+    resolver = _resolver(tmp_path, server)
+
+    assert list(await resolver.resolve_traits([5, 6])) == [5]
+    # 404 "all ids provided are invalid": résultat vide, pas d'exception
+    assert await resolver.resolve_traits([7]) == {}
+
+
+@pytest.mark.asyncio
+async def test_large_batches_are_split_with_bounded_concurrency(tmp_path):
+    ids = list(range(1, 1001))
+    server = _MultiIdServer({"skills": set(ids)})
+    resolver = _resolver(tmp_path, server, concurrency=2)
+
+    skills = await resolver.resolve_skills(ids)
+
+    assert sorted(skills) == ids
+    assert len(server.requests) == 5  # 200 IDs max par requête
+    assert server.max_in_flight <= 2
@@ -0,0 +1,179 @@
+"""
+Tests de l'évaluation par lots du pipeline d'apprentissage contre le faux
+serveur Ollama de conftest (lots, concurrence bornée, reprise, version de
+l'évaluateur).
+"""
+
+import asyncio
+import json
+import re
+
+import pytest
+
+from app.core.circuit_breaker import CircuitBreaker
+from app.models.learning import DataSource, FineTuningConfig, StorageConfig, TrainingDatapoint
+from app.services.ai.llm_scheduler import LLMPriority, LLMScheduler
+from app.services.learning.evaluator import BUILD_FIELDS, EVALUATOR_VERSION, EvaluationCheckpoint, Evaluator
+from app.services.learning.pipeline import LearningPipeline
+
+_ITEM = re.compile(r"^\[(\d+)\]", re.MULTILINE)
+
+
+@pytest.fixture
+def scoring_model(fake_ollama):
+    """Faux modèle qui note chaque item listé dans le prompt (7.0, ou ``score_for(item)``)."""
+
+    def make(score_for=lambda item: 7.0, drop_items=(), **options):
+        def reply(prompt):
+            scores = [
+                {"item": item, **{field: score_for(item) for field in BUILD_FIELDS}}
+                for item in _ITEM.findall(prompt)
+                if item not in drop_items
+            ]
+            return json.dumps({"scores": scores})
+
+        return fake_ollama(reply=reply, **options)
+
+    return make
+
+
+@pytest.fixture
+def make_evaluator(fake_ollama_service):
+    def make(model, checkpoint, **kwargs):
+        scheduler = LLMScheduler(
+            max_concurrency=8,
+            limits={LLMPriority.INTERACTIVE: 8, LLMPriority.BACKGROUND: 8},
+            breaker=CircuitBreaker(failure_threshold=100, recovery_timeout=60, max_retries=0),
+        )
+        service = fake_ollama_service(model, scheduler=scheduler)
+        return Evaluator(ollama_service=service, checkpoint=checkpoint, **kwargs)
+
+    return make
+
+
+def _items_seen(model):
+    return sum(len(_ITEM.findall(prompt)) for prompt in model.prompts)
+
+
+def _datapoints(count, prefix="dp"):
+    return [
+        TrainingDatapoint(
+            id=f"{prefix}-{i}",
+            build_id=f"build-{i}",
+            game_mode="wvw",
+            profession="Guardian",
+            role=f"support {i}",
+            source=DataSource.AI_GENERATED,
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_datapoints_are_scored_in_batches(tmp_path, scoring_model, make_evaluator):
+    model = scoring_model()
+    checkpoint = EvaluationCheckpoint(tmp_path / "checkpoint.jsonl")
+    evaluator = make_evaluator(model, checkpoint, batch_size=4)
+    datapoints = _datapoints(10)
+
+    scores = await evaluator.evaluate_datapoints(datapoints)
+
+    assert len(model.prompts) == 3
+    assert set(scores) == {dp.id for dp in datapoints}
+    assert all(q.meta_compliance == 7.0 and q.overall_score == 7.0 for q in scores.values())
+    assert evaluator.stats == {"restored": 0, "scored": 10, "fallback": 0, "batches": 3}
+    assert set(await checkpoint.load()) == set(scores)
+
+
+@pytest.mark.asyncio
+async def test_batches_in_flight_are_bounded(tmp_path, scoring_model, make_evaluator):
+    model = scoring_model(latency=0.02)
+    evaluator = make_evaluator(model, EvaluationCheckpoint(tmp_path / "checkpoint.jsonl"), batch_size=2, concurrency=2)
+
+    await evaluator.evaluate_datapoints(_datapoints(12))
+
+    assert len(model.prompts) == 6
+    assert model.max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_interrupted_run_resumes_from_checkpoint(tmp_path, scoring_model, make_evaluator):
+    path = tmp_path / "checkpoint.jsonl"
+    datapoints = _datapoints(6)
+
+    # Le 2e lot reste bloqué: on interrompt le run pendant qu'il attend le modèle
+    stalled = scoring_model()
+    stalled.gate = asyncio.Event()
+    interrupted = make_evaluator(stalled, EvaluationCheckpoint(path), batch_size=2, concurrency=1)
+    run = asyncio.ensure_future(interrupted.evaluate_datapoints(datapoints))
+    while len(stalled.prompts) < 2:
+        await asyncio.sleep(0.005)
+    run.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await run
+    assert set(await EvaluationCheckpoint(path).load()) == {"dp-0", "dp-1"}
+
+    model = scoring_model()
+    evaluator = make_evaluator(model, EvaluationCheckpoint(path), batch_size=2)
+    scores = await evaluator.evaluate_datapoints(datapoints)
+
+    assert _items_seen(model) == 4
+    assert "Evaluate these 2" in model.prompts[0]
+    assert set(scores) == {dp.id for dp in datapoints}
+    assert evaluator.stats["restored"] == 2
+
+
+@pytest.mark.asyncio
+async def test_scores_from_another_evaluator_version_are_redone(tmp_path, scoring_model, make_evaluator):
+    path = tmp_path / "checkpoint.jsonl"
+    datapoints = _datapoints(3)
+    stale = EvaluationCheckpoint(path, version=EVALUATOR_VERSION - 1)
+    await make_evaluator(scoring_model(), stale).evaluate_datapoints(datapoints)
+
+    model = scoring_model(score_for=lambda item: 9.0)
+    scores = await make_evaluator(model, EvaluationCheckpoint(path)).evaluate_datapoints(datapoints)
+    assert _items_seen(model) == 3
+    assert {q.overall_score for q in scores.values()} == {9.0}
+
+    # Même version: rien n'est renvoyé au modèle, et les anciennes lignes sont purgées
+    again = scoring_model()
+    assert await make_evaluator(again, EvaluationCheckpoint(path)).evaluate_datapoints(datapoints) == scores
+    assert again.prompts == []
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 3
+
+
+@pytest.mark.asyncio
+async def test_unscored_items_fall_back_and_are_retried(tmp_path, scoring_model, make_evaluator):
+    path = tmp_path / "checkpoint.jsonl"
+    # Item 2 absent de la réponse, item 3 hors bornes
+    model = scoring_model(drop_items={"2"}, score_for=lambda item: 42.0 if item == "3" else 6.0)
+    evaluator = make_evaluator(model, EvaluationCheckpoint(path), batch_size=4)
+    datapoints = _datapoints(4)
+
+    scores = await evaluator.evaluate_datapoints(datapoints)
+
+    assert scores["dp-0"].overall_score == 6.0
+    assert scores["dp-1"].overall_score == scores["dp-2"].overall_score == 5.5  # heuristique ai_generated
+    assert evaluator.stats["fallback"] == 2
+    assert set(await EvaluationCheckpoint(path).load()) == {"dp-0", "dp-3"}
+
+    retry = scoring_model()
+    await make_evaluator(retry, EvaluationCheckpoint(path), batch_size=4).evaluate_datapoints(datapoints)
+    assert _items_seen(retry) == 2
+
+
+@pytest.mark.asyncio
+async def test_pipeline_evaluates_unvalidated_datapoints(tmp_path, scoring_model, make_evaluator):
+    model = scoring_model()
+    pipeline = LearningPipeline(finetuning_config=FineTuningConfig(), storage_config=StorageConfig())
+    pipeline.evaluator = make_evaluator(model, EvaluationCheckpoint(tmp_path / "checkpoint.jsonl"), batch_size=8)
+    datapoints = _datapoints(5)
+    await pipeline._evaluate_datapoints(datapoints[:2])
+    model.prompts.clear()
+
+    stats = await pipeline._evaluate_datapoints(datapoints)
+
+    assert _items_seen(model) == 3
+    assert stats["datapoints_evaluated"] == 3
+    assert stats["average_quality_score"] == 7.0
+    assert all(dp.is_validated and dp.quality_scores for dp in datapoints)
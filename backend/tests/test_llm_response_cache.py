@@ -0,0 +1,108 @@
+"""
+Tests du cache persistant des réponses structurées du LLM (sans réseau).
+"""
+
+import json
+import time
+
+import pytest
+
+from app.services.ai.llm_response_cache import LLMResponseCache
+
+
+def _server(fake_ollama):
+    """Faux serveur qui répond un objet JSON numéroté par requête (c1, c2, ...)."""
+    server = fake_ollama()
+    server.reply = lambda prompt: json.dumps({"best_id": f"c{len(server.prompts)}"})
+    return server
+
+
+SCHEMA = {"type": "object", "properties": {"best_id": {"type": "string"}}}
+
+
+@pytest.mark.asyncio
+async def test_deterministic_calls_are_replayed_from_disk(tmp_path, fake_ollama, fake_ollama_service):
+    server = _server(fake_ollama)
+    cache = LLMResponseCache(tmp_path)
+    service = fake_ollama_service(server, response_cache=cache)
+
+    first = await service.generate_structured("Choisis\n  une option", "arbitre", SCHEMA, temperature=0.0)
+    # Espacement différent: même prompt normalisé
+    again = await service.generate_structured("Choisis une option ", "arbitre", SCHEMA, temperature=0.0)
+
+    assert first == again == {"best_id": "c1"}
+    assert len(server.requests) == 1
+    assert cache.stats == {"hit": 1, "miss": 1, "bypass": 0}
+    assert await service.generate_structured_cached("Choisis une option", "arbitre", SCHEMA, temperature=0.0) == (
+        first,
+        True,
+    )
+
+    # Persistant: une nouvelle instance (redémarrage) relit le disque
+    restarted = fake_ollama_service(server, response_cache=LLMResponseCache(tmp_path))
+    assert await restarted.generate_structured("Choisis une option", "arbitre", SCHEMA, temperature=0.0) == first
+    assert len(server.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_key_covers_schema_max_tokens_and_model(tmp_path, fake_ollama, fake_ollama_service):
+    server = _server(fake_ollama)
+    cache = LLMResponseCache(tmp_path)
+    service = fake_ollama_service(server, response_cache=cache)
+
+    await service.generate_structured("prompt", schema=SCHEMA, temperature=0.0)
+    await service.generate_structured("prompt", schema=None, temperature=0.0)
+    await service.generate_structured("prompt", schema=SCHEMA, max_tokens=512, temperature=0.0)
+    service.model = "other-model"
+    await service.generate_structured("prompt", schema=SCHEMA, temperature=0.0)
+
+    assert len(server.requests) == 4
+    assert cache.stats["hit"] == 0
+
+
+@pytest.mark.asyncio
+async def test_non_zero_temperature_bypasses_the_cache(tmp_path, fake_ollama, fake_ollama_service):
+    server = _server(fake_ollama)
+    cache = LLMResponseCache(tmp_path)
+    service = fake_ollama_service(server, response_cache=cache)
+
+    results = [await service.generate_structured_cached("prompt", schema=SCHEMA) for _ in range(2)]
+
+    assert results == [({"best_id": "c1"}, False), ({"best_id": "c2"}, False)]
+    assert json.loads(server.requests[0].content)["options"]["temperature"] == 0.3
+    assert cache.stats == {"hit": 0, "miss": 0, "bypass": 2}
+    assert not list(tmp_path.glob("*/*.json"))
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_dropped(tmp_path):
+    cache = LLMResponseCache(tmp_path, ttl_seconds=60)
+    key = cache.key("m", "prompt", None, None, 0.0, 256)
+    await cache.set(key, "m", {"answer": 42})
+    assert await cache.get(key) == {"answer": 42}
+
+    path = tmp_path / key[:2] / f"{key}.json"
+    entry = json.loads(path.read_text(encoding="utf-8"))
+    entry["stored_at"] = time.time() - 61
+    path.write_text(json.dumps(entry), encoding="utf-8")
+
+    assert await cache.get(key) is None
+    assert not path.exists()
+
+
+@pytest.mark.asyncio
+async def test_size_bound_evicts_least_recently_used(tmp_path):
+    cache = LLMResponseCache(tmp_path, max_entries=2)
+    keys = [cache.key("m", f"prompt {i}", None, None, 0.0, 256) for i in range(3)]
+
+    await cache.set(keys[0], "m", {"i": 0})
+    await cache.set(keys[1], "m", {"i": 1})
+    assert await cache.get(keys[0]) == {"i": 0}  # keys[1] devient le moins récent
+    await cache.set(keys[2], "m", {"i": 2})
+
+    assert await cache.get(keys[1]) is None
+    assert await cache.get(keys[0]) == {"i": 0}
+    assert len(list(tmp_path.glob("*/*.json"))) == 2
+
+    # L'index est reconstruit depuis le disque au redémarrage
+    assert await LLMResponseCache(tmp_path, max_entries=2).get(keys[2]) == {"i": 2}
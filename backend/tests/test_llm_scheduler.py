@@ -0,0 +1,231 @@
+"""
+Tests de l'ordonnanceur LLM (priorités, limites par classe, files bornées,
+échéances, circuit breaker) contre le faux serveur Ollama de conftest, qui
+renvoie le prompt après une latence configurable.
+"""
+
+import asyncio
+from contextlib import aclosing
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.core.circuit_breaker import CircuitBreaker, CircuitBreakerError
+from app.core.metrics import llm_queue_wait_seconds, llm_requests_rejected_total
+from app.exceptions import add_exception_handlers
+from app.services.ai.llm_scheduler import LLMPriority, LLMRejectedError, LLMScheduler, llm_priority
+
+INTERACTIVE, BACKGROUND = LLMPriority.INTERACTIVE, LLMPriority.BACKGROUND
+
+
+def _echo(prompt):
+    return prompt
+
+
+def _scheduler(**kwargs):
+    kwargs.setdefault("max_concurrency", 2)
+    kwargs.setdefault("limits", {INTERACTIVE: 2, BACKGROUND: 1})
+    kwargs.setdefault("breaker", CircuitBreaker(failure_threshold=2, recovery_timeout=60, max_retries=0))
+    return LLMScheduler(**kwargs)
+
+
+async def _background(service, prompt, **kwargs):
+    with llm_priority(BACKGROUND, **kwargs):
+        return await service.generate(prompt)
+
+
+@pytest.mark.asyncio
+async def test_background_class_limit_leaves_room_for_interactive(fake_ollama, fake_ollama_service):
+    model = fake_ollama(reply=_echo, latency=0.05)
+    scheduler = _scheduler()
+    service = fake_ollama_service(model, scheduler=scheduler)
+
+    jobs = [asyncio.ensure_future(_background(service, f"eval {i}")) for i in range(4)]
+    await asyncio.sleep(0.01)
+    # Un job de fond tourne, les autres attendent: la 2e place reste aux utilisateurs
+    assert scheduler.get_stats()["queued"] == {"interactive": 0, "background": 3}
+    assert await service.generate("live question") == "live question"
+
+    assert await asyncio.gather(*jobs) == [f"eval {i}" for i in range(4)]
+    assert model.max_in_flight == 2
+    assert scheduler.get_stats()["running"] == {"interactive": 0, "background": 0}
+
+
+@pytest.mark.asyncio
+async def test_freed_slot_goes_to_interactive_first(fake_ollama, fake_ollama_service):
+    model = fake_ollama(reply=_echo, latency=0.03)
+    scheduler = _scheduler(max_concurrency=1, limits={INTERACTIVE: 1, BACKGROUND: 1})
+    service = fake_ollama_service(model, scheduler=scheduler)
+
+    first = asyncio.ensure_future(_background(service, "bg running"))
+    await asyncio.sleep(0.005)
+    queued_bg = asyncio.ensure_future(_background(service, "bg queued"))
+    await asyncio.sleep(0.005)
+    interactive = asyncio.ensure_future(service.generate("interactive"))
+
+    await asyncio.gather(first, queued_bg, interactive)
+    assert model.prompts == ["bg running", "interactive", "bg queued"]
+
+
+@pytest.mark.asyncio
+async def test_bounded_queue_rejects_when_full(fake_ollama, fake_ollama_service):
+    model = fake_ollama(reply=_echo, latency=0.05)
+    scheduler = _scheduler(max_concurrency=1, queue_sizes={INTERACTIVE: 1})
+    service = fake_ollama_service(model, scheduler=scheduler)
+    rejected_before = llm_requests_rejected_total.labels(priority="interactive", reason="queue_full")._value.get()
+
+    running = asyncio.ensure_future(service.generate("running"))
+    await asyncio.sleep(0.005)
+    queued = asyncio.ensure_future(service.generate("queued"))
+    await asyncio.sleep(0.005)
+
+    with pytest.raises(LLMRejectedError) as excinfo:
+        await service.generate("overflow")
+    assert excinfo.value.reason == "queue_full"
+    assert await asyncio.gather(running, queued) == ["running", "queued"]
+    assert "overflow" not in model.prompts
+    assert llm_requests_rejected_total.labels(priority="interactive", reason="queue_full")._value.get() == (
+        rejected_before + 1
+    )
+
+
+@pytest.mark.asyncio
+async def test_deadline_rejects_queued_and_hopeless_requests(fake_ollama, fake_ollama_service):
+    model = fake_ollama(reply=_echo, latency=0.1)
+    scheduler = _scheduler(max_concurrency=1)
+    service = fake_ollama_service(model, scheduler=scheduler)
+
+    # En file au-delà de l'échéance: rejetée, sans avoir atteint le modèle
+    running = asyncio.ensure_future(service.generate("long"))
+    await asyncio.sleep(0.005)
+    with llm_priority(INTERACTIVE, max_wait=0.02):
+        with pytest.raises(LLMRejectedError) as excinfo:
+            await service.generate("impatient")
+    assert excinfo.value.reason == "deadline"
+    await running
+
+    # Durée d'une génération connue: attente estimée trop longue -> rejet immédiat
+    assert scheduler.service_time is not None and scheduler.service_time >= 0.1
+    running = asyncio.ensure_future(service.generate("long again"))
+    await asyncio.sleep(0.005)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    with pytest.raises(LLMRejectedError):
+        async with scheduler.acquire(INTERACTIVE, max_wait=0.05):
+            pass
+    assert loop.time() - started < 0.05
+    await running
+    assert model.prompts == ["long", "long again"]
+    assert scheduler.get_stats()["queued"]["interactive"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_frees_its_place_in_queue(fake_ollama, fake_ollama_service):
+    model = fake_ollama(reply=_echo, latency=0.03)
+    scheduler = _scheduler(max_concurrency=1)
+    service = fake_ollama_service(model, scheduler=scheduler)
+
+    running = asyncio.ensure_future(service.generate("running"))
+    await asyncio.sleep(0.005)
+    abandoned = asyncio.ensure_future(service.generate("abandoned"))
+    await asyncio.sleep(0.005)
+    abandoned.cancel()
+
+    assert await service.generate("next") == "next"
+    await running
+    assert model.prompts == ["running", "next"]
+    assert scheduler.running == 0
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast(fake_ollama, fake_ollama_service):
+    model = fake_ollama(reply=_echo, latency=0.0, status=500)
+    scheduler = _scheduler()
+    service = fake_ollama_service(model, scheduler=scheduler)
+
+    for i in range(2):
+        with pytest.raises(httpx.HTTPStatusError):
+            await service.chat([{"role": "user", "content": f"try {i}"}])
+    with pytest.raises(CircuitBreakerError):
+        await service.generate("while open")
+
+    assert len(model.prompts) == 2
+    assert scheduler.get_stats()["circuit"] == "OPEN"
+
+
+@pytest.mark.asyncio
+async def test_client_errors_do_not_open_the_circuit(fake_ollama, fake_ollama_service):
+    model = fake_ollama(reply=_echo, latency=0.0, status=400)
+    scheduler = _scheduler()
+    service = fake_ollama_service(model, scheduler=scheduler)
+
+    for i in range(3):
+        with pytest.raises(httpx.HTTPStatusError):
+            await service.chat([{"role": "user", "content": f"bad {i}"}])
+    assert scheduler.get_stats()["circuit"] == "CLOSED"
+
+
+@pytest.mark.asyncio
+async def test_wait_time_is_observed_per_class(fake_ollama, fake_ollama_service):
+    model = fake_ollama(reply=_echo, latency=0.02)
+    service = fake_ollama_service(model, scheduler=_scheduler(max_concurrency=1))
+    samples_before = llm_queue_wait_seconds.labels(priority="background")._sum.get()
+
+    await asyncio.gather(*(_background(service, f"job {i}") for i in range(3)))
+
+    # Les deux jobs en file ont attendu au moins une génération chacun
+    assert llm_queue_wait_seconds.labels(priority="background")._sum.get() - samples_before >= 0.02 * 2
+
+
+@pytest.mark.asyncio
+async def test_interactive_call_does_not_join_background_generation(fake_ollama, fake_ollama_service):
+    model = fake_ollama(reply=_echo, latency=0.05)
+    scheduler = _scheduler(max_concurrency=2)
+    service = fake_ollama_service(model, scheduler=scheduler)
+
+    background = asyncio.ensure_future(asyncio.gather(*(_background(service, "same prompt") for _ in range(2))))
+    await asyncio.sleep(0.01)
+    # Même prompt, mais admis sous sa propre classe (pas sous la limite de fond)
+    interactive = asyncio.ensure_future(service.generate("same prompt"))
+    await asyncio.sleep(0.01)
+    assert scheduler.get_stats()["running"] == {"interactive": 1, "background": 1}
+
+    assert await interactive == "same prompt"
+    assert await background == ["same prompt", "same prompt"]
+    assert model.prompts == ["same prompt", "same prompt"]
+
+
+@pytest.mark.asyncio
+async def test_stream_stopped_early_releases_its_slot(fake_ollama, fake_ollama_service):
+    model = fake_ollama(token_delay=0.01)
+    scheduler = _scheduler(max_concurrency=1)
+    service = fake_ollama_service(model, scheduler=scheduler)
+
+    async with aclosing(service.generate_stream("one two three four")) as stream:
+        async for token in stream:
+            assert token == "one "
+            assert scheduler.running == 1
+            break
+
+    # Place rendue à la fermeture du flux, sans attendre le ramasse-miettes
+    assert scheduler.running == 0
+    assert await service.generate("next") == "next "
+
+
+@pytest.mark.asyncio
+async def test_rejection_is_a_503_with_retry_after():
+    app = FastAPI()
+    add_exception_handlers(app)
+
+    @app.get("/busy")
+    async def busy():
+        raise LLMRejectedError(INTERACTIVE, "deadline", "estimated wait 12.0s exceeds 5.0s", retry_after=12.2)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/busy")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "13"
+    assert response.json()["error_code"] == "LLM_OVERLOADED"
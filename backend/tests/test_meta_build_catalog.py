@@ -0,0 +1,153 @@
+import json
+import random
+
+import pytest
+
+from app.services import meta_build_catalog
+from app.services.chat_code import BuildTemplate, encode_build_template
+from app.services.meta_build_catalog import (
+    META_BUILD_REGISTRY,
+    MetaBuild,
+    find_closest_meta_build,
+    find_meta_build_by_chat_code,
+    load_meta_builds_from_json,
+    query_meta_builds,
+    rank_meta_builds,
+)
+
+
+def _code(spec_ids, palettes, choices=((1, 1, 1),) * 3, profession=1):
+    return encode_build_template(BuildTemplate(profession, tuple(spec_ids), tuple(choices), tuple(palettes)))
+
+
+def _meta(mid, **fields):
+    values = dict(
+        id=mid,
+        name=mid,
+        profession="Guardian",
+        specialization="Firebrand",
+        role="support",
+        game_mode="wvw_zerg",
+    )
+    values.update(fields)
+    return MetaBuild(**values)
+
+
+@pytest.fixture(autouse=True)
+def _empty_registry():
+    META_BUILD_REGISTRY.clear()
+    yield
+    META_BUILD_REGISTRY.clear()
+
+
+def _reference_query(profession=None, specialization=None, role=None, game_mode=None, tags=None):
+    """Ancien parcours linéaire du registre."""
+    results = []
+    for meta in META_BUILD_REGISTRY.values():
+        if profession and meta.profession.lower() != profession.lower():
+            continue
+        if specialization and meta.specialization.lower() != specialization.lower():
+            continue
+        if role and meta.role.lower() != role.lower():
+            continue
+        if game_mode and meta.game_mode.lower() != game_mode.lower():
+            continue
+        if tags and not {t.lower() for t in tags} <= {t.lower() for t in meta.tags}:
+            continue
+        results.append(meta)
+    return results
+
+
+def test_indexed_query_matches_linear_scan():
+    rng = random.Random(7)
+    values = {
+        "profession": ["Guardian", "Necromancer", "Warrior"],
+        "specialization": ["Firebrand", "Scourge", "Spellbreaker", "Willbender"],
+        "role": ["support", "dps", "heal"],
+        "game_mode": ["wvw_zerg", "wvw_roam", "pve"],
+    }
+    all_tags = ["Zerg", "roam", "meta", "budget"]
+    for i in range(300):
+        fields = {name: rng.choice(options) for name, options in values.items()}
+        META_BUILD_REGISTRY[f"b{i}"] = _meta(f"b{i}", tags=rng.sample(all_tags, rng.randint(0, 3)), **fields)
+
+    for _ in range(200):
+        filters = {name: rng.choice(options + [None, None]) for name, options in values.items()}
+        if rng.random() < 0.3:
+            filters = {k: (v.upper() if v else v) for k, v in filters.items()}
+        tags = rng.sample(all_tags, rng.randint(0, 2)) or None
+        assert query_meta_builds(tags=tags, **filters) == _reference_query(tags=tags, **filters)
+
+
+def test_direct_registry_mutations_invalidate_indexes():
+    META_BUILD_REGISTRY["a"] = _meta("a")
+    assert [m.id for m in query_meta_builds(role="support")] == ["a"]
+
+    META_BUILD_REGISTRY["b"] = _meta("b", role="dps")
+    del META_BUILD_REGISTRY["a"]
+    assert query_meta_builds(role="support") == []
+    assert [m.id for m in query_meta_builds(role="DPS")] == ["b"]
+
+    registry = META_BUILD_REGISTRY
+    registry |= {"c": _meta("c")}
+    assert registry is META_BUILD_REGISTRY
+    assert [m.id for m in query_meta_builds(role="support")] == ["c"]
+
+
+def test_chat_code_lookup_uses_the_decoded_template():
+    code = _code((49, 13, 62), range(1, 11))
+    META_BUILD_REGISTRY["fb"] = _meta("fb", chat_code=code)
+    META_BUILD_REGISTRY["other"] = _meta("other", chat_code=_code((49, 13, 62), range(2, 12)))
+    META_BUILD_REGISTRY["bad"] = _meta("bad", chat_code="[&not-a-code]")
+
+    assert find_meta_build_by_chat_code(f"  {code}\n").id == "fb"
+    assert find_meta_build_by_chat_code(code[2:-1]).id == "fb"  # sans les crochets
+    assert find_meta_build_by_chat_code("[&not-a-code]").id == "bad"
+    assert find_meta_build_by_chat_code(_code((1, 2, 3), range(10))) is None
+    assert find_meta_build_by_chat_code("") is None
+
+
+def test_closest_meta_build_ranks_by_traits_and_skills():
+    META_BUILD_REGISTRY["far"] = _meta("far", trait_ids=(1, 2, 3), skill_ids=(10, 11))
+    META_BUILD_REGISTRY["near"] = _meta("near", trait_ids=(1, 2, 4, 5), skill_ids=(10, 12, 13))
+    META_BUILD_REGISTRY["dps"] = _meta("dps", role="dps", trait_ids=(4, 5, 6), skill_ids=(12, 13))
+
+    closest = find_closest_meta_build(profession="Guardian", role="support", trait_ids=[4, 5, 2], skill_ids=[12, 13])
+    assert closest.id == "near"
+
+    ranked = rank_meta_builds(role="support", trait_ids=[4, 5, 2], skill_ids=[12, 13])
+    assert [m.id for m, _ in ranked] == ["near", "far"]
+    assert ranked[0][1] > ranked[1][1] > 0
+
+    # Sans description du build: premier candidat, comme avant
+    assert find_closest_meta_build(role="support").id == "far"
+    assert find_closest_meta_build(role="heal") is None
+
+
+def test_closest_meta_build_from_chat_codes_uses_palettes():
+    META_BUILD_REGISTRY["a"] = _meta("a", chat_code=_code((0, 0, 0), [1, 0, 2, 0, 3, 0, 4, 0, 5, 0]))
+    META_BUILD_REGISTRY["b"] = _meta("b", chat_code=_code((0, 0, 0), [1, 0, 2, 0, 7, 0, 8, 0, 9, 0]))
+
+    query = _code((0, 0, 0), [1, 0, 2, 0, 7, 0, 8, 0, 6, 0])
+    assert find_closest_meta_build(chat_code=query).id == "b"
+
+
+def test_load_skips_unchanged_file_and_reloads_changes(tmp_path, monkeypatch):
+    path = tmp_path / "meta.json"
+    builds = [{"id": "m1", "name": "M1", "profession": "Guardian", "specialization": "Firebrand",
+               "role": "support", "game_mode": "wvw_zerg", "trait_ids": [1, 2], "skill_ids": "bad"}]
+    path.write_text(json.dumps({"builds": builds}), encoding="utf-8")
+
+    assert load_meta_builds_from_json(path) == 1
+    assert META_BUILD_REGISTRY["m1"].trait_ids == (1, 2)
+    assert META_BUILD_REGISTRY["m1"].skill_ids == ()
+
+    parsed = []
+    monkeypatch.setattr(meta_build_catalog, "_load_meta_builds_from_payload", lambda data: parsed.append(data) or 0)
+    assert load_meta_builds_from_json(path) == 1
+    assert parsed == []
+
+    builds.append(dict(builds[0], id="m2"))
+    path.write_text(json.dumps({"builds": builds}), encoding="utf-8")
+    load_meta_builds_from_json(path)
+    assert len(parsed) == 1
@@ -0,0 +1,90 @@
+import random
+
+import pytest
+
+from app.engine.combat.context import CombatContext
+from app.engine.gear.compiled import COMPILED_GEAR
+from app.engine.modifiers.base import Modifier, ModifierType
+from app.engine.modifiers.conditions import COMMON_CONDITIONS
+from app.engine.modifiers.stacking import ModifierStacker
+from app.engine.simulation.calculator import BuildCalculator
+
+
+def _reference_stack_all(modifiers, context):
+    """Ancienne implémentation multi-passes, composée des helpers par catégorie."""
+    active_mods = [m for m in modifiers if m.is_active(context)]
+    outgoing = [m for m in active_mods if not m.metadata.get("incoming_only")]
+    incoming = [m for m in active_mods if m.metadata.get("incoming_only")]
+    return {
+        "stat_bonuses": ModifierStacker.stack_flat_stats(active_mods, context),
+        "stat_multipliers": ModifierStacker.stack_percent_stats(active_mods, context),
+        "damage_multiplier": ModifierStacker.stack_damage_multipliers(outgoing, context, "all"),
+        "strike_multiplier": ModifierStacker.stack_damage_multipliers(outgoing, context, "strike"),
+        "condition_multiplier": ModifierStacker.stack_damage_multipliers(outgoing, context, "condition"),
+        "incoming_damage_multiplier": (
+            ModifierStacker.stack_damage_multipliers(incoming, context, "all") if incoming else 1.0
+        ),
+        "crit_chance_bonus": sum(
+            (m.get_effective_value(context) for m in active_mods if m.modifier_type == ModifierType.CRIT_CHANCE), 0.0
+        ),
+        "crit_damage_bonus": sum(
+            (m.get_effective_value(context) for m in active_mods if m.modifier_type == ModifierType.CRIT_DAMAGE), 0.0
+        ),
+        "active_modifiers": [m.name for m in active_mods],
+        "num_active": len(active_mods),
+    }
+
+
+def _random_modifiers(rng: random.Random, count: int):
+    conditions = [None, None] + list(COMMON_CONDITIONS.values())
+    stats = ["power", "precision", "ferocity", "condition_damage", None]
+    mods = []
+    for i in range(count):
+        max_stacks = rng.choice([1, 1, 10, 25])
+        metadata = {}
+        if rng.random() < 0.3:
+            metadata["additive_group"] = rng.choice(["trait", "sigil", "default"])
+        if rng.random() < 0.15:
+            metadata["incoming_only"] = True
+        mods.append(
+            Modifier(
+                name=f"Mod {i}",
+                source="Test",
+                modifier_type=rng.choice(list(ModifierType)),
+                value=rng.uniform(-0.2, 0.3) if rng.random() < 0.8 else rng.randint(10, 200),
+                condition=rng.choice(conditions),
+                target_stat=rng.choice(stats),
+                stacks=rng.randint(0, max_stacks),
+                max_stacks=max_stacks,
+                is_multiplicative=rng.random() < 0.6,
+                metadata=metadata or None,
+            )
+        )
+    return mods
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_single_pass_matches_reference_exactly(seed):
+    rng = random.Random(seed)
+    ctx = CombatContext.create_default(might_stacks=rng.randint(0, 25), fury=rng.random() < 0.5)
+    ctx.add_condition_to_target("Burning", rng.randint(0, 3))
+    ctx.target_health_percent = rng.random()
+    ctx.is_flanking = rng.random() < 0.5
+    mods = _random_modifiers(rng, rng.randint(0, 60))
+
+    for context in (ctx.snapshot(), ctx.to_dict()):
+        # Egalité stricte (pas approx): même ordre d'accumulation flottante
+        assert ModifierStacker.stack_all_modifiers(mods, context) == _reference_stack_all(mods, context)
+
+
+def test_single_pass_matches_reference_on_gear_and_boons():
+    ctx = CombatContext.create_default()
+    ctx.add_boon("Quickness", 1, 1)
+    ctx.add_boon("Protection", 1, 1)
+    ctx.set_boon_uptime("Protection", 0.6)
+    ctx.add_condition_to_target("Vulnerability", 10)
+
+    boon_mods = BuildCalculator().get_boon_modifiers(ctx)
+    for rune in COMPILED_GEAR.runes.values():
+        mods = list(rune) + list(COMPILED_GEAR.sigil_set(["Force", "Impact"])) + boon_mods
+        assert ModifierStacker.stack_all_modifiers(mods, ctx.snapshot()) == _reference_stack_all(mods, ctx.snapshot())
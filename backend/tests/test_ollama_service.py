@@ -0,0 +1,102 @@
+"""
+Tests d'OllamaService contre un faux serveur Ollama local (transport httpx, sans réseau).
+
+Le faux serveur (fixture ``fake_ollama`` de conftest) répond en NDJSON comme
+Ollama, en renvoyant le prompt mot par mot avec une latence configurable par token.
+"""
+
+import asyncio
+
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_generate_joins_streamed_tokens_over_one_pooled_client(fake_ollama, fake_ollama_service):
+    server = fake_ollama()
+    service = fake_ollama_service(server)
+
+    assert await service.generate("hello pooled world") == "hello pooled world "
+    client = service._get_http_client()
+    assert await service.generate("again") == "again "
+    assert await service.check_health() is True
+
+    assert service._get_http_client() is client
+    assert server.paths() == ["/api/chat", "/api/chat", "/api/tags"]
+    await service.aclose()
+    assert client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_generate_stream_yields_tokens_as_they_arrive(fake_ollama, fake_ollama_service):
+    service = fake_ollama_service(fake_ollama())
+
+    tokens = [token async for token in service.generate_stream("one two three", system_prompt="sys")]
+
+    assert tokens == ["one ", "two ", "three "]
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_prompts_share_one_generation(fake_ollama, fake_ollama_service):
+    server = fake_ollama(token_delay=0.01)
+    service = fake_ollama_service(server)
+
+    results = await asyncio.gather(
+        *(service.generate("same prompt", system_prompt="sys", temperature=0.3) for _ in range(5)),
+        service.generate("same prompt", system_prompt="sys", temperature=0.9),
+        service.generate("other prompt", system_prompt="sys", temperature=0.3),
+    )
+
+    assert results[:6] == ["same prompt "] * 6
+    assert results[6] == "other prompt "
+    # 5 appels identiques -> 1 génération; options ou prompt différents -> requêtes distinctes
+    assert len(server.requests) == 3
+    assert service._inflight == {}
+
+    # Génération terminée: un nouvel appel repart vers le modèle
+    await service.generate("same prompt", system_prompt="sys", temperature=0.3)
+    assert len(server.requests) == 4
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_generation(fake_ollama, fake_ollama_service):
+    server = fake_ollama(token_delay=0.02)
+    service = fake_ollama_service(server)
+
+    first = asyncio.ensure_future(service.generate("slow shared prompt"))
+    second = asyncio.ensure_future(service.generate("slow shared prompt"))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    assert await second == "slow shared prompt "
+    assert first.cancelled()
+    assert len(server.requests) == 1
+
+    # Seul appelant annulé: la génération est abandonnée
+    lone = asyncio.ensure_future(service.generate("abandoned prompt"))
+    await asyncio.sleep(0.01)
+    lone.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await lone
+    await asyncio.sleep(0)
+    assert service._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_generate_endpoint_on_404(fake_ollama, fake_ollama_service):
+    server = fake_ollama(chat_available=False)
+    service = fake_ollama_service(server)
+
+    assert await service.generate("legacy prompt", system_prompt="sys") == "sys legacy prompt "
+    assert [token async for token in service.generate_stream("legacy")] == ["legacy "]
+    assert server.paths() == ["/api/chat", "/api/generate", "/api/chat", "/api/generate"]
+
+
+@pytest.mark.asyncio
+async def test_streamed_error_is_raised_and_not_shared_afterwards(fake_ollama, fake_ollama_service):
+    server = fake_ollama(error="model crashed")
+    service = fake_ollama_service(server)
+
+    with pytest.raises(RuntimeError, match="model crashed"):
+        await service.generate("broken")
+    server.error = None
+    assert await service.generate("broken") == "broken "
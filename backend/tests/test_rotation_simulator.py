@@ -1,7 +1,35 @@
 import pytest
 
 from app.engine.combat.context import CombatContext
-from app.engine.simulation.rotation import RotationSimulator, RotationSkill
+from app.engine.simulation.rotation import (
+    RotationSimulator,
+    RotationSkill,
+    get_firebrand_support_wvw_rotation,
+    get_reaper_power_wvw_rotation,
+)
+
+
+BASE_STATS = {"power": 1500, "precision": 1500, "ferocity": 1500, "condition_damage": 0, "healing_power": 800}
+
+
+def _reference_casts(skills, duration):
+    """Ancienne boucle à pas fixe (scan de tous les skills à chaque cast)."""
+    next_available = [0.0 for _ in skills]
+    casts = {}
+    current_time = 0.0
+    while current_time < duration:
+        available = [i for i in range(len(skills)) if next_available[i] <= current_time]
+        if not available:
+            next_time = min(next_available)
+            if next_time >= duration:
+                break
+            current_time = next_time
+            continue
+        best = min(available, key=lambda idx: (skills[idx].priority, idx))
+        casts[skills[best].name] = casts.get(skills[best].name, 0) + 1
+        next_available[best] = current_time + skills[best].cooldown
+        current_time += skills[best].cast_time
+    return casts
 
 
 def test_rotation_simulator_single_skill_basic():
@@ -105,3 +133,30 @@ def test_rotation_simulator_healing_produces_hps():
     per_skill = result["per_skill"].get("Test Heal")
     assert per_skill is not None
     assert per_skill["total_heal"] > 0.0
+
+
+@pytest.mark.parametrize("rotation", [get_firebrand_support_wvw_rotation, get_reaper_power_wvw_rotation])
+@pytest.mark.parametrize("duration", [10.0, 60.0, 300.0])
+def test_event_driven_schedule_matches_fixed_step_loop(rotation, duration):
+    """Le planificateur à tas produit les mêmes lancers que l'ancienne boucle, y compris sur 300s."""
+    skills = [RotationSkill(**skill) for skill in rotation()]
+    sim = RotationSimulator()
+
+    result = sim.simulate_rotation(
+        base_stats=BASE_STATS,
+        modifiers=[],
+        context=CombatContext.create_default(),
+        skills=skills,
+        duration=duration,
+    )
+
+    expected = _reference_casts(skills, duration)
+    assert {name: entry["casts"] for name, entry in result["per_skill"].items()} == expected
+
+    # Dégâts par cast constants: le total d'un combat long est proportionnel aux lancers
+    short = sim.simulate_rotation(BASE_STATS, [], CombatContext.create_default(), skills[-1:], duration=1.0)
+    filler = skills[-1].name
+    assert result["per_skill"][filler]["total_damage"] == pytest.approx(
+        short["total_damage"] * expected[filler], rel=1e-12
+    )
+    assert result["dps"] == pytest.approx(result["total_damage"] / duration)
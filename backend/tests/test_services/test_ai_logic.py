@@ -62,3 +62,29 @@ async def test_skill_analysis_flow_end_to_end():
         assert result["rating"] == "Méta"
         assert "support" in result["tags"]
         assert "zerg" in result["tags"]
+
+
+async def test_build_analysis_retries_invalid_json_with_sampling(monkeypatch):
+    """The retry after invalid JSON must not replay the deterministic call."""
+    from app.agents.analyst_agent import AnalystAgent
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "LLM_AGENT_TEMPERATURE", 0.0)
+
+    temperatures = []
+
+    async def generate_structured(**kwargs):
+        temperatures.append(kwargs["temperature"])
+        if len(temperatures) == 1:
+            raise ValueError("Invalid JSON response")
+        return {"synergy_score": "A", "strengths": [], "weaknesses": [], "summary": "ok"}
+
+    ollama = AsyncMock()
+    ollama.generate_structured.side_effect = generate_structured
+    agent = AnalystAgent(ollama_service=ollama)
+
+    result = await agent.run({"build_data": {"specialization": "Firebrand"}, "context": "WvW Zerg"})
+
+    assert temperatures == [0.0, AnalystAgent.RETRY_TEMPERATURE]
+    assert AnalystAgent.RETRY_TEMPERATURE > 0
+    assert result["synergy_score"] == "A"
@@ -145,3 +145,26 @@ async def test_team_commander_api_collects_team_for_learning(monkeypatch) -> Non
     assert isinstance(payload.get("team_data"), dict)
     assert payload.get("game_mode") == "zerg"
     assert payload.get("source") is DataSource.AI_GENERATED
+
+    @pytest.mark.asyncio
+    async def test_slot_failing_to_finalize_is_dropped_not_the_team(self, monkeypatch) -> None:
+        """Un slot dont la finalisation échoue est écarté, les autres restent."""
+        agent = TeamCommanderAgent()
+        original = agent._finalize_slot
+
+        async def flaky_finalize(prepared, decision):
+            if prepared.role == Role.HEAL:
+                raise RuntimeError("finalize failed")
+            return await original(prepared, decision)
+
+        monkeypatch.setattr(agent, "_finalize_slot", flaky_finalize)
+        message = (
+            "Je veux une équipe de 10 joueurs pour WvW. "
+            "Dans chaque groupe il me faut un stabeur, un healer, un booner, "
+            "un dps strip et un dps pur."
+        )
+
+        result = await agent.run(message)
+
+        assert [len(g.slots) for g in result.groups] == [4, 4]
+        assert all(slot.role != Role.HEAL for g in result.groups for slot in g.slots)
@@ -0,0 +1,158 @@
+"""Unit tests for the CPU worker pool and the slot optimization job."""
+
+import asyncio
+import operator
+import pickle
+import time
+
+import pytest
+
+from app.agents import team_commander_agent as tc_module
+from app.agents.build_equipment_optimizer import BuildEquipmentOptimizer
+from app.agents.slot_optimization import SlotOptimizationJob, SlotResultCache, optimize_slot_presets
+from app.agents.team_commander_agent import Role, TeamCommanderAgent
+from app.core.process_pool import CPUWorkerPool, WorkerPoolFullError, WorkerPoolTimeoutError
+from app.engine.gear.prefixes import get_prefix_stats
+from app.services.gear_optimization_service import GearOptimizationService
+
+
+class TestCPUWorkerPool:
+    """Test suite for CPUWorkerPool."""
+
+    @pytest.fixture
+    def pool(self):
+        pool = CPUWorkerPool(max_workers=2, max_queue=2, job_timeout=30.0)
+        yield pool
+        pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_runs_jobs_in_parallel_and_keeps_order(self, pool):
+        results = await asyncio.gather(*(pool.submit(operator.mul, i, i) for i in range(4)))
+
+        assert results == [0, 1, 4, 9]
+        stats = pool.get_stats()
+        assert stats["completed"] == 4
+        assert stats["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_waits_for_capacity_instead_of_rejecting(self):
+        pool = CPUWorkerPool(max_workers=1, max_queue=0, job_timeout=30.0)
+        try:
+            results = await asyncio.gather(
+                pool.submit(time.sleep, 0.3),
+                pool.submit(operator.mul, 2, 3),
+                pool.submit(operator.mul, 3, 4),
+            )
+            assert results == [None, 6, 12]
+            stats = pool.get_stats()
+            assert stats["waited"] == 2
+            assert stats["rejected"] == 0
+            assert (stats["pending"], stats["waiting"]) == (0, 0)
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_wait_for_capacity_counts_toward_timeout(self):
+        pool = CPUWorkerPool(max_workers=1, max_queue=0, job_timeout=30.0)
+        try:
+            running = asyncio.ensure_future(pool.submit(time.sleep, 1.0))
+            await asyncio.sleep(0)
+            with pytest.raises(WorkerPoolTimeoutError):
+                await pool.submit(operator.mul, 2, 3, timeout=0.1)
+            assert pool.get_stats()["waiting"] == 0
+            await running
+            assert await pool.submit(operator.mul, 2, 3) == 6
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_rejects_beyond_max_waiters(self):
+        pool = CPUWorkerPool(max_workers=1, max_queue=0, job_timeout=30.0, max_waiters=0)
+        try:
+            running = asyncio.ensure_future(pool.submit(time.sleep, 1.0))
+            await asyncio.sleep(0)
+            with pytest.raises(WorkerPoolFullError):
+                await pool.submit(operator.mul, 2, 3)
+            await running
+            assert await pool.submit(operator.mul, 2, 3) == 6
+            assert pool.get_stats()["rejected"] == 1
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_job_timeout(self, pool):
+        with pytest.raises(WorkerPoolTimeoutError):
+            await pool.submit(time.sleep, 5.0, timeout=0.2)
+
+        assert pool.get_stats()["timed_out"] == 1
+        # The timed-out job still occupies its worker until it really finishes
+        assert pool.pending == 1
+
+    @pytest.mark.asyncio
+    async def test_inline_mode_runs_in_process(self):
+        pool = CPUWorkerPool(max_workers=0)
+
+        assert not pool.enabled
+        assert await pool.submit(operator.add, 1, 2) == 3
+
+
+class TestSlotOptimizationJob:
+    """The slot job must round-trip through pickle and match the inline path."""
+
+    def _job(self) -> SlotOptimizationJob:
+        return SlotOptimizationJob(
+            role="dps",
+            profession="Necromancer",
+            specialization="Reaper",
+            mode="wvw_zerg",
+            experience="intermediate",
+            stat_presets=(("Berserker", get_prefix_stats("Berserker")),),
+            skill_rotation=({"name": "Burst", "damage_coefficient": 2.0},),
+        )
+
+    @pytest.mark.asyncio
+    async def test_job_and_output_are_picklable(self):
+        job = self._job()
+        output = await optimize_slot_presets(job, BuildEquipmentOptimizer(), GearOptimizationService())
+
+        assert pickle.loads(pickle.dumps(job)) == job
+        restored = pickle.loads(pickle.dumps(output))
+        assert [c.candidate_id for c in restored.candidates] == [c.candidate_id for c in output.candidates]
+        assert output.candidates[-1].candidate_id.startswith("Berserker-")
+
+    @pytest.mark.asyncio
+    async def test_prepare_slot_through_worker_process(self, monkeypatch):
+        agent = TeamCommanderAgent()
+        monkeypatch.setattr(tc_module, "get_slot_result_cache", lambda: SlotResultCache(max_entries=0))
+        inline = await agent._prepare_slot(Role.DPS, "Necromancer", "Reaper", mode="wvw_zerg")
+
+        pool = CPUWorkerPool(max_workers=1, max_queue=4, job_timeout=120.0)
+        monkeypatch.setattr(tc_module, "get_cpu_pool", lambda: pool)
+        try:
+            pooled = await agent._prepare_slot(Role.DPS, "Necromancer", "Reaper", mode="wvw_zerg")
+        finally:
+            pool.shutdown()
+
+        assert pool.get_stats()["completed"] == 1
+        assert [(c.id, c.rune, c.sigils) for c in pooled.candidates] == [
+            (c.id, c.rune, c.sigils) for c in inline.candidates
+        ]
+
+    @pytest.mark.asyncio
+    async def test_saturated_pool_fails_the_slot_without_running_inline(self, monkeypatch):
+        class _SaturatedPool:
+            enabled = True
+
+            async def submit(self, *args, **kwargs):
+                raise WorkerPoolFullError("full")
+
+        async def inline(*args, **kwargs):  # pragma: no cover - must not run on the event loop
+            raise AssertionError("slot optimized on the event loop")
+
+        agent = TeamCommanderAgent()
+        monkeypatch.setattr(tc_module, "get_cpu_pool", lambda: _SaturatedPool())
+        monkeypatch.setattr(tc_module, "get_slot_result_cache", lambda: SlotResultCache(max_entries=0))
+        monkeypatch.setattr(tc_module, "optimize_slot_presets", inline)
+
+        with pytest.raises(WorkerPoolFullError):
+            await agent._prepare_slot(Role.DPS, "Necromancer", "Reaper", mode="wvw_zerg")
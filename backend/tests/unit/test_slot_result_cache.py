@@ -0,0 +1,157 @@
+"""Unit tests for the memoized slot optimization results."""
+
+import asyncio
+
+import pytest
+
+from app.agents import team_commander_agent as tc_module
+from app.agents.build_equipment_optimizer import OptimizationResult
+from app.agents.slot_optimization import (
+    SlotCandidateResult,
+    SlotOptimizationJob,
+    SlotOptimizationOutput,
+    SlotResultCache,
+)
+from app.agents.team_commander_agent import Role, TeamCommanderAgent
+from app.core.metrics import slot_cache_lookups_total
+
+
+def _job(profession: str = "Guardian", mode: str = "wvw_zerg") -> SlotOptimizationJob:
+    return SlotOptimizationJob(
+        role="support",
+        profession=profession,
+        specialization="Firebrand",
+        mode=mode,
+        experience="beginner",
+        stat_presets=(("Minstrel", {"toughness": 1200, "healing_power": 1200}),),
+        skill_rotation=({"name": "Burst", "damage_coefficient": 2.0},),
+    )
+
+
+def _output(rune: str = "Superior Rune of the Monk") -> SlotOptimizationOutput:
+    result = OptimizationResult(
+        rune_name=rune,
+        sigil_names=["Superior Sigil of Transference", "Superior Sigil of Concentration"],
+        total_damage=1000.0,
+        dps_increase_percent=0.0,
+        survivability_score=0.5,
+        overall_score=1.0,
+        breakdown={},
+    )
+    return SlotOptimizationOutput(candidates=[SlotCandidateResult("Minstrel-0", "Minstrel", result)])
+
+
+class _Counter:
+    def __init__(self, output_factory=_output):
+        self.calls = 0
+        self.output_factory = output_factory
+
+    async def __call__(self) -> SlotOptimizationOutput:
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return self.output_factory()
+
+
+class TestSlotResultCache:
+    """Test suite for SlotResultCache."""
+
+    @pytest.mark.asyncio
+    async def test_identical_jobs_are_computed_once(self):
+        cache = SlotResultCache(max_entries=8)
+        compute = _Counter()
+        context = {"target_armor": 2597}
+
+        first = await cache.get_or_compute(_job(), context, compute)
+        first.candidates[0].result.sigil_names.append("mutated")
+        second = await cache.get_or_compute(_job(), context, compute)
+
+        assert compute.calls == 1
+        assert second.candidates[0].result.sigil_names == [
+            "Superior Sigil of Transference",
+            "Superior Sigil of Concentration",
+        ]
+        assert cache.get_stats()["hit_rate"] == pytest.approx(0.5)
+
+    @pytest.mark.asyncio
+    async def test_key_covers_job_and_combat_context(self):
+        cache = SlotResultCache(max_entries=8)
+        compute = _Counter()
+
+        await cache.get_or_compute(_job(), {"target_armor": 2597}, compute)
+        await cache.get_or_compute(_job(), {"target_armor": 2271}, compute)
+        await cache.get_or_compute(_job(mode="wvw_roam"), {"target_armor": 2597}, compute)
+
+        assert compute.calls == 3
+        assert len(cache) == 3
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_share_one_computation(self):
+        cache = SlotResultCache(max_entries=8)
+        compute = _Counter()
+
+        outputs = await asyncio.gather(*(cache.get_or_compute(_job(), {}, compute) for _ in range(3)))
+
+        assert compute.calls == 1
+        assert len({id(o) for o in outputs}) == 3
+        assert cache.hits == 2 and cache.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_bounded_size_and_invalidation(self):
+        cache = SlotResultCache(max_entries=2)
+        compute = _Counter()
+
+        for profession in ("Guardian", "Warrior", "Necromancer"):
+            await cache.get_or_compute(_job(profession), {}, compute)
+        assert len(cache) == 2
+
+        # Guardian was evicted (least recently used)
+        await cache.get_or_compute(_job("Guardian"), {}, compute)
+        assert compute.calls == 4
+
+        assert cache.invalidate(profession="Guardian") == 1
+        assert cache.invalidate() == 1
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_empty_and_failed_outputs_are_not_cached(self):
+        cache = SlotResultCache(max_entries=8)
+        empty = _Counter(SlotOptimizationOutput)
+
+        await cache.get_or_compute(_job(), {}, empty)
+        await cache.get_or_compute(_job(), {}, empty)
+        assert empty.calls == 2
+
+        async def failing() -> SlotOptimizationOutput:
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            await cache.get_or_compute(_job("Warrior"), {}, failing)
+        assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_repeated_squad_slots_reuse_cached_result(monkeypatch):
+    cache = SlotResultCache(max_entries=8)
+    monkeypatch.setattr(tc_module, "get_slot_result_cache", lambda: cache)
+
+    calls = []
+    original = tc_module.optimize_slot_presets
+
+    async def counting(job, optimizer, gear_service):
+        calls.append(job)
+        return await original(job, optimizer, gear_service)
+
+    monkeypatch.setattr(tc_module, "optimize_slot_presets", counting)
+    hits_before = slot_cache_lookups_total.labels(result="hit")._value.get()
+
+    agent = TeamCommanderAgent()
+    slots = await asyncio.gather(
+        *(agent._prepare_slot(Role.HEAL, "Guardian", "Firebrand", mode="wvw_zerg") for _ in range(3))
+    )
+
+    assert len(calls) == 1
+    assert len({tuple((c.id, c.rune, tuple(c.sigils)) for c in s.candidates) for s in slots}) == 1
+    assert slot_cache_lookups_total.labels(result="hit")._value.get() - hits_before == 2
+
+    await agent._prepare_slot(Role.HEAL, "Guardian", "Firebrand", mode="wvw_roam")
+    assert len(calls) == 2